@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Benchmark broadcasting one large payload to many WebSocket connections.
+
+Sends a ~50 KB message to 10,000 Starlette WebSockets whose transport
+discards the frame, so the time measured is the per-recipient CPU cost of
+a broadcast.  Compares ``EventStream.broadcast`` (encode once, send the same
+text frame everywhere) with calling ``send_json`` for every connection,
+which is how broadcasts were sent before.
+
+Usage:
+    python benchmarks/bench_broadcast.py [--connections 10000] [--payload-kb 50]
+"""
+
+import argparse
+import asyncio
+import time
+
+from starlette.websockets import WebSocket, WebSocketState
+
+from refast.events.fanout import encode_frame, fan_out
+from refast.events.stream import EventStream, WebSocketConnection
+
+
+def make_socket(sent: list[int]) -> WebSocket:
+    """Return a connected WebSocket whose transport only records frame sizes."""
+
+    async def receive():
+        return {"type": "websocket.disconnect"}
+
+    async def send(message):
+        sent.append(len(message.get("text") or message.get("bytes") or ""))
+
+    ws = WebSocket({"type": "websocket", "path": "/ws", "headers": []}, receive, send)
+    ws.application_state = WebSocketState.CONNECTED
+    return ws
+
+
+def make_payload(size_kb: int) -> dict:
+    """Build a message of roughly *size_kb* KB resembling a table update."""
+    rows = []
+    payload = {"type": "event", "eventType": "table:update", "data": {"rows": rows}}
+    while len(encode_frame(payload)) < size_kb * 1024:
+        i = len(rows)
+        rows.append({"id": i, "name": f"row-{i}", "price": i * 1.25, "tags": ["a", "b", "ü"]})
+    return payload
+
+
+async def run(n_connections: int, payload: dict) -> None:
+    sent: list[int] = []
+    stream = EventStream()
+    sockets = [make_socket(sent) for _ in range(n_connections)]
+    for ws in sockets:
+        conn = WebSocketConnection(websocket=ws, connected=True)
+        stream._connections[conn.id] = conn
+
+    start = time.perf_counter()
+    result = await stream.broadcast(payload)
+    once = time.perf_counter() - start
+    assert result == n_connections
+    frame_size = sent[0]
+
+    sent.clear()
+    start = time.perf_counter()
+    result = await fan_out(sockets, lambda ws: ws.send_json(payload))
+    per_recipient = time.perf_counter() - start
+    assert result == n_connections
+    assert sent[0] == frame_size
+
+    print(f"{n_connections} connections, {frame_size / 1024:.1f} KB frame")
+    for name, elapsed in (("encode once", once), ("encode per recipient", per_recipient)):
+        per_conn = elapsed / n_connections * 1e6
+        print(f"  {name + ':':22}{elapsed * 1000:10.1f} ms  ({per_conn:.2f} us/conn)")
+    print(f"  speed-up:             {per_recipient / once:10.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connections", type=int, default=10_000)
+    parser.add_argument("--payload-kb", type=int, default=50)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.connections, make_payload(args.payload_kb)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Benchmark page route matching with a large route table.
+
+Registers 10,000 parameterised routes and compares ``RefastApp.match_route``
+(segment trie) with trying every compiled pattern in registration order,
+which is how routes were matched before.
+
+Usage:
+    python benchmarks/bench_routing.py [--routes 10000] [--lookups 20000]
+"""
+
+import argparse
+import random
+import time
+
+from refast import RefastApp
+
+
+def build_app(n_routes: int) -> tuple[RefastApp, list[str]]:
+    """Register *n_routes* parameterised pages and return sample URLs."""
+    app = RefastApp(auto_discover_extensions=False)
+    urls: list[str] = []
+    for i in range(n_routes):
+        kind = i % 4
+        if kind == 0:
+            path = f"/tenant{i}/users/{{user_id:int}}"
+            url = f"/tenant{i}/users/{i * 7}"
+        elif kind == 1:
+            path = f"/tenant{i}/posts/{{year:int}}/{{slug}}"
+            url = f"/tenant{i}/posts/2025/post-{i}"
+        elif kind == 2:
+            path = f"/tenant{i}/docs/{{doc_id:uuid}}"
+            url = f"/tenant{i}/docs/123e4567-e89b-12d3-a456-426614174000"
+        else:
+            path = f"/tenant{i}/files/{{rest:path}}"
+            url = f"/tenant{i}/files/a/b/c-{i}.txt"
+        app.page(path)(lambda ctx: None)
+        urls.append(url)
+    return app, urls
+
+
+def linear_match(app: RefastApp, path: str):
+    """The previous matcher: one regex fullmatch per registered pattern."""
+    func = app._pages.get(path)
+    if func is not None:
+        return func, {}
+    for compiled, param_types, handler in app._page_patterns:
+        m = compiled.fullmatch(path)
+        if m:
+            params = {}
+            for k, v in m.groupdict().items():
+                try:
+                    params[k] = param_types.get(k, str)(v)
+                except (ValueError, TypeError):
+                    params[k] = v
+            return handler, params
+    return None, {}
+
+
+def timed(func, paths: list[str]) -> float:
+    """Return the mean time per lookup in seconds."""
+    start = time.perf_counter()
+    for path in paths:
+        func(path)
+    return (time.perf_counter() - start) / len(paths)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--routes", type=int, default=10_000)
+    parser.add_argument("--lookups", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    start = time.perf_counter()
+    app, urls = build_app(args.routes)
+    print(f"Registered {args.routes} routes in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    hits = [rng.choice(urls) for _ in range(args.lookups)]
+    misses = [f"/unknown/{i}/page" for i in range(args.lookups)]
+
+    # Both matchers must agree before timing anything
+    for path in hits[:500] + misses[:50]:
+        assert app.match_route(path) == linear_match(app, path), path
+
+    # The linear scan is slow; time it on a sample of the lookups
+    sample = min(len(hits), 500)
+    for name, paths in (("Hits", hits), ("Misses", misses)):
+        trie = timed(app.match_route, paths)
+        linear = timed(lambda p: linear_match(app, p), paths[:sample])
+        print(f"\n{name}")
+        print(f"  match_route (trie):  {trie * 1e6:10.2f} us/lookup  ({len(paths)} lookups)")
+        print(f"  linear regex scan:   {linear * 1e6:10.2f} us/lookup  ({sample} lookups)")
+        print(f"  speed-up:            {linear / trie:10,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
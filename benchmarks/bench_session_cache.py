@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Benchmark CachedSessionStore read latency for hot sessions.
+
+Wraps a MemorySessionStore that sleeps to simulate a network round trip
+(as to Redis) and compares reads through the cache with direct reads.
+
+Usage:
+    python benchmarks/bench_session_cache.py [--sessions 1000] [--reads 20000] [--rtt 0.0005]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from refast.session.session import SessionData
+from refast.session.stores.cached import CachedSessionStore
+from refast.session.stores.memory import MemorySessionStore
+
+
+class RemoteStore(MemorySessionStore):
+    """Memory store with a simulated round trip on every read."""
+
+    def __init__(self, rtt: float):
+        super().__init__()
+        self.rtt = rtt
+
+    async def get(self, session_id):
+        await asyncio.sleep(self.rtt)
+        return await super().get(session_id)
+
+
+async def per_read(store, ids: list[str]) -> float:
+    """Mean time per get() in seconds."""
+    start = time.perf_counter()
+    for sid in ids:
+        await store.get(sid)
+    return (time.perf_counter() - start) / len(ids)
+
+
+async def run(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    remote = RemoteStore(args.rtt)
+    ids = [f"session-{i}" for i in range(args.sessions)]
+    for sid in ids:
+        await remote.set(
+            sid, SessionData(id=sid, data={"user_id": sid, "cart": [1, 2, 3]}).to_dict()
+        )
+    reads = [rng.choice(ids) for _ in range(args.reads)]
+
+    cache = CachedSessionStore(remote, max_entries=args.sessions, ttl=60)
+    await per_read(cache, ids)  # warm the cache
+
+    direct = await per_read(remote, reads[: args.reads // 20])
+    cached = await per_read(cache, reads)
+    print(f"{args.sessions} sessions, simulated round trip {args.rtt * 1e3:.2f} ms\n")
+    print(f"  direct  {direct * 1e6:10.2f} µs/read")
+    hit_rate = cache.hits / (cache.hits + cache.misses)
+    print(f"  cached  {cached * 1e6:10.2f} µs/read  (hit rate {hit_rate:.0%})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=1_000)
+    parser.add_argument("--reads", type=int, default=20_000)
+    parser.add_argument("--rtt", type=float, default=0.0005, help="simulated round trip (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Benchmark session store throughput.
+
+Runs concurrent writers and readers against MemorySessionStore,
+SQLiteSessionStore (in a temporary directory) and, when --redis-url is
+given and redis is installed, RedisSessionStore.
+
+Usage:
+    python benchmarks/bench_session_stores.py [--sessions 2000] [--concurrency 64]
+        [--redis-url redis://localhost:6379/15]
+"""
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from refast.session.session import SessionData
+from refast.session.stores.memory import MemorySessionStore
+from refast.session.stores.sqlite import SQLiteSessionStore
+
+
+async def throughput(concurrency: int, ops: list, func) -> float:
+    """Operations per second for *func* over *ops* with *concurrency* tasks."""
+    queue = iter(ops)
+
+    async def worker() -> None:
+        for op in queue:
+            await func(op)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return len(ops) / (time.perf_counter() - start)
+
+
+async def bench(name: str, store, args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    ids = [f"session-{i}" for i in range(args.sessions)]
+    sessions = {
+        sid: SessionData(id=sid, data={"user_id": sid, "cart": [1, 2, 3]}).to_dict() for sid in ids
+    }
+
+    async def write(sid: str) -> None:
+        await store.set(sid, sessions[sid])
+
+    async def read(sid: str) -> None:
+        await store.get(sid)
+
+    async def mixed(sid: str) -> None:
+        await (write if rng.random() < args.write_ratio else read)(sid)
+
+    writes = await throughput(args.concurrency, ids, write)
+    reads = await throughput(args.concurrency, [rng.choice(ids) for _ in ids], read)
+    both = await throughput(args.concurrency, [rng.choice(ids) for _ in ids], mixed)
+    print(f"  {name:<8} {writes:12,.0f} {reads:12,.0f} {both:12,.0f}")
+
+
+async def run(args: argparse.Namespace) -> None:
+    print(
+        f"{args.sessions} sessions, {args.concurrency} concurrent tasks, "
+        f"{args.write_ratio:.0%} writes in mixed (ops/s)\n"
+    )
+    print(f"  {'store':<8} {'set':>12} {'get':>12} {'mixed':>12}")
+    await bench("memory", MemorySessionStore(), args)
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = SQLiteSessionStore(Path(directory) / "sessions.db", synchronous=args.synchronous)
+        await bench("sqlite", store, args)
+        await store.close()
+
+    if args.redis_url:
+        from refast.session.stores.redis import RedisSessionStore
+
+        store = RedisSessionStore(redis_url=args.redis_url, prefix="bench:session:")
+        await bench("redis", store, args)
+        await store.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=2_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--synchronous", default="NORMAL", help="SQLite synchronous setting")
+    parser.add_argument("--redis-url", help="also benchmark RedisSessionStore")
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
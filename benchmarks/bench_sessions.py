@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""Benchmark MemorySessionStore with a large number of sessions.
+
+Stores 1,000,000 sessions, then times get/set/touch and cleanup of a
+small expired fraction.  Compares the sharded store with timer-wheel expiry with
+a replica of the previous one (one global asyncio.Lock around a single
+dict, datetime expiry, cleanup scanning every session).
+
+Usage:
+    python benchmarks/bench_sessions.py [--sessions 1000000] [--expired 0.01]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from refast.session.stores.memory import MemorySessionStore
+
+
+class LockedScanStore:
+    """The previous MemorySessionStore: global lock, full-scan cleanup."""
+
+    def __init__(self, default_ttl: int = 3600):
+        self._store: dict[str, tuple[dict[str, Any], datetime]] = {}
+        self._default_ttl = default_ttl
+        self._lock = asyncio.Lock()
+
+    async def get(self, session_id: str) -> dict[str, Any] | None:
+        async with self._lock:
+            entry = self._store.get(session_id)
+            if entry is None:
+                return None
+            if datetime.now(UTC) > entry[1]:
+                del self._store[session_id]
+                return None
+            return entry[0]
+
+    async def set(self, session_id: str, data: dict[str, Any], ttl: int | None = None) -> None:
+        expires_at = datetime.now(UTC) + timedelta(seconds=ttl or self._default_ttl)
+        async with self._lock:
+            self._store[session_id] = (data, expires_at)
+
+    async def touch(self, session_id: str, ttl: int = 3600) -> bool:
+        data = await self.get(session_id)
+        if data:
+            await self.set(session_id, data, ttl)
+            return True
+        return False
+
+    async def clear_expired(self) -> int:
+        now = datetime.now(UTC)
+        async with self._lock:
+            expired = [sid for sid, (_, expires_at) in self._store.items() if now > expires_at]
+            for sid in expired:
+                del self._store[sid]
+        return len(expired)
+
+
+async def fill(store, ids: list[str], expired: set[str]) -> float:
+    """Store every session; return the mean time per set() in seconds."""
+    start = time.perf_counter()
+    for sid in ids:
+        # ttl=1 sessions are expired after the wait below
+        await store.set(sid, {"user_id": sid}, ttl=1 if sid in expired else 3600)
+    return (time.perf_counter() - start) / len(ids)
+
+
+async def per_call(func, ids: list[str]) -> float:
+    """Mean time per call of ``await func(sid)`` in seconds."""
+    start = time.perf_counter()
+    for sid in ids:
+        await func(sid)
+    return (time.perf_counter() - start) / len(ids)
+
+
+async def longest_pause(coro) -> tuple[Any, float]:
+    """Run *coro* next to a ticker; return its result and the longest loop stall."""
+    gaps: list[float] = []
+    done = asyncio.Event()
+
+    async def ticker() -> None:
+        last = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(0)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    result = await coro
+    done.set()
+    await task
+    return result, max(gaps, default=0.0)
+
+
+async def run(name: str, store, ids: list[str], expired: set[str], lookups: list[str]) -> None:
+    set_time = await fill(store, ids, expired)
+    await asyncio.sleep(1.1)
+    get_time = await per_call(store.get, lookups)
+    touch_time = await per_call(store.touch, lookups)
+
+    start = time.perf_counter()
+    removed, pause = await longest_pause(store.clear_expired())
+    cleanup = time.perf_counter() - start
+
+    print(f"{name}:")
+    print(f"  set     {set_time * 1e6:8.2f} µs/op")
+    print(f"  get     {get_time * 1e6:8.2f} µs/op")
+    print(f"  touch   {touch_time * 1e6:8.2f} µs/op")
+    print(
+        f"  cleanup {cleanup * 1000:8.1f} ms for {removed} expired "
+        f"(longest loop pause {pause * 1000:.1f} ms)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=1_000_000)
+    parser.add_argument("--expired", type=float, default=0.01, help="fraction that expires")
+    parser.add_argument("--lookups", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    ids = [f"session-{i:08d}" for i in range(args.sessions)]
+    expired = set(rng.sample(ids, int(args.sessions * args.expired)))
+    live = [sid for sid in ids if sid not in expired]
+    lookups = [rng.choice(live) for _ in range(args.lookups)]
+
+    print(f"{args.sessions} sessions, {len(expired)} expiring\n")
+    asyncio.run(
+        run(
+            "MemorySessionStore (sharded, timer wheel)", MemorySessionStore(), ids, expired, lookups
+        )
+    )
+    asyncio.run(
+        run("Previous store (global lock, full scan)", LockedScanStore(), ids, expired, lookups)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -91,11 +91,12 @@ That's it! The streaming is complete. 🎉
 
 async def stream_markdown(ctx: Context):
     """Stream text to the Markdown component token by token."""
-    # Clear previous content and show streaming indicator
-    await ctx.update_props("markdown-output", {"content": "", "streaming": True})
-    await ctx.update_text("stream-status", "Streaming...")
-    await ctx.update_props("stream-status", {"variant": "primary"})
-    await ctx.update_props("stop-streaming", {"disabled": False})
+    # Clear previous content and show streaming indicator in a single frame
+    async with ctx.batch():
+        await ctx.update_props("markdown-output", {"content": "", "streaming": True})
+        await ctx.update_text("stream-status", "Streaming...")
+        await ctx.update_props("stream-status", {"variant": "primary"})
+        await ctx.update_props("stop-streaming", {"disabled": False})
     ctx.state.set("streaming_stopped", False)
 
     # Simulate token-by-token streaming (like an LLM)
@@ -14,6 +14,7 @@ const DebugPanel = lazy(() => import('./components/DebugPanel'));
 declare global {
   interface Window {
     __REFAST_INITIAL_DATA__?: ComponentTree;
+    __REFAST_INITIAL_HASH__?: string;
     __REFAST_CONFIG__?: {
       wsUrl?: string;
       csrfToken?: string;
@@ -129,6 +130,32 @@ export function RefastApp({ initialTree, wsUrl, className }: RefastAppProps): Re
     };
   }, [socket]);
 
+  // Forward prefetch requests and in-app visits from prefetching links
+  useEffect(() => {
+    const send = (message: Record<string, unknown>) => {
+      if (socket && socket.readyState === WebSocket.OPEN) {
+        socket.send(JSON.stringify(message));
+        return true;
+      }
+      return false;
+    };
+    const offPrefetch = refastBus.on('refast:prefetch', ({ path }) => {
+      send({ type: 'prefetch', path });
+    });
+    const offVisit = refastBus.on('refast:visit', ({ path }) => {
+      if (!send({ type: 'navigate', path })) {
+        window.location.href = path;
+        return;
+      }
+      window.history.pushState({}, '', path);
+      window.scrollTo({ top: 0 });
+    });
+    return () => {
+      offPrefetch();
+      offVisit();
+    };
+  }, [socket]);
+
   // Listen for refresh events
   useEffect(() => {
     return refastBus.on('refast:refresh', () => fetchPage());
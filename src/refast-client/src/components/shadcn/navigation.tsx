@@ -4,6 +4,12 @@ import * as NavigationMenuPrimitive from '@radix-ui/react-navigation-menu';
 import * as MenubarPrimitive from '@radix-ui/react-menubar';
 import { cn } from '../../utils';
 import { Icon } from './icon';
+import {
+  type PrefetchMode,
+  handlePrefetchedClick,
+  isInternalPath,
+  usePrefetch,
+} from '../../utils/prefetch';
 
 // ============================================================================
 // Breadcrumb
@@ -1933,6 +1939,8 @@ interface SidebarMenuButtonProps {
   size?: 'default' | 'sm' | 'lg';
   onClick?: () => void;
   href?: string;
+  prefetch?: PrefetchMode | null;
+  prefetchPath?: string | null;
   children?: React.ReactNode;
   'data-refast-id'?: string;
 }
@@ -1946,9 +1954,15 @@ export function SidebarMenuButton({
   size = 'default',
   onClick,
   href,
+  prefetch,
+  prefetchPath,
   children,
   'data-refast-id': dataRefastId,
 }: SidebarMenuButtonProps): React.ReactElement<any> {
+  const anchorRef = React.useRef<HTMLAnchorElement>(null);
+  const buttonRef = React.useRef<HTMLButtonElement>(null);
+  const target = prefetchPath ?? href;
+  usePrefetch(href ? anchorRef : buttonRef, target, prefetch);
   const buttonClasses = cn(
     'peer/menu-button flex w-full items-center gap-2 overflow-hidden rounded-md p-2 text-left text-sm outline-none ring-sidebar-ring transition-[width,height,padding] hover:bg-sidebar-accent hover:text-sidebar-accent-foreground focus-visible:ring-2 active:bg-sidebar-accent active:text-sidebar-accent-foreground disabled:pointer-events-none disabled:opacity-50 group-has-[[data-sidebar=menu-action]]/menu-item:pr-8 aria-disabled:pointer-events-none aria-disabled:opacity-50 data-[active=true]:bg-sidebar-accent data-[active=true]:font-medium data-[active=true]:text-sidebar-accent-foreground data-[state=open]:hover:bg-sidebar-accent data-[state=open]:hover:text-sidebar-accent-foreground',
     'group-data-[collapsible=icon]:!size-8 group-data-[collapsible=icon]:!p-2 [&>span:last-child]:truncate [&>svg]:size-4 [&>svg]:shrink-0',
@@ -1971,8 +1985,14 @@ export function SidebarMenuButton({
   if (href) {
     return (
       <a
+        ref={anchorRef}
         id={id}
         href={href}
+        onClick={
+          prefetch && isInternalPath(href)
+            ? (event) => handlePrefetchedClick(event, href)
+            : undefined
+        }
         data-sidebar="menu-button"
         data-size={size}
         data-active={isActive}
@@ -1986,6 +2006,7 @@ export function SidebarMenuButton({
 
   return (
     <button
+      ref={buttonRef}
       id={id}
       data-sidebar="menu-button"
       data-size={size}
@@ -3,6 +3,12 @@ import { ExternalLink, Copy, Check, X } from 'lucide-react';
 import { cn } from '../../utils';
 import { Icon } from './icon';
 import { ComponentRenderer } from '../ComponentRenderer';
+import {
+  type PrefetchMode,
+  handlePrefetchedClick,
+  isInternalPath,
+  usePrefetch,
+} from '../../utils/prefetch';
 
 /**
  * Internal copy-to-clipboard button shown on hover over code blocks.
@@ -184,6 +190,7 @@ interface LinkProps {
   variant?: 'default' | 'unstyled';
   target?: '_blank' | '_self' | '_parent' | '_top';
   external?: boolean;
+  prefetch?: PrefetchMode | null;
   onClick?: () => void;
   children?: React.ReactNode;
   style?: React.CSSProperties;
@@ -200,18 +207,29 @@ export function Link({
   variant = 'default',
   target = '_self',
   external = false,
+  prefetch,
   onClick,
   children,
   style,
   'data-refast-id': dataRefastId,
 }: LinkProps): React.ReactElement<any> {
+  const ref = React.useRef<HTMLAnchorElement>(null);
+  const prefetchable =
+    !!prefetch && !external && target === '_self' && isInternalPath(href);
+  usePrefetch(ref, prefetchable ? href : null, prefetch);
+
   return (
     <a
+      ref={ref}
       id={id}
       href={href}
       target={external ? '_blank' : target}
       rel={external ? 'noopener noreferrer' : undefined}
-      onClick={onClick}
+      onClick={
+        prefetchable && !onClick
+          ? (event) => handlePrefetchedClick(event, href)
+          : onClick
+      }
       className={cn(
         variant === 'default' && 'font-medium text-primary px-2 hover:bg-accent',
         className
@@ -368,13 +368,20 @@ export function EventManagerProvider({
 
     const handleMessage = (event: MessageEvent) => {
       try {
-        const message: UpdateMessage = JSON.parse(event.data);
+        const frame: UpdateMessage = JSON.parse(event.data);
 
-        // Notify all registered update handlers (StateManager, ToastManager, etc.)
-        updateHandlers.current.forEach((handler) => handler(message));
+        // A batch frame (from ctx.batch()) carries several update messages.
+        // Dispatching them synchronously in one task lets React fold all the
+        // resulting state changes into a single render.
+        const messages = frame.type === 'batch' ? frame.messages ?? [] : [frame];
 
-        // Dispatch to type-specific registered handlers.
-        messageHandlerRegistry.current.get(message.type)?.forEach((handler) => handler(message));
+        for (const message of messages) {
+          // Notify all registered update handlers (StateManager, ToastManager, etc.)
+          updateHandlers.current.forEach((handler) => handler(message));
+
+          // Dispatch to type-specific registered handlers.
+          messageHandlerRegistry.current.get(message.type)?.forEach((handler) => handler(message));
+        }
       } catch (error) {
         console.error('Error parsing WebSocket message:', error);
       }
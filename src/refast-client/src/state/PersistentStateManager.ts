@@ -156,11 +156,17 @@ export class PersistentStateManager {
       session: readStorage(sessionStorage, SESSION_PREFIX),
     };
 
+    // The page tree inlined in the HTML shell is only current for the first
+    // store_init of this document; later ones (reconnects) always re-render.
+    const rendered = window.__REFAST_INITIAL_HASH__;
+    window.__REFAST_INITIAL_HASH__ = undefined;
+
     // Include current path (with query string) so backend renders the correct page
     this.websocket.send(JSON.stringify({
       type: 'store_init',
       data,
       path: window.location.pathname + window.location.search,
+      ...(rendered ? { rendered } : {}),
     }));
 
     this.initialized = true;
@@ -102,7 +102,7 @@ export type AnyCallbackRef = AnyActionRef;
  * Update message from backend.
  */
 export interface UpdateMessage {
-  type: 'update' | 'state_update' | 'navigate' | 'toast' | 'event' | 'refresh' | 'store_update' | 'store_ready' | 'page_render' | 'js_exec' | 'resync_store' | 'bound_method_call' | 'theme_update' | 'desktop_notification' | 'debug_event';
+  type: 'update' | 'batch' | 'state_update' | 'navigate' | 'toast' | 'event' | 'refresh' | 'store_update' | 'store_ready' | 'page_render' | 'js_exec' | 'resync_store' | 'bound_method_call' | 'theme_update' | 'desktop_notification' | 'debug_event';
   operation?: 'replace' | 'append' | 'prepend' | 'remove' | 'update_props' | 'update_children' | 'append_prop';
   event?: {
     type: string;
@@ -116,6 +116,8 @@ export interface UpdateMessage {
   // append_prop specific fields
   propName?: string;
   value?: unknown;
+  // batch specific field: grouped update messages applied in one pass
+  messages?: UpdateMessage[];
   state?: Record<string, unknown>;
   path?: string;
   redirect?: boolean;
@@ -184,8 +186,10 @@ export interface StoreUpdate {
  * Event message to backend.
  */
 export interface EventMessage {
-  type: 'callback' | 'event' | 'subscribe' | 'unsubscribe';
+  type: 'callback' | 'event' | 'subscribe' | 'unsubscribe' | 'prefetch' | 'navigate';
   callbackId?: string;
+  /** Target page for 'prefetch' and 'navigate' messages. */
+  path?: string;
   eventType?: string;
   /** Bound args + requested prop store values. Passed as **kwargs to the Python callback. */
   data?: Record<string, unknown>;
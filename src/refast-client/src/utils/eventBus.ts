@@ -54,6 +54,10 @@ export interface RefastEventMap {
   'refast:toast': ToastEventDetail;
   /** Client-side navigation event (emitted by StateManager). */
   'refast:navigate': { path: string };
+  /** Ask the server to render a page ahead of navigation (emitted by usePrefetch). */
+  'refast:prefetch': { path: string };
+  /** Navigate to an internal page over the WebSocket without a reload (emitted by prefetching links). */
+  'refast:visit': { path: string };
   /** Trigger a page refresh via HTTP (emitted by StateManager fallback). */
   'refast:refresh': Record<string, never>;
   /** Force input/select components to sync their local value state with a new server value. */
@@ -0,0 +1,93 @@
+/**
+ * Predictive page prefetching.
+ *
+ * Links and sidebar items created with ``prefetch="hover"`` or
+ * ``prefetch="visible"`` ask the server to render their target page ahead of
+ * time.  The server keeps that render briefly on the connection's Context and
+ * serves the following navigation from it.
+ */
+
+import React, { useEffect } from 'react';
+import { refastBus } from './eventBus';
+
+export type PrefetchMode = 'hover' | 'visible';
+
+/** Minimum time between two prefetch requests for the same path. */
+const PREFETCH_INTERVAL_MS = 5000;
+
+const lastRequested = new Map<string, number>();
+
+/**
+ * Whether *href* points to a page of this app (same origin, not a fragment).
+ */
+export function isInternalPath(href: string | undefined | null): href is string {
+  return typeof href === 'string' && href.startsWith('/') && !href.startsWith('//');
+}
+
+/**
+ * Request a server-side prefetch of *path* (rate-limited per path).
+ */
+export function requestPrefetch(path: string): void {
+  const now = Date.now();
+  const last = lastRequested.get(path);
+  if (last !== undefined && now - last < PREFETCH_INTERVAL_MS) return;
+  lastRequested.set(path, now);
+  refastBus.emit('refast:prefetch', { path });
+}
+
+/**
+ * Prefetch *path* when the element is hovered/focused or scrolled into view.
+ */
+export function usePrefetch(
+  ref: React.RefObject<HTMLElement | null>,
+  path: string | undefined | null,
+  mode: PrefetchMode | undefined | null,
+): void {
+  useEffect(() => {
+    const el = ref.current;
+    if (!el || !mode || !isInternalPath(path)) return;
+
+    if (mode === 'visible' && typeof IntersectionObserver !== 'undefined') {
+      const observer = new IntersectionObserver((entries) => {
+        if (entries.some((entry) => entry.isIntersecting)) {
+          requestPrefetch(path);
+          observer.disconnect();
+        }
+      });
+      observer.observe(el);
+      return () => observer.disconnect();
+    }
+
+    const onIntent = () => requestPrefetch(path);
+    el.addEventListener('mouseenter', onIntent);
+    el.addEventListener('focus', onIntent);
+    el.addEventListener('touchstart', onIntent, { passive: true });
+    return () => {
+      el.removeEventListener('mouseenter', onIntent);
+      el.removeEventListener('focus', onIntent);
+      el.removeEventListener('touchstart', onIntent);
+    };
+  }, [ref, path, mode]);
+}
+
+/**
+ * Click handler for prefetching anchors: navigates over the WebSocket instead
+ * of reloading the document, so the prefetched render can be used.
+ */
+export function handlePrefetchedClick(
+  event: React.MouseEvent<HTMLAnchorElement>,
+  path: string,
+): void {
+  if (
+    event.defaultPrevented ||
+    event.button !== 0 ||
+    event.metaKey ||
+    event.ctrlKey ||
+    event.shiftKey ||
+    event.altKey
+  ) {
+    return;
+  }
+  event.preventDefault();
+  refastBus.emit('refast:visit', { path });
+}
@@ -15,10 +15,16 @@ from refast.context import (
     SaveProp,
 )
 from refast.extensions import Extension
-from refast.state import State
+from refast.state import SharedState, State
 from refast.store import BrowserStore, JSONEncoder, LocalStore, SessionStore, Store
 from refast.theme import Theme, ThemeColors, ThemeMode
-from refast.utils.temp_file_store import DiskFileStore, FileInfo, MemoryFileStore, TempFileStore
+from refast.utils.temp_file_store import (
+    DiskFileStore,
+    FileInfo,
+    MemoryFileStore,
+    SQLiteFileStore,
+    TempFileStore,
+)
 
 __version__ = "0.1.0"
 __all__ = [
@@ -31,6 +37,7 @@ __all__ = [
     "SaveProp",
     "ChainedAction",
     "State",
+    "SharedState",
     "Store",
     "LocalStore",
     "SessionStore",
@@ -45,4 +52,5 @@ __all__ = [
     "TempFileStore",
     "MemoryFileStore",
     "DiskFileStore",
+    "SQLiteFileStore",
 ]
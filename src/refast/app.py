@@ -1,25 +1,41 @@
 """Main RefastApp class."""
 
 import logging
-import re
 from collections.abc import Callable
 from typing import TYPE_CHECKING, Any, TypeVar
 
 from fastapi import APIRouter
 
+from refast.assets import build_extension_index
+from refast.events.fanout import DEFAULT_SEND_TIMEOUT, BroadcastResult
 from refast.events.manager import EventManager
+from refast.events.stream import EventStream
 from refast.router import RefastRouter
+from refast.routing import PARAM_RE, RouteTrie
+from refast.session.writer import SessionWriter
+from refast.snapshot import SnapshotWriter
+from refast.state import SharedState
 from refast.theme.theme import Theme
 from refast.utils.temp_file_store import MemoryFileStore, TempFileStore
 
 if TYPE_CHECKING:
+    from refast.assets import HtmlShell, StaticAssetIndex
     from refast.context import Context
+    from refast.events.backplane import Backplane, BackplaneMessage
     from refast.extensions import Extension
+    from refast.session.stores.base import SessionStore
+    from refast.snapshot import ContextSnapshotStore
 
 PageFunc = TypeVar("PageFunc", bound=Callable[..., Any])
 
 logger = logging.getLogger(__name__)
 
+# Backplane message kinds used by the app
+BACKPLANE_BROADCAST = "app:broadcast"
+BACKPLANE_THEME = "app:theme"
+BACKPLANE_CHANNEL = "app:channel"
+BACKPLANE_SESSION = "app:session"
+
 
 class RefastApp:
     """
@@ -88,6 +104,46 @@ class RefastApp:
             ``None`` means no additional total-size cap beyond what the
             :attr:`file_store` enforces per individual file.  Defaults to
             ``None`` (rely on the store's per-file limit).
+        prefetch_ttl: Seconds a page rendered by a client ``prefetch``
+            message (see :meth:`Context.prefetch`) stays valid for the
+            following navigation.  ``0`` disables prefetching.
+            Defaults to ``10.0``.
+        bundle_extensions: Serve all scripts of an extension as one
+            concatenated file, so loading it costs one request instead of
+            one per script.  Defaults to ``False``.
+        inline_initial_tree: Render the page during the HTTP request and
+            embed its component tree in the HTML shell, so the client can
+            paint it before the WebSocket connects.  The page function then
+            runs once for the HTTP request and again on ``store_init``
+            (which only re-sends the page if the output differs, e.g. because
+            of browser storage).  Component and callback IDs of these renders
+            are deterministic.  Defaults to ``False``.
+        backplane: A :class:`~refast.events.backplane.Backplane` connecting
+            the worker processes serving this app.  ``ctx.broadcast()`` and
+            ``ctx.broadcast_theme()`` then reach the clients of every
+            worker, not just the current one.  The backplane starts with
+            the first WebSocket connection; call ``await ui.backplane.close()``
+            on shutdown.  Defaults to ``None`` (single process).
+        session_cookie_name: Cookie identifying the browser session.  Its
+            value on the WebSocket handshake is the session ID used by
+            :meth:`Context.send_to_session`.  Defaults to
+            ``"refast_session"``, the name used by ``SessionMiddleware``.
+        snapshot_store: A :class:`~refast.snapshot.ContextSnapshotStore`
+            holding a snapshot of each connection's ``ctx.state``, location
+            and browser storage cache.  When a client reconnects, to this
+            or any other worker, its context is restored from the snapshot
+            before the page renders.  Defaults to ``None`` (state is lost
+            with the connection).
+        snapshot_interval: Seconds between batched snapshot writes; a
+            worker crash loses at most this much.  Defaults to ``1.0``.
+        session_store: The :class:`~refast.session.SessionStore` behind
+            ``SessionMiddleware`` (pass the same instance).  ``ctx.session``
+            is then the session named by the WebSocket handshake's session
+            cookie, loaded once per connection; changes are saved in
+            batches behind the callbacks.  Defaults to ``None``
+            (``ctx.session`` is a blank session that is never saved).
+        session_write_interval: Seconds between batched session writes.
+            Defaults to ``0.5``.
     """
 
     def __init__(
@@ -110,13 +166,22 @@ class RefastApp:
         max_upload_files: int = 20,
         max_upload_size: int | None = None,
         client_mode: str = "full",
+        prefetch_ttl: float = 10.0,
+        bundle_extensions: bool = False,
+        inline_initial_tree: bool = False,
+        backplane: "Backplane | None" = None,
+        session_cookie_name: str = "refast_session",
+        snapshot_store: "ContextSnapshotStore | None" = None,
+        snapshot_interval: float = 1.0,
+        session_store: "SessionStore | None" = None,
+        session_write_interval: float = 0.5,
     ):
         if client_mode not in ("full", "core"):
             raise ValueError("client_mode must be 'full' or 'core'")
         self.client_mode = client_mode
 
         self.title = title
-        self.theme = theme
+        self._theme = theme
         self.secret_key = secret_key
         self.debug = debug
         self.favicon = favicon
@@ -144,9 +209,14 @@ class RefastApp:
         self._head_tags: list[str] = list(head_tags) if head_tags else []
 
         self._pages: dict[str, Callable] = {}
-        # Entries: (compiled_pattern, param_types_dict, handler)
-        self._page_patterns: list[tuple[re.Pattern[str], dict[str, type], Callable]] = []
+        # Compiled matcher over the parameterised page paths, used by match_route()
+        self._route_trie = RouteTrie()
         self.events = EventManager(app=self)
+        # Registry of live WebSocket connections: contexts, sessions, channels
+        self.stream = EventStream(self)
+        self.session_cookie_name = session_cookie_name
+        # App-scoped reactive state shared by all connections
+        self.shared_state = SharedState()
         self._router: RefastRouter | None = None
         self._extensions: dict[str, Extension] = {}
 
@@ -154,6 +224,33 @@ class RefastApp:
         self.file_store: TempFileStore = file_store if file_store is not None else MemoryFileStore()
         self.max_upload_files: int = max_upload_files
         self.max_upload_size: int | None = max_upload_size
+        self.prefetch_ttl: float = prefetch_ttl
+        self.bundle_extensions: bool = bundle_extensions
+        self.inline_initial_tree: bool = inline_initial_tree
+        # Indexed static files of each registered extension
+        self._extension_assets: dict[str, StaticAssetIndex] = {}
+
+        # Carries broadcasts and theme updates to the other workers
+        self.backplane = backplane
+        if backplane is not None:
+            backplane.on(BACKPLANE_BROADCAST, self._on_backplane_broadcast)
+            backplane.on(BACKPLANE_THEME, self._on_backplane_theme)
+            backplane.on(BACKPLANE_CHANNEL, self._on_backplane_channel)
+            backplane.on(BACKPLANE_SESSION, self._on_backplane_session)
+
+        # Persists per-connection state so any worker can resume it
+        self.snapshots: SnapshotWriter | None = None
+        if snapshot_store is not None:
+            self.snapshots = SnapshotWriter(snapshot_store, interval=snapshot_interval)
+
+        # Loads ctx.session at the handshake and saves it behind the callbacks
+        self.sessions: SessionWriter | None = None
+        if session_store is not None:
+            self.sessions = SessionWriter(session_store, interval=session_write_interval)
+
+        # Rendered HTML shell; the version is bumped whenever the shell changes
+        self._shell_version = 0
+        self._html_shell: tuple[tuple[Any, ...], HtmlShell] | None = None
 
         # Auto-discover extensions via entry points
         if auto_discover_extensions:
@@ -173,11 +270,29 @@ class RefastApp:
 
     @property
     def active_contexts(self) -> list["Context"]:
-        """Get all active WebSocket contexts."""
+        """
+        Get all active WebSocket contexts.
+
+        Builds a new list on every call.  To reach a subset of clients,
+        prefer :meth:`Context.subscribe` with :meth:`Context.send_to_channel`,
+        or :meth:`Context.send_to_session`, which use indexes.
+        """
         if self._router is None:
             return []
         return self._router.active_contexts
 
+    @property
+    def theme(self) -> Theme | None:
+        """The app theme, rendered into the HTML shell."""
+        return self._theme
+
+    @theme.setter
+    def theme(self, theme: Theme | None) -> None:
+        # Assign a new theme rather than editing it in place: the cached
+        # shell is only rebuilt on assignment
+        self._theme = theme
+        self._shell_version += 1
+
     @property
     def pages(self) -> dict[str, Callable]:
         """Get registered pages."""
@@ -188,7 +303,9 @@ class RefastApp:
         Decorator to register a page.
 
         Args:
-            path: URL path for the page
+            path: URL path for the page.  May contain ``{name}`` or
+                ``{name:type}`` parameters (``str``, ``int``, ``float``,
+                ``uuid`` or ``path``), available as ``ctx.path_params``.
 
         Returns:
             Decorator function
@@ -198,38 +315,18 @@ class RefastApp:
             @ui.page("/dashboard")
             def dashboard(ctx: Context):
                 return Container(...)
+
+            @ui.page("/users/{user_id:int}")
+            def user(ctx: Context):
+                return Text(f"User {ctx.path_params['user_id']}")
             ```
         """
 
         # Check whether this is a parameterised path
-        _PARAM_RE = re.compile(r"\{(\w+)(?::(\w+))?\}")  # noqa: N806
-        if _PARAM_RE.search(path):
-            # Build a regex pattern by escaping static segments individually
-            # so we never call re.escape on the {name:type} tokens themselves.
-            _TYPE_MAP: dict[str, type] = {"int": int, "float": float, "str": str, "uuid": str}  # noqa: N806
-            _REGEX_MAP: dict[str, str] = {  # noqa: N806
-                "int": r"\d+",
-                "float": r"[\d.]+",
-                "str": r"[^/]+",
-                "uuid": (
-                    r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
-                ),
-            }
-            param_types: dict[str, type] = {}
-            parts: list[str] = []
-            last = 0
-            for m in _PARAM_RE.finditer(path):
-                parts.append(re.escape(path[last : m.start()]))
-                name = m.group(1)
-                type_str = m.group(2) or "str"
-                param_types[name] = _TYPE_MAP.get(type_str, str)
-                parts.append(f"(?P<{name}>{_REGEX_MAP.get(type_str, r'[^/]+')})")
-                last = m.end()
-            parts.append(re.escape(path[last:]))
-            compiled = re.compile("^" + "".join(parts) + "$")
-
-            def decorator(func: PageFunc, _compiled=compiled, _types=param_types) -> PageFunc:
-                self._page_patterns.append((_compiled, _types, func))
+        if PARAM_RE.search(path):
+
+            def decorator(func: PageFunc) -> PageFunc:
+                self._route_trie.add(path, func)
                 return func
         else:
 
@@ -243,9 +340,10 @@ class RefastApp:
         """
         Find a page handler for *path* and extract any path parameters.
 
-        Exact paths are checked first (O(1)); parameterised patterns are tried
-        next in registration order.  Type coercion (int, float) is applied
-        before returning.
+        Exact paths are checked first (O(1)); parameterised patterns are then
+        looked up in a segment trie, with the first registered pattern winning
+        when several match.  Type coercion (int, float) is applied before
+        returning.
 
         Returns:
             A ``(handler, path_params)`` tuple.  ``path_params`` is empty for
@@ -255,21 +353,7 @@ class RefastApp:
         func = self._pages.get(path)
         if func is not None:
             return func, {}
-
-        for compiled, param_types, handler in self._page_patterns:
-            m = compiled.fullmatch(path)
-            if m:
-                raw: dict[str, Any] = m.groupdict()
-                coerced: dict[str, Any] = {}
-                for k, v in raw.items():
-                    target_type = param_types.get(k, str)
-                    try:
-                        coerced[k] = target_type(v)
-                    except (ValueError, TypeError):
-                        coerced[k] = v
-                return handler, coerced
-
-        return None, {}
+        return self._route_trie.match(path)
 
     def on(
         self,
@@ -355,8 +439,12 @@ class RefastApp:
             for error in errors:
                 logger.warning(f"Extension validation warning: {error}")
 
-        # Register the extension
+        # Register the extension and index (and compress) its static files once
         self._extensions[extension.name] = extension
+        index = build_extension_index(extension, bundle=self.bundle_extensions)
+        if index is not None:
+            self._extension_assets[extension.name] = index
+        self._shell_version += 1
 
         # Call the extension's on_register hook
         extension.on_register(self)
@@ -429,6 +517,7 @@ class RefastApp:
             ```
         """
         self._custom_css.append(css)
+        self._shell_version += 1
 
     def add_js(self, js: str) -> None:
         """
@@ -448,6 +537,7 @@ class RefastApp:
             ```
         """
         self._custom_js.append(js)
+        self._shell_version += 1
 
     def add_head_tag(self, html: str) -> None:
         """
@@ -463,3 +553,85 @@ class RefastApp:
             ```
         """
         self._head_tags.append(html)
+        self._shell_version += 1
+
+    async def _broadcast(
+        self,
+        payload: dict[str, Any],
+        *,
+        exclude: Any = None,
+        timeout: float | None = DEFAULT_SEND_TIMEOUT,
+    ) -> BroadcastResult:
+        """Send *payload* to the clients of this worker and, via the backplane, all others."""
+        recipients = [
+            conn for conn in self.stream.get_all_connections() if conn.websocket is not exclude
+        ]
+        result = await self.stream.fan_out(recipients, payload, timeout=timeout)
+        await self._publish(BACKPLANE_BROADCAST, {"message": payload})
+        return result
+
+    async def _broadcast_theme(
+        self, theme: Any, *, timeout: float | None = DEFAULT_SEND_TIMEOUT
+    ) -> BroadcastResult:
+        """Push *theme* to every client; other workers also adopt it as their app theme."""
+        payload = {"type": "theme_update", "theme": theme.to_dict()}
+        result = await self.stream.fan_out(
+            self.stream.get_all_connections(), payload, timeout=timeout
+        )
+        dump = theme.model_dump(mode="json") if isinstance(theme, Theme) else None
+        await self._publish(BACKPLANE_THEME, {"theme": dump, "message": payload})
+        return result
+
+    async def _send_to_channel(
+        self,
+        channel: str,
+        payload: dict[str, Any],
+        *,
+        exclude: Any = None,
+        timeout: float | None = DEFAULT_SEND_TIMEOUT,
+    ) -> BroadcastResult:
+        """Send *payload* to the subscribers of *channel* on every worker."""
+        recipients = [
+            conn for conn in self.stream.get_subscribers(channel) if conn.websocket is not exclude
+        ]
+        result = await self.stream.fan_out(recipients, payload, timeout=timeout)
+        await self._publish(BACKPLANE_CHANNEL, {"channel": channel, "message": payload})
+        return result
+
+    async def _send_to_session(
+        self,
+        session_id: str,
+        payload: dict[str, Any],
+        *,
+        timeout: float | None = DEFAULT_SEND_TIMEOUT,
+    ) -> BroadcastResult:
+        """Send *payload* to the connections of *session_id* on every worker."""
+        recipients = self.stream.get_session_connections(session_id)
+        result = await self.stream.fan_out(recipients, payload, timeout=timeout)
+        await self._publish(BACKPLANE_SESSION, {"session_id": session_id, "message": payload})
+        return result
+
+    async def _publish(self, kind: str, payload: dict[str, Any]) -> None:
+        """Forward a message to the other workers, if there is a backplane."""
+        if self.backplane is None:
+            return
+        try:
+            await self.backplane.publish(kind, payload)
+        except Exception as e:
+            logger.error(f"Failed to publish {kind!r} to backplane: {e}")
+
+    async def _on_backplane_broadcast(self, message: "BackplaneMessage") -> None:
+        await self.stream.broadcast(message.payload["message"])
+
+    async def _on_backplane_theme(self, message: "BackplaneMessage") -> None:
+        if message.payload.get("theme") is not None:
+            self.theme = Theme.model_validate(message.payload["theme"])
+        await self.stream.broadcast(message.payload["message"])
+
+    async def _on_backplane_channel(self, message: "BackplaneMessage") -> None:
+        connections = self.stream.get_subscribers(message.payload["channel"])
+        await self.stream.fan_out(connections, message.payload["message"])
+
+    async def _on_backplane_session(self, message: "BackplaneMessage") -> None:
+        connections = self.stream.get_session_connections(message.payload["session_id"])
+        await self.stream.fan_out(connections, message.payload["message"])
@@ -2,12 +2,25 @@
 
 from __future__ import annotations
 
+import gzip
+import hashlib
 import json
+from email.utils import formatdate
+from functools import lru_cache
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
+try:
+    import brotli
+
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
 if TYPE_CHECKING:
     from refast.app import RefastApp
+    from refast.extensions import Extension
 
 # Static directory path for the built React client
 STATIC_DIR = Path(__file__).parent / "static"
@@ -27,6 +40,32 @@ UNSAFE_CONTENT_TYPES: frozenset[str] = frozenset(
     }
 )
 
+# Content types for files served from the static directories, by suffix
+_CONTENT_TYPES: dict[str, str] = {
+    ".js": "application/javascript",
+    ".css": "text/css",
+    ".html": "text/html",
+    ".json": "application/json",
+    ".svg": "image/svg+xml",
+    ".png": "image/png",
+    ".jpg": "image/jpg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+}
+
+# Suffixes worth serving with gzip/brotli variants
+COMPRESSIBLE_SUFFIXES = frozenset({".js", ".css", ".json", ".svg", ".html"})
+
+# Content types worth serving with gzip/brotli variants
+_COMPRESSIBLE_TYPES = frozenset(_CONTENT_TYPES[suffix] for suffix in COMPRESSIBLE_SUFFIXES)
+
+# Cache-Control for content-addressed files: their URL changes with their content
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Build outputs with stable (non-hashed) names; see vite.config.ts
+STABLE_ASSET_NAMES = frozenset({"refast-client.js", "refast-client-core.js", "refast-client.css"})
+
 # All known lazy feature-chunk names (must match vite manualChunks keys)
 ALL_FEATURE_CHUNKS = frozenset(
     {
@@ -155,6 +194,43 @@ def _get_chunk_files(
     return result
 
 
+def _resolve_features(app: RefastApp) -> tuple[set[str], list[str]]:
+    """Return ``(lazy_features, startup_features)`` for *app*."""
+    lazy_features = (
+        set(app.lazy_features) if app.lazy_features is not None else set(ALL_FEATURE_CHUNKS)
+    )
+    startup_features = sorted(
+        set(app.preloaded_features or []) | (set(ALL_FEATURE_CHUNKS) - lazy_features)
+    )
+    return lazy_features, startup_features
+
+
+def preload_links(app: RefastApp) -> list[str]:
+    """Build ``Link`` header values for the assets the shell loads at startup.
+
+    Covers the client CSS, the entry chunk and the startup feature chunks
+    from :func:`_get_chunk_files`, using the same URLs as the shell, so the
+    browser can fetch them while the document itself is still in flight.
+
+    Args:
+        app: The :class:`~refast.app.RefastApp` instance.
+
+    Returns:
+        Values such as ``</static/refast-client.css?v=…>; rel=preload; as=style``.
+    """
+    static_index = get_static_index(STATIC_DIR)
+    _, startup_features = _resolve_features(app)
+    chunk_files = _get_chunk_files(_load_manifest(), startup_features, app.client_mode)
+
+    links: list[str] = []
+    if "refast-client.css" in static_index:
+        links.append(f"<{static_index.url('refast-client.css')}>; rel=preload; as=style")
+    links.extend(
+        f"<{static_index.url(f)}>; rel=modulepreload" for f in chunk_files if f in static_index
+    )
+    return links
+
+
 def render_html_shell(app: RefastApp) -> str:
     """Render the full HTML shell for a Refast page.
 
@@ -168,33 +244,37 @@ def render_html_shell(app: RefastApp) -> str:
     Returns:
         A complete ``<!DOCTYPE html>`` string ready to send as an HTTP response.
     """
+    static_index = get_static_index(STATIC_DIR)
+
     # Check if React client CSS exists
-    client_css_path = STATIC_DIR / "refast-client.css"
-    has_client_css = client_css_path.exists()
+    has_client_css = "refast-client.css" in static_index
 
     # Resolve chunk files from the build manifest
-    manifest = _load_manifest()
-    lazy_features = (
-        set(app.lazy_features) if app.lazy_features is not None else set(ALL_FEATURE_CHUNKS)
-    )
-    startup_features = sorted(
-        set(app.preloaded_features or []) | (set(ALL_FEATURE_CHUNKS) - lazy_features)
-    )
-    chunk_files = _get_chunk_files(manifest, startup_features, app.client_mode)
+    lazy_features, startup_features = _resolve_features(app)
+    chunk_files = _get_chunk_files(_load_manifest(), startup_features, app.client_mode)
 
     # Build script tags — entry is type="module", chunks are modulepreload
     client_css = (
-        '<link rel="stylesheet" href="/static/refast-client.css">' if has_client_css else ""
+        f'<link rel="stylesheet" href="{static_index.url("refast-client.css")}">'
+        if has_client_css
+        else ""
     )
 
-    # The entry module + feature chunks
+    # The entry module + feature chunks.  Non-hashed files are referenced
+    # with a ?v=<hash> fingerprint so they can be cached as immutable.
     script_tags: list[str] = []
     preload_tags: list[str] = []
+    import_map_html = ""
     entry_js = "refast-client.js" if app.client_mode == "full" else "refast-client-core.js"
     for f in chunk_files:
-        path = f"/static/{f}"
+        path = static_index.url(f)
         if f == entry_js:
             script_tags.append(f'<script type="module" src="{path}"></script>')
+            if path != f"/static/{f}":
+                # Lazy chunks import the entry as "./refast-client.js"; map that
+                # to the fingerprinted URL so the module is only loaded once.
+                import_map = {"imports": {f"/static/{f}": path}}
+                import_map_html = f'<script type="importmap">{json.dumps(import_map)}</script>'
         else:
             preload_tags.append(f'<link rel="modulepreload" href="{path}">')
 
@@ -203,10 +283,9 @@ def render_html_shell(app: RefastApp) -> str:
     extension_script_map: dict[str, list[str]] = {}
     extension_component_map: dict[str, str] = {}
     for ext in app._extensions.values():
-        extension_styles.extend(
-            f'<link rel="stylesheet" href="{url}">' for url in ext.get_style_urls()
-        )
-        extension_script_map[ext.name] = ext.get_script_urls()
+        script_urls, style_urls = _extension_urls(app, ext)
+        extension_styles.extend(f'<link rel="stylesheet" href="{url}">' for url in style_urls)
+        extension_script_map[ext.name] = script_urls
         for component in ext.components:
             component_type = getattr(component, "component_type", component.__name__)
             extension_component_map[component_type] = ext.name
@@ -372,6 +451,7 @@ def render_html_shell(app: RefastApp) -> str:
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>{app.title}</title>
     {favicon_tag}
+    {import_map_html}
     {client_css}
     {preloads_html}
     {theme_style}
@@ -416,3 +496,485 @@ def render_html_shell(app: RefastApp) -> str:
     {custom_js_html}
 </body>
 </html>"""
+
+
+def content_type_for(path: Path | str) -> str:
+    """Return the content type Refast serves a static file with."""
+    return _CONTENT_TYPES.get(Path(path).suffix.lower(), "application/octet-stream")
+
+
+@lru_cache(maxsize=256)
+def _encoding_qualities(accept_encoding: str) -> dict[str, float]:
+    """Parse an ``Accept-Encoding`` header into ``{coding: q}``."""
+    qualities: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+    return qualities
+
+
+class EncodedBody:
+    """A response body with optional precompressed variants and a strong ETag.
+
+    Attributes:
+        identity: The uncompressed bytes.
+        gzip: Gzip-compressed bytes, or ``None``.
+        br: Brotli-compressed bytes, or ``None``.
+        etag: Strong ETag of the uncompressed bytes.
+    """
+
+    __slots__ = ("identity", "gzip", "br", "etag")
+
+    def __init__(self, identity: bytes, gzip: bytes | None = None, br: bytes | None = None):
+        self.identity = identity
+        self.gzip = gzip
+        self.br = br
+        self.etag = f'"{hashlib.sha256(identity).hexdigest()[:32]}"'
+
+    def select(self, accept_encoding: str) -> tuple[bytes, str | None, str]:
+        """Pick the best variant for an ``Accept-Encoding`` header.
+
+        The variant with the highest ``q`` value wins, brotli on a tie;
+        codings with ``q=0`` are never used.
+
+        Returns:
+            A ``(body, content_encoding, etag)`` tuple.  Compressed variants
+            carry their own ETag so caches never mix them up.
+        """
+        qualities = _encoding_qualities(accept_encoding)
+        default = qualities.get("*", 0.0)
+        br = qualities.get("br", default) if self.br is not None else 0.0
+        gz = qualities.get("gzip", default) if self.gzip is not None else 0.0
+        if self.br is not None and br > 0 and br >= gz:
+            return self.br, "br", self.etag[:-1] + '-br"'
+        if self.gzip is not None and gz > 0:
+            return self.gzip, "gzip", self.etag[:-1] + '-gz"'
+        return self.identity, None, self.etag
+
+    def matches(self, if_none_match: str | None) -> bool:
+        """Return True if an ``If-None-Match`` header names any variant."""
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        base = self.etag[1:-1]
+        for tag in if_none_match.split(","):
+            tag = tag.strip().removeprefix("W/").strip('"')
+            if tag in (base, f"{base}-br", f"{base}-gz"):
+                return True
+        return False
+
+
+class HtmlShell(EncodedBody):
+    """A rendered HTML shell with precompressed variants and ETags.
+
+    Built once per app configuration by :func:`get_html_shell`; serving it
+    only picks one of the precomputed variants.
+
+    Attributes:
+        html: The document as text.
+        identity: UTF-8 encoded document.
+        gzip: Gzip-compressed document.
+        br: Brotli-compressed document, or ``None`` if ``brotli`` is not
+            installed.
+        etag: Strong ETag of the uncompressed document.
+        links: Preload ``Link`` values for the assets the document loads
+            at startup (see :func:`preload_links`).
+        link_header: ``links`` joined into one ``Link`` header value.
+    """
+
+    __slots__ = ("html", "links", "link_header")
+
+    def __init__(self, html: str, links: list[str] | None = None):
+        identity = html.encode("utf-8")
+        super().__init__(
+            identity,
+            gzip=gzip.compress(identity, compresslevel=9, mtime=0),
+            br=brotli.compress(identity) if brotli is not None else None,
+        )
+        self.html = html
+        self.links = list(links or [])
+        self.link_header = ", ".join(self.links)
+
+
+class StaticAsset(EncodedBody):
+    """A static file held in memory together with its compressed variants.
+
+    ``.gz`` / ``.br`` files built next to the original are used as its
+    variants.  Missing variants of compressible files are built by
+    :meth:`precompress`.
+
+    Attributes:
+        content_type: Content type to serve the file with.
+        version: Short content hash, used as the ``?v=`` fingerprint.
+        last_modified: ``Last-Modified`` header value.
+        immutable: Whether the file name is content-hashed, so that it can
+            be cached forever.
+        mtime_ns: Modification time of the source file(s).
+    """
+
+    __slots__ = (
+        "content_type",
+        "version",
+        "last_modified",
+        "immutable",
+        "compressible",
+        "mtime_ns",
+    )
+
+    def __init__(
+        self,
+        identity: bytes,
+        content_type: str,
+        *,
+        mtime_ns: int,
+        gzip: bytes | None = None,
+        br: bytes | None = None,
+        immutable: bool = False,
+    ):
+        super().__init__(identity, gzip=gzip, br=br)
+        self.content_type = content_type
+        self.version = self.etag[1:13]
+        self.last_modified = formatdate(mtime_ns / 1e9, usegmt=True)
+        self.immutable = immutable
+        self.compressible = content_type in _COMPRESSIBLE_TYPES
+        self.mtime_ns = mtime_ns
+
+    @classmethod
+    def from_file(cls, path: Path, *, immutable: bool = False) -> StaticAsset:
+        """Load *path* and any ``.gz`` / ``.br`` variants built beside it."""
+        compressible = path.suffix.lower() in COMPRESSIBLE_SUFFIXES
+        return cls(
+            path.read_bytes(),
+            content_type_for(path),
+            mtime_ns=path.stat().st_mtime_ns,
+            gzip=_read_variant(path, ".gz") if compressible else None,
+            br=_read_variant(path, ".br") if compressible else None,
+            immutable=immutable,
+        )
+
+    def precompress(self) -> None:
+        """Generate the missing compressed variants now instead of on demand."""
+        if not self.compressible:
+            return
+        if self.gzip is None:
+            self.gzip = gzip.compress(self.identity, compresslevel=9, mtime=0)
+        if self.br is None and brotli is not None:
+            self.br = brotli.compress(self.identity)
+
+
+def _read_variant(path: Path, suffix: str) -> bytes | None:
+    """Read the precompressed *suffix* variant of *path*, if one was built."""
+    variant = path.with_name(path.name + suffix)
+    return variant.read_bytes() if variant.is_file() else None
+
+
+def _is_served(path: Path) -> bool:
+    """Whether a static directory serves *path* as a file of its own.
+
+    Package markers and the ``.gz`` / ``.br`` variants built next to a
+    compressible file are left out; the variants are served through the
+    original file's :class:`StaticAsset`.
+    """
+    if path.name == "__init__.py" or "__pycache__" in path.parts:
+        return False
+    if path.suffix in (".gz", ".br"):
+        original = path.with_suffix("")
+        return not (original.suffix.lower() in COMPRESSIBLE_SUFFIXES and original.is_file())
+    return True
+
+
+def _hashed_names(root: Path) -> set[str]:
+    """File names under *root* that the Vite manifest lists as content-hashed."""
+    manifest_path = root / "manifest.json"
+    if not manifest_path.is_file():
+        return set()
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except ValueError:
+        return set()
+
+    names: set[str] = set()
+    for entry in manifest.values():
+        if not isinstance(entry, dict):
+            continue
+        if not entry.get("isEntry") and isinstance(entry.get("file"), str):
+            names.add(entry["file"])
+        for key in ("css", "assets"):
+            names.update(f for f in entry.get(key, []) if isinstance(f, str))
+    return names - STABLE_ASSET_NAMES
+
+
+class StaticAssetIndex:
+    """In-memory index of a static directory, built once at startup.
+
+    Serving a file is a dictionary lookup: content types, hashes and the
+    bytes of every encoding are prepared when the index is built, so no
+    filesystem access happens per request.
+
+    Args:
+        root: Directory to index.
+        url_prefix: URL path the directory is served under.
+        precompress: Build the missing gzip/brotli variants of every
+            compressible file while indexing.  Without it only prebuilt
+            ``.gz`` / ``.br`` files are served compressed.
+
+    Example:
+        ```python
+        index = get_static_index(STATIC_DIR)
+        asset = index.get("refast-client.js")
+        index.url("refast-client.css")  # "/static/refast-client.css?v=3f2a9c..."
+        ```
+    """
+
+    def __init__(self, root: Path, *, url_prefix: str = "/static", precompress: bool = False):
+        self.root = root
+        self.url_prefix = url_prefix
+        self.precompress = precompress
+        self._hashed = _hashed_names(root)
+        self._assets: dict[str, StaticAsset] = {}
+        # Bundle name -> names of the files it concatenates
+        self._bundles: dict[str, list[str]] = {}
+        if root.is_dir():
+            for path in root.rglob("*"):
+                if not path.is_file() or not _is_served(path):
+                    continue
+                self._load(path.relative_to(root).as_posix(), path)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._assets
+
+    def __len__(self) -> int:
+        return len(self._assets)
+
+    def _load(self, name: str, path: Path) -> StaticAsset:
+        asset = StaticAsset.from_file(path, immutable=name in self._hashed)
+        if self.precompress:
+            asset.precompress()
+        self._assets[name] = asset
+        return asset
+
+    def get(self, name: str, *, revalidate: bool = False) -> StaticAsset | None:
+        """Look up a file by its path relative to the static directory.
+
+        Args:
+            name: Relative path, e.g. ``"refast-client.js"``.
+            revalidate: Check the file on disk and reload it if it changed
+                (or appeared) since the index was built.  Used in debug mode
+                so rebuilt assets are picked up without a restart.
+
+        Returns:
+            The :class:`StaticAsset`, or ``None`` if there is no such file.
+        """
+        asset = self._assets.get(name)
+        if not revalidate:
+            return asset
+        if name in self._bundles:
+            parts = self._bundles[name]
+            if any(self.get(part, revalidate=True) is None for part in parts):
+                return None
+            if asset is None or asset.mtime_ns != max(self._assets[p].mtime_ns for p in parts):
+                asset = self.add_bundle(name, parts)
+            return asset
+
+        path = self.root / name
+        try:
+            path.resolve().relative_to(self.root.resolve())
+            mtime_ns = path.stat().st_mtime_ns if path.is_file() else None
+        except (OSError, ValueError):
+            mtime_ns = None
+        if mtime_ns is None or not _is_served(path):
+            self._assets.pop(name, None)
+            return None
+        if asset is None or asset.mtime_ns != mtime_ns:
+            asset = self._load(name, path)
+        return asset
+
+    def add_bundle(self, name: str, parts: list[str]) -> StaticAsset:
+        """Concatenate the indexed scripts *parts* into one asset called *name*.
+
+        Parts are joined in order, separated by ``;`` so that each script
+        still ends its last statement.
+
+        Raises:
+            KeyError: If one of *parts* is not in the index.
+        """
+        assets = [self._assets[part] for part in parts]
+        bundle = StaticAsset(
+            b"\n;\n".join(asset.identity for asset in assets),
+            content_type_for(name),
+            mtime_ns=max(asset.mtime_ns for asset in assets),
+        )
+        if self.precompress:
+            bundle.precompress()
+        self._assets[name] = bundle
+        self._bundles[name] = list(parts)
+        return bundle
+
+    def url(self, name: str) -> str:
+        """Return the URL to reference *name* with from the HTML shell.
+
+        Content-hashed files keep their plain URL; other files get a
+        ``?v=<hash>`` fingerprint so they can be cached as immutable too.
+        """
+        asset = self._assets.get(name)
+        if asset is None or asset.immutable:
+            return f"{self.url_prefix}/{name}"
+        return f"{self.url_prefix}/{name}?v={asset.version}"
+
+
+_static_indexes: dict[Path, StaticAssetIndex] = {}
+
+
+def get_static_index(root: Path | None = None) -> StaticAssetIndex:
+    """Return the :class:`StaticAssetIndex` for *root*, building it on first use.
+
+    The index is precompressed, so requests never compress on the event loop.
+
+    Args:
+        root: Directory to index.  Defaults to the built client's ``STATIC_DIR``.
+    """
+    if root is None:
+        root = STATIC_DIR
+    index = _static_indexes.get(root)
+    if index is None:
+        index = _static_indexes[root] = StaticAssetIndex(root, precompress=True)
+    return index
+
+
+def build_extension_index(extension: Extension, *, bundle: bool = False) -> StaticAssetIndex | None:
+    """Index and precompress the static files of *extension*.
+
+    Args:
+        extension: The extension being registered.
+        bundle: Also build a single script concatenating all of the
+            extension's ``scripts``, in order.
+
+    Returns:
+        The index, or ``None`` if the extension has no static directory.
+    """
+    root = extension.static_path
+    if root is None or not root.is_dir():
+        return None
+    index = StaticAssetIndex(root, url_prefix=f"/static/ext/{extension.name}", precompress=True)
+    bundle_name = _extension_bundle_name(extension)
+    scripts = list(extension.scripts)
+    if (
+        bundle
+        and len(scripts) > 1
+        and bundle_name not in index
+        and all(script in index for script in scripts)
+    ):
+        index.add_bundle(bundle_name, scripts)
+    return index
+
+
+def _extension_bundle_name(extension: Extension) -> str:
+    return f"{extension.name}.bundle.js"
+
+
+def _extension_urls(app: RefastApp, extension: Extension) -> tuple[list[str], list[str]]:
+    """Return the ``(script_urls, style_urls)`` the shell should load for *extension*.
+
+    Files served from the extension's index are fingerprinted, and its
+    scripts are replaced by the bundle when one was built.
+    """
+    script_urls = extension.get_script_urls()
+    style_urls = extension.get_style_urls()
+    index = app._extension_assets.get(extension.name)
+    if index is None:
+        return script_urls, style_urls
+
+    prefix = f"{index.url_prefix}/"
+
+    def _fingerprint(url: str) -> str:
+        name = url[len(prefix) :] if url.startswith(prefix) else None
+        return index.url(name) if name is not None and name in index else url
+
+    bundle_name = _extension_bundle_name(extension)
+    if bundle_name in index._bundles and script_urls == [prefix + s for s in extension.scripts]:
+        script_urls = [index.url(bundle_name)]
+    return [_fingerprint(url) for url in script_urls], [_fingerprint(url) for url in style_urls]
+
+
+def tree_fingerprint(tree: Any) -> str:
+    """Return a short, stable hash of a rendered component tree."""
+    data = json.dumps(tree, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:32]
+
+
+def inline_initial_tree(html: str, tree: dict[str, Any]) -> str:
+    """Embed a rendered page tree in a shell produced by :func:`render_html_shell`.
+
+    The client renders ``window.__REFAST_INITIAL_DATA__`` as soon as its
+    script runs and reports ``__REFAST_INITIAL_HASH__`` in ``store_init``,
+    so the server can skip re-sending an identical ``page_render``.
+
+    Args:
+        html: The HTML shell.
+        tree: The rendered page component tree.
+
+    Returns:
+        The shell with an inline ``<script>`` after ``#refast-root``.
+    """
+    # Escape "<" so the JSON can never close the script element early
+    data = json.dumps(tree, separators=(",", ":"), default=str).replace("<", "\\u003c")
+    script = (
+        f"<script>window.__REFAST_INITIAL_DATA__ = {data};"
+        f'window.__REFAST_INITIAL_HASH__ = "{tree_fingerprint(tree)}";</script>'
+    )
+    root = '<div id="refast-root"></div>'
+    return html.replace(root, f"{root}\n    {script}", 1)
+
+
+def _shell_key(app: RefastApp) -> tuple[Any, ...]:
+    """Cheap fingerprint of everything :func:`render_html_shell` reads from *app*."""
+
+    def _frozen(values: list[str] | None) -> tuple[str, ...] | None:
+        return tuple(values) if values is not None else None
+
+    return (
+        app._shell_version,
+        STATIC_DIR,
+        app.title,
+        app.favicon,
+        app.debug,
+        app.client_mode,
+        _frozen(app.preloaded_features),
+        _frozen(app.lazy_features),
+        _frozen(app.preloaded_extensions),
+        _frozen(app.lazy_extensions),
+    )
+
+
+def get_html_shell(app: RefastApp) -> HtmlShell:
+    """Return the cached HTML shell for *app*, rendering it if needed.
+
+    The shell is rebuilt only when the app configuration changes: a new
+    ``theme``, title, favicon or feature list, or a call to ``add_css``,
+    ``add_js``, ``add_head_tag`` or ``register_extension``.
+
+    Args:
+        app: The :class:`~refast.app.RefastApp` instance.
+
+    Returns:
+        The :class:`HtmlShell` for the current configuration.
+    """
+    key = _shell_key(app)
+    cached = app._html_shell
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    shell = HtmlShell(render_html_shell(app), links=preload_links(app))
+    app._html_shell = (key, shell)
+    return shell
@@ -0,0 +1,187 @@
+"""Reactive prop bindings.
+
+A :class:`Binding` is a placeholder that can be passed anywhere a component
+accepts a plain prop value or a child.  When a page is rendered the binding is
+replaced by the current value of its key and the ``(component id, prop)``
+target is remembered on the source, so a later change to that key can be
+pushed to the client as a minimal ``update_props`` message instead of a full
+page re-render.
+"""
+
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any, Protocol
+
+if TYPE_CHECKING:
+    from refast.context import Context
+
+
+class BindingSource(Protocol):
+    """A keyed value container that bindings can be attached to."""
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the current value for *key*."""
+        ...
+
+    def _bind(self, ctx: "Context", key: str, target: "BindingTarget") -> None:
+        """Remember that *target* in *ctx* displays the value of *key*."""
+        ...
+
+    def _unbind(self, ctx: "Context") -> None:
+        """Forget every target registered for *ctx*."""
+        ...
+
+    def _unbind_targets(self, ctx: "Context", match: Callable[["BindingTarget"], bool]) -> None:
+        """Forget the targets registered for *ctx* for which *match* is true."""
+        ...
+
+
+class Binding:
+    """
+    Placeholder prop value bound to a key of a :class:`BindingSource`.
+
+    Created with ``ctx.bind(key)`` or ``ui.shared_state.bind(key)``; not
+    usually instantiated directly.
+
+    Args:
+        source: The state container holding the value.
+        key: The key to read.
+        default: Value used when *key* is not set.
+        format: Optional callable applied to the value before it is sent to
+            the client (e.g. ``lambda v: f"Count: {v}"``).
+    """
+
+    __slots__ = ("source", "key", "default", "format")
+
+    def __init__(
+        self,
+        source: BindingSource,
+        key: str,
+        default: Any = None,
+        format: Callable[[Any], Any] | None = None,
+    ):
+        self.source = source
+        self.key = key
+        self.default = default
+        self.format = format
+
+    def resolve(self) -> Any:
+        """Return the current (formatted) value of the bound key."""
+        value = self.source.get(self.key, self.default)
+        if self.format is not None:
+            return self.format(value)
+        return value
+
+    def __repr__(self) -> str:
+        return f"Binding(key={self.key!r})"
+
+
+class BindingTarget:
+    """
+    A rendered location that displays one or more bindings.
+
+    ``prop`` is the prop name, or ``None`` when the bindings appear in the
+    component's children.  For children, ``template`` holds the full children
+    list with :class:`Binding` placeholders left in place so that the list can
+    be rebuilt when any of them changes.
+    """
+
+    __slots__ = ("component_id", "prop", "template")
+
+    def __init__(self, component_id: str, prop: str | None, template: Any):
+        self.component_id = component_id
+        self.prop = prop
+        self.template = template
+
+    def value(self) -> Any:
+        """Return the current value for this target."""
+        if self.prop is not None:
+            return self.template.resolve()
+        return [
+            _child_value(item.resolve()) if isinstance(item, Binding) else item
+            for item in self.template
+        ]
+
+
+def _child_value(value: Any) -> Any:
+    """Coerce a resolved value to a valid child (string or component dict)."""
+    if isinstance(value, (str, dict)):
+        return value
+    return "" if value is None else str(value)
+
+
+def resolve_bindings(tree: Any, ctx: "Context | None", parent_id: str | None = None) -> Any:
+    """
+    Replace :class:`Binding` placeholders in a rendered tree, in place.
+
+    Every binding found in a component's top-level props or direct children
+    is registered with its source for *ctx*.  Nested component dicts inside
+    props (e.g. an ``icon`` component) and children are walked as well.
+    Components holding or containing bindings are recorded in
+    ``ctx._binding_parents`` so that the targets of a subtree can be dropped
+    when it is replaced.
+
+    Args:
+        tree: The output of ``Component.render()``.
+        ctx: The context the tree is being rendered for, or ``None`` to
+            resolve values without registering any targets (HTTP renders).
+        parent_id: ID of the component the tree is rendered into, if any.
+
+    Returns:
+        The same *tree* object with all bindings resolved.
+    """
+    _resolve(tree, ctx, parent_id)
+    return tree
+
+
+def _resolve(tree: Any, ctx: "Context | None", parent_id: str | None) -> bool:
+    """Resolve the bindings in *tree*; return True if it contains any."""
+    bound = False
+    if isinstance(tree, dict):
+        component_id = tree.get("id")
+        inner_parent = component_id if component_id is not None else parent_id
+        props = tree.get("props")
+        if isinstance(props, dict):
+            for name, value in props.items():
+                if isinstance(value, Binding):
+                    if ctx is not None:
+                        target = BindingTarget(component_id, name, value)
+                        value.source._bind(ctx, value.key, target)
+                    props[name] = value.resolve()
+                    bound = True
+                else:
+                    bound = _resolve(value, ctx, inner_parent) or bound
+        children = tree.get("children")
+        if isinstance(children, list):
+            template: list[Any] | None = None
+            for index, child in enumerate(children):
+                if isinstance(child, Binding):
+                    if template is None:
+                        template = list(children)
+                    children[index] = _child_value(child.resolve())
+                else:
+                    bound = _resolve(child, ctx, inner_parent) or bound
+            if template is not None:
+                bound = True
+                if ctx is not None:
+                    target = BindingTarget(component_id, None, template)
+                    for item in template:
+                        if isinstance(item, Binding):
+                            item.source._bind(ctx, item.key, target)
+        if bound and ctx is not None and component_id is not None:
+            ctx._binding_parents[component_id] = parent_id
+    elif isinstance(tree, list):
+        for item in tree:
+            bound = _resolve(item, ctx, parent_id) or bound
+    return bound
+
+
+async def push_targets(ctx: "Context", targets: list["BindingTarget"]) -> None:
+    """Send the current values of *targets* to *ctx* as ``update_props`` messages."""
+    updates: dict[str, dict[str, Any]] = {}
+    for target in targets:
+        props = updates.setdefault(target.component_id, {})
+        props["children" if target.prop is None else target.prop] = target.value()
+
+    async with ctx.batch():
+        for component_id, props in updates.items():
+            await ctx.update_props(component_id, props)
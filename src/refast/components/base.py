@@ -3,10 +3,12 @@
 import logging
 import os
 import re
-import uuid
 from abc import ABC, abstractmethod
 from typing import Any, Literal, Self, Union, cast
 
+from refast.binding import Binding
+from refast.utils.ids import new_id
+
 ComponentSize = Literal["xs", "sm", "md", "lg", "xl"]
 
 logger = logging.getLogger(__name__)
@@ -88,7 +90,7 @@ class Component(ABC):
         parent_style: dict[str, Any] | None = None,
         extra_props: dict[str, Any] | None = None,
     ):
-        self.id = id or str(uuid.uuid4())
+        self.id = id or new_id()
         self.class_name = class_name
         self.style = style or {}
         self.parent_style = parent_style or {}
@@ -141,7 +143,8 @@ class Component(ABC):
                 continue
             if isinstance(child, Component):
                 result.append(child.render())
-            elif isinstance(child, dict):
+            elif isinstance(child, (dict, Binding)):
+                # Bindings are resolved by the Context after rendering
                 result.append(child)
             else:
                 result.append(str(child))
@@ -2324,6 +2324,10 @@ class SidebarMenuButton(Component):
         size: "default", "sm", or "lg"
         href: Optional URL to link to
         on_click: Optional click callback
+        prefetch: ``"hover"`` or ``"visible"`` to have the server render the
+            target page ahead of navigation (see ``Context.prefetch``)
+        prefetch_path: Page to prefetch when the button navigates from a
+            callback (e.g. ``ctx.load("/reports")``); defaults to ``href``
     """
 
     component_type: str = "SidebarMenuButton"
@@ -2337,6 +2341,8 @@ class SidebarMenuButton(Component):
         size: Literal["default", "sm", "lg"] = "default",
         href: str | None = None,
         on_click: Any = None,
+        prefetch: Literal["hover", "visible"] | None = None,
+        prefetch_path: str | None = None,
         id: str | None = None,
         class_name: str = "",
         style: dict[str, Any] | None = None,
@@ -2357,6 +2363,8 @@ class SidebarMenuButton(Component):
         self.size = size
         self.href = href
         self.on_click = on_click
+        self.prefetch = prefetch
+        self.prefetch_path = prefetch_path
 
     def render(self) -> dict[str, Any]:
         return {
@@ -2369,6 +2377,8 @@ class SidebarMenuButton(Component):
                 "size": self.size,
                 "href": self.href,
                 "onClick": self.on_click.serialize() if self.on_click else None,
+                "prefetch": self.prefetch,
+                "prefetchPath": self.prefetch_path,
                 "class_name": self.class_name,
                 **self._serialize_extra_props(),
             },
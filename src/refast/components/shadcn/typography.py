@@ -168,7 +168,13 @@ class Code(Component):
 
 
 class Link(Component):
-    """Link component for navigation."""
+    """
+    Link component for navigation.
+
+    Set ``prefetch`` to ``"hover"`` or ``"visible"`` on links to pages of the
+    app to have the server render the target page ahead of time; clicking
+    the link then navigates over the WebSocket without reloading the document.
+    """
 
     component_type: str = "Link"
 
@@ -181,6 +187,7 @@ class Link(Component):
         target: Literal["_self", "_blank", "_parent", "_top"] = "_self",
         on_click: Any = None,
         external: bool = False,
+        prefetch: Literal["hover", "visible"] | None = None,
         id: str | None = None,
         class_name: str = "",
         style: dict[str, Any] | None = None,
@@ -199,6 +206,7 @@ class Link(Component):
         self.variant = variant
         self.target = target
         self.external = external
+        self.prefetch = prefetch
         self.style = style
         self.on_click = on_click
         if children is not None:
@@ -220,6 +228,7 @@ class Link(Component):
                 "variant": self.variant,
                 "target": self.target,
                 "external": self.external,
+                "prefetch": self.prefetch,
                 "on_click": self.on_click.serialize() if self.on_click else None,
                 "class_name": self.class_name,
                 "style": self.style,
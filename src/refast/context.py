@@ -1,12 +1,19 @@
 """Context class for request handling."""
 
 import asyncio
-import uuid
-from collections.abc import Callable
+import copy
+import logging
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, Generic, Literal, TypeVar
 
 from fastapi import Request, WebSocket
 
+from refast.binding import Binding, resolve_bindings
+
 # Action types live in events.actions; re-exported here for backward compatibility
 # so that ``from refast.context import Callback`` etc. continue to work.
 from refast.events.actions import (  # noqa: F401
@@ -18,16 +25,72 @@ from refast.events.actions import (  # noqa: F401
     JsCallback,
     SaveProp,
 )
+from refast.events.fanout import DEFAULT_SEND_TIMEOUT, BroadcastResult
 from refast.state import State
 from refast.store import Store
+from refast.utils.ids import new_id
 
 if TYPE_CHECKING:
     from refast.app import RefastApp
     from refast.components.base import Component
+    from refast.events.stream import WebSocketConnection
     from refast.session.session import Session
 
 T = TypeVar("T")
 
+logger = logging.getLogger(__name__)
+
+# Upper bound on speculatively rendered pages kept per connection
+_MAX_PREFETCHED_PAGES = 8
+# Upper bound on background prefetch renders running at once per connection
+_MAX_PREFETCH_TASKS = 4
+
+
+@dataclass
+class _PrefetchedPage:
+    """A page rendered ahead of navigation by :meth:`Context.prefetch`."""
+
+    component: Any
+    callbacks: dict[str, Callable[..., Any]]
+    error_handlers: dict[str, Callable[..., Any]]
+    pathname: str
+    path_params: dict[str, Any]
+    query_params: dict[str, str]
+    query_string: str
+    version: tuple[int, ...]
+    expires: float
+
+
+@dataclass(eq=False)
+class _Batch:
+    """Updates buffered by one ``async with ctx.batch()`` block."""
+
+    context: "Context[Any]"
+    # The batch that was active when this one was opened, if any
+    outer: "_Batch | None"
+    updates: list[dict[str, Any]] = field(default_factory=list)
+    # Target ID -> index of its last mergeable message in ``updates``
+    targets: dict[str, int] = field(default_factory=dict)
+    open: bool = True
+
+    def find(self, context: "Context[Any]") -> "_Batch | None":
+        """Return the open batch of *context* in this chain, if any."""
+        batch: _Batch | None = self
+        while batch is not None:
+            if batch.context is context and batch.open:
+                return batch
+            batch = batch.outer
+        return None
+
+
+# The batches of the running task; tasks started inside a block inherit it
+_active_batch: ContextVar[_Batch | None] = ContextVar("refast_active_batch", default=None)
+
+
+def _location_key(pathname: str, query_string: str) -> str:
+    """Cache key for a normalised URL."""
+    return f"{pathname}?{query_string}" if query_string else pathname
+
 
 class Context(Generic[T]):
     """
@@ -78,6 +141,8 @@ class Context(Generic[T]):
                     except Exception:
                         pass
         self._app = app
+        # Registry entry for this connection, set by the router
+        self._connection: WebSocketConnection | None = None
         self._state: State = State()
         self._store: Store | None = None
         self._session: Session | None = None
@@ -89,6 +154,18 @@ class Context(Generic[T]):
         self._query_string: str = ""
         self._callbacks: dict[str, Callable[..., Any]] = {}
         self._callback_error_handlers: dict[str, Callable[..., Any]] = {}
+        # Binding sources (State, SharedState) holding targets rendered here
+        self._binding_sources: set[Any] = set()
+        # Parent IDs of the rendered components that hold or contain bindings
+        self._binding_parents: dict[str, str | None] = {}
+        # Pages rendered ahead of navigation, keyed by "path?query"
+        self._prefetched: dict[str, _PrefetchedPage] = {}
+        # Prefetches running in the background, keyed like _prefetched
+        self._prefetch_tasks: dict[str, asyncio.Task[bool]] = {}
+        # State that bind() targets; the live one while rendering a prefetch
+        self._bind_state: State | None = None
+        # Key of this connection's snapshot, set when the app persists snapshots
+        self._snapshot_id: str | None = None
 
     @property
     def request(self) -> Request | None:
@@ -134,11 +211,110 @@ class Context(Generic[T]):
         self._callbacks.clear()
         self._callback_error_handlers.clear()
 
+    def _render_component(self, component: Any, parent_id: str | None = None) -> Any:
+        """Render *component* (if needed) and resolve any reactive bindings in it.
+
+        Args:
+            component: The component (or already rendered tree).
+            parent_id: ID of the component it is rendered into, if known.
+        """
+        tree = component.render() if hasattr(component, "render") else component
+        return resolve_bindings(tree, self if self._websocket else None, parent_id)
+
+    def _render_page(self, component: Any) -> dict[str, Any]:
+        """Render a full page tree, replacing the bindings of the previous render."""
+        self._clear_bindings()
+        if not hasattr(component, "render"):
+            return {}
+        return self._render_component(component)
+
+    def _clear_bindings(self) -> None:
+        """Unregister every binding target rendered for this connection."""
+        for source in self._binding_sources:
+            source._unbind(self)
+        self._binding_sources.clear()
+        self._binding_parents.clear()
+
+    def _unbind_subtree(self, component_id: str, *, children_only: bool = False) -> None:
+        """Drop the binding targets of a component that is replaced or removed.
+
+        Args:
+            component_id: The component whose subtree goes away.
+            children_only: Keep the component itself and its prop bindings;
+                only its children (and a binding of its children) go away.
+        """
+        parents = self._binding_parents
+        if not parents:
+            return
+        doomed: set[str] = set()
+        for start in parents:
+            node: str | None = start
+            for _ in range(len(parents) + 1):
+                if node is None:
+                    break
+                if node == component_id:
+                    doomed.add(start)
+                    break
+                node = parents.get(node)
+        if children_only:
+            doomed.discard(component_id)
+        for doomed_id in doomed:
+            del parents[doomed_id]
+
+        def match(target: Any) -> bool:
+            return target.component_id in doomed or (
+                children_only and target.component_id == component_id and target.prop is None
+            )
+
+        for source in self._binding_sources:
+            source._unbind_targets(self, match)
+
     @property
     def state(self) -> State:
         """Access the state object."""
         return self._state
 
+    def bind(
+        self,
+        key: str,
+        default: Any = None,
+        *,
+        format: Callable[[Any], Any] | None = None,
+    ) -> Binding:
+        """
+        Bind a component prop or child to a key of :attr:`state`.
+
+        The binding renders as the current value of ``ctx.state[key]``.
+        Afterwards, ``ctx.state[key] = ...``, ``ctx.state.set()``,
+        ``update()`` and ``pop()`` queue an ``update_props`` message for
+        exactly the bound components — the page function is not re-run and no
+        ``refresh`` frame is sent.
+
+        Args:
+            key: The state key to display.
+            default: Value used while *key* is not set.
+            format: Optional callable applied to the value before it is sent
+                to the client.
+
+        Returns:
+            A :class:`~refast.binding.Binding` placeholder.
+
+        Example:
+            ```python
+            @ui.page("/")
+            def home(ctx: Context):
+                return Column([
+                    Text(ctx.bind("count", 0, format=lambda v: f"Count: {v}")),
+                    Button("+1", on_click=ctx.callback(increment)),
+                ])
+
+            async def increment(ctx: Context):
+                ctx.state["count"] = ctx.state.get("count", 0) + 1
+            ```
+        """
+        state = self._bind_state if self._bind_state is not None else self._state
+        return Binding(state, key, default=default, format=format)
+
     @property
     def store(self) -> Store:
         """
@@ -163,7 +339,23 @@ class Context(Generic[T]):
 
     @property
     def session(self) -> "Session":
-        """Access the session."""
+        """
+        Access the server-side session.
+
+        If the app was given a ``session_store``, this is the session named
+        by the session cookie of the WebSocket handshake, loaded when the
+        connection opened and shared with the browser's other tabs on this
+        worker.  Changes are saved automatically, batched every
+        ``session_write_interval`` seconds, and when the connection closes.
+        Without a store it is a blank session that is never saved.
+
+        Example:
+            ```python
+            async def add_to_cart(ctx: Context, item_id: int):
+                cart = ctx.session.get("cart", [])
+                ctx.session.set("cart", [*cart, item_id])
+            ```
+        """
         if self._session is None:
             from refast.session.session import Session
 
@@ -220,7 +412,7 @@ class Context(Generic[T]):
             )
             ```
         """
-        callback_id = str(uuid.uuid4())
+        callback_id = new_id("cb")
 
         cb = Callback(
             id=callback_id,
@@ -631,43 +823,46 @@ class Context(Generic[T]):
     async def replace(self, target_id: str, component: Any) -> None:
         """Replace a component in the frontend."""
         if self._websocket:
-            await self._websocket.send_json(
+            parent_id = self._binding_parents.get(target_id)
+            self._unbind_subtree(target_id)
+            await self._send_update(
                 {
                     "type": "update",
                     "operation": "replace",
                     "targetId": target_id,
-                    "component": component.render() if hasattr(component, "render") else component,
+                    "component": self._render_component(component, parent_id),
                 }
             )
 
     async def append(self, target_id: str, component: Any) -> None:
         """Append a component to a container."""
         if self._websocket:
-            await self._websocket.send_json(
+            await self._send_update(
                 {
                     "type": "update",
                     "operation": "append",
                     "targetId": target_id,
-                    "component": component.render() if hasattr(component, "render") else component,
+                    "component": self._render_component(component, target_id),
                 }
             )
 
     async def prepend(self, target_id: str, component: Any) -> None:
         """Prepend a component to a container."""
         if self._websocket:
-            await self._websocket.send_json(
+            await self._send_update(
                 {
                     "type": "update",
                     "operation": "prepend",
                     "targetId": target_id,
-                    "component": component.render() if hasattr(component, "render") else component,
+                    "component": self._render_component(component, target_id),
                 }
             )
 
     async def remove(self, target_id: str) -> None:
         """Remove a component from the frontend."""
         if self._websocket:
-            await self._websocket.send_json(
+            self._unbind_subtree(target_id)
+            await self._send_update(
                 {
                     "type": "update",
                     "operation": "remove",
@@ -708,6 +903,9 @@ class Context(Generic[T]):
         if self._websocket:
             from refast.components.base import Component
 
+            if "children" in props:
+                self._unbind_subtree(target_id, children_only=True)
+
             # Separate children from regular props
             serialized_props = {}
             children = None
@@ -718,20 +916,23 @@ class Context(Generic[T]):
                     if isinstance(value, (list, tuple)):
                         for child in value:
                             if isinstance(child, Component):
-                                children.append(child.render())
+                                children.append(self._render_component(child, target_id))
                             elif child is not None:
                                 children.append(
                                     str(child) if not isinstance(child, (dict, str)) else child
                                 )
                     elif isinstance(value, Component):
-                        children = [value.render()]
+                        children = [self._render_component(value, target_id)]
                     elif value is not None:
                         children = [str(value) if not isinstance(value, (dict, str)) else value]
                 elif isinstance(value, Component):
-                    serialized_props[key] = value.render()
+                    serialized_props[key] = self._render_component(value, target_id)
                 elif isinstance(value, (list, tuple)):
                     serialized_props[key] = [
-                        item.render() if isinstance(item, Component) else item for item in value
+                        self._render_component(item, target_id)
+                        if isinstance(item, Component)
+                        else item
+                        for item in value
                     ]
                 else:
                     serialized_props[key] = value
@@ -746,12 +947,13 @@ class Context(Generic[T]):
             if children is not None:
                 message["children"] = children
 
-            await self._websocket.send_json(message)
+            await self._send_update(message)
 
     async def update_text(self, target_id: str, text: str) -> None:
         """Update the text content of a component."""
         if self._websocket:
-            await self._websocket.send_json(
+            self._unbind_subtree(target_id, children_only=True)
+            await self._send_update(
                 {
                     "type": "update",
                     "operation": "update_children",
@@ -803,7 +1005,7 @@ class Context(Generic[T]):
             ```
         """
         if self._websocket:
-            await self._websocket.send_json(
+            await self._send_update(
                 {
                     "type": "update",
                     "operation": "append_prop",
@@ -813,6 +1015,117 @@ class Context(Generic[T]):
                 }
             )
 
+    @asynccontextmanager
+    async def batch(self) -> AsyncIterator["Context[T]"]:
+        """
+        Group UI update operations into a single WebSocket frame.
+
+        Inside the ``async with`` block, ``replace``, ``append``, ``prepend``,
+        ``remove``, ``update_props``, ``update_text``, ``append_prop`` and
+        partial ``refresh(target_id=...)`` calls are buffered instead of being
+        sent one by one.  Redundant operations are merged while buffering:
+
+        - Consecutive ``update_props`` calls for the same target collapse into
+          one message; the last value wins per prop key.
+        - Consecutive ``append_prop`` string values for the same target and
+          prop are concatenated.
+
+        Structural operations (``replace``, ``append``, ``prepend``,
+        ``remove``, ``update_text``) are never reordered and act as merge
+        barriers.  On exit the buffer is flushed as one ``batch`` message that
+        the client applies in a single state update.  If the block raises, the
+        buffered updates are discarded.  Nested ``batch()`` blocks join the
+        outermost one.
+
+        The buffer belongs to the task that opened the block (and tasks it
+        starts while the block is open), so updates sent concurrently by
+        other handlers on the same connection go out immediately.
+
+        Other messages (toasts, navigation, ``call_js``, ...) are not buffered
+        and are sent immediately.
+
+        Example:
+            ```python
+            async def start_stream(ctx: Context):
+                async with ctx.batch():
+                    await ctx.update_props("output", {"content": "", "streaming": True})
+                    await ctx.update_text("status", "Streaming...")
+                    await ctx.update_props("status", {"variant": "primary"})
+                    await ctx.update_props("stop", {"disabled": False})
+            ```
+        """
+        active = _active_batch.get()
+        if active is not None and active.find(self) is not None:
+            yield self
+            return
+
+        batch = _Batch(self, active)
+        token = _active_batch.set(batch)
+        try:
+            yield self
+        except BaseException:
+            batch.open = False
+            raise
+        finally:
+            _active_batch.reset(token)
+        await self._flush_batch(batch)
+
+    async def _send_update(self, message: dict[str, Any]) -> None:
+        """Send an ``update`` message, or buffer it when a batch is active."""
+        active = _active_batch.get()
+        batch = active.find(self) if active is not None else None
+        if batch is None:
+            await self._websocket.send_json(message)
+            return
+
+        operation = message.get("operation")
+        target_id = message.get("targetId")
+        if operation in ("update_props", "append_prop"):
+            index = batch.targets.get(target_id)
+            if index is not None and self._merge_update(batch.updates[index], message):
+                return
+        else:
+            # Structural changes may replace any subtree, so later operations
+            # must not be folded into anything queued before them.
+            batch.targets = {}
+
+        batch.updates.append(message)
+        batch.targets[target_id] = len(batch.updates) - 1
+
+    @staticmethod
+    def _merge_update(previous: dict[str, Any], message: dict[str, Any]) -> bool:
+        """Fold *message* into the buffered *previous* message if possible."""
+        operation = message["operation"]
+        if previous["operation"] != operation:
+            return False
+
+        if operation == "update_props":
+            if "props" in message:
+                previous["props"] = {**previous.get("props", {}), **message["props"]}
+            if "children" in message:
+                previous["children"] = message["children"]
+            return True
+
+        if (
+            previous["propName"] == message["propName"]
+            and isinstance(previous["value"], str)
+            and isinstance(message["value"], str)
+        ):
+            previous["value"] += message["value"]
+            return True
+        return False
+
+    async def _flush_batch(self, batch: _Batch) -> None:
+        """Close *batch* and send its buffered updates as one frame."""
+        batch.open = False
+        updates = batch.updates
+        if not updates or not self._websocket:
+            return
+        if len(updates) == 1:
+            await self._websocket.send_json(updates[0])
+        else:
+            await self._websocket.send_json({"type": "batch", "messages": updates})
+
     async def load(
         self,
         path: str,
@@ -858,13 +1171,19 @@ class Context(Generic[T]):
             self._current_path = pathname
             # Also render the target page and send its component tree
             if self._app:
-                page_func, path_params = self._app.match_route(pathname)
-                self._path_params = path_params
-                if page_func is None:
-                    page_func = self._app._pages.get("/")  # Fallback to index
-                if page_func is not None:
-                    component = page_func(self)
-                    component_data = component.render() if hasattr(component, "render") else {}
+                await self._wait_for_prefetch(path)
+                component = self._take_prefetched(path)
+                if component is None:
+                    page_func, path_params = self._app.match_route(pathname)
+                    self._path_params = path_params
+                    if page_func is None:
+                        page_func = self._app._pages.get("/")  # Fallback to index
+                    if page_func is not None:
+                        from refast.router import RefastRouter
+
+                        component = await RefastRouter._execute_page_func(page_func, self, pathname)
+                if component is not None:
+                    component_data = self._render_page(component)
                     await self._websocket.send_json(
                         {
                             "type": "page_render",
@@ -872,6 +1191,193 @@ class Context(Generic[T]):
                         }
                     )
 
+    async def prefetch(self, path: str) -> bool:
+        """Render a page ahead of navigation so that opening it is instant.
+
+        The page function for *path* runs against a detached context: it has
+        no WebSocket, and its ``state``, ``store`` and ``session`` are copies,
+        so writes made while rendering neither reach the client nor change
+        this connection's data.  A page that writes to them (for example to
+        initialise ``ctx.state``) is therefore not cached and is rendered
+        normally on navigation.  ``ctx.bind()`` still binds to the live
+        state, so an adopted page updates like a normally rendered one.  The
+        result is kept for ``app.prefetch_ttl`` seconds.  The next
+        :meth:`load` or client navigation to the same URL is served from it,
+        provided that ``ctx.state``, ``ctx.store`` and ``app.shared_state``
+        have not changed since the render started.
+
+        The client calls this automatically (via a ``prefetch`` message) for
+        ``Link`` and sidebar items created with ``prefetch="hover"`` or
+        ``prefetch="visible"``; those renders run in a background task.
+
+        Args:
+            path: The target page path, optionally with a query string.
+
+        Returns:
+            True if a render for *path* is cached after the call.
+
+        Example:
+            ```python
+            async def start_wizard(ctx: Context):
+                await ctx.load("/wizard/1")
+                # Warm the next step while the user fills in this one
+                await ctx.prefetch("/wizard/2")
+            ```
+        """
+        if self._app is None or self._app.prefetch_ttl <= 0:
+            return False
+
+        from refast.router import RefastRouter, _parse_url
+
+        pathname, query_params, query_string = _parse_url(path)
+        key = _location_key(pathname, query_string)
+        now = time.monotonic()
+        version = self._data_version()
+        entry = self._prefetched.get(key)
+        if entry is not None and entry.expires > now and entry.version == version:
+            return True
+
+        page_func, path_params = self._app.match_route(pathname)
+        if page_func is None:
+            return False
+
+        speculative = self._detached_copy()
+        speculative._current_path = pathname
+        speculative._path_params = path_params
+        speculative._query_params = query_params
+        speculative._query_string = query_string
+        try:
+            component = await RefastRouter._execute_page_func(page_func, speculative, pathname)
+        except Exception:
+            # Speculative only: the real navigation reports any error
+            logger.debug("Prefetch of %s failed", path, exc_info=True)
+            return False
+        if speculative._wrote_data():
+            # Adopting the render would drop those writes: render on navigation
+            return False
+
+        self._prefetched.pop(key, None)
+        self._prefetched[key] = _PrefetchedPage(
+            component=component,
+            callbacks=speculative._callbacks,
+            error_handlers=speculative._callback_error_handlers,
+            pathname=pathname,
+            path_params=path_params,
+            query_params=query_params,
+            query_string=query_string,
+            version=version,
+            expires=time.monotonic() + self._app.prefetch_ttl,
+        )
+        for stale in [k for k, e in self._prefetched.items() if e.expires <= now]:
+            del self._prefetched[stale]
+        while len(self._prefetched) > _MAX_PREFETCHED_PAGES:
+            del self._prefetched[next(iter(self._prefetched))]
+        return True
+
+    def _detached_copy(self) -> "Context[T]":
+        """A context for speculative renders: no WebSocket, copied data."""
+        ctx: Context[T] = Context(request=self._request, app=self._app)
+        ctx._state = State(self._state._data)
+        ctx._state._model_class = self._state._model_class
+        ctx._bind_state = self._state
+        if self._store is not None:
+            ctx._store = Store(ctx)
+            ctx._store._local._data = dict(self._store._local._data)
+            ctx._store._session._data = dict(self._store._session._data)
+        if self._session is not None:
+            from refast.session.session import Session
+
+            data = copy.copy(self._session._data)
+            data.data = dict(data.data)
+            ctx._session = Session(data)
+        return ctx
+
+    def _wrote_data(self) -> bool:
+        """Whether ``state``, ``store`` or ``session`` of a detached copy was written."""
+        store = self._store._version if self._store is not None else 0
+        session = self._session is not None and self._session.is_modified
+        return self._state._version != 0 or store != 0 or session
+
+    def _prefetch_later(self, path: str) -> None:
+        """Run :meth:`prefetch` for *path* in a background task.
+
+        Requests beyond ``_MAX_PREFETCH_TASKS`` renders in flight are ignored;
+        prefetching is only a hint and navigation renders the page anyway.
+        """
+        from refast.router import _parse_url
+
+        pathname, _query_params, query_string = _parse_url(path)
+        key = _location_key(pathname, query_string)
+        if key in self._prefetch_tasks or len(self._prefetch_tasks) >= _MAX_PREFETCH_TASKS:
+            return
+        task = asyncio.get_running_loop().create_task(self.prefetch(path))
+        self._prefetch_tasks[key] = task
+
+        def _done(task: asyncio.Task[bool]) -> None:
+            self._prefetch_tasks.pop(key, None)
+            if not task.cancelled() and task.exception() is not None:
+                logger.error("Prefetch of %s failed", path, exc_info=task.exception())
+
+        task.add_done_callback(_done)
+
+    async def _wait_for_prefetch(self, path: str) -> None:
+        """Wait for a background prefetch of *path* that is still running."""
+        if not self._prefetch_tasks:
+            return
+
+        from refast.router import _parse_url
+
+        pathname, _query_params, query_string = _parse_url(path)
+        task = self._prefetch_tasks.get(_location_key(pathname, query_string))
+        if task is not None:
+            await asyncio.wait({task})
+
+    def _cancel_prefetches(self) -> None:
+        """Cancel all background prefetches (the connection is closing)."""
+        for task in self._prefetch_tasks.values():
+            task.cancel()
+        self._prefetch_tasks.clear()
+
+    def _take_prefetched(self, path: str, *, replace_callbacks: bool = False) -> Any:
+        """Adopt a still-valid prefetched render of *path*, if there is one.
+
+        On a hit the callbacks registered while prefetching are added to this
+        context (replacing the existing ones if *replace_callbacks* is set)
+        and the URL attributes are set to the target page.
+
+        Returns:
+            The page component, or ``None`` if the page must be rendered now.
+        """
+        if not self._prefetched:
+            return None
+
+        from refast.router import _parse_url
+
+        pathname, _query_params, query_string = _parse_url(path)
+        entry = self._prefetched.pop(_location_key(pathname, query_string), None)
+        if (
+            entry is None
+            or entry.expires <= time.monotonic()
+            or entry.version != self._data_version()
+        ):
+            return None
+
+        if replace_callbacks:
+            self.clear_callbacks()
+        self._callbacks.update(entry.callbacks)
+        self._callback_error_handlers.update(entry.error_handlers)
+        self._current_path = entry.pathname
+        self._path_params = entry.path_params
+        self._query_params = entry.query_params
+        self._query_string = entry.query_string
+        return entry.component
+
+    def _data_version(self) -> tuple[int, ...]:
+        """Change counters of all data a page function typically reads."""
+        shared = self._app.shared_state._version if self._app is not None else 0
+        store = self._store._version if self._store is not None else 0
+        return (self._state._version, store, shared)
+
     async def redirect(self, path: str, target: str | None = None) -> None:
         """Redirect to a different page.
 
@@ -916,7 +1422,9 @@ class Context(Generic[T]):
 
             if page_func is not None:
                 # Re-render the page with current state
-                component = page_func(self)
+                from refast.router import RefastRouter
+
+                component = await RefastRouter._execute_page_func(page_func, self, page_path)
 
                 if target_id:
                     # Partial refresh: Find and update only the target component
@@ -928,8 +1436,10 @@ class Context(Generic[T]):
                         target_component = find_component_in_tree(component, target_id)
 
                         if target_component:
-                            component_data = target_component.render()
-                            await self._websocket.send_json(
+                            parent_id = self._binding_parents.get(target_id)
+                            self._unbind_subtree(target_id)
+                            component_data = self._render_component(target_component, parent_id)
+                            await self._send_update(
                                 {
                                     # Use 'replace' operation to safely swap the component
                                     "type": "update",
@@ -943,7 +1453,7 @@ class Context(Generic[T]):
                             pass
                 else:
                     # Full page refresh (default behavior)
-                    component_data = component.render() if hasattr(component, "render") else {}
+                    component_data = self._render_page(component)
 
                     # Send the rendered component tree via WebSocket
                     await self._websocket.send_json(
@@ -1067,7 +1577,7 @@ class Context(Generic[T]):
             if toast_id is not None:
                 payload["id"] = toast_id
             if component is not None:
-                payload["component"] = component.render()
+                payload["component"] = self._render_component(component)
 
             await self._websocket.send_json(payload)
 
@@ -1184,15 +1694,23 @@ class Context(Generic[T]):
                 }
             )
 
-    async def broadcast_theme(self, theme: Any) -> int:
+    async def broadcast_theme(
+        self, theme: Any, *, timeout: float | None = DEFAULT_SEND_TIMEOUT
+    ) -> BroadcastResult:
         """
         Broadcast a theme change to **all** connected clients.
 
+        If the app has a backplane, clients of other workers receive the
+        update as well and those workers adopt the theme for new page loads.
+
         Args:
             theme: A ``Theme`` instance (from ``refast.theme``).
+            timeout: Seconds each client may take to accept the update.
 
         Returns:
-            Number of clients that received the update.
+            Number of clients of this worker that received the update, as a
+            :class:`~refast.events.fanout.BroadcastResult` that also counts
+            failed and timed-out clients.
 
         Example:
             ```python
@@ -1206,52 +1724,161 @@ class Context(Generic[T]):
             self._app.theme = theme
 
         if not self._app:
-            return 0
+            return BroadcastResult()
 
-        count = 0
-        payload = {
-            "type": "theme_update",
-            "theme": theme.to_dict(),
-        }
-        for other_ctx in self._app.active_contexts:
-            if other_ctx._websocket:
-                try:
-                    await other_ctx._websocket.send_json(payload)
-                    count += 1
-                except Exception:
-                    pass
-        return count
+        return await self._app._broadcast_theme(theme, timeout=timeout)
 
-    async def broadcast(self, event_type: str, data: Any) -> int:
+    async def broadcast(
+        self, event_type: str, data: Any, *, timeout: float | None = DEFAULT_SEND_TIMEOUT
+    ) -> BroadcastResult:
         """
         Broadcast an event to all connected clients.
 
+        The event is encoded once and the same frame is sent to every
+        client. Sends go out concurrently, so one slow client does not hold
+        up the rest; a client that takes longer than *timeout* is skipped.
+        If the app has a backplane, clients of other workers receive the
+        event as well.
+
         Args:
             event_type: Type of event to broadcast
             data: Event data to send
+            timeout: Seconds each client may take to accept the event.
 
         Returns:
-            Number of clients that received the broadcast
+            Number of clients of this worker that received the broadcast, as a
+            :class:`~refast.events.fanout.BroadcastResult` that also counts
+            failed and timed-out clients.
+
+        Raises:
+            TypeError: If *data* is not JSON-serializable.
         """
         if not self._app:
-            return 0
+            return BroadcastResult()
 
-        count = 0
-        for ctx in self._app.active_contexts:
-            if ctx._websocket and ctx._websocket != self._websocket:
-                try:
-                    await ctx._websocket.send_json(
-                        {
-                            "type": "event",
-                            "eventType": event_type,
-                            "data": data,
-                        }
-                    )
-                    count += 1
-                except Exception:
-                    # Connection may be closed
-                    pass
-        return count
+        payload = {
+            "type": "event",
+            "eventType": event_type,
+            "data": data,
+        }
+        return await self._app._broadcast(payload, exclude=self._websocket, timeout=timeout)
+
+    @property
+    def session_id(self) -> str | None:
+        """
+        The browser session this connection belongs to.
+
+        Taken from the app's session cookie on the WebSocket handshake;
+        ``None`` if the browser sent none.
+        """
+        return self._connection.session_id if self._connection else None
+
+    def subscribe(self, channel: str) -> None:
+        """
+        Subscribe this client to a channel.
+
+        Events sent with :meth:`send_to_channel` to *channel* are delivered
+        to every subscribed client.  The subscription ends when the client
+        disconnects.
+
+        Args:
+            channel: The channel name, or a pattern such as ``"room:*"``
+                (see :mod:`refast.events.channels`).
+
+        Example:
+            ```python
+            async def join_room(ctx: Context, room: str):
+                ctx.subscribe(f"room:{room}")
+            ```
+        """
+        if self._connection is not None:
+            self._connection.subscribe(channel)
+
+    def unsubscribe(self, channel: str) -> None:
+        """
+        Unsubscribe this client from a channel.
+
+        Args:
+            channel: The channel name or pattern passed to :meth:`subscribe`.
+        """
+        if self._connection is not None:
+            self._connection.unsubscribe(channel)
+
+    async def send_to_channel(
+        self,
+        channel: str,
+        event_type: str,
+        data: Any,
+        *,
+        include_self: bool = False,
+        timeout: float | None = DEFAULT_SEND_TIMEOUT,
+    ) -> BroadcastResult:
+        """
+        Send an event to the clients subscribed to a channel.
+
+        Only the subscribers are visited, so the cost does not grow with
+        the number of other connected clients.  If the app has a backplane,
+        subscribers on other workers receive the event as well.
+
+        Args:
+            channel: The channel name.
+            event_type: Type of event to send.
+            data: Event data to send.
+            include_self: Also deliver to this client if it is subscribed.
+            timeout: Seconds each client may take to accept the event.
+
+        Returns:
+            Number of subscribers of this worker that received the event.
+
+        Example:
+            ```python
+            async def send_message(ctx: Context, room: str, text: str):
+                await ctx.send_to_channel(f"room:{room}", "chat:message", {"text": text})
+            ```
+        """
+        if not self._app:
+            return BroadcastResult()
+
+        payload = {"type": "event", "eventType": event_type, "data": data}
+        exclude = None if include_self else self._websocket
+        return await self._app._send_to_channel(channel, payload, exclude=exclude, timeout=timeout)
+
+    async def send_to_session(
+        self,
+        session_id: str,
+        event_type: str,
+        data: Any,
+        *,
+        timeout: float | None = DEFAULT_SEND_TIMEOUT,
+    ) -> BroadcastResult:
+        """
+        Send an event to every open tab of a browser session.
+
+        The session's connections are looked up directly.  If the app has
+        a backplane, its connections on other workers receive the event as
+        well.
+
+        Args:
+            session_id: The target session (see :attr:`session_id`).
+            event_type: Type of event to send.
+            data: Event data to send.
+            timeout: Seconds each client may take to accept the event.
+
+        Returns:
+            Number of connections of this worker that received the event.
+
+        Example:
+            ```python
+            async def notify_other_tabs(ctx: Context):
+                if ctx.session_id:
+                    await ctx.send_to_session(ctx.session_id, "cart:updated", {"items": 3})
+            ```
+        """
+        if not self._app:
+            return BroadcastResult()
+
+        payload = {"type": "event", "eventType": event_type, "data": data}
+        return await self._app._send_to_session(session_id, payload, timeout=timeout)
 
     async def create_file_url(
         self,
@@ -2,7 +2,10 @@
 
 from refast.events.actions import Callback
 from refast.events.broadcast import BroadcastManager, BroadcastMessage
+from refast.events.channels import ChannelIndex
+from refast.events.fanout import BroadcastResult, encode_frame, fan_out
 from refast.events.manager import EventManager
+from refast.events.queue import BroadcastQueue, OverflowPolicy, Priority, QueueStats
 from refast.events.stream import EventStream, WebSocketConnection
 from refast.events.types import CallbackEvent, Event, EventHandler, EventType
 
@@ -17,4 +20,12 @@ __all__ = [
     "WebSocketConnection",
     "BroadcastManager",
     "BroadcastMessage",
+    "BroadcastResult",
+    "BroadcastQueue",
+    "OverflowPolicy",
+    "Priority",
+    "QueueStats",
+    "ChannelIndex",
+    "encode_frame",
+    "fan_out",
 ]
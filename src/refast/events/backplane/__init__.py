@@ -0,0 +1,21 @@
+"""Cross-worker broadcast backplanes.
+
+A backplane carries broadcasts, channel messages and theme updates between
+worker processes, so they reach every connected client and not only those
+served by the worker that sent them.
+"""
+
+from refast.events.backplane.base import Backplane, BackplaneHandler, BackplaneMessage
+from refast.events.backplane.local import UnixSocketBackplane
+from refast.events.backplane.memory import InProcessBackplane, InProcessHub
+from refast.events.backplane.redis import RedisBackplane
+
+__all__ = [
+    "Backplane",
+    "BackplaneHandler",
+    "BackplaneMessage",
+    "InProcessBackplane",
+    "InProcessHub",
+    "RedisBackplane",
+    "UnixSocketBackplane",
+]
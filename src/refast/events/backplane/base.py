@@ -0,0 +1,199 @@
+"""Abstract base class for broadcast backplanes."""
+
+import asyncio
+import json
+import logging
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from refast.events.fanout import encode_frame
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BackplaneMessage:
+    """
+    A message carried between workers.
+
+    Attributes:
+        kind: What the message is for; selects the handlers it is given to
+        payload: JSON-serializable message data
+        id: Unique message ID, used to drop duplicates
+        origin: ID of the backplane that published the message
+    """
+
+    kind: str
+    payload: dict[str, Any]
+    id: str
+    origin: str
+
+
+BackplaneHandler = Callable[[BackplaneMessage], Awaitable[None]]
+
+
+class Backplane(ABC):
+    """
+    Abstract base class for cross-worker pub/sub.
+
+    Each worker process owns one backplane.  :meth:`publish` sends a message
+    to every *other* worker: messages a backplane published itself are
+    filtered out on receipt (the caller has already handled them locally),
+    and a message delivered twice, e.g. across a reconnect, is only handed to
+    the handlers once.
+
+    Subclasses implement the transport: :meth:`_connect`, :meth:`_disconnect`
+    and :meth:`_send`, and call :meth:`_receive` with every frame they get.
+
+    Example:
+        ```python
+        class MyBackplane(Backplane):
+            async def _connect(self) -> None:
+                # Subscribe; call self._receive(data) for each incoming frame
+                pass
+
+            async def _disconnect(self) -> None:
+                pass
+
+            async def _send(self, data: bytes) -> None:
+                # Deliver data to every worker, this one included
+                pass
+        ```
+
+    Attributes:
+        origin: Unique ID of this backplane instance
+    """
+
+    def __init__(self, *, dedup_size: int = 4096):
+        """
+        Initialize the backplane.
+
+        Args:
+            dedup_size: How many recent message IDs to remember for
+                dropping duplicates
+        """
+        self.origin = uuid.uuid4().hex
+        self._handlers: dict[str, list[BackplaneHandler]] = {}
+        self._seen: OrderedDict[str, None] = OrderedDict()
+        self._dedup_size = dedup_size
+        self._started = False
+        self._start_lock: asyncio.Lock | None = None
+
+    @property
+    def started(self) -> bool:
+        """Whether the backplane is connected and receiving."""
+        return self._started
+
+    def on(self, kind: str, handler: BackplaneHandler) -> Callable[[], None]:
+        """
+        Register a handler for messages of one kind from other workers.
+
+        Args:
+            kind: The message kind
+            handler: Coroutine function called with each message
+
+        Returns:
+            A function that removes the handler.
+        """
+        handlers = self._handlers.setdefault(kind, [])
+        handlers.append(handler)
+
+        def remove() -> None:
+            if handler in handlers:
+                handlers.remove(handler)
+
+        return remove
+
+    async def start(self) -> None:
+        """Connect and start receiving.  Safe to call more than once."""
+        if self._started:
+            return
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self._started:
+                return
+            await self._connect()
+            self._started = True
+            logger.info(f"{type(self).__name__} started ({self.origin})")
+
+    async def close(self) -> None:
+        """Stop receiving and release the transport."""
+        if not self._started:
+            return
+        self._started = False
+        await self._disconnect()
+        logger.info(f"{type(self).__name__} closed ({self.origin})")
+
+    async def publish(self, kind: str, payload: dict[str, Any]) -> str:
+        """
+        Send a message to the other workers.
+
+        Starts the backplane if needed.
+
+        Args:
+            kind: The message kind
+            payload: JSON-serializable message data
+
+        Returns:
+            The message ID.
+
+        Raises:
+            TypeError: If *payload* is not JSON-serializable.
+        """
+        message_id = uuid.uuid4().hex
+        data = encode_frame(
+            {"id": message_id, "origin": self.origin, "kind": kind, "payload": payload}
+        ).encode()
+        await self.start()
+        self._remember(message_id)
+        await self._send(data)
+        return message_id
+
+    async def _receive(self, data: bytes | str) -> None:
+        """Decode one frame from the transport and dispatch it."""
+        try:
+            raw = json.loads(data)
+            message = BackplaneMessage(
+                kind=raw["kind"],
+                payload=raw["payload"],
+                id=raw["id"],
+                origin=raw["origin"],
+            )
+        except (ValueError, TypeError, KeyError) as e:
+            logger.warning(f"Dropping malformed backplane message: {e}")
+            return
+
+        if message.origin == self.origin or not self._remember(message.id):
+            return
+
+        for handler in list(self._handlers.get(message.kind, ())):
+            try:
+                await handler(message)
+            except Exception:
+                logger.exception(f"Backplane handler for {message.kind!r} failed")
+
+    def _remember(self, message_id: str) -> bool:
+        """Record *message_id*; return False if it was already seen."""
+        if message_id in self._seen:
+            return False
+        self._seen[message_id] = None
+        if len(self._seen) > self._dedup_size:
+            self._seen.popitem(last=False)
+        return True
+
+    @abstractmethod
+    async def _connect(self) -> None:
+        """Connect to the transport and start feeding :meth:`_receive`."""
+
+    @abstractmethod
+    async def _disconnect(self) -> None:
+        """Stop receiving and release the transport."""
+
+    @abstractmethod
+    async def _send(self, data: bytes) -> None:
+        """Deliver *data* to every backplane on the transport."""
@@ -0,0 +1,228 @@
+"""Unix-domain-socket backplane for workers on one host."""
+
+import asyncio
+import contextlib
+import logging
+import os
+import struct
+
+from refast.events.backplane.base import Backplane
+
+try:
+    import fcntl
+
+    FCNTL_AVAILABLE = True
+except ImportError:
+    fcntl = None  # type: ignore[assignment]
+    FCNTL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct("!I")
+
+# Largest frame accepted from a peer
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+# Bytes a peer may fall behind before the hub disconnects it
+MAX_PEER_BUFFER = 64 * 1024 * 1024
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> bytes:
+    """Read one length-prefixed frame."""
+    (size,) = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+    if size > MAX_FRAME_SIZE:
+        raise ValueError(f"Backplane frame of {size} bytes exceeds the limit")
+    return await reader.readexactly(size)
+
+
+class UnixSocketBackplane(Backplane):
+    """
+    Backplane for several worker processes on one host.
+
+    Needs no external service: the first worker to start becomes the hub.
+    It holds an exclusive lock on ``<path>.lock``, listens on the Unix socket
+    at *path* and relays every frame to all connected workers, itself
+    included.  If the hub exits, the remaining workers reconnect and one of
+    them takes over.  Messages published while no hub is reachable are
+    dropped, as with Redis pub/sub.
+
+    Only available on POSIX systems.
+
+    Example:
+        ```python
+        # Every uvicorn worker builds the same app
+        ui = RefastApp(backplane=UnixSocketBackplane("/run/myapp/backplane.sock"))
+        ```
+
+    Attributes:
+        path: Filesystem path of the hub's socket
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str] = "/tmp/refast-backplane.sock",
+        *,
+        reconnect_delay: float = 0.05,
+        max_reconnect_delay: float = 2.0,
+        dedup_size: int = 4096,
+    ):
+        """
+        Initialize the backplane.
+
+        Args:
+            path: Socket path shared by all workers
+            reconnect_delay: Initial delay between reconnect attempts
+            max_reconnect_delay: Upper bound for the reconnect back-off
+            dedup_size: How many recent message IDs to remember
+
+        Raises:
+            ImportError: If the platform has no ``fcntl`` (e.g. Windows)
+        """
+        if not FCNTL_AVAILABLE:
+            raise ImportError("UnixSocketBackplane requires a POSIX system")
+
+        super().__init__(dedup_size=dedup_size)
+        self.path = os.fspath(path)
+        self._reconnect_delay = reconnect_delay
+        self._max_reconnect_delay = max_reconnect_delay
+
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._reader_task: asyncio.Task[None] | None = None
+        self._closing = False
+
+        # Only set while this worker is the hub
+        self._lock_fd: int | None = None
+        self._server: asyncio.AbstractServer | None = None
+        self._peers: set[asyncio.StreamWriter] = set()
+        self._peer_tasks: set[asyncio.Task[None]] = set()
+
+    @property
+    def is_hub(self) -> bool:
+        """Whether this worker is currently relaying for the others."""
+        return self._server is not None
+
+    async def _connect(self) -> None:
+        self._closing = False
+        await self._open()
+        self._reader_task = asyncio.create_task(self._read_loop())
+
+    async def _disconnect(self) -> None:
+        self._closing = True
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._reader_task
+            self._reader_task = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        await self._stop_hub()
+
+    async def _send(self, data: bytes) -> None:
+        writer = self._writer
+        if writer is None:
+            logger.warning("Backplane not connected; dropping message")
+            return
+        try:
+            writer.write(_HEADER.pack(len(data)) + data)
+            await writer.drain()
+        except (ConnectionError, OSError) as e:
+            logger.warning(f"Backplane send failed: {e}")
+
+    async def _open(self) -> None:
+        """Connect to the hub, becoming the hub if there is none."""
+        delay = self._reconnect_delay
+        while True:
+            try:
+                self._reader, self._writer = await asyncio.open_unix_connection(self.path)
+                return
+            except (FileNotFoundError, ConnectionRefusedError):
+                if await self._become_hub():
+                    continue
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self._max_reconnect_delay)
+
+    async def _read_loop(self) -> None:
+        """Feed incoming frames to the handlers, reconnecting when the hub goes away."""
+        while not self._closing:
+            reader = self._reader
+            try:
+                if reader is None:
+                    raise ConnectionError("not connected")
+                while True:
+                    await self._receive(await _read_frame(reader))
+            except (asyncio.IncompleteReadError, ConnectionError, ValueError, OSError) as e:
+                if self._closing:
+                    return
+                logger.warning(f"Backplane connection lost ({e}); reconnecting")
+                if self._writer is not None:
+                    self._writer.close()
+                    self._writer = None
+                await self._open()
+
+    async def _become_hub(self) -> bool:
+        """Take the hub lock and start relaying; False if another worker holds it."""
+        if self._server is not None:
+            return True
+        fd = os.open(self.path + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+
+        self._lock_fd = fd
+        # Any socket file left is stale: its owner no longer holds the lock
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.path)
+        self._server = await asyncio.start_unix_server(self._serve_peer, path=self.path)
+        logger.info(f"Backplane hub listening on {self.path}")
+        return True
+
+    async def _stop_hub(self) -> None:
+        if self._server is None:
+            return
+        self._server.close()
+        for peer in list(self._peers):
+            peer.close()
+        self._peers.clear()
+        if self._peer_tasks:
+            await asyncio.gather(*self._peer_tasks, return_exceptions=True)
+        await self._server.wait_closed()
+        self._server = None
+        # Remove the socket before releasing the lock so a new hub's socket is never deleted
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.path)
+        if self._lock_fd is not None:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    async def _serve_peer(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Relay every frame a worker sends to all workers."""
+        if self._server is None or not self._server.is_serving():
+            # Accepted just before the hub stopped
+            writer.close()
+            return
+        task = asyncio.current_task()
+        if task is not None:
+            self._peer_tasks.add(task)
+        self._peers.add(writer)
+        try:
+            while True:
+                data = await _read_frame(reader)
+                frame = _HEADER.pack(len(data)) + data
+                for peer in list(self._peers):
+                    if peer.transport.get_write_buffer_size() > MAX_PEER_BUFFER:
+                        logger.warning("Disconnecting backplane peer that stopped reading")
+                        self._peers.discard(peer)
+                        peer.close()
+                    else:
+                        peer.write(frame)
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError, OSError):
+            pass
+        finally:
+            self._peers.discard(writer)
+            self._peer_tasks.discard(task)  # type: ignore[arg-type]
+            writer.close()
@@ -0,0 +1,59 @@
+"""In-process backplane."""
+
+from refast.events.backplane.base import Backplane
+
+
+class InProcessHub:
+    """
+    Connects the :class:`InProcessBackplane` instances attached to it.
+
+    Each hub is an isolated bus, so tests can run several independent
+    groups of "workers" in one process.
+    """
+
+    def __init__(self) -> None:
+        self.members: list[InProcessBackplane] = []
+
+
+_default_hub = InProcessHub()
+
+
+class InProcessBackplane(Backplane):
+    """
+    Backplane connecting apps that run in the same process.
+
+    Useful for tests and for hosting several :class:`~refast.RefastApp`
+    instances in one server.  It does not cross process boundaries; use
+    :class:`~refast.events.backplane.UnixSocketBackplane` or
+    :class:`~refast.events.backplane.RedisBackplane` for multiple workers.
+
+    Example:
+        ```python
+        hub = InProcessHub()
+        app_a = RefastApp(backplane=InProcessBackplane(hub))
+        app_b = RefastApp(backplane=InProcessBackplane(hub))
+        ```
+    """
+
+    def __init__(self, hub: InProcessHub | None = None, *, dedup_size: int = 4096):
+        """
+        Initialize the backplane.
+
+        Args:
+            hub: The hub to attach to (defaults to a process-wide hub)
+            dedup_size: How many recent message IDs to remember
+        """
+        super().__init__(dedup_size=dedup_size)
+        self.hub = hub if hub is not None else _default_hub
+
+    async def _connect(self) -> None:
+        if self not in self.hub.members:
+            self.hub.members.append(self)
+
+    async def _disconnect(self) -> None:
+        if self in self.hub.members:
+            self.hub.members.remove(self)
+
+    async def _send(self, data: bytes) -> None:
+        for member in list(self.hub.members):
+            await member._receive(data)
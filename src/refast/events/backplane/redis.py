@@ -0,0 +1,132 @@
+"""Redis pub/sub backplane."""
+
+import asyncio
+import contextlib
+import logging
+from typing import Any
+
+from refast.events.backplane.base import Backplane
+
+try:
+    import redis.asyncio as redis
+
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis = None  # type: ignore[assignment]
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class RedisBackplane(Backplane):
+    """
+    Backplane over a Redis pub/sub channel.
+
+    Reaches workers on any number of hosts.  Requires the `redis` extra
+    (pip install refast[redis]) unless a client is passed in.
+
+    Example:
+        ```python
+        ui = RefastApp(backplane=RedisBackplane(redis_url="redis://localhost:6379/0"))
+
+        # Or with an existing client
+        ui = RefastApp(backplane=RedisBackplane(client=redis.from_url("redis://cache")))
+        ```
+
+    Attributes:
+        channel: The Redis pub/sub channel used by all workers
+    """
+
+    def __init__(
+        self,
+        redis_url: str | None = None,
+        client: Any = None,
+        channel: str = "refast:backplane",
+        *,
+        reconnect_delay: float = 0.1,
+        max_reconnect_delay: float = 5.0,
+        dedup_size: int = 4096,
+    ):
+        """
+        Initialize the backplane.
+
+        Args:
+            redis_url: Redis connection URL
+            client: Existing ``redis.asyncio`` client (or compatible object)
+            channel: Pub/sub channel shared by all workers
+            reconnect_delay: Initial delay before resubscribing after an error
+            max_reconnect_delay: Upper bound for the resubscribe back-off
+            dedup_size: How many recent message IDs to remember
+
+        Raises:
+            ImportError: If redis_url is given and redis is not installed
+            ValueError: If neither redis_url nor client is provided
+        """
+        super().__init__(dedup_size=dedup_size)
+        self.channel = channel
+        self._reconnect_delay = reconnect_delay
+        self._max_reconnect_delay = max_reconnect_delay
+
+        if client is not None:
+            self._client = client
+            self._owned_client = False
+        elif redis_url:
+            if not REDIS_AVAILABLE:
+                raise ImportError("Redis is not installed. Install with: pip install refast[redis]")
+            self._client = redis.from_url(redis_url)  # type: ignore[union-attr]
+            self._owned_client = True
+        else:
+            raise ValueError("Either redis_url or client must be provided")
+
+        self._pubsub: Any = None
+        self._listener: asyncio.Task[None] | None = None
+
+    async def _connect(self) -> None:
+        await self._subscribe()
+        self._listener = asyncio.create_task(self._listen())
+
+    async def _disconnect(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+        await self._close_pubsub()
+        if self._owned_client:
+            await self._client.aclose()
+
+    async def _send(self, data: bytes) -> None:
+        await self._client.publish(self.channel, data)
+
+    async def _subscribe(self) -> None:
+        self._pubsub = self._client.pubsub()
+        await self._pubsub.subscribe(self.channel)
+
+    async def _close_pubsub(self) -> None:
+        if self._pubsub is None:
+            return
+        with contextlib.suppress(Exception):
+            await self._pubsub.unsubscribe(self.channel)
+            await self._pubsub.aclose()
+        self._pubsub = None
+
+    async def _listen(self) -> None:
+        """Feed published frames to the handlers, resubscribing after errors."""
+        delay = self._reconnect_delay
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    if message.get("type") == "message":
+                        delay = self._reconnect_delay
+                        await self._receive(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Redis backplane error ({e}); resubscribing in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self._max_reconnect_delay)
+            try:
+                await self._close_pubsub()
+                await self._subscribe()
+            except Exception as e:
+                logger.warning(f"Redis backplane resubscribe failed: {e}")
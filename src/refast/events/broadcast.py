@@ -5,11 +5,24 @@ import logging
 from dataclasses import dataclass
 from typing import Any
 
+from refast.events.backplane import Backplane, BackplaneMessage
+from refast.events.fanout import BroadcastResult
+from refast.events.queue import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_QUEUE_SIZE,
+    BroadcastQueue,
+    OverflowPolicy,
+    Priority,
+    QueueStats,
+)
 from refast.events.stream import EventStream
 from refast.events.types import Event
 
 logger = logging.getLogger(__name__)
 
+# Backplane message kind for broadcasts forwarded between workers
+BACKPLANE_KIND = "broadcast_manager"
+
 
 @dataclass
 class BroadcastMessage:
@@ -21,12 +34,14 @@ class BroadcastMessage:
         event_type: The type of event
         data: The event data
         exclude_session: Session ID to exclude from broadcast
+        priority: Queue lane for deferred delivery
     """
 
     channel: str
     event_type: str
     data: dict[str, Any]
     exclude_session: str | None = None
+    priority: Priority = Priority.NORMAL
 
 
 class BroadcastManager:
@@ -37,6 +52,15 @@ class BroadcastManager:
     - Broadcast to all clients
     - Broadcast to specific channels
     - Exclude specific sessions
+    - Reach clients of other workers through a backplane
+    - Deferred broadcasts through a bounded, prioritized queue
+
+    Broadcasts queued with :meth:`queue_broadcast` are drained in batches
+    once :meth:`start` has been called.  Each batch is merged per
+    destination: the events bound for the same channel (or for everyone)
+    go out as a single ``batch`` frame, so a burst of N events costs one
+    fan-out per destination instead of N.  High-priority events are taken
+    first and may overtake normal ones already waiting.
 
     Example:
         ```python
@@ -49,18 +73,39 @@ class BroadcastManager:
         await broadcaster.broadcast_to_channel(
             "room:123", "message", {"text": "Hi room!"}
         )
+
+        # Defer delivery; alerts jump the queue
+        await broadcaster.start()
+        broadcaster.queue_broadcast("", "tick", {"n": 1})
+        broadcaster.queue_broadcast("", "alert", {"text": "Down!"}, priority=Priority.HIGH)
         ```
     """
 
-    def __init__(self, stream: EventStream | None = None):
+    def __init__(
+        self,
+        stream: EventStream | None = None,
+        backplane: Backplane | None = None,
+        *,
+        max_queue_size: int = DEFAULT_QUEUE_SIZE,
+        overflow: OverflowPolicy | str = OverflowPolicy.DROP_OLDEST,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
         """
         Initialize the broadcast manager.
 
         Args:
             stream: The EventStream for WebSocket connections
+            backplane: Optional backplane carrying broadcasts to other workers
+            max_queue_size: Maximum number of queued broadcasts
+            overflow: What to do with a broadcast queued while the queue is full
+            batch_size: Maximum number of queued broadcasts sent per batch
         """
         self.stream = stream
-        self._queue: asyncio.Queue[BroadcastMessage] = asyncio.Queue()
+        self.backplane = backplane
+        if backplane is not None:
+            backplane.on(BACKPLANE_KIND, self._on_backplane_message)
+        self.batch_size = batch_size
+        self._queue: BroadcastQueue[BroadcastMessage] = BroadcastQueue(max_queue_size, overflow)
         self._running = False
         self._task: asyncio.Task[None] | None = None
 
@@ -70,6 +115,8 @@ class BroadcastManager:
             return
 
         self._running = True
+        if self.backplane is not None:
+            await self.backplane.start()
         self._task = asyncio.create_task(self._process_queue())
         logger.info("Broadcast manager started")
 
@@ -89,38 +136,33 @@ class BroadcastManager:
         event_type: str,
         data: dict[str, Any],
         exclude_session: str | None = None,
-    ) -> int:
+    ) -> BroadcastResult:
         """
         Broadcast an event to all connected clients.
 
+        With a backplane, the event is also sent to the clients of every
+        other worker.
+
         Args:
             event_type: Type of event to broadcast
             data: Event data
             exclude_session: Optional session to exclude
 
         Returns:
-            Number of clients that received the broadcast
+            Number of clients of this worker that received the broadcast
         """
+        event = Event(type=event_type, data=data, source="server")
+        message = {"target": "all", "event": event.to_dict(), "exclude_session": exclude_session}
         if not self.stream:
             logger.warning("No stream configured for broadcast")
-            return 0
+            await self._publish(message)
+            return BroadcastResult()
 
-        event = Event(
-            type=event_type,
-            data=data,
-            source="server",
-        )
+        result = await self._deliver(message)
+        await self._publish(message)
 
-        count = 0
-        for conn in self.stream._connections.values():
-            if exclude_session and conn.session_id == exclude_session:
-                continue
-
-            if await conn.send_event(event):
-                count += 1
-
-        logger.debug(f"Broadcast {event_type} to {count} clients")
-        return count
+        logger.debug(f"Broadcast {event_type} to {result.delivered} clients")
+        return result
 
     async def broadcast_to_channel(
         self,
@@ -128,10 +170,12 @@ class BroadcastManager:
         event_type: str,
         data: dict[str, Any],
         exclude_session: str | None = None,
-    ) -> int:
+    ) -> BroadcastResult:
         """
         Broadcast to clients subscribed to a specific channel.
 
+        With a backplane, subscribers on other workers receive it too.
+
         Args:
             channel: The channel name
             event_type: Type of event
@@ -139,60 +183,87 @@ class BroadcastManager:
             exclude_session: Optional session to exclude
 
         Returns:
-            Number of clients that received the broadcast
+            Number of clients of this worker that received the broadcast
         """
-        if not self.stream:
-            return 0
-
-        event = Event(
-            type=event_type,
-            data=data,
-            source="server",
-        )
-
-        count = 0
-        for conn in self.stream._connections.values():
-            if exclude_session and conn.session_id == exclude_session:
-                continue
-
-            if conn.is_subscribed(channel):
-                if await conn.send_event(event):
-                    count += 1
-
-        return count
+        event = Event(type=event_type, data=data, source="server")
+        message = {
+            "target": "channel",
+            "channel": channel,
+            "event": event.to_dict(),
+            "exclude_session": exclude_session,
+        }
+        result = await self._deliver(message)
+        await self._publish(message)
+        return result
 
     async def broadcast_to_session(
         self,
         session_id: str,
         event_type: str,
         data: dict[str, Any],
-    ) -> int:
+    ) -> BroadcastResult:
         """
         Send an event to all connections for a specific session.
 
+        With a backplane, the session's connections on other workers
+        receive it too.
+
         Args:
             session_id: The session ID
             event_type: Type of event
             data: Event data
 
         Returns:
-            Number of connections that received the event
+            Number of connections of this worker that received the event
         """
+        event = Event(type=event_type, data=data, source="server")
+        message = {"target": "session", "session_id": session_id, "event": event.to_dict()}
+        result = await self._deliver(message)
+        await self._publish(message)
+        return result
+
+    async def _deliver(self, message: dict[str, Any]) -> BroadcastResult:
+        """Send a broadcast to the matching connections of this worker."""
         if not self.stream:
-            return 0
+            return BroadcastResult()
+
+        target = message["target"]
+        if target == "session":
+            recipients = self.stream.get_session_connections(message["session_id"])
+        else:
+            if target == "channel":
+                candidates = self.stream.get_subscribers(message["channel"])
+            else:
+                candidates = self.stream.get_all_connections()
+            exclude = message.get("exclude_session")
+            recipients = [c for c in candidates if not (exclude and c.session_id == exclude)]
+        return await self.stream.fan_out(recipients, message["event"])
+
+    async def _publish(self, message: dict[str, Any]) -> None:
+        """Forward a broadcast to the other workers, if there is a backplane."""
+        if self.backplane is None:
+            return
+        try:
+            await self.backplane.publish(BACKPLANE_KIND, message)
+        except Exception as e:
+            logger.error(f"Failed to publish broadcast to backplane: {e}")
 
-        event = Event(
-            type=event_type,
-            data=data,
-            source="server",
-        )
+    async def _on_backplane_message(self, message: BackplaneMessage) -> None:
+        await self._deliver(message.payload)
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of queued broadcasts waiting to be sent."""
+        return self._queue.qsize()
 
-        count = 0
-        for conn in self.stream.get_session_connections(session_id):
-            if await conn.send_event(event):
-                count += 1
+    @property
+    def queue_lag(self) -> float:
+        """Seconds the oldest queued broadcast has been waiting."""
+        return self._queue.lag
 
-        return count
+    def stats(self) -> QueueStats:
+        """Return the queue's depth, lag and drop counters."""
+        return self._queue.stats()
 
     def queue_broadcast(
         self,
@@ -200,7 +271,8 @@ class BroadcastManager:
         event_type: str,
         data: dict[str, Any],
         exclude_session: str | None = None,
-    ) -> None:
+        priority: Priority | int = Priority.NORMAL,
+    ) -> bool:
         """
         Queue a broadcast for async processing.
 
@@ -209,39 +281,56 @@ class BroadcastManager:
             event_type: Type of event
             data: Event data
             exclude_session: Optional session to exclude
+            priority: Queue lane; higher lanes are sent first
+
+        Returns:
+            True if queued, False if the overflow policy dropped it
+
+        Raises:
+            asyncio.QueueFull: If the queue is full and the overflow policy
+                is ``OverflowPolicy.ERROR``
         """
         message = BroadcastMessage(
             channel=channel,
             event_type=event_type,
             data=data,
             exclude_session=exclude_session,
+            priority=Priority(priority),
         )
-        self._queue.put_nowait(message)
+        accepted = self._queue.put_nowait(message, message.priority)
+        if not accepted:
+            logger.warning(f"Broadcast queue full; dropped {event_type}")
+        return accepted
 
     async def _process_queue(self) -> None:
-        """Process queued broadcasts."""
+        """Send queued broadcasts in batches as they arrive."""
         while self._running:
-            try:
-                message = await asyncio.wait_for(
-                    self._queue.get(),
-                    timeout=1.0,
-                )
-
-                if message.channel:
-                    await self.broadcast_to_channel(
-                        message.channel,
-                        message.event_type,
-                        message.data,
-                        message.exclude_session,
-                    )
-                else:
-                    await self.broadcast(
-                        message.event_type,
-                        message.data,
-                        message.exclude_session,
-                    )
-
-            except TimeoutError:
-                continue
-            except Exception as e:
-                logger.error(f"Error processing broadcast: {e}")
+            await self._queue.wait()
+            for message in self._merge(self._queue.drain(self.batch_size)):
+                try:
+                    await self._deliver(message)
+                    await self._publish(message)
+                except Exception as e:
+                    logger.error(f"Error processing broadcast: {e}")
+            # Let producers run between batches
+            await asyncio.sleep(0)
+
+    @staticmethod
+    def _merge(batch: list[BroadcastMessage]) -> list[dict[str, Any]]:
+        """Combine queued broadcasts into one message per destination."""
+        groups: dict[tuple[str, str | None], list[dict[str, Any]]] = {}
+        for queued in batch:
+            event = Event(type=queued.event_type, data=queued.data, source="server")
+            groups.setdefault((queued.channel, queued.exclude_session), []).append(event.to_dict())
+
+        messages = []
+        for (channel, exclude_session), events in groups.items():
+            message: dict[str, Any] = {
+                "target": "channel" if channel else "all",
+                "event": events[0] if len(events) == 1 else {"type": "batch", "messages": events},
+                "exclude_session": exclude_session,
+            }
+            if channel:
+                message["channel"] = channel
+            messages.append(message)
+        return messages
@@ -0,0 +1,194 @@
+"""Channel subscription index.
+
+Maps channel names to the connections subscribed to them, so sending to a
+channel costs time proportional to its subscribers rather than to every
+open connection.
+
+Channel names are split into segments on ``:`` (``"room:42"``).  A
+subscription may use wildcards:
+
+- ``*`` matches exactly one segment: ``"room:*"`` receives ``"room:42"``
+  but not ``"room:42:typing"``
+- ``**`` as the last segment matches one or more segments:
+  ``"room:**"`` receives ``"room:42"`` and ``"room:42:typing"``
+
+Exact subscriptions are kept in a dict; wildcard subscriptions in a
+segment trie that is only walked when at least one exists.
+"""
+
+from collections.abc import Hashable, Iterator
+from typing import Generic, TypeVar
+
+CHANNEL_SEPARATOR = ":"
+WILDCARD = "*"
+PREFIX_WILDCARD = "**"
+
+K = TypeVar("K", bound=Hashable)
+
+
+def split_channel(pattern: str) -> list[str]:
+    """
+    Split a channel name or subscription pattern into segments.
+
+    Raises:
+        ValueError: If ``**`` appears anywhere but the last segment.
+    """
+    segments = pattern.split(CHANNEL_SEPARATOR)
+    if PREFIX_WILDCARD in segments[:-1]:
+        raise ValueError(f"'{PREFIX_WILDCARD}' must be the last segment of {pattern!r}")
+    return segments
+
+
+def is_pattern(channel: str) -> bool:
+    """Return True if *channel* contains a wildcard segment."""
+    segments = channel.split(CHANNEL_SEPARATOR)
+    return WILDCARD in segments or PREFIX_WILDCARD in segments
+
+
+def channel_matches(pattern: str, channel: str) -> bool:
+    """
+    Check whether the subscription *pattern* receives messages sent to *channel*.
+
+    Example:
+        ```python
+        channel_matches("room:*", "room:42")          # True
+        channel_matches("room:**", "room:42:typing")  # True
+        channel_matches("room:*", "room:42:typing")   # False
+        ```
+    """
+    expected = split_channel(pattern)
+    actual = channel.split(CHANNEL_SEPARATOR)
+    if expected[-1] == PREFIX_WILDCARD:
+        expected = expected[:-1]
+        if len(actual) <= len(expected):
+            return False
+        actual = actual[: len(expected)]
+    elif len(actual) != len(expected):
+        return False
+    return all(e == WILDCARD or e == a for e, a in zip(expected, actual, strict=True))
+
+
+class _Node(Generic[K]):
+    """One segment position in the wildcard trie."""
+
+    __slots__ = ("children", "members", "prefix_members")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node[K]] = {}
+        # Subscribed to the pattern ending at this node
+        self.members: set[K] = set()
+        # Subscribed to "<pattern ending at this node>:**"
+        self.prefix_members: set[K] = set()
+
+    def is_empty(self) -> bool:
+        return not (self.children or self.members or self.prefix_members)
+
+
+class ChannelIndex(Generic[K]):
+    """
+    Inverted index from channels to subscriber keys.
+
+    Example:
+        ```python
+        index = ChannelIndex()
+        index.add("room:42", "conn-a")
+        index.add("room:*", "conn-b")
+
+        index.match("room:42")  # {"conn-a", "conn-b"}
+        index.match("room:7")   # {"conn-b"}
+        ```
+    """
+
+    def __init__(self) -> None:
+        self._exact: dict[str, set[K]] = {}
+        self._root: _Node[K] = _Node()
+        self._pattern_count = 0
+
+    def __len__(self) -> int:
+        """Number of distinct channels and patterns with subscribers."""
+        return len(self._exact) + self._pattern_count
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over exact channel names with subscribers."""
+        return iter(self._exact)
+
+    def add(self, pattern: str, key: K) -> None:
+        """
+        Subscribe *key* to a channel or wildcard pattern.
+
+        Raises:
+            ValueError: If the pattern is malformed.
+        """
+        segments = split_channel(pattern)
+        if not is_pattern(pattern):
+            self._exact.setdefault(pattern, set()).add(key)
+            return
+
+        node = self._root
+        prefix = segments[-1] == PREFIX_WILDCARD
+        for segment in segments[:-1] if prefix else segments:
+            node = node.children.setdefault(segment, _Node())
+        members = node.prefix_members if prefix else node.members
+        if not members:
+            self._pattern_count += 1
+        members.add(key)
+
+    def discard(self, pattern: str, key: K) -> None:
+        """Unsubscribe *key* from *pattern*, if subscribed."""
+        if not is_pattern(pattern):
+            members = self._exact.get(pattern)
+            if members is not None:
+                members.discard(key)
+                if not members:
+                    del self._exact[pattern]
+            return
+
+        segments = split_channel(pattern)
+        prefix = segments[-1] == PREFIX_WILDCARD
+        path = [self._root]
+        for segment in segments[:-1] if prefix else segments:
+            child = path[-1].children.get(segment)
+            if child is None:
+                return
+            path.append(child)
+
+        members = path[-1].prefix_members if prefix else path[-1].members
+        if key not in members:
+            return
+        members.discard(key)
+        if not members:
+            self._pattern_count -= 1
+
+        # Prune nodes left without subscribers
+        walked = segments[:-1] if prefix else segments
+        for depth in range(len(walked), 0, -1):
+            if not path[depth].is_empty():
+                break
+            del path[depth - 1].children[walked[depth - 1]]
+
+    def match(self, channel: str) -> set[K]:
+        """
+        Return the keys subscribed to *channel*, directly or through a pattern.
+
+        Args:
+            channel: A concrete channel name.
+
+        Returns:
+            A new set; each key appears once however many of its
+            subscriptions match.
+        """
+        found = set(self._exact.get(channel, ()))
+        if self._pattern_count:
+            self._collect(self._root, channel.split(CHANNEL_SEPARATOR), 0, found)
+        return found
+
+    def _collect(self, node: _Node[K], segments: list[str], position: int, found: set[K]) -> None:
+        if position == len(segments):
+            found.update(node.members)
+            return
+        # "**" needs at least one more segment, which there is
+        found.update(node.prefix_members)
+        for key in (segments[position], WILDCARD):
+            child = node.children.get(key)
+            if child is not None:
+                self._collect(child, segments, position + 1, found)
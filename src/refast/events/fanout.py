@@ -0,0 +1,144 @@
+"""Concurrent fan-out of one message to many recipients."""
+
+import asyncio
+import json
+import logging
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+R = TypeVar("R")
+
+# Sends in flight at once during a broadcast
+DEFAULT_FANOUT_CONCURRENCY = 256
+
+# Seconds a single recipient may take before it is counted as timed out
+DEFAULT_SEND_TIMEOUT = 5.0
+
+
+def encode_frame(data: Any) -> str:
+    """
+    Encode a message as a WebSocket text frame.
+
+    Produces exactly what ``WebSocket.send_json`` would send, so a broadcast
+    can encode its payload once and hand the same frame to every recipient
+    with ``send_text``.
+
+    Args:
+        data: A JSON-serializable message.
+
+    Returns:
+        The compact JSON text.
+
+    Raises:
+        TypeError: If *data* is not JSON-serializable.
+    """
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+class BroadcastResult(int):
+    """
+    Outcome of a broadcast.
+
+    Behaves as the number of recipients the message was delivered to, so
+    code comparing the return value of a broadcast with an ``int`` keeps
+    working, and adds the failure counts.
+
+    Attributes:
+        delivered: Recipients the message was sent to.
+        failed: Recipients whose send raised or reported failure.
+        timed_out: Recipients that did not accept the message in time.
+
+    Example:
+        ```python
+        result = await ctx.broadcast("price", {"symbol": "ACME", "price": 12.5})
+        if result.timed_out:
+            logger.warning(f"{result.timed_out} slow clients skipped")
+        ```
+    """
+
+    delivered: int
+    failed: int
+    timed_out: int
+
+    def __new__(cls, delivered: int = 0, failed: int = 0, timed_out: int = 0) -> "BroadcastResult":
+        result = super().__new__(cls, delivered)
+        result.delivered = delivered
+        result.failed = failed
+        result.timed_out = timed_out
+        return result
+
+    @property
+    def total(self) -> int:
+        """Number of recipients the broadcast was attempted for."""
+        return self.delivered + self.failed + self.timed_out
+
+    def __repr__(self) -> str:
+        return (
+            f"BroadcastResult(delivered={self.delivered}, failed={self.failed}, "
+            f"timed_out={self.timed_out})"
+        )
+
+
+async def fan_out(
+    recipients: Iterable[R],
+    send: Callable[[R], Awaitable[bool | None]],
+    *,
+    concurrency: int = DEFAULT_FANOUT_CONCURRENCY,
+    timeout: float | None = DEFAULT_SEND_TIMEOUT,
+) -> BroadcastResult:
+    """
+    Call ``send(recipient)`` for every recipient, at most *concurrency* at a time.
+
+    A slow recipient only holds up its own slot: the others keep being
+    served, and after *timeout* seconds its send is cancelled and counted
+    as timed out.
+
+    Args:
+        recipients: Who to send to.
+        send: Coroutine function sending to one recipient.  Returning
+            ``False`` or raising counts as a failure; anything else
+            (including ``None``) as delivered.
+        concurrency: Maximum number of sends in flight.
+        timeout: Per-recipient timeout in seconds, or ``None`` for no limit.
+
+    Returns:
+        A :class:`BroadcastResult` with the delivered, failed and timed-out counts.
+    """
+    delivered = failed = timed_out = 0
+
+    async def _send_one(recipient: R) -> None:
+        nonlocal delivered, failed, timed_out
+        try:
+            async with asyncio.timeout(timeout):
+                ok = await send(recipient)
+        except TimeoutError:
+            timed_out += 1
+        except Exception as e:
+            logger.debug(f"Broadcast send failed: {e}")
+            failed += 1
+        else:
+            if ok is False:
+                failed += 1
+            else:
+                delivered += 1
+
+    # Snapshot first: connections may come and go while sends are awaited
+    targets = list(recipients)
+    if len(targets) == 1:
+        await _send_one(targets[0])
+        return BroadcastResult(delivered, failed, timed_out)
+
+    iterator = iter(targets)
+
+    async def _worker() -> None:
+        for recipient in iterator:
+            await _send_one(recipient)
+
+    # Workers share one iterator, so there are never more than `concurrency`
+    # tasks however many recipients there are.
+    workers = min(max(concurrency, 1), len(targets))
+    if workers:
+        await asyncio.gather(*(_worker() for _ in range(workers)))
+    return BroadcastResult(delivered, failed, timed_out)
@@ -0,0 +1,250 @@
+"""Bounded, prioritized queue for deferred broadcasts."""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from enum import IntEnum, StrEnum
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+# Messages held before the overflow policy applies
+DEFAULT_QUEUE_SIZE = 10_000
+
+# Messages taken from the queue per drain
+DEFAULT_BATCH_SIZE = 1_000
+
+
+class Priority(IntEnum):
+    """Broadcast priority lanes; higher lanes are drained first."""
+
+    LOW = 0
+    NORMAL = 1
+    HIGH = 2
+
+
+class OverflowPolicy(StrEnum):
+    """What a full queue does with a new message."""
+
+    DROP_OLDEST = "drop_oldest"
+    """Evict the oldest message of the lowest lane at or below the new one's priority."""
+
+    DROP_NEWEST = "drop_newest"
+    """Reject the new message."""
+
+    ERROR = "error"
+    """Raise :class:`asyncio.QueueFull`."""
+
+
+@dataclass
+class QueueStats:
+    """
+    Snapshot of a :class:`BroadcastQueue`'s metrics.
+
+    Attributes:
+        depth: Messages waiting
+        maxsize: Capacity of the queue
+        depth_by_priority: Messages waiting in each lane
+        lag: Seconds the oldest waiting message has been queued
+        max_lag: Longest time any message waited before being taken
+        enqueued: Messages accepted since creation
+        dequeued: Messages taken since creation
+        dropped: Messages discarded by the overflow policy
+        batches: Non-empty drains since creation
+    """
+
+    depth: int
+    maxsize: int
+    depth_by_priority: dict[Priority, int] = field(default_factory=dict)
+    lag: float = 0.0
+    max_lag: float = 0.0
+    enqueued: int = 0
+    dequeued: int = 0
+    dropped: int = 0
+    batches: int = 0
+
+
+class BroadcastQueue(Generic[T]):
+    """
+    Bounded FIFO queue with priority lanes and batch draining.
+
+    Each :class:`Priority` has its own lane.  :meth:`drain` empties the
+    lanes highest first, so an alert queued behind thousands of routine
+    messages is still taken in the next batch.  When the queue is full the
+    :class:`OverflowPolicy` decides what is lost; the queue never grows past
+    *maxsize*.
+
+    Example:
+        ```python
+        queue = BroadcastQueue(maxsize=1000, overflow=OverflowPolicy.DROP_OLDEST)
+        queue.put_nowait(message)
+        queue.put_nowait(alert, Priority.HIGH)
+
+        await queue.wait()
+        batch = queue.drain()  # [alert, message]
+        ```
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_QUEUE_SIZE,
+        overflow: OverflowPolicy | str = OverflowPolicy.DROP_OLDEST,
+    ):
+        """
+        Initialize the queue.
+
+        Args:
+            maxsize: Maximum number of waiting messages
+            overflow: Policy applied when a message arrives at a full queue
+
+        Raises:
+            ValueError: If maxsize is less than 1 or overflow is unknown
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.overflow = OverflowPolicy(overflow)
+        self._lanes: dict[Priority, deque[tuple[float, T]]] = {p: deque() for p in Priority}
+        # Highest lane first
+        self._drain_order = sorted(Priority, reverse=True)
+        self._size = 0
+        self._ready = asyncio.Event()
+        self._enqueued = 0
+        self._dequeued = 0
+        self._dropped = 0
+        self._batches = 0
+        self._max_lag = 0.0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def qsize(self) -> int:
+        """Number of waiting messages."""
+        return self._size
+
+    def empty(self) -> bool:
+        """Whether no message is waiting."""
+        return self._size == 0
+
+    def full(self) -> bool:
+        """Whether the next message will trigger the overflow policy."""
+        return self._size >= self.maxsize
+
+    def put_nowait(self, item: T, priority: Priority | int = Priority.NORMAL) -> bool:
+        """
+        Add a message to its priority lane.
+
+        Args:
+            item: The message
+            priority: Lane to queue it in
+
+        Returns:
+            True if the message was queued, False if the overflow policy
+            dropped it.
+
+        Raises:
+            asyncio.QueueFull: If the queue is full and the policy is ``ERROR``
+        """
+        priority = Priority(priority)
+        if self._size >= self.maxsize:
+            if self.overflow is OverflowPolicy.ERROR:
+                raise asyncio.QueueFull
+            if self.overflow is OverflowPolicy.DROP_NEWEST or not self._evict(priority):
+                self._dropped += 1
+                return False
+
+        self._lanes[priority].append((time.monotonic(), item))
+        self._size += 1
+        self._enqueued += 1
+        self._ready.set()
+        return True
+
+    def get_nowait(self) -> T:
+        """
+        Remove and return the next message.
+
+        Raises:
+            asyncio.QueueEmpty: If no message is waiting
+        """
+        for priority in self._drain_order:
+            lane = self._lanes[priority]
+            if lane:
+                return self._pop(lane, time.monotonic())
+        raise asyncio.QueueEmpty
+
+    def drain(self, limit: int | None = None) -> list[T]:
+        """
+        Remove and return the waiting messages, highest lane first.
+
+        Args:
+            limit: Maximum number of messages to take (default: all)
+
+        Returns:
+            The messages in delivery order; empty if none are waiting.
+        """
+        remaining = self._size if limit is None else min(limit, self._size)
+        batch: list[T] = []
+        now = time.monotonic()
+        for priority in self._drain_order:
+            lane = self._lanes[priority]
+            while lane and remaining:
+                batch.append(self._pop(lane, now))
+                remaining -= 1
+        if batch:
+            self._batches += 1
+        return batch
+
+    async def wait(self) -> None:
+        """Wait until at least one message is queued."""
+        while not self._size:
+            self._ready.clear()
+            await self._ready.wait()
+
+    def depth(self, priority: Priority | int | None = None) -> int:
+        """Number of waiting messages, in total or in one lane."""
+        if priority is None:
+            return self._size
+        return len(self._lanes[Priority(priority)])
+
+    @property
+    def lag(self) -> float:
+        """Seconds the oldest waiting message has been queued (0 when empty)."""
+        heads = [lane[0][0] for lane in self._lanes.values() if lane]
+        if not heads:
+            return 0.0
+        return time.monotonic() - min(heads)
+
+    def stats(self) -> QueueStats:
+        """Return a snapshot of the queue's depth, lag and counters."""
+        return QueueStats(
+            depth=self._size,
+            maxsize=self.maxsize,
+            depth_by_priority={p: len(lane) for p, lane in self._lanes.items()},
+            lag=self.lag,
+            max_lag=self._max_lag,
+            enqueued=self._enqueued,
+            dequeued=self._dequeued,
+            dropped=self._dropped,
+            batches=self._batches,
+        )
+
+    def _pop(self, lane: deque[tuple[float, T]], now: float) -> T:
+        enqueued_at, item = lane.popleft()
+        self._size -= 1
+        self._dequeued += 1
+        self._max_lag = max(self._max_lag, now - enqueued_at)
+        return item
+
+    def _evict(self, priority: Priority) -> bool:
+        """Drop the oldest message of the lowest lane not above *priority*."""
+        for lane_priority in Priority:
+            if lane_priority > priority:
+                break
+            lane = self._lanes[lane_priority]
+            if lane:
+                lane.popleft()
+                self._size -= 1
+                self._dropped += 1
+                return True
+        return False
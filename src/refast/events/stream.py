@@ -2,13 +2,22 @@
 
 import logging
 import uuid
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Iterable
 from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
+from types import EllipsisType
 from typing import TYPE_CHECKING, Any
 
 from fastapi import WebSocket, WebSocketDisconnect
 
+from refast.events.channels import ChannelIndex, channel_matches, is_pattern, split_channel
+from refast.events.fanout import (
+    DEFAULT_FANOUT_CONCURRENCY,
+    DEFAULT_SEND_TIMEOUT,
+    BroadcastResult,
+    encode_frame,
+    fan_out,
+)
 from refast.events.types import Event
 
 if TYPE_CHECKING:
@@ -31,6 +40,7 @@ class WebSocketConnection:
         subscriptions: Set of channels the connection is subscribed to
         connected: Whether the connection is active
         metadata: Additional connection metadata
+        context: The Refast ``Context`` serving this connection, if any
     """
 
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
@@ -39,13 +49,17 @@ class WebSocketConnection:
     subscriptions: set[str] = field(default_factory=set)
     connected: bool = False
     metadata: dict[str, Any] = field(default_factory=dict)
+    context: Any = field(default=None, repr=False, compare=False)
+    # The stream this connection is registered with; keeps its channel index current
+    _stream: "EventStream | None" = field(default=None, repr=False, compare=False)
 
-    async def send(self, data: dict[str, Any]) -> bool:
+    async def send(self, data: dict[str, Any] | str) -> bool:
         """
         Send data to the client.
 
         Args:
-            data: The data to send
+            data: The data to send, or a frame already encoded with
+                :func:`~refast.events.fanout.encode_frame`
 
         Returns:
             True if successful, False otherwise
@@ -54,7 +68,10 @@ class WebSocketConnection:
             return False
 
         try:
-            await self.websocket.send_json(data)
+            if isinstance(data, str):
+                await self.websocket.send_text(data)
+            else:
+                await self.websocket.send_json(data)
             return True
         except Exception as e:
             logger.error(f"Error sending to connection {self.id}: {e}")
@@ -78,18 +95,31 @@ class WebSocketConnection:
         Subscribe to an event channel.
 
         Args:
-            channel: The channel name
+            channel: The channel name, or a pattern such as ``"room:*"``
+                (see :mod:`refast.events.channels`)
+
+        Raises:
+            ValueError: If the pattern is malformed.
         """
+        split_channel(channel)
+        if channel in self.subscriptions:
+            return
         self.subscriptions.add(channel)
+        if self._stream is not None:
+            self._stream._channels.add(channel, self.id)
 
     def unsubscribe(self, channel: str) -> None:
         """
         Unsubscribe from an event channel.
 
         Args:
-            channel: The channel name
+            channel: The channel name or pattern passed to :meth:`subscribe`
         """
+        if channel not in self.subscriptions:
+            return
         self.subscriptions.discard(channel)
+        if self._stream is not None:
+            self._stream._channels.discard(channel, self.id)
 
     def is_subscribed(self, channel: str) -> bool:
         """
@@ -99,9 +129,15 @@ class WebSocketConnection:
             channel: The channel name
 
         Returns:
-            True if subscribed
+            True if subscribed, directly or through a wildcard pattern
         """
-        return channel in self.subscriptions
+        if channel in self.subscriptions:
+            return True
+        return any(
+            channel_matches(pattern, channel)
+            for pattern in self.subscriptions
+            if is_pattern(pattern)
+        )
 
 
 class EventStream:
@@ -123,16 +159,32 @@ class EventStream:
         ```
     """
 
-    def __init__(self, app: "RefastApp | None" = None):
+    def __init__(
+        self,
+        app: "RefastApp | None" = None,
+        *,
+        send_concurrency: int = DEFAULT_FANOUT_CONCURRENCY,
+        send_timeout: float | None = DEFAULT_SEND_TIMEOUT,
+    ):
         """
         Initialize the event stream.
 
         Args:
             app: Optional RefastApp instance
+            send_concurrency: Maximum concurrent sends when one message goes
+                to many connections
+            send_timeout: Seconds a connection may take to accept a message
+                before it is skipped, or ``None`` to wait indefinitely
         """
         self.app = app
+        self.send_concurrency = send_concurrency
+        self.send_timeout = send_timeout
         self._connections: dict[str, WebSocketConnection] = {}
         self._session_connections: dict[str, set[str]] = {}
+        # WebSocket object -> its connection
+        self._websocket_connections: dict[Any, WebSocketConnection] = {}
+        # Channel -> ids of subscribed connections
+        self._channels: ChannelIndex[str] = ChannelIndex()
 
     @property
     def connection_count(self) -> int:
@@ -151,6 +203,18 @@ class EventStream:
         """
         return self._connections.get(connection_id)
 
+    def get_websocket_connection(self, websocket: Any) -> WebSocketConnection | None:
+        """
+        Get the connection registered for a WebSocket object.
+
+        Args:
+            websocket: The WebSocket
+
+        Returns:
+            The connection or None
+        """
+        return self._websocket_connections.get(websocket)
+
     def get_session_connections(self, session_id: str) -> list[WebSocketConnection]:
         """
         Get all connections for a session.
@@ -173,6 +237,63 @@ class EventStream:
         """
         return list(self._connections.values())
 
+    def get_subscribers(self, channel: str) -> list[WebSocketConnection]:
+        """
+        Get the connections subscribed to a channel.
+
+        Looks the channel up in an index, so the cost depends on the number
+        of subscribers, not the number of connections.
+
+        Args:
+            channel: The channel name
+
+        Returns:
+            Connections subscribed to *channel* directly or via a pattern
+        """
+        connections = self._connections
+        return [connections[cid] for cid in self._channels.match(channel) if cid in connections]
+
+    def add_connection(self, conn: WebSocketConnection) -> None:
+        """
+        Register a connection with this stream.
+
+        Indexes its session and any channels it is already subscribed to;
+        later :meth:`WebSocketConnection.subscribe` calls update the index
+        directly.
+
+        Args:
+            conn: The connection to register
+        """
+        self._connections[conn.id] = conn
+        conn._stream = self
+        if conn.websocket is not None:
+            self._websocket_connections[conn.websocket] = conn
+        if conn.session_id:
+            self._session_connections.setdefault(conn.session_id, set()).add(conn.id)
+        for channel in conn.subscriptions:
+            self._channels.add(channel, conn.id)
+
+    def remove_connection(self, conn: WebSocketConnection) -> None:
+        """
+        Unregister a connection and drop it from the session and channel indexes.
+
+        Args:
+            conn: The connection to remove
+        """
+        self._connections.pop(conn.id, None)
+        if conn.websocket is not None and self._websocket_connections.get(conn.websocket) is conn:
+            del self._websocket_connections[conn.websocket]
+        if conn._stream is self:
+            conn._stream = None
+        if conn.session_id:
+            session = self._session_connections.get(conn.session_id)
+            if session is not None:
+                session.discard(conn.id)
+                if not session:
+                    del self._session_connections[conn.session_id]
+        for channel in conn.subscriptions:
+            self._channels.discard(channel, conn.id)
+
     @asynccontextmanager
     async def connection(
         self, websocket: WebSocket, session_id: str | None = None
@@ -204,12 +325,7 @@ class EventStream:
             await websocket.accept()
             conn.connected = True
 
-            # Register connection
-            self._connections[conn.id] = conn
-            if session_id:
-                if session_id not in self._session_connections:
-                    self._session_connections[session_id] = set()
-                self._session_connections[session_id].add(conn.id)
+            self.add_connection(conn)
 
             logger.info(f"WebSocket connected: {conn.id}")
             yield conn
@@ -221,9 +337,7 @@ class EventStream:
         finally:
             # Cleanup
             conn.connected = False
-            self._connections.pop(conn.id, None)
-            if session_id and session_id in self._session_connections:
-                self._session_connections[session_id].discard(conn.id)
+            self.remove_connection(conn)
             logger.info(f"WebSocket cleaned up: {conn.id}")
 
     async def receive(self, conn: WebSocketConnection) -> AsyncIterator[dict[str, Any]]:
@@ -259,7 +373,7 @@ class EventStream:
         self,
         session_id: str,
         data: dict[str, Any],
-    ) -> int:
+    ) -> BroadcastResult:
         """
         Send data to all connections for a session.
 
@@ -270,20 +384,13 @@ class EventStream:
         Returns:
             Number of successful sends
         """
-        connections = self.get_session_connections(session_id)
-        success_count = 0
-
-        for conn in connections:
-            if await conn.send(data):
-                success_count += 1
-
-        return success_count
+        return await self.fan_out(self.get_session_connections(session_id), data)
 
     async def send_to_subscribers(
         self,
         channel: str,
         data: dict[str, Any],
-    ) -> int:
+    ) -> BroadcastResult:
         """
         Send data to all connections subscribed to a channel.
 
@@ -294,16 +401,9 @@ class EventStream:
         Returns:
             Number of successful sends
         """
-        success_count = 0
+        return await self.fan_out(self.get_subscribers(channel), data)
 
-        for conn in self._connections.values():
-            if conn.is_subscribed(channel):
-                if await conn.send(data):
-                    success_count += 1
-
-        return success_count
-
-    async def broadcast(self, data: dict[str, Any]) -> int:
+    async def broadcast(self, data: dict[str, Any]) -> BroadcastResult:
         """
         Broadcast data to all connected clients.
 
@@ -313,10 +413,36 @@ class EventStream:
         Returns:
             Number of successful sends
         """
-        success_count = 0
+        return await self.fan_out(self._connections.values(), data)
+
+    async def fan_out(
+        self,
+        connections: Iterable[WebSocketConnection],
+        data: dict[str, Any],
+        *,
+        timeout: float | None | EllipsisType = ...,
+    ) -> BroadcastResult:
+        """
+        Send *data* to *connections* concurrently.
 
-        for conn in self._connections.values():
-            if await conn.send(data):
-                success_count += 1
+        *data* is encoded once and the same frame is sent to every
+        connection. Uses this stream's ``send_concurrency`` and
+        ``send_timeout``.
 
-        return success_count
+        Args:
+            connections: The recipients
+            data: The data to send
+            timeout: Seconds each connection may take to accept the message,
+                overriding ``send_timeout``; ``None`` waits indefinitely
+
+        Returns:
+            A :class:`~refast.events.fanout.BroadcastResult`; as an ``int``
+            it is the number of successful sends.
+        """
+        frame = encode_frame(data)
+        return await fan_out(
+            connections,
+            lambda conn: conn.send(frame),
+            concurrency=self.send_concurrency,
+            timeout=self.send_timeout if timeout is ... else timeout,
+        )
@@ -5,6 +5,7 @@ from refast.models.messages import (
     ClientMessage,
     EventMessage,
     NavigateMessage,
+    PrefetchMessage,
     StoreInitMessage,
     StoreSyncMessage,
     client_message_adapter,
@@ -15,6 +16,7 @@ __all__ = [
     "ClientMessage",
     "EventMessage",
     "NavigateMessage",
+    "PrefetchMessage",
     "StoreInitMessage",
     "StoreSyncMessage",
     "client_message_adapter",
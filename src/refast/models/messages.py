@@ -30,6 +30,8 @@ class StoreInitMessage(BaseMessage):
     type: Literal["store_init"]
     data: dict[str, Any] = Field(default_factory=dict)
     path: str = "/"
+    # Fingerprint of the page tree inlined in the HTML shell, if any
+    rendered: str | None = None
 
 
 class NavigateMessage(BaseMessage):
@@ -39,6 +41,13 @@ class NavigateMessage(BaseMessage):
     path: str = "/"
 
 
+class PrefetchMessage(BaseMessage):
+    """Payload for speculatively rendering a page before navigation."""
+
+    type: Literal["prefetch"]
+    path: str = "/"
+
+
 class EventMessage(BaseMessage):
     """Payload for custom event."""
 
@@ -55,7 +64,12 @@ class StoreSyncMessage(BaseMessage):
 
 
 ClientMessage = Annotated[
-    CallbackMessage | StoreInitMessage | NavigateMessage | EventMessage | StoreSyncMessage,
+    CallbackMessage
+    | StoreInitMessage
+    | NavigateMessage
+    | PrefetchMessage
+    | EventMessage
+    | StoreSyncMessage,
     Field(discriminator="type"),
 ]
 
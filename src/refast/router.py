@@ -1,6 +1,7 @@
 """FastAPI router integration for Refast."""
 
 import asyncio
+import gzip
 import inspect
 import logging
 import re
@@ -19,16 +20,24 @@ from fastapi import (
     WebSocket,
     WebSocketDisconnect,
 )
-from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, Response
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 
 from refast.assets import (
+    IMMUTABLE_CACHE_CONTROL,
     STATIC_DIR,
-    render_html_shell,
+    EncodedBody,
+    StaticAsset,
+    get_html_shell,
+    get_static_index,
+    inline_initial_tree,
+    tree_fingerprint,
 )
 from refast.assets import (
     UNSAFE_CONTENT_TYPES as _UNSAFE_CONTENT_TYPES,
 )
+from refast.events.stream import WebSocketConnection
 from refast.models.messages import client_message_adapter
+from refast.utils.ids import deterministic_ids
 
 if TYPE_CHECKING:
     from refast.app import RefastApp
@@ -37,6 +46,7 @@ if TYPE_CHECKING:
         CallbackMessage,
         EventMessage,
         NavigateMessage,
+        PrefetchMessage,
         StoreInitMessage,
     )
 
@@ -149,15 +159,17 @@ class RefastRouter:
         self.app = app
         self.api_router = APIRouter()
         # Track contexts per WebSocket connection to preserve state
-        self._websocket_contexts: dict[WebSocket, Context] = {}
         # Dispatch table: message type → handler coroutine method
         self._message_dispatch = {
             "callback": self._on_callback,
             "store_init": self._on_store_init,
             "navigate": self._on_navigate,
+            "prefetch": self._on_prefetch,
             "event": self._on_event,
         }
         self._setup_routes()
+        # Index the built client once up front rather than on the first request
+        get_static_index(STATIC_DIR)
 
     def _setup_routes(self) -> None:
         """Set up all routes."""
@@ -211,91 +223,48 @@ class RefastRouter:
         )
 
     async def _static_handler(self, request: Request, filename: str) -> Response:
-        """Serve static files, with support for pre-compressed variants."""
-        file_path = STATIC_DIR / filename
-
-        # Prevent path traversal: resolved path must stay inside STATIC_DIR.
-        try:
-            file_path.resolve().relative_to(STATIC_DIR.resolve())
-        except ValueError:
-            return HTMLResponse(content="Not Found", status_code=404)
-
-        if not file_path.exists() or not file_path.is_file():
+        """Serve static files from the in-memory asset index."""
+        # Index keys are relative paths of files inside STATIC_DIR, so a
+        # traversal attempt simply finds nothing.
+        asset = get_static_index(STATIC_DIR).get(filename, revalidate=self.app.debug)
+        if asset is None:
             return HTMLResponse(content="Not Found", status_code=404)
+        return self._asset_response(request, asset)
 
-        # Determine content type
-        content_type = "application/octet-stream"
-        suffix = file_path.suffix.lower()
-        if suffix == ".js":
-            content_type = "application/javascript"
-        elif suffix == ".css":
-            content_type = "text/css"
-        elif suffix == ".html":
-            content_type = "text/html"
-        elif suffix == ".json":
-            content_type = "application/json"
-        elif suffix == ".svg":
-            content_type = "image/svg+xml"
-        elif suffix in (".png", ".jpg", ".jpeg", ".gif", ".webp"):
-            content_type = f"image/{suffix[1:]}"
-
-        # Try pre-compressed variant if the browser supports it
-        accept_encoding = request.headers.get("accept-encoding", "")
-        if suffix in (".js", ".css", ".json", ".svg", ".html"):
-            if "br" in accept_encoding:
-                br_path = file_path.with_suffix(file_path.suffix + ".br")
-                if br_path.is_file():
-                    return Response(
-                        content=br_path.read_bytes(),
-                        media_type=content_type,
-                        headers={
-                            "Content-Encoding": "br",
-                            "Vary": "Accept-Encoding",
-                        },
-                    )
-            if "gzip" in accept_encoding:
-                gz_path = file_path.with_suffix(file_path.suffix + ".gz")
-                if gz_path.is_file():
-                    return Response(
-                        content=gz_path.read_bytes(),
-                        media_type=content_type,
-                        headers={
-                            "Content-Encoding": "gzip",
-                            "Vary": "Accept-Encoding",
-                        },
-                    )
-
-        return FileResponse(file_path, media_type=content_type)
-
-    async def _extension_static_handler(self, extension_name: str, filename: str) -> FileResponse:
+    async def _extension_static_handler(
+        self, request: Request, extension_name: str, filename: str
+    ) -> Response:
         """Serve static files from extensions."""
         extension = self.app.get_extension(extension_name)
 
         if extension is None:
             return HTMLResponse(content=f"Extension not found: {extension_name}", status_code=404)
 
-        file_path = extension.get_static_file_path(filename)
+        index = self.app._extension_assets.get(extension_name)
+        asset = index.get(filename, revalidate=self.app.debug) if index is not None else None
 
-        if file_path is None:
+        if asset is None:
             return HTMLResponse(content=f"File not found: {filename}", status_code=404)
-
-        # Determine content type
-        content_type = "application/octet-stream"
-        suffix = file_path.suffix.lower()
-        if suffix == ".js":
-            content_type = "application/javascript"
-        elif suffix == ".css":
-            content_type = "text/css"
-        elif suffix == ".html":
-            content_type = "text/html"
-        elif suffix == ".json":
-            content_type = "application/json"
-        elif suffix == ".svg":
-            content_type = "image/svg+xml"
-        elif suffix in (".png", ".jpg", ".jpeg", ".gif", ".webp"):
-            content_type = f"image/{suffix[1:]}"
-
-        return FileResponse(file_path, media_type=content_type)
+        return self._asset_response(request, asset)
+
+    def _asset_response(self, request: Request, asset: StaticAsset) -> Response:
+        """Build the response for an indexed static file, honouring If-None-Match."""
+        body, encoding, etag = asset.select(request.headers.get("accept-encoding", ""))
+        fingerprinted = request.query_params.get("v") == asset.version
+        headers = {
+            "ETag": etag,
+            "Last-Modified": asset.last_modified,
+            "Cache-Control": (
+                IMMUTABLE_CACHE_CONTROL if asset.immutable or fingerprinted else "no-cache"
+            ),
+        }
+        if asset.compressible:
+            headers["Vary"] = "Accept-Encoding"
+        if asset.matches(request.headers.get("if-none-match")):
+            return Response(status_code=304, headers=headers)
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type=asset.content_type, headers=headers)
 
     async def _upload_handler(
         self,
@@ -429,10 +398,8 @@ class RefastRouter:
             },
         )
 
-    async def _page_handler(self, request: Request, path: str = "") -> HTMLResponse:
-        """Handle page requests."""
-        from refast.context import Context
-
+    async def _page_handler(self, request: Request, path: str = "") -> Response:
+        """Handle page requests by serving the cached HTML shell."""
         # Normalize path
         page_path = f"/{path}" if not path.startswith("/") else path
         if page_path != "/" and page_path.endswith("/"):
@@ -446,20 +413,100 @@ class RefastRouter:
         if page_func is None:
             return HTMLResponse(content="<h1>404 - Page Not Found</h1>", status_code=404)
 
-        # Do NOT call page_func here — components are created (and random IDs
-        # assigned) only after the WebSocket connects via the store_init /
-        # page_render flow.  Calling it twice caused a visible blink because
-        # the initial tree (with one set of IDs) was immediately replaced by
-        # the post-WebSocket tree (with a fresh set of IDs).
+        # By default page_func is NOT called here — components are created only
+        # after the WebSocket connects via the store_init / page_render flow.
+        # Calling it twice with random IDs caused a visible blink because the
+        # initial tree was immediately replaced by one with fresh IDs; the
+        # inline_initial_tree mode avoids that with deterministic IDs.
+        shell = get_html_shell(self.app)
+        accept_encoding = request.headers.get("accept-encoding", "")
+        document: EncodedBody = shell
+        if self.app.inline_initial_tree:
+            # Hint the assets first: they download while the page renders
+            if shell.links:
+                await self._send_early_hints(request, shell.links)
+            tree = await self._render_initial_tree(request, page_func, page_path, _path_params)
+            if tree is not None:
+                identity = inline_initial_tree(shell.html, tree).encode("utf-8")
+                compressed = (
+                    gzip.compress(identity, compresslevel=6, mtime=0)
+                    if "gzip" in accept_encoding
+                    else None
+                )
+                document = EncodedBody(identity, gzip=compressed)
+
+        body, encoding, etag = document.select(accept_encoding)
+        headers = {
+            "ETag": etag,
+            # The inline tree may depend on the user; keep it out of shared caches
+            "Cache-Control": "no-cache" if document is shell else "private, no-cache",
+            "Vary": "Accept-Encoding",
+        }
+        if document.matches(request.headers.get("if-none-match")):
+            return Response(status_code=304, headers=headers)
+        if shell.links:
+            if not self.app.inline_initial_tree:
+                await self._send_early_hints(request, shell.links)
+            # Also sent on the final response for servers and proxies without
+            # 103 support; CDNs commonly turn this header into Early Hints.
+            headers["Link"] = shell.link_header
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type="text/html; charset=utf-8", headers=headers)
+
+    async def _render_initial_tree(
+        self,
+        request: Request,
+        page_func: Callable[..., Any],
+        page_path: str,
+        path_params: dict[str, Any],
+    ) -> dict[str, Any] | None:
+        """Render a page for inlining in the HTML shell.
+
+        Returns:
+            The component tree, or ``None`` if the page failed to render (the
+            client then waits for ``page_render`` as usual).
+        """
+        from refast.context import Context
+
         ctx = Context(request=request, app=self.app)
-        ctx._query_params = dict(request.query_params)
-        ctx._query_string = str(request.url.query)
-        ctx._path_params = _path_params
-        html = self._render_html_shell(None, ctx)
-        return HTMLResponse(content=html)
+        query = request.url.query
+        ctx._current_path, ctx._query_params, ctx._query_string = _parse_url(
+            f"{page_path}?{query}" if query else page_path
+        )
+        ctx._path_params = path_params
+        try:
+            with deterministic_ids():
+                component = await self._execute_page_func(page_func, ctx, page_path)
+                return ctx._render_page(component)
+        except Exception as e:
+            logger.debug(f"Inline render of {page_path} failed: {e}", exc_info=True)
+            return None
+
+    async def _send_early_hints(self, request: Request, links: list[str]) -> None:
+        """Send a ``103 Early Hints`` response if the ASGI server supports it.
+
+        Uses the ``http.response.early_hint`` ASGI extension (e.g. Hypercorn);
+        servers without it only get the ``Link`` header on the final response.
+        """
+        if "http.response.early_hint" not in request.scope.get("extensions", {}):
+            return
+        send = getattr(request, "_send", None)
+        if send is None:
+            return
+        try:
+            await send(
+                {
+                    "type": "http.response.early_hint",
+                    "links": [link.encode("latin-1") for link in links],
+                }
+            )
+        except Exception as e:
+            logger.debug(f"Early hints not sent: {e}")
 
+    @staticmethod
     async def _execute_page_func(
-        self, page_func: Callable[..., Any], ctx: "Context", page_path: str
+        page_func: Callable[..., Any], ctx: "Context", page_path: str
     ) -> Any:
         """Invoke a page function and reject unsupported return values."""
         component = page_func(ctx)
@@ -510,13 +557,28 @@ class RefastRouter:
         component = await self._execute_page_func(page_func, ctx, page_path)
 
         # Return component tree as JSON
-        component_data = component.render() if hasattr(component, "render") else {}
+        component_data = ctx._render_page(component)
         return JSONResponse(content=component_data)
 
     @property
     def active_contexts(self) -> list["Context"]:
         """Get all active WebSocket contexts."""
-        return list(self._websocket_contexts.values())
+        return [
+            conn.context
+            for conn in self.app.stream._connections.values()
+            if conn.context is not None
+        ]
+
+    def _register_context(self, websocket: WebSocket, ctx: "Context") -> None:
+        """Add *ctx* to the app's connection registry under *websocket*."""
+        conn = WebSocketConnection(
+            websocket=websocket,
+            session_id=websocket.cookies.get(self.app.session_cookie_name),
+            connected=True,
+            context=ctx,
+        )
+        ctx._connection = conn
+        self.app.stream.add_connection(conn)
 
     async def _websocket_handler(self, websocket: WebSocket) -> None:
         """Handle WebSocket connections for real-time updates."""
@@ -529,7 +591,20 @@ class RefastRouter:
         from refast.context import Context
 
         ctx = Context(websocket=websocket, app=self.app)
-        self._websocket_contexts[websocket] = ctx
+        self._register_context(websocket, ctx)
+
+        if self.app.backplane is not None and not self.app.backplane.started:
+            try:
+                await self.app.backplane.start()
+            except Exception as e:
+                logger.error(f"Failed to start backplane: {e}")
+
+        if self.app.sessions is not None and ctx.session_id:
+            # Loaded once here; callbacks then use it without store round trips
+            try:
+                ctx._session = await self.app.sessions.acquire(ctx.session_id)
+            except Exception as e:
+                logger.error(f"Failed to load session: {e}")
 
         try:
             while True:
@@ -566,21 +641,32 @@ class RefastRouter:
                     # Process other messages normally
                     await self._handle_websocket_message(websocket, message)
         except WebSocketDisconnect:
+            pass
+        finally:
             # Clean up context when WebSocket disconnects
-            self._websocket_contexts.pop(websocket, None)
+            if ctx._connection is not None:
+                ctx._connection.connected = False
+                self.app.stream.remove_connection(ctx._connection)
+            ctx._clear_bindings()
+            ctx._cancel_prefetches()
+            if self.app.snapshots is not None:
+                await self.app.snapshots.release(ctx)
+            if self.app.sessions is not None and ctx._session is not None:
+                await self.app.sessions.release(ctx._session)
 
     async def _handle_websocket_message(self, websocket: WebSocket, message: Any) -> None:
         """Dispatch an incoming WebSocket message to the appropriate handler."""
         message_type = message.type
 
         # Get the persistent context for this WebSocket connection
-        ctx = self._websocket_contexts.get(websocket)
+        conn = self.app.stream.get_websocket_connection(websocket)
+        ctx = conn.context if conn is not None else None
         if ctx is None:
             # Fallback: create a new context if not found (shouldn't happen)
             from refast.context import Context
 
             ctx = Context(websocket=websocket, app=self.app)
-            self._websocket_contexts[websocket] = ctx
+            self._register_context(websocket, ctx)
 
         handler = self._message_dispatch.get(message_type)
         if handler is not None:
@@ -733,6 +819,9 @@ class RefastRouter:
                     await websocket.send_json({"type": "page_render", "component": component_data})
                 elif message_type in ("callback", "event"):
                     await ctx.show_toast(message="Internal Server Error", variant="destructive")
+            finally:
+                if self.app.snapshots is not None:
+                    self.app.snapshots.mark(ctx)
 
     async def _on_callback(
         self, ctx: "Context", websocket: WebSocket, message: "CallbackMessage"
@@ -750,6 +839,7 @@ class RefastRouter:
                     callback, event_data_raw, callback_data
                 )
                 await callback(ctx, **kwargs)
+                await ctx.state.flush()
                 await ctx.sync_store()
             except Exception as exc:
                 error_handler = ctx.get_callback_error_handler(callback_id)
@@ -785,6 +875,9 @@ class RefastRouter:
         """Handle a ``store_init`` message: load browser storage then render the page."""
         store_data = message.data
         ctx._load_store_from_browser(store_data)
+        if self.app.snapshots is not None and ctx._snapshot_id is None:
+            # Pick up where the tab's previous connection (on any worker) left off
+            await self.app.snapshots.restore(ctx)
 
         raw_path = message.path
         pathname, query_params, query_string = _parse_url(raw_path)
@@ -798,9 +891,18 @@ class RefastRouter:
             page_func = self.app._pages.get("/")
         if page_func is not None:
             ctx.clear_callbacks()
-            component = await self._execute_page_func(page_func, ctx, pathname)
-            component_data = component.render() if hasattr(component, "render") else {}
-            await websocket.send_json({"type": "page_render", "component": component_data})
+            if self.app.inline_initial_tree:
+                # Same IDs as the tree inlined in the HTML shell
+                with deterministic_ids():
+                    component = await self._execute_page_func(page_func, ctx, pathname)
+                    component_data = ctx._render_page(component)
+            else:
+                component = await self._execute_page_func(page_func, ctx, pathname)
+                component_data = ctx._render_page(component)
+            # The client already shows an identical inline tree: only storage
+            # needed reconciling, so skip re-sending the page.
+            if message.rendered is None or message.rendered != tree_fingerprint(component_data):
+                await websocket.send_json({"type": "page_render", "component": component_data})
 
         await websocket.send_json({"type": "store_ready"})
 
@@ -809,6 +911,13 @@ class RefastRouter:
     ) -> None:
         """Handle a ``navigate`` message: render the page for the requested path."""
         raw_path = message.path
+        await ctx._wait_for_prefetch(raw_path)
+        component = ctx._take_prefetched(raw_path, replace_callbacks=True)
+        if component is not None:
+            component_data = ctx._render_page(component)
+            await websocket.send_json({"type": "page_render", "component": component_data})
+            return
+
         pathname, query_params, query_string = _parse_url(raw_path)
         ctx._current_path = pathname
         ctx._query_params = query_params
@@ -821,9 +930,16 @@ class RefastRouter:
         if page_func is not None:
             ctx.clear_callbacks()
             component = await self._execute_page_func(page_func, ctx, pathname)
-            component_data = component.render() if hasattr(component, "render") else {}
+            component_data = ctx._render_page(component)
             await websocket.send_json({"type": "page_render", "component": component_data})
 
+    async def _on_prefetch(
+        self, ctx: "Context", websocket: WebSocket, message: "PrefetchMessage"
+    ) -> None:
+        """Handle a ``prefetch`` message: render a page ahead of navigation."""
+        # In the background, so that the receive loop is not held up
+        ctx._prefetch_later(message.path)
+
     async def _on_event(
         self, ctx: "Context", websocket: WebSocket, message: "EventMessage"
     ) -> None:
@@ -831,5 +947,5 @@ class RefastRouter:
         await self.app.events.emit(message.event_type, message.data, ctx=ctx)
 
     def _render_html_shell(self, component, ctx):
-        """Render the HTML shell. Delegates to render_html_shell(self.app)."""
-        return render_html_shell(self.app)
+        """Return the (cached) HTML shell document for this app."""
+        return get_html_shell(self.app).html
@@ -0,0 +1,250 @@
+"""Page route matching.
+
+Parameterised page paths such as ``/users/{id:int}/posts/{slug}`` are compiled
+into a segment trie so that finding the handler for a URL costs time
+proportional to the number of path segments rather than the number of
+registered routes.
+
+Supported parameter types:
+
+- ``{name}`` / ``{name:str}`` — one path segment
+- ``{name:int}`` — digits, coerced to ``int``
+- ``{name:float}`` — digits and dots, coerced to ``float``
+- ``{name:uuid}`` — a canonical UUID string
+- ``{name:path}`` — the rest of the path, slashes included
+
+When several patterns match the same URL the one registered first wins,
+exactly as if the patterns were tried one after another.
+"""
+
+import re
+from collections.abc import Callable
+from typing import Any
+
+PARAM_RE = re.compile(r"\{(\w+)(?::(\w+))?\}")
+
+PARAM_TYPES: dict[str, type] = {
+    "int": int,
+    "float": float,
+    "str": str,
+    "uuid": str,
+    "path": str,
+}
+
+PARAM_REGEXES: dict[str, str] = {
+    "int": r"\d+",
+    "float": r"[\d.]+",
+    "str": r"[^/]+",
+    "uuid": r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}",
+    "path": r".+",
+}
+
+_DEFAULT_REGEX = r"[^/]+"
+
+
+def compile_pattern(path: str) -> tuple[re.Pattern[str], dict[str, type]]:
+    """
+    Compile a parameterised page path into a regex with named groups.
+
+    Args:
+        path: A page path containing ``{name}`` / ``{name:type}`` tokens.
+
+    Returns:
+        A ``(compiled_regex, param_types)`` tuple.
+    """
+    regex, names, types = _translate(path, named=True)
+    return re.compile("^" + regex + "$"), dict(zip(names, types, strict=True))
+
+
+def _translate(pattern: str, *, named: bool) -> tuple[str, list[str], list[type]]:
+    """Turn *pattern* into regex source plus the parameter names and types in order."""
+    parts: list[str] = []
+    names: list[str] = []
+    types: list[type] = []
+    last = 0
+    for m in PARAM_RE.finditer(pattern):
+        # Escape static text individually so the {name:type} tokens stay intact
+        parts.append(re.escape(pattern[last : m.start()]))
+        name = m.group(1)
+        type_str = m.group(2) or "str"
+        regex = PARAM_REGEXES.get(type_str, _DEFAULT_REGEX)
+        parts.append(f"(?P<{name}>{regex})" if named else f"({regex})")
+        names.append(name)
+        types.append(PARAM_TYPES.get(type_str, str))
+        last = m.end()
+    parts.append(re.escape(pattern[last:]))
+    return "".join(parts), names, types
+
+
+class _Route:
+    """A registered pattern as stored in the trie."""
+
+    __slots__ = ("index", "handler", "names", "types")
+
+    def __init__(self, index: int, handler: Callable, names: list[str], types: list[type]):
+        self.index = index
+        self.handler = handler
+        self.names = names
+        self.types = types
+
+    def params(self, values: list[str]) -> dict[str, Any]:
+        """Coerce captured *values* to the declared parameter types."""
+        coerced: dict[str, Any] = {}
+        for name, target_type, value in zip(self.names, self.types, values, strict=True):
+            try:
+                coerced[name] = target_type(value)
+            except (ValueError, TypeError):
+                coerced[name] = value
+        return coerced
+
+
+class _Node:
+    """One path segment position in the trie."""
+
+    __slots__ = ("static", "params", "segments", "tails", "route", "min_index")
+
+    def __init__(self) -> None:
+        # Literal segment -> child
+        self.static: dict[str, _Node] = {}
+        # Whole-segment parameters ("{id:int}"), keyed by regex source
+        self.params: dict[str, tuple[re.Pattern[str], _Node]] = {}
+        # Segments mixing text and parameters ("v{major:int}.{minor:int}")
+        self.segments: dict[str, tuple[re.Pattern[str], _Node]] = {}
+        # Patterns containing a {name:path} parameter: regex for the rest of the URL
+        self.tails: list[tuple[re.Pattern[str], _Route]] = []
+        # First route that ends exactly at this node
+        self.route: _Route | None = None
+        # Lowest registration index of any route at or below this node
+        self.min_index: int = -1
+
+    def _lower(self, index: int) -> None:
+        if self.min_index < 0 or index < self.min_index:
+            self.min_index = index
+
+
+class RouteTrie:
+    """
+    Segment trie mapping parameterised page paths to handlers.
+
+    Example:
+        ```python
+        trie = RouteTrie()
+        trie.add("/users/{id:int}", user_page)
+        trie.add("/users/{name}", user_by_name_page)
+
+        trie.match("/users/42")     # (user_page, {"id": 42})
+        trie.match("/users/alice")  # (user_by_name_page, {"name": "alice"})
+        ```
+    """
+
+    def __init__(self) -> None:
+        self._root = _Node()
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, path: str, handler: Callable) -> None:
+        """
+        Register *handler* for the page path *path*.
+
+        Args:
+            path: Page path, possibly containing ``{name:type}`` parameters.
+            handler: The page function.
+        """
+        index = self._count
+        self._count += 1
+
+        node = self._root
+        node._lower(index)
+        segments = path.split("/")
+        names: list[str] = []
+        types: list[type] = []
+        for position, segment in enumerate(segments):
+            tokens = list(PARAM_RE.finditer(segment))
+            if any(m.group(2) == "path" for m in tokens):
+                # Catch-all: match the remainder of the URL in one go
+                rest = "/".join(segments[position:])
+                regex, rest_names, rest_types = _translate(rest, named=False)
+                route = _Route(index, handler, names + rest_names, types + rest_types)
+                node.tails.append((re.compile(regex), route))
+                return
+
+            if not tokens:
+                child = node.static.get(segment)
+                if child is None:
+                    child = node.static[segment] = _Node()
+            else:
+                regex, seg_names, seg_types = _translate(segment, named=False)
+                whole = len(tokens) == 1 and tokens[0].span() == (0, len(segment))
+                table = node.params if whole else node.segments
+                entry = table.get(regex)
+                if entry is None:
+                    entry = table[regex] = (re.compile(regex), _Node())
+                child = entry[1]
+                names.extend(seg_names)
+                types.extend(seg_types)
+            child._lower(index)
+            node = child
+
+        if node.route is None:
+            node.route = _Route(index, handler, names, types)
+
+    def match(self, path: str) -> tuple[Callable | None, dict[str, Any]]:
+        """
+        Find the handler for *path*.
+
+        Returns:
+            A ``(handler, path_params)`` tuple, or ``(None, {})`` when no
+            pattern matches.
+        """
+        found = self._search(self._root, path.split("/"), 0, [], None)
+        if found is None:
+            return None, {}
+        route, values = found
+        return route.handler, route.params(values)
+
+    def _search(
+        self,
+        node: _Node,
+        segments: list[str],
+        position: int,
+        values: list[str],
+        best: tuple[_Route, list[str]] | None,
+    ) -> tuple[_Route, list[str]] | None:
+        """Depth-first search returning the earliest-registered match below *node*."""
+        if position == len(segments):
+            route = node.route
+            if route is not None and (best is None or route.index < best[0].index):
+                return route, list(values)
+            return best
+
+        for regex, route in node.tails:
+            if best is not None and route.index >= best[0].index:
+                continue
+            m = regex.fullmatch("/".join(segments[position:]))
+            if m:
+                best = route, values + list(m.groups())
+
+        segment = segments[position]
+        candidates: list[tuple[_Node, tuple[str, ...]]] = []
+        child = node.static.get(segment)
+        if child is not None:
+            candidates.append((child, ()))
+        for regex, child in node.params.values():
+            if regex.fullmatch(segment):
+                candidates.append((child, (segment,)))
+        for regex, child in node.segments.values():
+            m = regex.fullmatch(segment)
+            if m:
+                candidates.append((child, m.groups()))
+        if len(candidates) > 1:
+            candidates.sort(key=lambda candidate: candidate[0].min_index)
+
+        for child, captured in candidates:
+            if best is not None and child.min_index >= best[0].index:
+                break
+            values.extend(captured)
+            best = self._search(child, segments, position + 1, values, best)
+            del values[len(values) - len(captured) :]
+        return best
@@ -36,6 +36,13 @@ Example:
     ```
 """
 
+from refast.security.backends import (  # noqa: F401
+    MemoryRateLimitBackend,
+    RateLimitBackend,
+    RateLimitResult,
+    RedisRateLimitBackend,
+    SharedMemoryRateLimitBackend,
+)
 from refast.security.csp import ContentSecurityPolicy  # noqa: F401
 from refast.security.csrf import (  # noqa: F401
     CSRFConfig,
@@ -45,6 +52,7 @@ from refast.security.csrf import (  # noqa: F401
 from refast.security.middleware import SecurityMiddleware  # noqa: F401
 from refast.security.rate_limit import (  # noqa: F401
     RateLimitConfig,
+    RateLimitCounter,
     RateLimitEntry,
     RateLimiter,
     rate_limit,
@@ -63,8 +71,14 @@ __all__ = [
     # Rate limiting
     "RateLimiter",
     "RateLimitConfig",
+    "RateLimitCounter",
     "RateLimitEntry",
     "rate_limit",
+    "RateLimitBackend",
+    "RateLimitResult",
+    "MemoryRateLimitBackend",
+    "SharedMemoryRateLimitBackend",
+    "RedisRateLimitBackend",
     # Sanitization
     "InputSanitizer",
     "SanitizeConfig",
@@ -0,0 +1,20 @@
+"""Rate limit backends.
+
+A backend keeps the counters behind ``RateLimiter``.  The default keeps
+them in process memory; the others share them between worker processes,
+so a limit applies to the application as a whole rather than per worker.
+"""
+
+from refast.security.backends.base import RateLimitBackend, RateLimitCounter, RateLimitResult
+from refast.security.backends.local import SharedMemoryRateLimitBackend
+from refast.security.backends.memory import MemoryRateLimitBackend
+from refast.security.backends.redis import RedisRateLimitBackend
+
+__all__ = [
+    "MemoryRateLimitBackend",
+    "RateLimitBackend",
+    "RateLimitCounter",
+    "RateLimitResult",
+    "RedisRateLimitBackend",
+    "SharedMemoryRateLimitBackend",
+]
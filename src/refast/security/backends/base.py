@@ -0,0 +1,226 @@
+"""Abstract base class for rate limit backends."""
+
+import asyncio
+import math
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+# A rate limit check: (key, max requests, window in seconds)
+Hit = tuple[str, int, float]
+
+
+@dataclass(slots=True)
+class RateLimitResult:
+    """
+    The outcome of one rate limit check.
+
+    Attributes:
+        allowed: Whether the request was admitted (and counted)
+        remaining: Requests left in the window
+        reset: Seconds until a blocked request would be admitted, or until
+            the current window ends
+    """
+
+    allowed: bool
+    remaining: int
+    reset: int
+
+
+@dataclass(slots=True)
+class RateLimitCounter:
+    """
+    Sliding window counter for one key.
+
+    Counts requests in the current fixed window and remembers the count of
+    the previous one.  The number of requests in the sliding window ending
+    now is estimated by weighting the previous count by how much of the
+    previous window the sliding window still covers.  This takes constant
+    time and space per key, however many requests it has seen.
+
+    Attributes:
+        start: Start of the current window, on ``time.monotonic()``
+        current: Requests in the current window
+        previous: Requests in the previous window
+    """
+
+    start: float
+    current: int = 0
+    previous: int = 0
+
+    def advance(self, now: float, window: float) -> float:
+        """
+        Move to the window containing *now*.
+
+        Args:
+            now: The current ``time.monotonic()``
+            window: The window length in seconds
+
+        Returns:
+            How far into the current window *now* is, from 0 to 1
+        """
+        elapsed = now - self.start
+        if elapsed >= window:
+            windows = int(elapsed // window)
+            self.previous = self.current if windows == 1 else 0
+            self.current = 0
+            self.start += windows * window
+            elapsed -= windows * window
+        return elapsed / window
+
+    def estimate(self, now: float, window: float) -> float:
+        """
+        Estimated requests in the sliding window ending at *now*.
+
+        Args:
+            now: The current ``time.monotonic()``
+            window: The window length in seconds
+
+        Returns:
+            The weighted request count
+        """
+        elapsed = now - self.start
+        if elapsed < window:
+            return self.previous * (1 - elapsed / window) + self.current
+        if elapsed < 2 * window:
+            return self.current * (2 - elapsed / window)
+        return 0.0
+
+    def is_idle(self, now: float, window: float) -> bool:
+        """Whether all counted requests have left the sliding window."""
+        return now - self.start >= 2 * window
+
+    def hit(self, now: float, limit: int, window: float) -> RateLimitResult:
+        """
+        Count a request at *now* if fewer than *limit* are in the window.
+
+        Args:
+            now: The current ``time.monotonic()``
+            limit: Maximum requests in the window
+            window: The window length in seconds
+
+        Returns:
+            The decision
+        """
+        fraction = self.advance(now, window)
+        estimate = self.previous * (1 - fraction) + self.current
+        allowed = estimate < limit
+        if allowed:
+            self.current += 1
+            estimate += 1
+            # Seconds until the current window ends
+            wait = 1 - fraction
+        elif self.current < limit:
+            # Until enough of the previous window has slid out
+            wait = 1 - (limit - self.current) / self.previous - fraction
+        else:
+            # Until the next window, plus the share of it this one still covers
+            wait = 1 - fraction + 1 - limit / max(self.current, 1)
+        return RateLimitResult(
+            allowed=allowed,
+            remaining=max(0, math.floor(limit - estimate)),
+            reset=max(1, math.ceil(wait * window)),
+        )
+
+
+class RateLimitBackend(ABC):
+    """
+    Abstract base class for rate limit state.
+
+    A backend keeps a sliding window counter per key and decides whether a
+    request is admitted.  Checks are made in batches: :meth:`hit_many`
+    decides several at once (one lock acquisition or one round trip), and
+    subclasses that set ``batched = True`` have concurrent :meth:`hit`
+    calls collected into such batches automatically.
+
+    Example:
+        ```python
+        class MyBackend(RateLimitBackend):
+            async def hit_many(self, hits):
+                ...
+
+            async def counts(self, window):
+                ...
+
+            async def clear(self):
+                ...
+        ```
+    """
+
+    # Whether concurrent hit() calls are decided together by hit_many()
+    batched = False
+
+    def __init__(self) -> None:
+        self._pending: list[tuple[Hit, asyncio.Future[RateLimitResult]]] = []
+        self._flusher: asyncio.Task[None] | None = None
+
+    async def hit(self, key: str, limit: int, window: float) -> RateLimitResult:
+        """
+        Count a request for *key* if fewer than *limit* are in the window.
+
+        Args:
+            key: The client's rate limit key
+            limit: Maximum requests in the window
+            window: The window length in seconds
+
+        Returns:
+            The decision
+        """
+        if not self.batched:
+            return (await self.hit_many([(key, limit, window)]))[0]
+        future: asyncio.Future[RateLimitResult] = asyncio.get_running_loop().create_future()
+        self._pending.append(((key, limit, window), future))
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush())
+        return await future
+
+    async def _flush(self) -> None:
+        # Hits arriving while a batch is decided form the next batch
+        while self._pending:
+            batch, self._pending = self._pending, []
+            try:
+                results = await self.hit_many([hit for hit, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results, strict=True):
+                if not future.done():
+                    future.set_result(result)
+
+    @abstractmethod
+    async def hit_many(self, hits: Sequence[Hit]) -> list[RateLimitResult]:
+        """
+        Decide several checks, in order.
+
+        Args:
+            hits: (key, limit, window) for each check
+
+        Returns:
+            The decision for each check
+        """
+        ...
+
+    @abstractmethod
+    async def counts(self, window: float) -> dict[str, int]:
+        """
+        Estimated requests in the window for every tracked key.
+
+        Args:
+            window: The window length in seconds
+
+        Returns:
+            Request count by key
+        """
+        ...
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Forget all counters."""
+        ...
+
+    async def close(self) -> None:
+        """Release the backend's resources."""
+        if self._flusher is not None:
+            await asyncio.gather(self._flusher, return_exceptions=True)
@@ -0,0 +1,277 @@
+"""Shared-memory rate limit backend for workers on one host."""
+
+import asyncio
+import hashlib
+import math
+import mmap
+import os
+import threading
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from struct import Struct
+from typing import TypeVar
+
+from refast.security.backends.base import Hit, RateLimitBackend, RateLimitCounter, RateLimitResult
+
+try:
+    import fcntl
+
+    FCNTL_AVAILABLE = True
+except ImportError:
+    fcntl = None  # type: ignore[assignment]
+    FCNTL_AVAILABLE = False
+
+_MAGIC = b"RFRL"
+_VERSION = 1
+
+# File header (magic, version, slot count), padded to one slot
+_HEADER = Struct("<4sIQ")
+_HEADER_SIZE = 64
+
+# Bytes of each key kept for get_stats()
+_KEY_BYTES = 40
+
+# Slot: key hash (0 = empty), window start, current, previous, key prefix
+_SLOT = Struct(f"<QdII{_KEY_BYTES}s")
+
+T = TypeVar("T")
+
+
+def _hash(key: str) -> int:
+    digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little") | 1
+
+
+class SharedMemoryRateLimitBackend(RateLimitBackend):
+    """
+    Rate limit counters shared by the worker processes of one host.
+
+    Needs no external service: the counters live in a hash table in a
+    memory-mapped file that every worker maps, so a limit applies to the
+    host as a whole.  Put the file on a RAM-backed filesystem such as
+    ``/dev/shm``.
+
+    The table has a fixed number of *slots*.  A key is looked up in up to
+    *max_probes* consecutive slots; when none is free, the slot whose
+    window started longest ago (usually an idle key) is reused.  Workers
+    take an exclusive ``flock`` on the file while updating it, once per
+    batch of concurrent checks.  File access runs in a dedicated thread, so
+    waiting for another worker's lock never blocks the event loop.  Times
+    come from ``time.monotonic()``, which is shared by all processes of a
+    host.
+
+    Only available on POSIX systems.
+
+    Example:
+        ```python
+        # Every uvicorn worker builds the same app
+        backend = SharedMemoryRateLimitBackend("/dev/shm/myapp-ratelimit")
+        app.add_middleware(
+            SecurityMiddleware,
+            secret_key="your-secret-key",
+            rate_limit_backend=backend,
+        )
+        ```
+
+    Attributes:
+        path: The shared file
+        slots: Number of slots in the table
+        max_probes: Slots searched per key
+    """
+
+    batched = True
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str] = "/tmp/refast-ratelimit",
+        *,
+        slots: int = 65_536,
+        max_probes: int = 16,
+    ):
+        """
+        Initialize the backend.  The file is created or opened on first use.
+
+        Args:
+            path: File shared by all workers
+            slots: Number of slots in the table, if the file is created
+                (an existing file keeps its size)
+            max_probes: Slots searched per key
+
+        Raises:
+            ImportError: If the platform has no ``fcntl`` (e.g. Windows)
+            ValueError: If slots or max_probes is less than 1
+        """
+        if not FCNTL_AVAILABLE:
+            raise ImportError("SharedMemoryRateLimitBackend requires a POSIX system")
+        if slots < 1 or max_probes < 1:
+            raise ValueError("slots and max_probes must be at least 1")
+        super().__init__()
+        self.path = os.fspath(path)
+        self.slots = slots
+        self.max_probes = max_probes
+        self._lock = threading.Lock()
+        self._fd: int | None = None
+        self._map: mmap.mmap | None = None
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="refast-ratelimit")
+
+    async def _run(self, func: Callable[..., T], *args: object) -> T:
+        """Run *func* in the backend's thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _open(self) -> mmap.mmap:
+        """Map the file, creating it if needed."""
+        if self._map is not None:
+            return self._map
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)  # type: ignore[union-attr]
+            try:
+                size = os.fstat(fd).st_size
+                if size == 0:
+                    size = _HEADER_SIZE + self.slots * _SLOT.size
+                    os.ftruncate(fd, size)
+                    os.pwrite(fd, _HEADER.pack(_MAGIC, _VERSION, self.slots), 0)
+                header = os.pread(fd, _HEADER.size, 0)
+                magic, version, slots = (
+                    _HEADER.unpack(header) if len(header) == _HEADER.size else (b"", 0, 0)
+                )
+                if (magic, version) != (_MAGIC, _VERSION) or (
+                    size != _HEADER_SIZE + slots * _SLOT.size
+                ):
+                    raise ValueError(f"{self.path} is not a rate limit file")
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)  # type: ignore[union-attr]
+            self._map = mmap.mmap(fd, size)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+        self.slots = slots
+        return self._map
+
+    def _find(self, table: mmap.mmap, key_hash: int, now: float) -> tuple[int, bool]:
+        """
+        Find the slot for *key_hash*.
+
+        Returns:
+            The slot's offset, and whether it already holds the key
+        """
+        first = key_hash % self.slots
+        victim, victim_start = 0, math.inf
+        for probe in range(min(self.max_probes, self.slots)):
+            offset = _HEADER_SIZE + (first + probe) % self.slots * _SLOT.size
+            slot_hash, start = _SLOT.unpack_from(table, offset)[:2]
+            if slot_hash == key_hash:
+                return offset, True
+            if slot_hash == 0:
+                return offset, False
+            # A start in the future predates a reboot: the slot is stale
+            if start > now:
+                start = -math.inf
+            if start < victim_start:
+                victim, victim_start = offset, start
+        return victim, False
+
+    def _hit(
+        self, table: mmap.mmap, now: float, key: str, limit: int, window: float
+    ) -> RateLimitResult:
+        key_hash = _hash(key)
+        offset, found = self._find(table, key_hash, now)
+        counter = None
+        if found:
+            _, start, current, previous, _ = _SLOT.unpack_from(table, offset)
+            if start <= now:
+                counter = RateLimitCounter(start, current, previous)
+        if counter is None:
+            counter = RateLimitCounter(start=now)
+        result = counter.hit(now, limit, window)
+        _SLOT.pack_into(
+            table,
+            offset,
+            key_hash,
+            counter.start,
+            counter.current,
+            counter.previous,
+            key.encode()[:_KEY_BYTES],
+        )
+        return result
+
+    async def hit_many(self, hits: Sequence[Hit]) -> list[RateLimitResult]:
+        """
+        Decide several checks, in order, under one lock of the file.
+
+        Args:
+            hits: (key, limit, window) for each check
+
+        Returns:
+            The decision for each check
+        """
+        return await self._run(self._hit_many, hits)
+
+    def _hit_many(self, hits: Sequence[Hit]) -> list[RateLimitResult]:
+        with self._lock:
+            table = self._open()
+            fcntl.flock(self._fd, fcntl.LOCK_EX)  # type: ignore[union-attr]
+            try:
+                now = time.monotonic()
+                return [self._hit(table, now, *hit) for hit in hits]
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)  # type: ignore[union-attr]
+
+    async def counts(self, window: float) -> dict[str, int]:
+        """
+        Estimated requests in the window for every key in the table.
+
+        Keys longer than 40 bytes are shown truncated.
+
+        Args:
+            window: The window length in seconds
+
+        Returns:
+            Request count by key
+        """
+        return await self._run(self._counts, window)
+
+    def _counts(self, window: float) -> dict[str, int]:
+        with self._lock:
+            table = self._open()
+            now = time.monotonic()
+            counts: dict[str, int] = {}
+            for offset in range(_HEADER_SIZE, len(table), _SLOT.size):
+                slot_hash, start, current, previous, key = _SLOT.unpack_from(table, offset)
+                if slot_hash and start <= now:
+                    counter = RateLimitCounter(start, current, previous)
+                    if not counter.is_idle(now, window):
+                        name = key.rstrip(b"\0").decode(errors="ignore")
+                        counts[name] = math.ceil(counter.estimate(now, window))
+            return counts
+
+    async def clear(self) -> None:
+        """Forget all counters, for every worker."""
+        await self._run(self._clear)
+
+    def _clear(self) -> None:
+        with self._lock:
+            table = self._open()
+            fcntl.flock(self._fd, fcntl.LOCK_EX)  # type: ignore[union-attr]
+            try:
+                table[_HEADER_SIZE:] = bytes(len(table) - _HEADER_SIZE)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)  # type: ignore[union-attr]
+
+    async def close(self) -> None:
+        """Unmap the file; it is left in place for the other workers."""
+        await super().close()
+        await self._run(self._unmap)
+        self._executor.shutdown(wait=False)
+
+    def _unmap(self) -> None:
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
@@ -0,0 +1,150 @@
+"""In-process rate limit backend."""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+
+from refast.security.backends.base import Hit, RateLimitBackend, RateLimitCounter, RateLimitResult
+
+
+class _Shard:
+    """Counters for a subset of keys, least recently used first."""
+
+    __slots__ = ("lock", "counters")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.counters: OrderedDict[str, RateLimitCounter] = OrderedDict()
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """
+    Rate limit counters in process memory.
+
+    The default backend.  Limits apply per worker process and reset when
+    it restarts; use ``SharedMemoryRateLimitBackend`` or
+    ``RedisRateLimitBackend`` to share them.
+
+    Keys are spread over *shards*, each with its own lock, so the backend
+    can be shared by threads and event loops.  Counters of keys with no
+    requests in the last two windows are dropped as new keys arrive, and at
+    most *max_keys* counters are kept (the least recently used are dropped
+    first), so many one-off clients cannot grow memory without bound.
+
+    Example:
+        ```python
+        limiter = RateLimiter(100, 60, backend=MemoryRateLimitBackend(max_keys=10_000))
+        ```
+
+    Attributes:
+        max_keys: Most keys tracked at once
+    """
+
+    def __init__(self, *, shards: int = 16, max_keys: int = 100_000):
+        """
+        Initialize the backend.
+
+        Args:
+            shards: Number of independently locked partitions of the keys
+            max_keys: Most keys tracked at once
+
+        Raises:
+            ValueError: If shards or max_keys is less than 1
+        """
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+        if max_keys < 1:
+            raise ValueError("max_keys must be at least 1")
+        super().__init__()
+        self.max_keys = max_keys
+        self._shards = tuple(_Shard() for _ in range(shards))
+        self._keys_per_shard = math.ceil(max_keys / shards)
+
+    def hit_nowait(self, key: str, limit: int, window: float) -> RateLimitResult:
+        """
+        Decide a check without awaiting.
+
+        Args:
+            key: The client's rate limit key
+            limit: Maximum requests in the window
+            window: The window length in seconds
+
+        Returns:
+            The decision
+        """
+        now = time.monotonic()
+        shard = self._shards[hash(key) % len(self._shards)]
+        with shard.lock:
+            counters = shard.counters
+            counter = counters.get(key)
+            if counter is None:
+                counter = counters[key] = RateLimitCounter(start=now)
+                self._evict(counters, now, window)
+            else:
+                counters.move_to_end(key)
+            return counter.hit(now, limit, window)
+
+    def _evict(
+        self, counters: OrderedDict[str, RateLimitCounter], now: float, window: float
+    ) -> None:
+        """Drop idle and, above the size limit, least recently used counters."""
+        while len(counters) > self._keys_per_shard:
+            counters.popitem(last=False)
+        # Amortized constant time: each key is dropped at most once per insert
+        while counters:
+            key, oldest = next(iter(counters.items()))
+            if not oldest.is_idle(now, window):
+                break
+            del counters[key]
+
+    async def hit(self, key: str, limit: int, window: float) -> RateLimitResult:
+        """
+        Count a request for *key* if fewer than *limit* are in the window.
+
+        Args:
+            key: The client's rate limit key
+            limit: Maximum requests in the window
+            window: The window length in seconds
+
+        Returns:
+            The decision
+        """
+        return self.hit_nowait(key, limit, window)
+
+    async def hit_many(self, hits: Sequence[Hit]) -> list[RateLimitResult]:
+        """
+        Decide several checks, in order.
+
+        Args:
+            hits: (key, limit, window) for each check
+
+        Returns:
+            The decision for each check
+        """
+        return [self.hit_nowait(*hit) for hit in hits]
+
+    async def counts(self, window: float) -> dict[str, int]:
+        """
+        Estimated requests in the window for every tracked key.
+
+        Args:
+            window: The window length in seconds
+
+        Returns:
+            Request count by key
+        """
+        now = time.monotonic()
+        counts: dict[str, int] = {}
+        for shard in self._shards:
+            with shard.lock:
+                for key, counter in shard.counters.items():
+                    counts[key] = math.ceil(counter.estimate(now, window))
+        return counts
+
+    async def clear(self) -> None:
+        """Forget all counters."""
+        for shard in self._shards:
+            with shard.lock:
+                shard.counters.clear()
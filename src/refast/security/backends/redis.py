@@ -0,0 +1,203 @@
+"""Redis rate limit backend."""
+
+import math
+from collections.abc import Sequence
+from typing import Any
+
+from refast.security.backends.base import Hit, RateLimitBackend, RateLimitCounter, RateLimitResult
+
+try:
+    import redis.asyncio as redis
+
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis = None  # type: ignore[assignment]
+    REDIS_AVAILABLE = False
+
+# The sliding window counter of RateLimitCounter, run atomically in Redis.
+# KEYS[1]: the counter hash; ARGV: limit, window in milliseconds.
+# Returns {allowed (0/1), remaining, reset in seconds}.
+HIT_SCRIPT = """
+if redis.replicate_commands then redis.replicate_commands() end
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+
+local state = redis.call('HMGET', KEYS[1], 's', 'c', 'p')
+local start = tonumber(state[1])
+local current = tonumber(state[2]) or 0
+local previous = tonumber(state[3]) or 0
+if start == nil or start > now then
+    start, current, previous = now, 0, 0
+end
+
+local elapsed = now - start
+if elapsed >= window then
+    local windows = math.floor(elapsed / window)
+    if windows == 1 then previous = current else previous = 0 end
+    current = 0
+    start = start + windows * window
+    elapsed = elapsed - windows * window
+end
+
+local fraction = elapsed / window
+local estimate = previous * (1 - fraction) + current
+local allowed = 0
+local wait
+if estimate < limit then
+    allowed = 1
+    current = current + 1
+    estimate = estimate + 1
+    wait = 1 - fraction
+elseif current < limit then
+    wait = 1 - (limit - current) / previous - fraction
+else
+    wait = 2 - fraction - limit / math.max(current, 1)
+end
+
+redis.call('HSET', KEYS[1], 's', start, 'c', current, 'p', previous)
+redis.call('PEXPIRE', KEYS[1], 2 * window)
+local remaining = math.max(0, math.floor(limit - estimate))
+return {allowed, remaining, math.max(1, math.ceil(wait * window / 1000))}
+"""
+
+
+def _int(value: Any) -> int:
+    return int(float(value)) if value is not None else 0
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """
+    Rate limit counters in Redis, shared by all workers and hosts.
+
+    Each key's counter is a hash updated by a Lua script, so concurrent
+    checks from any number of workers are atomic.  Times come from the
+    Redis server's clock.  Checks made concurrently on one worker are sent
+    in one pipeline, costing one round trip per batch rather than per
+    request.  Counters expire two windows after their last request.
+
+    Example:
+        ```python
+        backend = RedisRateLimitBackend(redis_url="redis://localhost")
+        app.add_middleware(
+            SecurityMiddleware,
+            secret_key="your-secret-key",
+            rate_limit_backend=backend,
+        )
+        ```
+    """
+
+    batched = True
+
+    def __init__(
+        self,
+        redis_url: str | None = None,
+        client: Any = None,
+        prefix: str = "refast:ratelimit:",
+        *,
+        scan_count: int = 500,
+    ):
+        """
+        Initialize the Redis backend.
+
+        Args:
+            redis_url: Redis connection URL
+            client: Existing Redis client instance
+            prefix: Key prefix for counter keys
+            scan_count: Keys requested per SCAN step in :meth:`counts`
+                and :meth:`clear`
+
+        Raises:
+            ImportError: If redis_url is given and redis is not installed
+            ValueError: If neither redis_url nor client is provided
+        """
+        super().__init__()
+        self._prefix = prefix
+        self._scan_count = scan_count
+
+        if client:
+            self._client = client
+            self._owned_client = False
+        elif redis_url:
+            if not REDIS_AVAILABLE:
+                raise ImportError("Redis is not installed. Install with: pip install refast[redis]")
+            self._client = redis.from_url(redis_url)  # type: ignore[union-attr]
+            self._owned_client = True
+        else:
+            raise ValueError("Either redis_url or client must be provided")
+
+        self._script = self._client.register_script(HIT_SCRIPT)
+
+    def _key(self, key: str) -> str:
+        return f"{self._prefix}{key}"
+
+    async def hit_many(self, hits: Sequence[Hit]) -> list[RateLimitResult]:
+        """
+        Decide several checks, in order, in one round trip.
+
+        Args:
+            hits: (key, limit, window) for each check
+
+        Returns:
+            The decision for each check
+        """
+        pipe = self._client.pipeline(transaction=False)
+        for key, limit, window in hits:
+            await self._script(
+                keys=[self._key(key)], args=[limit, max(1, round(window * 1000))], client=pipe
+            )
+        replies = await pipe.execute()
+        return [
+            RateLimitResult(allowed=bool(int(allowed)), remaining=int(remaining), reset=int(reset))
+            for allowed, remaining, reset in replies
+        ]
+
+    async def _keys(self) -> list[Any]:
+        return [
+            key
+            async for key in self._client.scan_iter(
+                match=f"{self._prefix}*", count=self._scan_count
+            )
+        ]
+
+    async def counts(self, window: float) -> dict[str, int]:
+        """
+        Estimated requests in the window for every key (scans Redis).
+
+        Args:
+            window: The window length in seconds
+
+        Returns:
+            Request count by key
+        """
+        keys = await self._keys()
+        if not keys:
+            return {}
+        pipe = self._client.pipeline(transaction=False)
+        pipe.time()
+        for key in keys:
+            pipe.hmget(key, "s", "c", "p")
+        (seconds, micros), *states = await pipe.execute()
+        now = int(seconds) + int(micros) / 1e6
+
+        counts: dict[str, int] = {}
+        for key, (start, current, previous) in zip(keys, states, strict=True):
+            if start is None:
+                continue
+            counter = RateLimitCounter(_int(start) / 1000, _int(current), _int(previous))
+            name = key.decode() if isinstance(key, bytes) else key
+            counts[name[len(self._prefix) :]] = math.ceil(counter.estimate(now, window))
+        return counts
+
+    async def clear(self) -> None:
+        """Delete all counters under the prefix."""
+        keys = await self._keys()
+        for start in range(0, len(keys), self._scan_count):
+            await self._client.delete(*keys[start : start + self._scan_count])
+
+    async def close(self) -> None:
+        """Close the Redis connection if owned."""
+        await super().close()
+        if self._owned_client:
+            await self._client.aclose()
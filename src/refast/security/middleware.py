@@ -44,6 +44,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import Response
 
+from refast.security.backends.base import RateLimitBackend
 from refast.security.csp import ContentSecurityPolicy
 from refast.security.csrf import CSRFConfig, CSRFProtection
 from refast.security.rate_limit import RateLimiter
@@ -81,6 +82,9 @@ class SecurityMiddleware(BaseHTTPMiddleware):
         rate_limit_enabled: Enable rate limiting (default: True)
         rate_limit: Max requests per window (default: 100)
         rate_limit_window: Window size in seconds (default: 60)
+        rate_limit_backend: Where rate limit counters are kept (default:
+            per-process memory); share one across workers to enforce the
+            limit for the whole application
         csp: Content Security Policy configuration
         hsts_enabled: Enable HSTS header (default: True)
         hsts_max_age: HSTS max-age in seconds (default: 1 year)
@@ -98,6 +102,7 @@ class SecurityMiddleware(BaseHTTPMiddleware):
         rate_limit_enabled: bool = True,
         rate_limit: int = 100,
         rate_limit_window: int = 60,
+        rate_limit_backend: RateLimitBackend | None = None,
         csp: ContentSecurityPolicy | None = None,
         hsts_enabled: bool = True,
         hsts_max_age: int = 31536000,
@@ -119,7 +124,9 @@ class SecurityMiddleware(BaseHTTPMiddleware):
         self.rate_limit_enabled = rate_limit_enabled
         self.rate_limiter: RateLimiter | None = None
         if rate_limit_enabled:
-            self.rate_limiter = RateLimiter(rate_limit, rate_limit_window)
+            self.rate_limiter = RateLimiter(
+                rate_limit, rate_limit_window, backend=rate_limit_backend
+            )
 
         # Content Security Policy
         self.csp = csp or ContentSecurityPolicy.for_refast()
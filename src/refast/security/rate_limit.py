@@ -1,6 +1,6 @@
 """Rate limiting for Refast.
 
-Provides in-memory rate limiting using a sliding window algorithm
+Provides in-memory rate limiting using a sliding window counter
 to prevent abuse and control API usage.
 
 Example:
@@ -37,8 +37,6 @@ Example:
 
 from __future__ import annotations
 
-import asyncio
-from collections import defaultdict
 from collections.abc import Callable
 from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
@@ -47,6 +45,9 @@ from typing import TYPE_CHECKING, Any
 
 from fastapi import HTTPException, Request
 
+from refast.security.backends.base import RateLimitBackend, RateLimitCounter  # noqa: F401
+from refast.security.backends.memory import MemoryRateLimitBackend
+
 if TYPE_CHECKING:
     pass
 
@@ -75,6 +76,8 @@ class RateLimitEntry:
     Tracks requests for a specific key.
 
     Maintains a list of request timestamps to implement sliding window.
+    ``RateLimiter`` keeps a constant-size ``RateLimitCounter`` per key
+    instead; this class is kept for code that uses it directly.
 
     Attributes:
         requests: List of request timestamps
@@ -104,10 +107,14 @@ class RateLimitEntry:
 
 class RateLimiter:
     """
-    In-memory rate limiter using sliding window algorithm.
+    Rate limiter using a sliding window counter.
 
     Limits requests per client based on IP address or custom key function.
-    Thread-safe using asyncio locks.
+    The counters live in a *backend*: by default in process memory
+    (``MemoryRateLimitBackend``), where each worker process enforces the
+    limit separately.  Pass ``SharedMemoryRateLimitBackend`` or
+    ``RedisRateLimitBackend`` to enforce it across workers.  Limiters
+    sharing a backend share the count of each key.
 
     Example:
         ```python
@@ -133,6 +140,10 @@ class RateLimiter:
         max_requests: Maximum requests allowed in window
         window_seconds: Time window in seconds
         key_func: Optional function to extract key from request
+        backend: Where the counters are kept (default: a new
+            ``MemoryRateLimitBackend``)
+        shards: ``shards`` of the default backend
+        max_keys: ``max_keys`` of the default backend
     """
 
     def __init__(
@@ -140,14 +151,17 @@ class RateLimiter:
         max_requests: int = 100,
         window_seconds: int = 60,
         key_func: Callable[[Request], str] | None = None,
+        *,
+        backend: RateLimitBackend | None = None,
+        shards: int = 16,
+        max_keys: int = 100_000,
     ):
         self.config = RateLimitConfig(
             max_requests=max_requests,
             window_seconds=window_seconds,
             key_func=key_func,
         )
-        self._entries: dict[str, RateLimitEntry] = defaultdict(RateLimitEntry)
-        self._lock = asyncio.Lock()
+        self.backend = backend or MemoryRateLimitBackend(shards=shards, max_keys=max_keys)
 
     def _get_key(self, request: Request) -> str:
         """
@@ -184,25 +198,14 @@ class RateLimiter:
             - remaining: Requests remaining in window
             - reset: Seconds until window resets
         """
-        key = self._get_key(request)
-        window = timedelta(seconds=self.config.window_seconds)
-
-        async with self._lock:
-            entry = self._entries[key]
-            entry.clean_old(window)
-
-            info = {
-                "limit": self.config.max_requests,
-                "remaining": max(0, self.config.max_requests - entry.count),
-                "reset": self.config.window_seconds,
-            }
-
-            if entry.count >= self.config.max_requests:
-                return False, info
-
-            entry.add_request()
-            info["remaining"] = max(0, self.config.max_requests - entry.count)
-            return True, info
+        result = await self.backend.hit(
+            self._get_key(request), self.config.max_requests, self.config.window_seconds
+        )
+        return result.allowed, {
+            "limit": self.config.max_requests,
+            "remaining": result.remaining,
+            "reset": result.reset,
+        }
 
     def limit(
         self,
@@ -264,8 +267,7 @@ class RateLimiter:
 
     async def clear(self) -> None:
         """Clear all rate limit entries."""
-        async with self._lock:
-            self._entries.clear()
+        await self.backend.clear()
 
     async def get_stats(self) -> dict[str, Any]:
         """
@@ -274,13 +276,14 @@ class RateLimiter:
         Returns:
             Dictionary with:
             - total_keys: Number of tracked keys
-            - entries: Dictionary of key -> request count
+            - entries: Dictionary of key -> estimated requests in the window
         """
-        async with self._lock:
-            return {
-                "total_keys": len(self._entries),
-                "entries": {k: v.count for k, v in self._entries.items()},
-            }
+        entries = await self.backend.counts(self.config.window_seconds)
+        return {"total_keys": len(entries), "entries": entries}
+
+    async def close(self) -> None:
+        """Close the backend."""
+        await self.backend.close()
 
 
 def rate_limit(
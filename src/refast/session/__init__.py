@@ -1,17 +1,24 @@
 """Session management system."""
 
-from refast.session.middleware import SessionMiddleware, get_session
+from refast.session.middleware import SessionMiddleware, get_session, load_session
 from refast.session.session import Session, SessionData
 from refast.session.stores.base import SessionStore
+from refast.session.stores.cached import CachedSessionStore
 from refast.session.stores.memory import MemorySessionStore
+from refast.session.stores.sqlite import SQLiteSessionStore
+from refast.session.writer import SessionWriter
 
 __all__ = [
     "Session",
     "SessionData",
     "SessionStore",
+    "CachedSessionStore",
     "MemorySessionStore",
+    "SQLiteSessionStore",
     "SessionMiddleware",
+    "SessionWriter",
     "get_session",
+    "load_session",
 ]
 
 # Optional Redis import
@@ -1,28 +1,118 @@
 """Session middleware for automatic session handling."""
 
-from collections.abc import Callable
-from typing import TYPE_CHECKING
+import asyncio
+import http.cookies
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from typing import Any
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+import anyio.from_thread
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection, Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from refast.session.session import Session, SessionData
 from refast.session.stores.base import SessionStore
 from refast.session.stores.memory import MemorySessionStore
 
-if TYPE_CHECKING:
-    from fastapi import FastAPI
+# Path prefixes served without a session: Refast's client bundle, extension
+# assets and files created with ctx.create_file_url()
+DEFAULT_EXCLUDED_PATHS = ("/static", "/api/file")
 
+# Attributes Session.__init__ sets; reading any of them loads a _LazySession
+_SESSION_ATTRS = frozenset({"_data", "_store", "_modified", "_changed", "_on_modified"})
 
-class SessionMiddleware(BaseHTTPMiddleware):
+
+class _LazySession(Session):
+    """
+    A request's session, read from the store on first use.
+
+    Until then it only holds the ID from the cookie.  Loading fills in the
+    attributes ``Session.__init__`` would have set, so afterwards it is an
+    ordinary session with no extra cost per access.
+    """
+
+    def __init__(self, store: SessionStore, cookie_id: str | None):
+        self._lazy_store = store
+        self._cookie_id = cookie_id
+        self._is_new = False
+
+    def __getattr__(self, name: str) -> Any:
+        if name not in _SESSION_ATTRS:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        self._load_nowait()
+        return self.__dict__[name]
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the session has been read from the store."""
+        return "_data" in self.__dict__
+
+    async def load(self) -> None:
+        """Read the session from the store, if not done yet."""
+        if self.is_loaded:
+            return
+        data = None
+        if self._cookie_id:
+            data = await self._lazy_store.get(self._cookie_id)
+        self._resolve(data)
+
+    def _load_nowait(self) -> None:
+        """Load the session from synchronous code."""
+        if self.is_loaded:
+            return
+        if not self._cookie_id:
+            self._resolve(None)
+            return
+        try:
+            data = self._lazy_store.get_nowait(self._cookie_id)
+        except NotImplementedError:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                # A worker thread (sync endpoint or dependency) can wait for the loop
+                anyio.from_thread.run(self.load)
+                return
+            raise RuntimeError(
+                f"The session has not been loaded and {type(self._lazy_store).__name__} "
+                "cannot read it synchronously. Call 'await load_session(request)' or "
+                "use Depends(load_session) first, or add SessionMiddleware with lazy=False."
+            ) from None
+        self._resolve(data)
+
+    def _resolve(self, data: dict[str, Any] | None) -> None:
+        if data:
+            session_data = SessionData.from_dict(data)
+            if not session_data.is_expired():
+                Session.__init__(self, session_data, self._lazy_store, persisted=True)
+                return
+        Session.__init__(self, SessionData(), self._lazy_store)
+        self._is_new = True
+
+
+class SessionMiddleware:
     """
     Middleware that handles session lifecycle.
 
-    - Loads session from cookie
-    - Attaches session to request state
-    - Saves session after response
-    - Sets session cookie
+    - Reads the session ID from the cookie
+    - Attaches the session to request state, loading it on first use
+    - Saves the session if it was modified
+    - Sets the session cookie for new, modified and refreshed sessions
+
+    This is a plain ASGI middleware: responses, including streamed ones,
+    pass through unbuffered.  Requests under *exclude_paths* skip session
+    handling entirely.  Other requests read the session from the store only
+    if the endpoint uses it, so a request that never touches the session
+    costs no store round trip and (if it had a cookie) sends no cookie.
+
+    Lazy loading is the default for stores that can read synchronously
+    (those implementing ``get_nowait``, such as ``MemorySessionStore``).
+    Other stores need an ``await`` to load, so by default their sessions are
+    loaded up front.  With ``lazy=True`` and such a store, use the
+    ``load_session`` dependency or ``await load_session(request)`` before
+    reading ``request.state.session`` from an ``async`` endpoint; sync
+    endpoints and dependencies, which run in a worker thread, can use it
+    directly.
 
     Example:
         ```python
@@ -37,8 +127,7 @@ class SessionMiddleware(BaseHTTPMiddleware):
         )
 
         @app.get("/")
-        async def home(request: Request):
-            session = request.state.session
+        async def home(session: Session = Depends(get_session)):
             session.set("visits", session.get("visits", 0) + 1)
             return {"visits": session.get("visits")}
         ```
@@ -47,11 +136,14 @@ class SessionMiddleware(BaseHTTPMiddleware):
         store: The session store backend
         cookie_name: Name of the session cookie
         cookie_max_age: Cookie max age in seconds
+        exclude_paths: Path prefixes served without a session
+        refresh_after: Seconds after its last save at which a session in use
+            is saved again and its cookie re-sent
     """
 
     def __init__(
         self,
-        app: "FastAPI",
+        app: ASGIApp,
         store: SessionStore | None = None,
         cookie_name: str = "refast_session",
         cookie_max_age: int = 3600,
@@ -61,12 +153,16 @@ class SessionMiddleware(BaseHTTPMiddleware):
         cookie_httponly: bool = True,
         cookie_samesite: str = "lax",
         secret_key: str | None = None,
+        *,
+        exclude_paths: Sequence[str] = DEFAULT_EXCLUDED_PATHS,
+        lazy: bool | None = None,
+        refresh_after: int | None = None,
     ):
         """
         Initialize the session middleware.
 
         Args:
-            app: The FastAPI application
+            app: The ASGI application
             store: Session store backend (defaults to MemorySessionStore)
             cookie_name: Name of the session cookie
             cookie_max_age: Cookie max age in seconds
@@ -76,8 +172,15 @@ class SessionMiddleware(BaseHTTPMiddleware):
             cookie_httponly: Whether cookie is HTTP-only
             cookie_samesite: Cookie SameSite policy
             secret_key: Secret key for signing (future use)
+            exclude_paths: Path prefixes (whole segments) handled without
+                a session
+            lazy: Load sessions on first use instead of for every request
+                (defaults to True if the store implements ``get_nowait``)
+            refresh_after: Seconds after its last save at which a session
+                used by a request is saved again and its cookie re-sent,
+                extending both lifetimes (defaults to half of cookie_max_age)
         """
-        super().__init__(app)
+        self.app = app
         self.store = store or MemorySessionStore()
         self.cookie_name = cookie_name
         self.cookie_max_age = cookie_max_age
@@ -87,78 +190,127 @@ class SessionMiddleware(BaseHTTPMiddleware):
         self.cookie_httponly = cookie_httponly
         self.cookie_samesite = cookie_samesite
         self.secret_key = secret_key
+        self.exclude_paths = tuple(path.rstrip("/") for path in exclude_paths)
+        self.lazy = _reads_synchronously(self.store) if lazy is None else lazy
+        self.refresh_after = cookie_max_age // 2 if refresh_after is None else refresh_after
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable[[Request], Response],
-    ) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
-        Process request with session handling.
+        Process a request with session handling.
 
         Args:
-            request: The incoming request
-            call_next: The next handler in the chain
-
-        Returns:
-            The response with session cookie set
+            scope: The ASGI connection scope
+            receive: The ASGI receive channel
+            send: The ASGI send channel
         """
-        # Get session ID from cookie
-        session_id = request.cookies.get(self.cookie_name)
+        if scope["type"] != "http" or self._is_excluded(scope["path"]):
+            await self.app(scope, receive, send)
+            return
 
-        # Load or create session
-        session = await self._load_session(session_id)
+        session = _LazySession(self.store, HTTPConnection(scope).cookies.get(self.cookie_name))
+        scope.setdefault("state", {})["session"] = session
+        if not self.lazy:
+            await session.load()
 
-        # Attach to request
-        request.state.session = session
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and await self._commit(session):
+                MutableHeaders(scope=message).append("set-cookie", self._cookie(session.id))
+            await send(message)
 
-        # Process request
-        response = await call_next(request)
+        await self.app(scope, receive, send_with_cookie)
 
-        # Save session if modified
-        if session.is_modified:
+        # Changes made while a streamed body was being sent
+        if session.is_loaded and session.is_modified:
             await session.save()
 
-        # Set cookie
-        response.set_cookie(
-            key=self.cookie_name,
-            value=session.id,
-            max_age=self.cookie_max_age,
-            path=self.cookie_path,
-            domain=self.cookie_domain,
-            secure=self.cookie_secure,
-            httponly=self.cookie_httponly,
-            samesite=self.cookie_samesite,
-        )
-
-        return response
+    def _is_excluded(self, path: str) -> bool:
+        return any(path == prefix or path.startswith(prefix + "/") for prefix in self.exclude_paths)
 
-    async def _load_session(self, session_id: str | None) -> Session:
+    async def _commit(self, session: _LazySession) -> bool:
         """
-        Load session from store or create new one.
-
-        Args:
-            session_id: The session ID from cookie
+        Save the session if needed before the response starts.
 
         Returns:
-            The loaded or new session
+            Whether the response should set the session cookie
         """
-        if session_id:
-            data = await self.store.get(session_id)
-            if data:
-                session_data = SessionData.from_dict(data)
-                if not session_data.is_expired():
-                    return Session(session_data, self.store)
+        if not session.is_loaded:
+            if session._cookie_id:
+                # An existing session the request did not use
+                return False
+            # No cookie: issue a new session, which needs no store read
+            session._resolve(None)
+
+        if not session._is_new:
+            age = (datetime.now(UTC) - session.updated_at).total_seconds()
+            if age >= self.refresh_after:
+                session.refresh()
+
+        if session.is_modified:
+            await session.save()
+            return True
+        return session._is_new
+
+    def _cookie(self, value: str) -> str:
+        """Build the Set-Cookie header value for *value*."""
+        cookie: http.cookies.SimpleCookie = http.cookies.SimpleCookie()
+        cookie[self.cookie_name] = value
+        morsel = cookie[self.cookie_name]
+        morsel["max-age"] = self.cookie_max_age
+        morsel["path"] = self.cookie_path
+        if self.cookie_domain is not None:
+            morsel["domain"] = self.cookie_domain
+        if self.cookie_secure:
+            morsel["secure"] = True
+        if self.cookie_httponly:
+            morsel["httponly"] = True
+        morsel["samesite"] = self.cookie_samesite
+        return cookie.output(header="").strip()
+
+
+def _reads_synchronously(store: SessionStore) -> bool:
+    """Whether *store* overrides :meth:`SessionStore.get_nowait`."""
+    return type(store).get_nowait is not SessionStore.get_nowait
+
+
+async def load_session(request: HTTPConnection) -> Session:
+    """
+    Load the request's session from the store, if not done yet.
+
+    After this, ``request.state.session`` can be used from async code
+    with any store.  It also works as an async dependency.
 
-        # Create new session
-        session_data = SessionData()
-        return Session(session_data, self.store)
+    Example:
+        ```python
+        @app.get("/profile")
+        async def profile(request: Request):
+            session = await load_session(request)
+            return {"user": session.get("user")}
+
+        @app.get("/cart")
+        async def cart(session: Session = Depends(load_session)):
+            return {"items": session.get("cart", [])}
+        ```
+
+    Args:
+        request: The request or WebSocket connection
+
+    Returns:
+        The loaded session
+    """
+    session = request.state.session
+    if isinstance(session, _LazySession):
+        await session.load()
+    return session
 
 
 def get_session(request: Request) -> Session:
     """
     Dependency to get session from request.
 
+    FastAPI runs this in a worker thread, which can load a lazy session from
+    any store.  In async code with a store that needs an ``await``, use
+    :func:`load_session` instead.
+
     Example:
         ```python
         from fastapi import Depends
@@ -172,6 +324,9 @@ def get_session(request: Request) -> Session:
         request: The FastAPI request
 
     Returns:
-        The session from request state
+        The session from request state, loaded from the store
     """
-    return request.state.session
+    session = request.state.session
+    if isinstance(session, _LazySession):
+        session._load_nowait()
+    return session
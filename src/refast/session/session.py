@@ -1,6 +1,7 @@
 """Session class for accessing session data."""
 
 import uuid
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING, Any
@@ -86,6 +87,8 @@ class Session:
         self,
         session_data: SessionData | None = None,
         store: "SessionStore | None" = None,
+        *,
+        persisted: bool = False,
     ):
         """
         Initialize the session.
@@ -93,10 +96,16 @@ class Session:
         Args:
             session_data: The underlying session data
             store: Optional session store for persistence
+            persisted: Whether session_data was loaded from the store, so
+                saving only needs to write the keys changed since
         """
         self._data = session_data or SessionData()
         self._store = store
         self._modified = False
+        # Keys changed since the last save; None when everything must be written
+        self._changed: set[str] | None = set() if persisted else None
+        # Called on each modification, e.g. to schedule a write-behind save
+        self._on_modified: Callable[[Session], None] | None = None
 
     @property
     def id(self) -> str:
@@ -128,6 +137,11 @@ class Session:
         """Check if session has expired."""
         return self._data.is_expired()
 
+    def _mark_modified(self) -> None:
+        self._modified = True
+        if self._on_modified is not None:
+            self._on_modified(self)
+
     def get(self, key: str, default: Any = None) -> Any:
         """
         Get a value from the session.
@@ -151,7 +165,9 @@ class Session:
         """
         self._data.data[key] = value
         self._data.updated_at = _now_utc()
-        self._modified = True
+        self._mark_modified()
+        if self._changed is not None:
+            self._changed.add(key)
 
     def delete(self, key: str) -> None:
         """
@@ -163,13 +179,16 @@ class Session:
         if key in self._data.data:
             del self._data.data[key]
             self._data.updated_at = _now_utc()
-            self._modified = True
+            self._mark_modified()
+            if self._changed is not None:
+                self._changed.add(key)
 
     def clear(self) -> None:
         """Clear all session data."""
         self._data.data.clear()
         self._data.updated_at = _now_utc()
-        self._modified = True
+        self._mark_modified()
+        self._changed = None
 
     def __contains__(self, key: str) -> bool:
         """Check if key exists in session."""
@@ -206,8 +225,9 @@ class Session:
     async def save(self) -> None:
         """Save session to store."""
         if self._store and self._modified:
-            await self._store.set(self._data.id, self._data.to_dict())
+            await self._store.update(self._data.id, self._data.to_dict(), self._changed)
             self._modified = False
+            self._changed = set()
 
     async def destroy(self) -> None:
         """Destroy the session."""
@@ -215,6 +235,15 @@ class Session:
             await self._store.delete(self._data.id)
         self._data.data.clear()
 
+    def refresh(self) -> None:
+        """
+        Mark the session to be saved without changing its data.
+
+        Saving it then extends its lifetime in the store.
+        """
+        self._data.updated_at = _now_utc()
+        self._mark_modified()
+
     def set_expiry(self, seconds: int) -> None:
         """
         Set session expiry time.
@@ -223,7 +252,7 @@ class Session:
             seconds: Number of seconds until expiry
         """
         self._data.expires_at = _now_utc() + timedelta(seconds=seconds)
-        self._modified = True
+        self._mark_modified()
 
     def __repr__(self) -> str:
         """Return string representation."""
@@ -1,9 +1,11 @@
 """Session store implementations."""
 
 from refast.session.stores.base import SessionStore
+from refast.session.stores.cached import CachedSessionStore
 from refast.session.stores.memory import MemorySessionStore
+from refast.session.stores.sqlite import SQLiteSessionStore
 
-__all__ = ["SessionStore", "MemorySessionStore"]
+__all__ = ["SessionStore", "CachedSessionStore", "MemorySessionStore", "SQLiteSessionStore"]
 
 try:
     from refast.session.stores.redis import RedisSessionStore  # noqa: F401
@@ -1,6 +1,7 @@
 """Abstract base class for session stores."""
 
 from abc import ABC, abstractmethod
+from collections.abc import Collection, Iterable
 from typing import Any
 
 
@@ -82,6 +83,86 @@ class SessionStore(ABC):
             True if session exists
         """
 
+    def get_nowait(self, session_id: str) -> dict[str, Any] | None:
+        """
+        Retrieve session data without awaiting, for stores that can.
+
+        Lets synchronous code (such as a first access to
+        ``request.state.session``) load a session.  Stores whose reads need
+        I/O keep this default.
+
+        Args:
+            session_id: The session identifier
+
+        Returns:
+            Session data dict or None if not found
+
+        Raises:
+            NotImplementedError: If reading requires awaiting I/O
+        """
+        raise NotImplementedError(f"{type(self).__name__} cannot read sessions synchronously")
+
+    async def update(
+        self,
+        session_id: str,
+        data: dict[str, Any],
+        changed: Collection[str] | None = None,
+        ttl: int | None = None,
+    ) -> bool:
+        """
+        Store session data of which only some keys changed since it was loaded.
+
+        Backends that can write single keys override this; by default the
+        whole session is written with :meth:`set`.
+
+        Args:
+            session_id: The session identifier
+            data: The full session data (as from ``SessionData.to_dict()``)
+            changed: Keys of ``data["data"]`` set or deleted since the last
+                save, or None if the whole session must be written
+            ttl: Time-to-live in seconds (uses the store default if not specified)
+
+        Returns:
+            True if the session was written; False if a partial save was
+            skipped because the session no longer exists
+        """
+        if ttl is None:
+            await self.set(session_id, data)
+        else:
+            await self.set(session_id, data, ttl)
+        return True
+
+    async def get_many(self, session_ids: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """
+        Retrieve several sessions.
+
+        Args:
+            session_ids: The session identifiers
+
+        Returns:
+            Session data by ID, for the sessions that exist
+        """
+        found = {}
+        for session_id in session_ids:
+            data = await self.get(session_id)
+            if data is not None:
+                found[session_id] = data
+        return found
+
+    async def set_many(self, sessions: dict[str, dict[str, Any]], ttl: int | None = None) -> None:
+        """
+        Store several sessions.
+
+        Args:
+            sessions: Session data by ID
+            ttl: Time-to-live in seconds (uses the store default if not specified)
+        """
+        for session_id, data in sessions.items():
+            if ttl is None:
+                await self.set(session_id, data)
+            else:
+                await self.set(session_id, data, ttl)
+
     async def touch(self, session_id: str, ttl: int = 3600) -> bool:
         """
         Update session TTL without modifying data.
@@ -0,0 +1,415 @@
+"""In-process cache in front of another session store."""
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Collection, Iterable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from refast.session.stores.base import SessionStore
+
+if TYPE_CHECKING:
+    from refast.events.backplane import Backplane, BackplaneMessage
+
+# Backplane message kind announcing changed sessions
+INVALIDATE_KIND = "session:invalidate"
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    """
+    A cached session.
+
+    Attributes:
+        data: The session data, as stored
+        version: Version stamp of the write that produced it
+        expires_at: When the entry stops being served, on ``time.monotonic()``
+    """
+
+    data: dict[str, Any]
+    version: str | None
+    expires_at: float
+
+
+def _copy(data: dict[str, Any]) -> dict[str, Any]:
+    """Copy *data* deep enough that changing session keys leaves it intact."""
+    return {**data, "data": dict(data.get("data") or {})}
+
+
+class CachedSessionStore(SessionStore):
+    """
+    Session store keeping recently used sessions in process memory.
+
+    Wraps another store (typically Redis).  Reads of a cached session cost
+    a dict lookup instead of a round trip; writes go through to the wrapped
+    store and update the cache.  The cache holds at most *max_entries*
+    sessions (least recently used are dropped first) for at most *ttl*
+    seconds each.
+
+    Every write stamps the session with a new version and announces it on
+    the *backplane*; the other workers drop their cached copy unless it
+    already has that version.  A read racing an invalidation is not
+    cached.  Without a backplane only *ttl* bounds how stale another
+    worker's copy can get, so use one whenever several workers share the
+    wrapped store.
+
+    Example:
+        ```python
+        backplane = RedisBackplane(redis_url="redis://localhost")
+        store = CachedSessionStore(
+            RedisSessionStore(redis_url="redis://localhost"),
+            backplane=backplane,
+            max_entries=50_000,
+        )
+        app.add_middleware(SessionMiddleware, store=store)
+        ```
+
+    Attributes:
+        store: The wrapped store
+        max_entries: Most sessions kept in memory
+        ttl: Seconds a cached session is served before it is re-read
+    """
+
+    def __init__(
+        self,
+        store: SessionStore,
+        *,
+        backplane: "Backplane | None" = None,
+        max_entries: int = 10_000,
+        ttl: float = 5.0,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            store: The store to cache
+            backplane: Carries invalidations between workers
+            max_entries: Most sessions kept in memory
+            ttl: Seconds a cached session is served before it is re-read
+
+        Raises:
+            ValueError: If max_entries is less than 1 or ttl is negative
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if ttl < 0:
+            raise ValueError("ttl must not be negative")
+        self.store = store
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        # Reads in flight, shared by concurrent callers, and those an
+        # invalidation overtook (their result must not be cached)
+        self._loads: dict[str, asyncio.Future[dict[str, Any] | None]] = {}
+        self._overtaken: set[str] = set()
+        self._backplane = backplane
+        self._unsubscribe = (
+            backplane.on(INVALIDATE_KIND, self._on_invalidate) if backplane else None
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, session_id: str) -> dict[str, Any] | None:
+        """Return a copy of the cached session, or None on a miss."""
+        entry = self._entries.get(session_id)
+        if entry is None:
+            return None
+        if time.monotonic() >= entry.expires_at:
+            del self._entries[session_id]
+            return None
+        self._entries.move_to_end(session_id)
+        self.hits += 1
+        return _copy(entry.data)
+
+    def _remember(self, session_id: str, data: dict[str, Any]) -> None:
+        self._entries[session_id] = CacheEntry(
+            data=_copy(data),
+            version=data.get("version"),
+            expires_at=time.monotonic() + self.ttl,
+        )
+        self._entries.move_to_end(session_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _forget(self, session_id: str) -> None:
+        self._entries.pop(session_id, None)
+        if session_id in self._loads:
+            self._overtaken.add(session_id)
+
+    async def _ensure_subscribed(self) -> None:
+        # Nothing may be cached before invalidations can arrive
+        if self._backplane is not None and not self._backplane.started:
+            await self._backplane.start()
+
+    async def _announce(self, versions: dict[str, str | None]) -> None:
+        if self._backplane is not None and versions:
+            await self._backplane.publish(INVALIDATE_KIND, {"sessions": versions})
+
+    async def _on_invalidate(self, message: "BackplaneMessage") -> None:
+        for session_id, version in message.payload.get("sessions", {}).items():
+            entry = self._entries.get(session_id)
+            if entry is None or version is None or entry.version != version:
+                self._forget(session_id)
+
+    async def _load(self, session_id: str) -> dict[str, Any] | None:
+        """Read a session from the wrapped store, caching the result."""
+        loading = self._loads.get(session_id)
+        if loading is not None:
+            data = await asyncio.shield(loading)
+            return _copy(data) if data else None
+
+        loading = asyncio.get_running_loop().create_future()
+        self._loads[session_id] = loading
+        try:
+            data = await self.store.get(session_id)
+        except BaseException as e:
+            loading.set_exception(e)
+            # Consumed here so an error nobody else awaited is not reported
+            loading.exception()
+            raise
+        finally:
+            del self._loads[session_id]
+            overtaken = session_id in self._overtaken
+            self._overtaken.discard(session_id)
+
+        loading.set_result(data)
+        if data and not overtaken:
+            self._remember(session_id, data)
+        return _copy(data) if data else None
+
+    def get_nowait(self, session_id: str) -> dict[str, Any] | None:
+        """
+        Return a cached session without awaiting.
+
+        Args:
+            session_id: The session identifier
+
+        Returns:
+            A copy of the cached session data
+
+        Raises:
+            NotImplementedError: If the session is not cached (it must be
+                read from the wrapped store)
+        """
+        data = self._lookup(session_id)
+        if data is None:
+            raise NotImplementedError("Session is not cached")
+        return data
+
+    async def get(self, session_id: str) -> dict[str, Any] | None:
+        """
+        Retrieve session data, from memory if cached.
+
+        Args:
+            session_id: The session identifier
+
+        Returns:
+            A copy of the session data, or None if not found
+        """
+        data = self._lookup(session_id)
+        if data is not None:
+            return data
+        self.misses += 1
+        await self._ensure_subscribed()
+        return await self._load(session_id)
+
+    async def get_many(self, session_ids: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """
+        Retrieve several sessions, reading only the uncached ones.
+
+        Args:
+            session_ids: The session identifiers
+
+        Returns:
+            Session data by ID, for the sessions that exist
+        """
+        found: dict[str, dict[str, Any]] = {}
+        missing = []
+        for session_id in session_ids:
+            data = self._lookup(session_id)
+            if data is None:
+                missing.append(session_id)
+            else:
+                found[session_id] = data
+        if not missing:
+            return found
+        self.misses += len(missing)
+        await self._ensure_subscribed()
+
+        # Join reads already in flight; register the rest like _load does
+        joined = {sid: self._loads[sid] for sid in missing if sid in self._loads}
+        owned = [sid for sid in dict.fromkeys(missing) if sid not in joined]
+        loop = asyncio.get_running_loop()
+        loads = {sid: loop.create_future() for sid in owned}
+        self._loads.update(loads)
+        try:
+            loaded = await self.store.get_many(owned) if owned else {}
+        except BaseException as e:
+            for loading in loads.values():
+                loading.set_exception(e)
+                loading.exception()
+            raise
+        finally:
+            overtaken = self._overtaken.intersection(owned)
+            self._overtaken.difference_update(owned)
+            for session_id in owned:
+                del self._loads[session_id]
+
+        for session_id, loading in loads.items():
+            data = loaded.get(session_id)
+            loading.set_result(data)
+            if data:
+                if session_id not in overtaken:
+                    self._remember(session_id, data)
+                found[session_id] = _copy(data)
+        for session_id, loading in joined.items():
+            data = await asyncio.shield(loading)
+            if data:
+                found[session_id] = _copy(data)
+        return found
+
+    async def set(
+        self,
+        session_id: str,
+        data: dict[str, Any],
+        ttl: int | None = None,
+    ) -> None:
+        """
+        Store session data in the wrapped store and the cache.
+
+        Args:
+            session_id: The session identifier
+            data: The session data
+            ttl: Time-to-live in seconds
+        """
+        await self.update(session_id, data, None, ttl)
+
+    async def update(
+        self,
+        session_id: str,
+        data: dict[str, Any],
+        changed: Collection[str] | None = None,
+        ttl: int | None = None,
+    ) -> bool:
+        """
+        Write the changed keys through to the wrapped store.
+
+        The session is cached only if the wrapped store wrote it; a partial
+        save of a session deleted meanwhile leaves it uncached.
+
+        Args:
+            session_id: The session identifier
+            data: The full session data
+            changed: Keys of ``data["data"]`` changed since the last save,
+                or None to replace the whole session
+            ttl: Time-to-live in seconds
+
+        Returns:
+            True if the session was written
+        """
+        await self._ensure_subscribed()
+        data = {**data, "version": uuid.uuid4().hex}
+        self._forget(session_id)
+        if not await self.store.update(session_id, data, changed, ttl):
+            await self._announce({session_id: None})
+            return False
+        self._remember(session_id, data)
+        await self._announce({session_id: data["version"]})
+        return True
+
+    async def set_many(self, sessions: dict[str, dict[str, Any]], ttl: int | None = None) -> None:
+        """
+        Store several sessions in the wrapped store and the cache.
+
+        Args:
+            sessions: Session data by ID
+            ttl: Time-to-live in seconds
+        """
+        if not sessions:
+            return
+        await self._ensure_subscribed()
+        stamped = {sid: {**data, "version": uuid.uuid4().hex} for sid, data in sessions.items()}
+        for session_id in stamped:
+            self._forget(session_id)
+        await self.store.set_many(stamped, ttl)
+        for session_id, data in stamped.items():
+            self._remember(session_id, data)
+        await self._announce({sid: data["version"] for sid, data in stamped.items()})
+
+    async def delete(self, session_id: str) -> None:
+        """
+        Delete a session everywhere.
+
+        Args:
+            session_id: The session identifier
+        """
+        self._forget(session_id)
+        await self.store.delete(session_id)
+        await self._announce({session_id: None})
+
+    async def exists(self, session_id: str) -> bool:
+        """
+        Check if a session exists.
+
+        Args:
+            session_id: The session identifier
+
+        Returns:
+            True if session exists
+        """
+        if self._lookup(session_id) is not None:
+            return True
+        return await self.store.exists(session_id)
+
+    async def touch(self, session_id: str, ttl: int | None = None) -> bool:
+        """
+        Extend a session's TTL in the wrapped store.
+
+        Args:
+            session_id: The session identifier
+            ttl: New time-to-live in seconds
+
+        Returns:
+            True if session was touched
+        """
+        if ttl is None:
+            return await self.store.touch(session_id)
+        return await self.store.touch(session_id, ttl)
+
+    async def clear_expired(self) -> int:
+        """
+        Clear expired sessions in the wrapped store and drop stale cache entries.
+
+        Returns:
+            Number of sessions cleared from the wrapped store
+        """
+        now = time.monotonic()
+        for session_id in [sid for sid, e in self._entries.items() if e.expires_at <= now]:
+            del self._entries[session_id]
+        return await self.store.clear_expired()
+
+    def invalidate(self, session_id: str | None = None) -> None:
+        """
+        Drop cached sessions on this worker.
+
+        Args:
+            session_id: The session to drop, or None for all
+        """
+        if session_id is None:
+            for sid in self._loads:
+                self._overtaken.add(sid)
+            self._entries.clear()
+        else:
+            self._forget(session_id)
+
+    async def close(self) -> None:
+        """Stop listening for invalidations and close the wrapped store."""
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        self._entries.clear()
+        close = getattr(self.store, "close", None)
+        if close is not None:
+            await close()
@@ -1,24 +1,32 @@
 """In-memory session store."""
 
 import asyncio
+import heapq
+import time
 from dataclasses import dataclass
-from datetime import UTC, datetime, timedelta
 from typing import Any
 
 from refast.session.stores.base import SessionStore
 
+# Default number of dicts sessions are spread over
+DEFAULT_SHARDS = 16
 
-def _now_utc() -> datetime:
-    """Get current UTC time."""
-    return datetime.now(UTC)
+# Sessions clear_expired() visits before yielding to the event loop
+CLEANUP_BATCH_SIZE = 1_000
 
 
-@dataclass
+@dataclass(slots=True)
 class MemoryEntry:
-    """Entry in the memory store."""
+    """
+    Entry in the memory store.
+
+    Attributes:
+        data: The session data
+        expires_at: Expiry time on the ``time.monotonic()`` clock
+    """
 
     data: dict[str, Any]
-    expires_at: datetime
+    expires_at: float
 
 
 class MemorySessionStore(SessionStore):
@@ -28,6 +36,14 @@ class MemorySessionStore(SessionStore):
     Best for development and testing. Not suitable for production
     with multiple workers or server restarts.
 
+    Sessions are spread over several dicts by hashing the session ID,
+    which keeps any single dict small and its resizes cheap.  Every
+    operation is a plain dict access that completes without awaiting, so
+    no lock is needed: the event loop cannot interleave another coroutine
+    mid-operation.  Sessions are filed by expiry time in buckets of
+    *resolution* seconds (a timer wheel), so :meth:`clear_expired` only
+    visits the buckets that are due.
+
     Example:
         ```python
         store = MemorySessionStore(default_ttl=3600)
@@ -45,6 +61,8 @@ class MemorySessionStore(SessionStore):
         self,
         default_ttl: int = 3600,
         cleanup_interval: int = 300,
+        shards: int = DEFAULT_SHARDS,
+        resolution: float = 1.0,
     ):
         """
         Initialize the memory store.
@@ -52,12 +70,60 @@ class MemorySessionStore(SessionStore):
         Args:
             default_ttl: Default time-to-live in seconds
             cleanup_interval: Seconds between cleanup runs
+            shards: Number of dicts to spread sessions over
+            resolution: Width in seconds of the expiry buckets
+
+        Raises:
+            ValueError: If shards is less than 1 or resolution is not positive
         """
-        self._store: dict[str, MemoryEntry] = {}
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+        if resolution <= 0:
+            raise ValueError("resolution must be positive")
+        self._shards: list[dict[str, MemoryEntry]] = [{} for _ in range(shards)]
+        # Timer wheel: session IDs by expiry bucket, plus a min-heap of the
+        # bucket numbers.  IDs whose session was since rewritten, touched or
+        # deleted are skipped when their bucket is swept.
+        self._resolution = resolution
+        self._buckets: dict[int, list[str]] = {}
+        self._bucket_order: list[int] = []
+        self._scheduled = 0
+        # Bumped by _rebuild_wheel() so a sweep can tell its bucket was re-filed
+        self._wheel_generation = 0
         self._default_ttl = default_ttl
         self._cleanup_interval = cleanup_interval
         self._cleanup_task: asyncio.Task[None] | None = None
-        self._lock = asyncio.Lock()
+
+    def _shard(self, session_id: str) -> dict[str, MemoryEntry]:
+        return self._shards[hash(session_id) % len(self._shards)]
+
+    def _schedule_expiry(self, session_id: str, expires_at: float) -> None:
+        bucket = int(expires_at // self._resolution)
+        ids = self._buckets.get(bucket)
+        if ids is None:
+            ids = self._buckets[bucket] = []
+            heapq.heappush(self._bucket_order, bucket)
+        ids.append(session_id)
+        self._scheduled += 1
+        # Rebuild once stale wheel entries outnumber live sessions
+        if self._scheduled % 1024 == 0 and self._scheduled > 2 * self.session_count():
+            self._rebuild_wheel()
+
+    def _rebuild_wheel(self) -> None:
+        self._wheel_generation += 1
+        self._buckets = {}
+        self._bucket_order = []
+        self._scheduled = 0
+        for shard in self._shards:
+            for sid, entry in shard.items():
+                bucket = int(entry.expires_at // self._resolution)
+                ids = self._buckets.get(bucket)
+                if ids is None:
+                    ids = self._buckets[bucket] = []
+                    self._bucket_order.append(bucket)
+                ids.append(sid)
+                self._scheduled += 1
+        heapq.heapify(self._bucket_order)
 
     async def start_cleanup(self) -> None:
         """Start the periodic cleanup task."""
@@ -84,17 +150,29 @@ class MemorySessionStore(SessionStore):
         Returns:
             Session data or None if not found/expired
         """
-        async with self._lock:
-            entry = self._store.get(session_id)
-            if entry is None:
-                return None
+        return self.get_nowait(session_id)
 
-            # Check expiration
-            if _now_utc() > entry.expires_at:
-                del self._store[session_id]
-                return None
+    def get_nowait(self, session_id: str) -> dict[str, Any] | None:
+        """
+        Retrieve session data synchronously.
 
-            return entry.data
+        Args:
+            session_id: The session identifier
+
+        Returns:
+            Session data or None if not found/expired
+        """
+        shard = self._shard(session_id)
+        entry = shard.get(session_id)
+        if entry is None:
+            return None
+
+        # Check expiration
+        if time.monotonic() > entry.expires_at:
+            del shard[session_id]
+            return None
+
+        return entry.data
 
     async def set(
         self,
@@ -113,13 +191,9 @@ class MemorySessionStore(SessionStore):
         if ttl is None:
             ttl = self._default_ttl
 
-        expires_at = _now_utc() + timedelta(seconds=ttl)
-
-        async with self._lock:
-            self._store[session_id] = MemoryEntry(
-                data=data,
-                expires_at=expires_at,
-            )
+        expires_at = time.monotonic() + ttl
+        self._shard(session_id)[session_id] = MemoryEntry(data=data, expires_at=expires_at)
+        self._schedule_expiry(session_id, expires_at)
 
     async def delete(self, session_id: str) -> None:
         """
@@ -128,8 +202,7 @@ class MemorySessionStore(SessionStore):
         Args:
             session_id: The session identifier
         """
-        async with self._lock:
-            self._store.pop(session_id, None)
+        self._shard(session_id).pop(session_id, None)
 
     async def exists(self, session_id: str) -> bool:
         """
@@ -144,33 +217,99 @@ class MemorySessionStore(SessionStore):
         data = await self.get(session_id)
         return data is not None
 
+    async def touch(self, session_id: str, ttl: int | None = None) -> bool:
+        """
+        Extend a session's TTL without copying its data.
+
+        Args:
+            session_id: The session identifier
+            ttl: New time-to-live in seconds (uses default if not specified)
+
+        Returns:
+            True if session was touched
+        """
+        if ttl is None:
+            ttl = self._default_ttl
+
+        shard = self._shard(session_id)
+        entry = shard.get(session_id)
+        now = time.monotonic()
+        if entry is None:
+            return False
+        if now > entry.expires_at:
+            del shard[session_id]
+            return False
+
+        entry.expires_at = now + ttl
+        self._schedule_expiry(session_id, entry.expires_at)
+        return True
+
     async def clear_expired(self) -> int:
         """
         Clear expired sessions.
 
+        Cost is proportional to the number of sessions expiring up to now,
+        not to the number stored.  Yields to the event loop every
+        ``CLEANUP_BATCH_SIZE`` sessions visited.
+
         Returns:
             Number of sessions cleared
         """
-        now = _now_utc()
         count = 0
-
-        async with self._lock:
-            expired_ids = [sid for sid, entry in self._store.items() if now > entry.expires_at]
-
-            for sid in expired_ids:
-                del self._store[sid]
-                count += 1
+        visited = 0
+        now = time.monotonic()
+        while self._bucket_order and self._bucket_order[0] <= int(now // self._resolution):
+            bucket = heapq.heappop(self._bucket_order)
+            ids = self._buckets.pop(bucket)
+            self._scheduled -= len(ids)
+            generation = self._wheel_generation
+            # The bucket holding "now" may contain sessions that have not expired yet
+            current = bucket == int(now // self._resolution)
+            pending = []
+            for sid in ids:
+                shard = self._shard(sid)
+                entry = shard.get(sid)
+                # Entries whose session was deleted, rewritten or touched are skipped
+                if entry is not None:
+                    if entry.expires_at < now:
+                        del shard[sid]
+                        count += 1
+                    elif current and int(entry.expires_at // self._resolution) == bucket:
+                        pending.append(sid)
+
+                visited += 1
+                if visited % CLEANUP_BATCH_SIZE == 0:
+                    await asyncio.sleep(0)
+                    if self._wheel_generation != generation:
+                        # The rebuilt wheel already files the rest of this bucket
+                        pending = []
+                        break
+
+            if pending:
+                for sid in pending:
+                    entry = self._shard(sid).get(sid)
+                    # Deleted, or touched into another bucket, while we yielded
+                    if entry is None or int(entry.expires_at // self._resolution) != bucket:
+                        continue
+                    self._schedule_expiry(sid, entry.expires_at)
+                    if self._wheel_generation != generation:
+                        break
+                break
+            now = time.monotonic()
 
         return count
 
     async def clear_all(self) -> None:
         """Clear all sessions (for testing)."""
-        async with self._lock:
-            self._store.clear()
+        for shard in self._shards:
+            shard.clear()
+        self._buckets.clear()
+        self._bucket_order.clear()
+        self._scheduled = 0
 
     def session_count(self) -> int:
         """Get number of sessions (for testing)."""
-        return len(self._store)
+        return sum(len(shard) for shard in self._shards)
 
     async def _cleanup_loop(self) -> None:
         """Periodic cleanup of expired sessions."""
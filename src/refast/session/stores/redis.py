@@ -1,6 +1,8 @@
 """Redis session store."""
 
 import json
+from collections.abc import Callable, Collection, Iterable
+from datetime import UTC, datetime
 from typing import Any
 
 from refast.session.stores.base import SessionStore
@@ -13,6 +15,81 @@ except ImportError:
     redis = None  # type: ignore[assignment]
     REDIS_AVAILABLE = False
 
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None  # type: ignore[assignment]
+    MSGPACK_AVAILABLE = False
+
+# Hash field holding id and timestamps; data keys are stored as "d:<key>"
+META_FIELD = "__meta__"
+DATA_PREFIX = "d:"
+
+_META_KEYS = ("id", "created_at", "updated_at", "expires_at", "version")
+
+# Partial save: write only if the session still exists, so a save racing a
+# delete cannot leave a hash holding just the changed keys.
+# KEYS[1]: the session hash; ARGV: ttl, number of fields to set, then the
+# field/value pairs to set and the fields to delete.  Returns 1 if written.
+UPDATE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then return 0 end
+local n = tonumber(ARGV[2])
+redis.call('HSET', KEYS[1], unpack(ARGV, 3, 2 + 2 * n))
+if #ARGV > 2 + 2 * n then
+    redis.call('HDEL', KEYS[1], unpack(ARGV, 3 + 2 * n))
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+# Convert a session stored as a JSON string by older versions of this store
+# into a hash, unless it was deleted or converted in the meantime.
+# KEYS[1]: the session key; ARGV: ttl, then the field/value pairs.
+MIGRATE_SCRIPT = """
+if redis.call('TYPE', KEYS[1]).ok ~= 'string' then return 0 end
+redis.call('DEL', KEYS[1])
+redis.call('HSET', KEYS[1], unpack(ARGV, 2))
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+
+def _serializer(name: str) -> tuple[Callable[[Any], bytes | str], Callable[[Any], Any]]:
+    """Return the (encode, decode) pair for a serializer name."""
+    if name == "json":
+        return (lambda v: json.dumps(v, separators=(",", ":"))), json.loads
+    if name == "orjson":
+        if not ORJSON_AVAILABLE:
+            raise ImportError("orjson is not installed. Install with: pip install orjson")
+        return orjson.dumps, orjson.loads  # type: ignore[union-attr]
+    if name == "msgpack":
+        if not MSGPACK_AVAILABLE:
+            raise ImportError("msgpack is not installed. Install with: pip install msgpack")
+        return (
+            lambda v: msgpack.packb(v, use_bin_type=True),  # type: ignore[union-attr]
+            lambda b: msgpack.unpackb(b, raw=False),  # type: ignore[union-attr]
+        )
+    raise ValueError(f"Unknown serializer: {name!r} (use 'json', 'orjson' or 'msgpack')")
+
+
+def _field_name(field: Any) -> str:
+    return field.decode() if isinstance(field, bytes) else field
+
+
+def _flatten(fields: dict[str, Any]) -> list[Any]:
+    """Hash fields as a flat field, value, ... argument list."""
+    return [item for pair in fields.items() for item in pair]
+
 
 class RedisSessionStore(SessionStore):
     """
@@ -21,11 +98,20 @@ class RedisSessionStore(SessionStore):
     Suitable for production with multiple workers.
     Requires the `redis` extra: pip install refast[redis]
 
+    Each session is a Redis hash with one field per session key, so saving
+    a session writes only the keys that changed.  The field writes and the
+    TTL refresh run together in one script, which skips sessions deleted in
+    the meantime.  Sessions stored as JSON strings by older versions are
+    converted to hashes when first read.  Values are encoded with
+    JSON, or with ``orjson`` or ``msgpack`` if installed and selected.
+
     Example:
         ```python
         store = RedisSessionStore(
             redis_url="redis://localhost:6379/0",
             prefix="refast:session:",
+            serializer="msgpack",
+            max_connections=50,
         )
 
         # Or with existing Redis client
@@ -44,6 +130,10 @@ class RedisSessionStore(SessionStore):
         client: Any = None,
         prefix: str = "refast:session:",
         default_ttl: int = 3600,
+        *,
+        serializer: str = "json",
+        max_connections: int | None = None,
+        scan_count: int = 500,
     ):
         """
         Initialize the Redis store.
@@ -53,26 +143,37 @@ class RedisSessionStore(SessionStore):
             client: Existing Redis client instance
             prefix: Key prefix for session keys
             default_ttl: Default time-to-live in seconds
+            serializer: Value encoding: ``"json"``, ``"orjson"`` or ``"msgpack"``
+            max_connections: Size limit of the connection pool created for
+                redis_url (default: redis-py's)
+            scan_count: Keys requested per SCAN step in :meth:`clear_expired`
 
         Raises:
-            ImportError: If redis is not installed
-            ValueError: If neither redis_url nor client is provided
+            ImportError: If redis_url is given and redis is not installed,
+                or the serializer's package is not installed
+            ValueError: If neither redis_url nor client is provided, or the
+                serializer is unknown
         """
-        if not REDIS_AVAILABLE:
-            raise ImportError("Redis is not installed. Install with: pip install refast[redis]")
-
         self._prefix = prefix
         self._default_ttl = default_ttl
+        self._encode, self._decode = _serializer(serializer)
+        self._scan_count = scan_count
 
         if client:
             self._client = client
             self._owned_client = False
         elif redis_url:
-            self._client = redis.from_url(redis_url)  # type: ignore[union-attr]
+            if not REDIS_AVAILABLE:
+                raise ImportError("Redis is not installed. Install with: pip install refast[redis]")
+            options = {} if max_connections is None else {"max_connections": max_connections}
+            self._client = redis.from_url(redis_url, **options)  # type: ignore[union-attr]
             self._owned_client = True
         else:
             raise ValueError("Either redis_url or client must be provided")
 
+        self._update_script = self._client.register_script(UPDATE_SCRIPT)
+        self._migrate_script = self._client.register_script(MIGRATE_SCRIPT)
+
     def _key(self, session_id: str) -> str:
         """
         Generate the Redis key for a session.
@@ -85,6 +186,56 @@ class RedisSessionStore(SessionStore):
         """
         return f"{self._prefix}{session_id}"
 
+    def _meta(self, data: dict[str, Any]) -> bytes | str:
+        return self._encode({k: data[k] for k in _META_KEYS if k in data})
+
+    def _fields(self, data: dict[str, Any], keys: Iterable[str] | None = None) -> dict[str, Any]:
+        """Hash fields for the metadata and the given (default: all) data keys."""
+        values = data.get("data", {})
+        fields: dict[str, Any] = {META_FIELD: self._meta(data)}
+        for key in values if keys is None else keys:
+            if key in values:
+                fields[DATA_PREFIX + key] = self._encode(values[key])
+        return fields
+
+    def _parse(self, raw: dict[Any, Any]) -> dict[str, Any] | None:
+        """Rebuild session data from a hash; None if it is empty."""
+        if not raw:
+            return None
+        session: dict[str, Any] = {}
+        values: dict[str, Any] = {}
+        for field, value in raw.items():
+            name = _field_name(field)
+            if name == META_FIELD:
+                session.update(self._decode(value))
+            elif name.startswith(DATA_PREFIX):
+                values[name[len(DATA_PREFIX) :]] = self._decode(value)
+        if "id" not in session:
+            return None
+        session["data"] = values
+        return session
+
+    async def _queue_write(
+        self,
+        pipe: Any,
+        session_id: str,
+        data: dict[str, Any],
+        changed: Collection[str] | None,
+        ttl: int,
+    ) -> None:
+        """Add the commands writing one session to *pipe*."""
+        key = self._key(session_id)
+        if changed is None:
+            pipe.delete(key)
+            pipe.hset(key, mapping=self._fields(data))
+            pipe.expire(key, ttl)
+            return
+        values = data.get("data", {})
+        fields = self._fields(data, changed)
+        removed = [DATA_PREFIX + k for k in changed if k not in values]
+        args = [ttl, len(fields), *_flatten(fields), *removed]
+        await self._update_script(keys=[key], args=args, client=pipe)
+
     async def get(self, session_id: str) -> dict[str, Any] | None:
         """
         Retrieve session data from Redis.
@@ -95,10 +246,65 @@ class RedisSessionStore(SessionStore):
         Returns:
             Session data or None if not found
         """
-        data = await self._client.get(self._key(session_id))
-        if data is None:
+        key = self._key(session_id)
+        try:
+            raw = await self._client.hgetall(key)
+        except Exception as e:
+            # A session stored as a string by an older version of this store
+            if "WRONGTYPE" not in str(e):
+                raise
+            return await self._migrate(key)
+        return self._parse(raw)
+
+    async def _migrate(self, key: str) -> dict[str, Any] | None:
+        """Convert a session stored as a JSON string into the hash layout."""
+        pipe = self._client.pipeline(transaction=False)
+        pipe.get(key)
+        pipe.ttl(key)
+        legacy, ttl = await pipe.execute()
+        data = json.loads(legacy) if legacy is not None else None
+        if not isinstance(data, dict) or "id" not in data:
             return None
-        return json.loads(data)
+        data.setdefault("data", {})
+        args = [ttl if ttl > 0 else self._default_ttl, *_flatten(self._fields(data))]
+        if not await self._migrate_script(keys=[key], args=args):
+            # Deleted or already converted by another worker
+            return self._parse(await self._client.hgetall(key))
+        return data
+
+    async def get_many(self, session_ids: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """
+        Retrieve several sessions in one round trip.
+
+        Sessions stored as JSON strings by older versions are converted to
+        hashes, as in :meth:`get`.
+
+        Args:
+            session_ids: The session identifiers
+
+        Returns:
+            Session data by ID, for the sessions that exist
+        """
+        ids = list(session_ids)
+        if not ids:
+            return {}
+        pipe = self._client.pipeline(transaction=False)
+        for session_id in ids:
+            pipe.hgetall(self._key(session_id))
+        results = await pipe.execute(raise_on_error=False)
+
+        found = {}
+        for session_id, raw in zip(ids, results, strict=True):
+            if isinstance(raw, Exception):
+                # A session stored as a string by an older version of this store
+                if "WRONGTYPE" not in str(raw):
+                    raise raw
+                data = await self._migrate(self._key(session_id))
+            else:
+                data = self._parse(raw)
+            if data is not None:
+                found[session_id] = data
+        return found
 
     async def set(
         self,
@@ -107,21 +313,65 @@ class RedisSessionStore(SessionStore):
         ttl: int | None = None,
     ) -> None:
         """
-        Store session data in Redis.
+        Store session data in Redis, replacing any stored copy.
 
         Args:
             session_id: The session identifier
             data: The session data
             ttl: Time-to-live in seconds
         """
+        await self.update(session_id, data, None, ttl)
+
+    async def update(
+        self,
+        session_id: str,
+        data: dict[str, Any],
+        changed: Collection[str] | None = None,
+        ttl: int | None = None,
+    ) -> bool:
+        """
+        Write the changed keys of a session and refresh its TTL.
+
+        A partial save is one script: HSET of the metadata and changed
+        keys, HDEL of deleted keys and EXPIRE, skipped if the session no
+        longer exists.  A full save replaces the hash in one transaction.
+
+        Args:
+            session_id: The session identifier
+            data: The full session data
+            changed: Keys of ``data["data"]`` set or deleted since the last
+                save, or None to replace the whole session
+            ttl: Time-to-live in seconds
+
+        Returns:
+            True if the session was written; False if a partial save was
+            skipped because the session no longer exists
+        """
         if ttl is None:
             ttl = self._default_ttl
 
-        await self._client.setex(
-            self._key(session_id),
-            ttl,
-            json.dumps(data),
-        )
+        pipe = self._client.pipeline(transaction=True)
+        await self._queue_write(pipe, session_id, data, changed, ttl)
+        results = await pipe.execute()
+        return changed is None or bool(results[0])
+
+    async def set_many(self, sessions: dict[str, dict[str, Any]], ttl: int | None = None) -> None:
+        """
+        Store several sessions in one round trip.
+
+        Args:
+            sessions: Session data by ID
+            ttl: Time-to-live in seconds
+        """
+        if not sessions:
+            return
+        if ttl is None:
+            ttl = self._default_ttl
+
+        pipe = self._client.pipeline(transaction=False)
+        for session_id, data in sessions.items():
+            await self._queue_write(pipe, session_id, data, None, ttl)
+        await pipe.execute()
 
     async def delete(self, session_id: str) -> None:
         """
@@ -162,7 +412,50 @@ class RedisSessionStore(SessionStore):
         result = await self._client.expire(self._key(session_id), ttl)
         return result > 0
 
+    async def clear_expired(self) -> int:
+        """
+        Delete sessions whose own ``expires_at`` has passed.
+
+        Redis removes sessions when their TTL runs out; this catches
+        sessions given a shorter expiry with ``Session.set_expiry()``.
+        Walks the keyspace incrementally with SCAN, so Redis is never
+        blocked, and reads the metadata of each batch in one pipeline.
+
+        Returns:
+            Number of sessions cleared
+        """
+        now = datetime.now(UTC)
+        count = 0
+        batch: list[Any] = []
+
+        async def sweep(keys: list[Any]) -> int:
+            pipe = self._client.pipeline(transaction=False)
+            for key in keys:
+                pipe.hget(key, META_FIELD)
+            metas = await pipe.execute()
+            expired = []
+            for key, meta in zip(keys, metas, strict=True):
+                if meta is None:
+                    continue
+                expires_at = self._decode(meta).get("expires_at")
+                if expires_at and datetime.fromisoformat(expires_at) < now:
+                    expired.append(key)
+            if expired:
+                await self._client.delete(*expired)
+            return len(expired)
+
+        async for key in self._client.scan_iter(
+            match=f"{self._prefix}*", count=self._scan_count, _type="hash"
+        ):
+            batch.append(key)
+            if len(batch) >= self._scan_count:
+                count += await sweep(batch)
+                batch = []
+        if batch:
+            count += await sweep(batch)
+        return count
+
     async def close(self) -> None:
         """Close the Redis connection if owned."""
         if self._owned_client:
-            await self._client.close()
+            await self._client.aclose()
@@ -0,0 +1,215 @@
+"""SQLite session store."""
+
+import json
+import os
+import time
+from collections.abc import Iterable
+from typing import Any
+
+from refast.session.stores.base import SessionStore
+from refast.utils.sqlite import SQLiteDatabase
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS sessions (
+        id TEXT PRIMARY KEY,
+        data TEXT NOT NULL,
+        expires_at REAL NOT NULL
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS sessions_expires_at ON sessions (expires_at)",
+)
+
+_GET = "SELECT data FROM sessions WHERE id = ? AND expires_at > ?"
+_EXISTS = "SELECT 1 FROM sessions WHERE id = ? AND expires_at > ?"
+_UPSERT = (
+    "INSERT INTO sessions (id, data, expires_at) VALUES (?, ?, ?) "
+    "ON CONFLICT (id) DO UPDATE SET data = excluded.data, expires_at = excluded.expires_at"
+)
+_DELETE = "DELETE FROM sessions WHERE id = ?"
+_TOUCH = "UPDATE sessions SET expires_at = ? WHERE id = ? AND expires_at > ?"
+_CLEAR_EXPIRED = "DELETE FROM sessions WHERE expires_at <= ?"
+
+# Most IDs per SELECT ... IN (...) in get_many (SQLite's variable limit is 32766)
+_MANY_CHUNK = 500
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Session store in a SQLite database file.
+
+    Durable across restarts and shared by all worker processes of one host,
+    without running a separate server.  The database runs in WAL mode, so
+    reads never wait for writes.  All I/O happens in worker threads.
+    Writes from concurrent requests are committed together in one
+    transaction, and expired sessions are found through an index on the
+    expiry time.
+
+    Example:
+        ```python
+        store = SQLiteSessionStore("/var/lib/myapp/sessions.db")
+        app.add_middleware(SessionMiddleware, store=store)
+        ```
+
+    Attributes:
+        path: The database file
+        default_ttl: Default time-to-live in seconds
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        default_ttl: int = 3600,
+        *,
+        readers: int = 2,
+        synchronous: str = "NORMAL",
+    ):
+        """
+        Initialize the store.  The database is opened on first use.
+
+        Args:
+            path: The database file (created if missing)
+            default_ttl: Default time-to-live in seconds
+            readers: Number of reader threads
+            synchronous: SQLite ``synchronous`` setting (``"FULL"`` to
+                survive power loss as well as crashes)
+        """
+        self.path = os.fspath(path)
+        self._default_ttl = default_ttl
+        self._db = SQLiteDatabase(path, schema=_SCHEMA, readers=readers, synchronous=synchronous)
+
+    @staticmethod
+    def _encode(data: dict[str, Any]) -> str:
+        return json.dumps(data, separators=(",", ":"))
+
+    async def get(self, session_id: str) -> dict[str, Any] | None:
+        """
+        Retrieve session data.
+
+        Args:
+            session_id: The session identifier
+
+        Returns:
+            Session data or None if not found/expired
+        """
+        row = await self._db.read(
+            lambda conn: conn.execute(_GET, (session_id, time.time())).fetchone()
+        )
+        return json.loads(row[0]) if row else None
+
+    async def get_many(self, session_ids: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """
+        Retrieve several sessions with one query per 500 IDs.
+
+        Args:
+            session_ids: The session identifiers
+
+        Returns:
+            Session data by ID, for the sessions that exist
+        """
+        ids = list(dict.fromkeys(session_ids))
+        if not ids:
+            return {}
+
+        def select(conn: Any) -> list[tuple[str, str]]:
+            now = time.time()
+            rows = []
+            for start in range(0, len(ids), _MANY_CHUNK):
+                chunk = ids[start : start + _MANY_CHUNK]
+                marks = ",".join("?" * len(chunk))
+                rows += conn.execute(
+                    f"SELECT id, data FROM sessions WHERE id IN ({marks}) AND expires_at > ?",
+                    (*chunk, now),
+                ).fetchall()
+            return rows
+
+        return {session_id: json.loads(data) for session_id, data in await self._db.read(select)}
+
+    async def set(
+        self,
+        session_id: str,
+        data: dict[str, Any],
+        ttl: int | None = None,
+    ) -> None:
+        """
+        Store session data.
+
+        Args:
+            session_id: The session identifier
+            data: The session data
+            ttl: Time-to-live in seconds (uses default if not specified)
+        """
+        if ttl is None:
+            ttl = self._default_ttl
+        await self._db.execute(_UPSERT, (session_id, self._encode(data), time.time() + ttl))
+
+    async def set_many(self, sessions: dict[str, dict[str, Any]], ttl: int | None = None) -> None:
+        """
+        Store several sessions in one statement.
+
+        Args:
+            sessions: Session data by ID
+            ttl: Time-to-live in seconds (uses default if not specified)
+        """
+        if not sessions:
+            return
+        if ttl is None:
+            ttl = self._default_ttl
+        expires_at = time.time() + ttl
+        await self._db.executemany(
+            _UPSERT,
+            [(sid, self._encode(data), expires_at) for sid, data in sessions.items()],
+        )
+
+    async def delete(self, session_id: str) -> None:
+        """
+        Delete a session.
+
+        Args:
+            session_id: The session identifier
+        """
+        await self._db.execute(_DELETE, (session_id,))
+
+    async def exists(self, session_id: str) -> bool:
+        """
+        Check if session exists.
+
+        Args:
+            session_id: The session identifier
+
+        Returns:
+            True if session exists and is not expired
+        """
+        row = await self._db.read(
+            lambda conn: conn.execute(_EXISTS, (session_id, time.time())).fetchone()
+        )
+        return row is not None
+
+    async def touch(self, session_id: str, ttl: int | None = None) -> bool:
+        """
+        Extend a session's TTL without rewriting its data.
+
+        Args:
+            session_id: The session identifier
+            ttl: New time-to-live in seconds (uses default if not specified)
+
+        Returns:
+            True if session was touched
+        """
+        if ttl is None:
+            ttl = self._default_ttl
+        now = time.time()
+        return await self._db.execute(_TOUCH, (now + ttl, session_id, now)) > 0
+
+    async def clear_expired(self) -> int:
+        """
+        Delete expired sessions, found through the expiry index.
+
+        Returns:
+            Number of sessions cleared
+        """
+        return await self._db.execute(_CLEAR_EXPIRED, (time.time(),))
+
+    async def close(self) -> None:
+        """Commit pending writes and close the database."""
+        await self._db.close()
@@ -0,0 +1,186 @@
+"""Write-behind persistence of sessions used by WebSocket connections."""
+
+import asyncio
+import contextlib
+import logging
+from typing import Any
+
+from refast.session.session import Session, SessionData
+from refast.session.stores.base import SessionStore
+
+logger = logging.getLogger(__name__)
+
+
+class SessionWriter:
+    """
+    Loads sessions for WebSocket connections and saves them behind them.
+
+    A connection's session is read from the store once, at the handshake,
+    and shared by all connections of this worker with the same session
+    cookie.  Changes are not written per mutation: a modified session is
+    queued, and every *interval* seconds the queued sessions are saved in
+    one batch, so a burst of callbacks costs one write.  When the last
+    connection using a session closes, pending changes are saved at once.
+
+    Example:
+        ```python
+        writer = SessionWriter(RedisSessionStore(redis_url="redis://localhost"))
+        session = await writer.acquire(session_id)  # on connect
+        session.set("cart", items)                  # saved within `interval`
+        await writer.release(session)               # on disconnect
+        ```
+
+    Attributes:
+        store: Where sessions are kept
+        interval: Seconds between batched writes
+        ttl: Time-to-live of written sessions (default: the store's)
+    """
+
+    def __init__(
+        self,
+        store: SessionStore,
+        interval: float = 0.5,
+        ttl: int | None = None,
+    ):
+        """
+        Initialize the writer.
+
+        Args:
+            store: Where sessions are kept
+            interval: Seconds between batched writes
+            ttl: Time-to-live of written sessions
+        """
+        self.store = store
+        self.interval = interval
+        self.ttl = ttl
+        # Loaded sessions by ID, with the number of connections using each
+        self._sessions: dict[str, Session] = {}
+        self._users: dict[str, int] = {}
+        self._dirty: dict[str, Session] = {}
+        self._task: asyncio.Task[None] | None = None
+
+    async def acquire(self, session_id: str) -> Session:
+        """
+        Return the session for *session_id*, loading it on first use.
+
+        Only sessions found in the store are adopted.  For an ID that is
+        missing or expired (e.g. one planted in the browser by someone else)
+        the connection gets a new session with a server-generated ID.  It
+        is neither shared nor saved, since a WebSocket cannot set the cookie
+        that would name it.
+
+        Args:
+            session_id: The session ID from the handshake cookie
+
+        Returns:
+            The session, shared with other connections using the same ID
+        """
+        session = self._sessions.get(session_id)
+        if session is None:
+            loaded = await self._load(session_id)
+            if loaded is None:
+                return Session(SessionData(), self.store)
+            # Another connection may have loaded it in the meantime
+            session = self._sessions.setdefault(session_id, loaded)
+
+        self._users[session_id] = self._users.get(session_id, 0) + 1
+        return session
+
+    async def release(self, session: Session) -> None:
+        """
+        Stop tracking *session* for one connection.
+
+        When no connection uses it any more, its pending changes are
+        saved now and it is dropped from the cache.
+        """
+        session_id = session.id
+        if self._sessions.get(session_id) is not session:
+            return
+        users = self._users.get(session_id, 0) - 1
+        if users > 0:
+            self._users[session_id] = users
+            return
+        self._users.pop(session_id, None)
+        del self._sessions[session_id]
+        session._on_modified = None
+        self._dirty.pop(session_id, None)
+        await self._write({session_id: session})
+
+    def mark(self, session: Session) -> None:
+        """Schedule a write of *session*."""
+        self._dirty[session.id] = session
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def flush(self) -> None:
+        """Save all pending sessions now."""
+        dirty, self._dirty = self._dirty, {}
+        await self._write(dirty)
+
+    async def close(self) -> None:
+        """Stop the background writer after saving pending sessions."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
+
+    async def _load(self, session_id: str) -> Session | None:
+        data = await self.store.get(session_id)
+        if not data:
+            return None
+        session_data = SessionData.from_dict(data)
+        if session_data.is_expired() or session_data.id != session_id:
+            return None
+        session = Session(session_data, self.store, persisted=True)
+        session._on_modified = self.mark
+        return session
+
+    async def _run(self) -> None:
+        while self._dirty:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    async def _write(self, sessions: dict[str, Session]) -> None:
+        """Save the modified sessions among *sessions*."""
+        full: dict[str, dict[str, Any]] = {}
+        partial: list[tuple[Session, dict[str, Any], set[str]]] = []
+        for session in sessions.values():
+            if not session.is_modified:
+                continue
+            changed, session._changed = session._changed, set()
+            session._modified = False
+            if changed is None:
+                full[session.id] = session.to_dict()
+            else:
+                partial.append((session, session.to_dict(), changed))
+
+        writes = [self._write_full(full, sessions)] if full else []
+        writes.extend(self._write_partial(*args) for args in partial)
+        if writes:
+            await asyncio.gather(*writes)
+
+    async def _write_full(
+        self, full: dict[str, dict[str, Any]], sessions: dict[str, Session]
+    ) -> None:
+        try:
+            await self.store.set_many(full, self.ttl)
+        except Exception as e:
+            logger.error(f"Failed to save sessions: {e}")
+            for session_id in full:
+                self._rewrite_later(sessions[session_id])
+
+    async def _write_partial(
+        self, session: Session, data: dict[str, Any], changed: set[str]
+    ) -> None:
+        try:
+            await self.store.update(session.id, data, changed, self.ttl)
+        except Exception as e:
+            logger.error(f"Failed to save session: {e}")
+            self._rewrite_later(session)
+
+    def _rewrite_later(self, session: Session) -> None:
+        # Written in full with its next change, or when released
+        session._modified = True
+        session._changed = None
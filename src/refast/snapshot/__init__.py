@@ -0,0 +1,17 @@
+"""Externalized context snapshots for reconnecting to any worker."""
+
+from refast.snapshot.base import SNAPSHOT_STORAGE_KEY, ContextSnapshot, ContextSnapshotStore
+from refast.snapshot.disk import DiskSnapshotStore
+from refast.snapshot.memory import MemorySnapshotStore
+from refast.snapshot.redis import RedisSnapshotStore
+from refast.snapshot.writer import SnapshotWriter
+
+__all__ = [
+    "SNAPSHOT_STORAGE_KEY",
+    "ContextSnapshot",
+    "ContextSnapshotStore",
+    "DiskSnapshotStore",
+    "MemorySnapshotStore",
+    "RedisSnapshotStore",
+    "SnapshotWriter",
+]
@@ -0,0 +1,235 @@
+"""Context snapshots and the abstract snapshot store."""
+
+import hashlib
+import json
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from refast.context import Context
+
+# sessionStorage key holding the tab's snapshot ID
+SNAPSHOT_STORAGE_KEY = "__refast_snapshot"
+
+
+def _session_hash(session_id: str | None) -> str | None:
+    """Digest of a session ID, stored instead of the ID itself."""
+    if session_id is None:
+        return None
+    return hashlib.sha256(session_id.encode()).hexdigest()
+
+
+@dataclass
+class ContextSnapshot:
+    """
+    Compact copy of the per-connection state of a :class:`~refast.Context`.
+
+    Holds what a worker needs to carry on a connection that was served by
+    another worker: the state dict, the current location and the browser
+    storage cache.  Callbacks and bindings are not included; they are
+    recreated by re-rendering the page.
+
+    Attributes:
+        state: Contents of ``ctx.state``
+        path: Current page path
+        query_string: Raw query string of the current URL
+        query_params: Parsed query parameters
+        path_params: Parameters matched from the page route
+        store: Browser storage cache, ``{"local": {...}, "session": {...}}``
+        session_hash: SHA-256 of the session ID of the connection it was
+            taken from (``None`` without a session cookie)
+        saved_at: Wall-clock time the snapshot was taken
+    """
+
+    state: dict[str, Any] = field(default_factory=dict)
+    path: str = "/"
+    query_string: str = ""
+    query_params: dict[str, str] = field(default_factory=dict)
+    path_params: dict[str, Any] = field(default_factory=dict)
+    store: dict[str, dict[str, Any]] = field(default_factory=dict)
+    session_hash: str | None = None
+    saved_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def capture(cls, ctx: "Context") -> "ContextSnapshot":
+        """Take a snapshot of *ctx*."""
+        store: dict[str, dict[str, Any]] = {}
+        if ctx._store is not None:
+            store = {
+                "local": ctx._store.local.get_all(),
+                "session": ctx._store.session.get_all(),
+            }
+            store["session"].pop(SNAPSHOT_STORAGE_KEY, None)
+        return cls(
+            state=ctx._state.to_dict(),
+            path=ctx._current_path,
+            query_string=ctx._query_string,
+            query_params=dict(ctx._query_params),
+            path_params=dict(ctx._path_params),
+            store=store,
+            session_hash=_session_hash(ctx.session_id),
+        )
+
+    def belongs_to(self, ctx: "Context") -> bool:
+        """Whether *ctx* has the session the snapshot was taken in."""
+        return self.session_hash == _session_hash(ctx.session_id)
+
+    def restore(self, ctx: "Context") -> None:
+        """
+        Apply the snapshot to a fresh context.
+
+        Browser storage already loaded into *ctx* wins: only keys the
+        browser did not report (writes that had not reached it yet) are
+        restored, and are queued for syncing back.
+        """
+        ctx._state.update(self.state)
+        ctx._current_path = self.path
+        ctx._query_string = self.query_string
+        ctx._query_params = dict(self.query_params)
+        ctx._path_params = dict(self.path_params)
+        for storage in (ctx.store.local, ctx.store.session):
+            for key, value in self.store.get(storage.storage_type, {}).items():
+                if key not in storage:
+                    storage.set(key, value)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        return {
+            "state": self.state,
+            "path": self.path,
+            "query_string": self.query_string,
+            "query_params": self.query_params,
+            "path_params": self.path_params,
+            "store": self.store,
+            "session_hash": self.session_hash,
+            "saved_at": self.saved_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ContextSnapshot":
+        """Create a snapshot from :meth:`to_dict` output."""
+        return cls(
+            state=data.get("state", {}),
+            path=data.get("path", "/"),
+            query_string=data.get("query_string", ""),
+            query_params=data.get("query_params", {}),
+            path_params=data.get("path_params", {}),
+            store=data.get("store", {}),
+            session_hash=data.get("session_hash"),
+            saved_at=data.get("saved_at", 0.0),
+        )
+
+    def encode(self) -> bytes:
+        """
+        Serialize to compact JSON.
+
+        Raises:
+            TypeError: If the state holds a value JSON cannot represent
+        """
+        return json.dumps(self.to_dict(), separators=(",", ":"), ensure_ascii=False).encode()
+
+    @classmethod
+    def decode(cls, data: bytes | str) -> "ContextSnapshot":
+        """Deserialize :meth:`encode` output."""
+        return cls.from_dict(json.loads(data))
+
+
+class ContextSnapshotStore(ABC):
+    """
+    Abstract base class for context snapshot storage.
+
+    Snapshots are written behind the connection (see
+    :class:`~refast.snapshot.SnapshotWriter`) and read when a client
+    reconnects, possibly to a different worker.  Use a store all workers
+    can reach: :class:`~refast.snapshot.DiskSnapshotStore` for workers on
+    one host, :class:`~refast.snapshot.RedisSnapshotStore` across hosts.
+
+    Example:
+        ```python
+        class MyStore(ContextSnapshotStore):
+            async def get(self, snapshot_id: str) -> ContextSnapshot | None:
+                data = await backend.read(snapshot_id)
+                return ContextSnapshot.decode(data) if data else None
+
+            async def set(
+                self, snapshot_id: str, snapshot: ContextSnapshot, ttl: int | None = None
+            ) -> None:
+                await backend.write(snapshot_id, snapshot.encode(), ttl)
+
+            async def delete(self, snapshot_id: str) -> None:
+                await backend.remove(snapshot_id)
+        ```
+
+    Attributes:
+        default_ttl: Seconds a snapshot is kept when no TTL is given
+    """
+
+    default_ttl: int = 86400
+
+    @abstractmethod
+    async def get(self, snapshot_id: str) -> ContextSnapshot | None:
+        """
+        Retrieve a snapshot.
+
+        Args:
+            snapshot_id: The snapshot identifier
+
+        Returns:
+            The snapshot, or None if missing or expired
+        """
+
+    @abstractmethod
+    async def set(
+        self,
+        snapshot_id: str,
+        snapshot: ContextSnapshot,
+        ttl: int | None = None,
+    ) -> None:
+        """
+        Store a snapshot, replacing any previous one.
+
+        Args:
+            snapshot_id: The snapshot identifier
+            snapshot: The snapshot to store
+            ttl: Time-to-live in seconds (default: :attr:`default_ttl`)
+        """
+
+    @abstractmethod
+    async def delete(self, snapshot_id: str) -> None:
+        """
+        Delete a snapshot.
+
+        Args:
+            snapshot_id: The snapshot identifier
+        """
+
+    async def set_many(
+        self,
+        snapshots: dict[str, ContextSnapshot],
+        ttl: int | None = None,
+    ) -> None:
+        """
+        Store several snapshots.
+
+        Backends that can batch writes override this.
+
+        Args:
+            snapshots: Snapshots by ID
+            ttl: Time-to-live in seconds (default: :attr:`default_ttl`)
+        """
+        for snapshot_id, snapshot in snapshots.items():
+            await self.set(snapshot_id, snapshot, ttl)
+
+    async def clear_expired(self) -> int:
+        """
+        Remove expired snapshots.
+
+        Returns:
+            Number of snapshots removed
+        """
+        return 0
+
+    async def close(self) -> None:
+        """Release resources held by the store."""
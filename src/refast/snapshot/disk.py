@@ -0,0 +1,144 @@
+"""File-per-snapshot store on a local or shared filesystem."""
+
+import asyncio
+import contextlib
+import json
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+
+from refast.snapshot.base import ContextSnapshot, ContextSnapshotStore
+
+_VALID_ID = re.compile(r"^[A-Za-z0-9_-]{1,128}$")
+
+
+class DiskSnapshotStore(ContextSnapshotStore):
+    """
+    Snapshot store keeping one JSON file per snapshot in a directory.
+
+    All workers of a host (or of several hosts sharing the directory)
+    see the same snapshots.  Files are replaced atomically, so a reader
+    never sees a partial write, and all file I/O runs in a thread.
+
+    Example:
+        ```python
+        ui = RefastApp(snapshot_store=DiskSnapshotStore("/var/lib/myapp/snapshots"))
+        ```
+
+    Attributes:
+        directory: Where snapshot files are kept
+    """
+
+    def __init__(self, directory: str | os.PathLike[str], default_ttl: int = 86400):
+        """
+        Initialize the store, creating *directory* if needed.
+
+        Args:
+            directory: Directory for snapshot files
+            default_ttl: Default time-to-live in seconds
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.default_ttl = default_ttl
+
+    def _path(self, snapshot_id: str) -> Path:
+        """
+        Return the file for *snapshot_id*.
+
+        Raises:
+            ValueError: If the ID could escape the directory
+        """
+        if not _VALID_ID.match(snapshot_id):
+            raise ValueError(f"Invalid snapshot ID: {snapshot_id!r}")
+        return self.directory / f"{snapshot_id}.json"
+
+    async def get(self, snapshot_id: str) -> ContextSnapshot | None:
+        try:
+            path = self._path(snapshot_id)
+        except ValueError:
+            return None
+        return await asyncio.to_thread(self._read, path)
+
+    async def set(
+        self,
+        snapshot_id: str,
+        snapshot: ContextSnapshot,
+        ttl: int | None = None,
+    ) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        path = self._path(snapshot_id)
+        data = _envelope(snapshot, time.time() + ttl)
+        await asyncio.to_thread(self._write, path, data)
+
+    async def set_many(
+        self,
+        snapshots: dict[str, ContextSnapshot],
+        ttl: int | None = None,
+    ) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.time() + ttl
+        writes = [
+            (self._path(key), _envelope(snapshot, expires_at))
+            for key, snapshot in snapshots.items()
+        ]
+
+        def write_all() -> None:
+            for path, data in writes:
+                self._write(path, data)
+
+        await asyncio.to_thread(write_all)
+
+    async def delete(self, snapshot_id: str) -> None:
+        path = self._path(snapshot_id)
+        await asyncio.to_thread(path.unlink, missing_ok=True)
+
+    async def clear_expired(self) -> int:
+        def sweep() -> int:
+            now = time.time()
+            removed = 0
+            for path in self.directory.glob("*.json"):
+                try:
+                    expires_at = json.loads(path.read_bytes())["expires_at"]
+                except (OSError, ValueError, KeyError, TypeError):
+                    continue
+                if expires_at <= now:
+                    path.unlink(missing_ok=True)
+                    removed += 1
+            return removed
+
+        return await asyncio.to_thread(sweep)
+
+    def _read(self, path: Path) -> ContextSnapshot | None:
+        try:
+            raw = json.loads(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            # Corrupt file; treat as missing
+            return None
+        if raw.get("expires_at", 0) <= time.time():
+            path.unlink(missing_ok=True)
+            return None
+        return ContextSnapshot.from_dict(raw["snapshot"])
+
+    def _write(self, path: Path, data: bytes) -> None:
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(tmp)
+            raise
+
+
+def _envelope(snapshot: ContextSnapshot, expires_at: float) -> bytes:
+    """Encode *snapshot* together with its expiry time."""
+    return json.dumps(
+        {"expires_at": expires_at, "snapshot": snapshot.to_dict()},
+        separators=(",", ":"),
+        ensure_ascii=False,
+    ).encode()
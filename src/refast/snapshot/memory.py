@@ -0,0 +1,63 @@
+"""In-memory snapshot store."""
+
+import time
+
+from refast.snapshot.base import ContextSnapshot, ContextSnapshotStore
+
+
+class MemorySnapshotStore(ContextSnapshotStore):
+    """
+    In-memory snapshot store.
+
+    Snapshots survive a dropped connection but not the worker, so this
+    store only helps clients that reconnect to the same process.  Useful
+    for development and tests.
+
+    Example:
+        ```python
+        ui = RefastApp(snapshot_store=MemorySnapshotStore())
+        ```
+    """
+
+    def __init__(self, default_ttl: int = 86400):
+        """
+        Initialize the store.
+
+        Args:
+            default_ttl: Default time-to-live in seconds
+        """
+        self.default_ttl = default_ttl
+        # Encoded, so stored snapshots never alias live state
+        self._entries: dict[str, tuple[float, bytes]] = {}
+
+    async def get(self, snapshot_id: str) -> ContextSnapshot | None:
+        entry = self._entries.get(snapshot_id)
+        if entry is None:
+            return None
+        expires_at, data = entry
+        if expires_at <= time.monotonic():
+            del self._entries[snapshot_id]
+            return None
+        return ContextSnapshot.decode(data)
+
+    async def set(
+        self,
+        snapshot_id: str,
+        snapshot: ContextSnapshot,
+        ttl: int | None = None,
+    ) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        self._entries[snapshot_id] = (time.monotonic() + ttl, snapshot.encode())
+
+    async def delete(self, snapshot_id: str) -> None:
+        self._entries.pop(snapshot_id, None)
+
+    async def clear_expired(self) -> int:
+        now = time.monotonic()
+        expired = [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+        return len(expired)
+
+    def __len__(self) -> int:
+        return len(self._entries)
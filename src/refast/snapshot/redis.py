@@ -0,0 +1,104 @@
+"""Redis snapshot store."""
+
+from typing import Any
+
+from refast.snapshot.base import ContextSnapshot, ContextSnapshotStore
+
+try:
+    import redis.asyncio as redis
+
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis = None  # type: ignore[assignment]
+    REDIS_AVAILABLE = False
+
+
+class RedisSnapshotStore(ContextSnapshotStore):
+    """
+    Redis-backed snapshot store.
+
+    Reachable from workers on any host.  Batched writes go out in one
+    pipeline.  Requires the `redis` extra (pip install refast[redis])
+    unless a client is passed in.
+
+    Example:
+        ```python
+        ui = RefastApp(snapshot_store=RedisSnapshotStore(redis_url="redis://localhost:6379/0"))
+        ```
+
+    Attributes:
+        prefix: Key prefix for snapshot keys in Redis
+    """
+
+    def __init__(
+        self,
+        redis_url: str | None = None,
+        client: Any = None,
+        prefix: str = "refast:snapshot:",
+        default_ttl: int = 86400,
+    ):
+        """
+        Initialize the Redis store.
+
+        Args:
+            redis_url: Redis connection URL
+            client: Existing ``redis.asyncio`` client (or compatible object)
+            prefix: Key prefix for snapshot keys
+            default_ttl: Default time-to-live in seconds
+
+        Raises:
+            ImportError: If redis_url is given and redis is not installed
+            ValueError: If neither redis_url nor client is provided
+        """
+        self.prefix = prefix
+        self.default_ttl = default_ttl
+
+        if client is not None:
+            self._client = client
+            self._owned_client = False
+        elif redis_url:
+            if not REDIS_AVAILABLE:
+                raise ImportError("Redis is not installed. Install with: pip install refast[redis]")
+            self._client = redis.from_url(redis_url)  # type: ignore[union-attr]
+            self._owned_client = True
+        else:
+            raise ValueError("Either redis_url or client must be provided")
+
+    def _key(self, snapshot_id: str) -> str:
+        return f"{self.prefix}{snapshot_id}"
+
+    async def get(self, snapshot_id: str) -> ContextSnapshot | None:
+        data = await self._client.get(self._key(snapshot_id))
+        if data is None:
+            return None
+        return ContextSnapshot.decode(data)
+
+    async def set(
+        self,
+        snapshot_id: str,
+        snapshot: ContextSnapshot,
+        ttl: int | None = None,
+    ) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        await self._client.setex(self._key(snapshot_id), ttl, snapshot.encode())
+
+    async def set_many(
+        self,
+        snapshots: dict[str, ContextSnapshot],
+        ttl: int | None = None,
+    ) -> None:
+        if not snapshots:
+            return
+        ttl = self.default_ttl if ttl is None else ttl
+        pipe = self._client.pipeline(transaction=False)
+        for snapshot_id, snapshot in snapshots.items():
+            pipe.setex(self._key(snapshot_id), ttl, snapshot.encode())
+        await pipe.execute()
+
+    async def delete(self, snapshot_id: str) -> None:
+        await self._client.delete(self._key(snapshot_id))
+
+    async def close(self) -> None:
+        """Close the Redis connection if owned."""
+        if self._owned_client:
+            await self._client.aclose()
@@ -0,0 +1,166 @@
+"""Write-behind scheduling of context snapshots."""
+
+import asyncio
+import contextlib
+import logging
+import secrets
+from typing import TYPE_CHECKING, Any
+
+from refast.snapshot.base import SNAPSHOT_STORAGE_KEY, ContextSnapshot, ContextSnapshotStore
+
+if TYPE_CHECKING:
+    from refast.context import Context
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotWriter:
+    """
+    Persists context snapshots behind the connections.
+
+    Contexts are marked dirty after each message they handle.  Every
+    *interval* seconds the writer snapshots the dirty contexts whose data
+    changed since their last write and stores them in one batch, so a burst
+    of callbacks costs one write.  A crash loses at most *interval* seconds
+    of changes.  On disconnect the final state is written at once.
+
+    Each browser tab gets its own snapshot ID, kept in its sessionStorage,
+    which the client sends back on every (re)connect.
+
+    Example:
+        ```python
+        writer = SnapshotWriter(MemorySnapshotStore(), interval=0.5)
+        await writer.restore(ctx)  # on store_init
+        writer.mark(ctx)           # after each handled message
+        await writer.release(ctx)  # on disconnect
+        ```
+
+    Attributes:
+        store: Where snapshots are kept
+        interval: Seconds between batched writes
+        ttl: Time-to-live of written snapshots (default: the store's)
+    """
+
+    def __init__(
+        self,
+        store: ContextSnapshotStore,
+        interval: float = 1.0,
+        ttl: int | None = None,
+    ):
+        """
+        Initialize the writer.
+
+        Args:
+            store: Where snapshots are kept
+            interval: Seconds between batched writes
+            ttl: Time-to-live of written snapshots
+        """
+        self.store = store
+        self.interval = interval
+        self.ttl = ttl
+        self._dirty: dict[str, Context] = {}
+        # Data version of each snapshot when last written
+        self._written: dict[str, tuple[Any, ...]] = {}
+        self._task: asyncio.Task[None] | None = None
+
+    async def restore(self, ctx: "Context") -> bool:
+        """
+        Restore *ctx* from the snapshot named in its sessionStorage.
+
+        Call after the browser storage has been loaded.  A snapshot taken
+        in another session is not applied.  Gives the context a fresh
+        snapshot ID either way, so tabs duplicated from one another do not
+        overwrite each other's snapshots; a restored snapshot is saved
+        under the new ID and the old one is deleted.
+
+        Returns:
+            True if a snapshot was found and applied
+        """
+        previous = ctx.store.session.get(SNAPSHOT_STORAGE_KEY)
+        restored = False
+        if isinstance(previous, str):
+            try:
+                snapshot = await self.store.get(previous)
+            except Exception as e:
+                logger.error(f"Failed to load context snapshot: {e}")
+                snapshot = None
+            if snapshot is not None and not snapshot.belongs_to(ctx):
+                logger.warning("Ignoring a context snapshot taken in another session")
+            elif snapshot is not None:
+                snapshot.restore(ctx)
+                restored = True
+
+        ctx._snapshot_id = secrets.token_urlsafe(24)
+        ctx.store.session.set(SNAPSHOT_STORAGE_KEY, ctx._snapshot_id)
+        if restored:
+            # Saved under the new ID before the old copy goes away
+            await self._write(self._collect({ctx._snapshot_id: ctx}))
+            self._written.pop(previous, None)
+            try:
+                await self.store.delete(previous)
+            except Exception as e:
+                logger.error(f"Failed to delete context snapshot: {e}")
+        return restored
+
+    def mark(self, ctx: "Context") -> None:
+        """Schedule a write of *ctx*'s snapshot."""
+        if ctx._snapshot_id is None:
+            return
+        self._dirty[ctx._snapshot_id] = ctx
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def release(self, ctx: "Context") -> None:
+        """Write *ctx*'s final snapshot now and stop tracking it."""
+        snapshot_id = ctx._snapshot_id
+        if snapshot_id is None:
+            return
+        self._dirty.pop(snapshot_id, None)
+        snapshots = self._collect({snapshot_id: ctx})
+        self._written.pop(snapshot_id, None)
+        await self._write(snapshots)
+
+    async def flush(self) -> None:
+        """Write all pending snapshots now."""
+        dirty, self._dirty = self._dirty, {}
+        await self._write(self._collect(dirty))
+
+    async def close(self) -> None:
+        """Stop the background writer after flushing pending snapshots."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while self._dirty:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    def _collect(self, contexts: dict[str, "Context"]) -> dict[str, ContextSnapshot]:
+        """Snapshot the contexts whose data changed since their last write."""
+        snapshots = {}
+        for snapshot_id, ctx in contexts.items():
+            version = (*ctx._data_version(), ctx.url)
+            if self._written.get(snapshot_id) == version:
+                continue
+            self._written[snapshot_id] = version
+            snapshots[snapshot_id] = ContextSnapshot.capture(ctx)
+        return snapshots
+
+    async def _write(self, snapshots: dict[str, ContextSnapshot]) -> None:
+        if not snapshots:
+            return
+        try:
+            await self.store.set_many(snapshots, self.ttl)
+            return
+        except Exception as e:
+            logger.warning(f"Batched snapshot write failed ({e}); writing individually")
+        for snapshot_id, snapshot in snapshots.items():
+            try:
+                await self.store.set(snapshot_id, snapshot, self.ttl)
+            except Exception as e:
+                self._written.pop(snapshot_id, None)
+                logger.error(f"Failed to write context snapshot: {e}")
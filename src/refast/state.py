@@ -1,11 +1,22 @@
 """State management for Refast."""
 
-from typing import Any, Generic, TypeVar
+import asyncio
+import inspect
+import logging
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
 
 from pydantic import BaseModel
 
+from refast.binding import Binding, BindingTarget, push_targets
+
+if TYPE_CHECKING:
+    from refast.context import Context
+
 T = TypeVar("T")
 
+logger = logging.getLogger(__name__)
+
 
 class State(Generic[T]):
     """
@@ -29,6 +40,10 @@ class State(Generic[T]):
         ```python
         ctx.state["count"] = 0
         ```
+
+    Keys can be bound to component props with ``ctx.bind(key)``.  Changing a
+    bound key queues an ``update_props`` message for exactly the components
+    that display it, so no ``ctx.refresh()`` is needed.
     """
 
     def __init__(self, initial: T | dict[str, Any] | None = None):
@@ -41,12 +56,22 @@ class State(Generic[T]):
         else:
             self._data = {}
             self._model_class = None
+        # Binding targets rendered for the owning context, by key
+        self._targets: dict[str, list[BindingTarget]] = {}
+        self._ctx: Context | None = None
+        self._pending: set[str] = set()
+        self._flush_scheduled = False
+        # Bumped on every write; used to detect stale prefetched pages
+        self._version = 0
 
     def __getitem__(self, key: str) -> Any:
         return self._data[key]
 
     def __setitem__(self, key: str, value: Any) -> None:
         self._data[key] = value
+        self._version += 1
+        if key in self._targets:
+            self._mark_changed(key)
 
     def __contains__(self, key: str) -> bool:
         return key in self._data
@@ -57,15 +82,23 @@ class State(Generic[T]):
 
     def set(self, key: str, value: Any) -> None:
         """Set a value."""
-        self._data[key] = value
+        self[key] = value
 
     def update(self, data: dict[str, Any]) -> None:
         """Update multiple values."""
         self._data.update(data)
+        self._version += 1
+        for key in data:
+            if key in self._targets:
+                self._mark_changed(key)
 
     def pop(self, key: str, *args: Any) -> Any:
         """Remove specified key and return the corresponding value."""
-        return self._data.pop(key, *args)
+        value = self._data.pop(key, *args)
+        self._version += 1
+        if key in self._targets:
+            self._mark_changed(key)
+        return value
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
@@ -80,3 +113,276 @@ class State(Generic[T]):
             except Exception:
                 return False
         return True
+
+    async def flush(self) -> None:
+        """Push queued changes of bound keys to the client now."""
+        keys = self._pending
+        self._pending = set()
+        if not keys or self._ctx is None:
+            return
+        targets = [target for key in keys for target in self._targets.get(key, ())]
+        if targets:
+            await push_targets(self._ctx, targets)
+
+    def _mark_changed(self, key: str) -> None:
+        """Queue *key* for pushing and schedule an automatic flush."""
+        self._pending.add(key)
+        if not self._flush_scheduled:
+            self._flush_scheduled = _schedule(self._do_flush)
+
+    def _do_flush(self) -> None:
+        """Run :meth:`flush` in a task (scheduled from :meth:`_mark_changed`)."""
+        self._flush_scheduled = False
+        _create_task(self.flush())
+
+    def _bind(self, ctx: "Context", key: str, target: BindingTarget) -> None:
+        """Register a rendered target for *key*."""
+        self._ctx = ctx
+        self._targets.setdefault(key, []).append(target)
+        ctx._binding_sources.add(self)
+
+    def _unbind(self, ctx: "Context") -> None:
+        """Drop all targets; the new render already shows current values."""
+        self._targets.clear()
+        self._pending.clear()
+
+    def _unbind_targets(self, ctx: "Context", match: Callable[[BindingTarget], bool]) -> None:
+        """Drop the targets for which *match* is true (their subtree was replaced)."""
+        for key in list(self._targets):
+            targets = [target for target in self._targets[key] if not match(target)]
+            if targets:
+                self._targets[key] = targets
+            else:
+                del self._targets[key]
+
+
+def _schedule(callback: Callable[[], None]) -> bool:
+    """Run *callback* soon on the running loop; return False if there is none."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # No running event loop - changes are pushed on the next flush()
+        return False
+    loop.call_soon(callback)
+    return True
+
+
+# Strong references to running flush tasks (the loop only keeps weak ones)
+_background_tasks: set[asyncio.Task[Any]] = set()
+
+
+def _create_task(coro: Any) -> None:
+    """Start *coro* as a task on the running loop, if there is one."""
+    try:
+        task = asyncio.get_running_loop().create_task(coro)
+    except RuntimeError:
+        coro.close()
+        return
+    _background_tasks.add(task)
+    task.add_done_callback(_task_done)
+
+
+def _task_done(task: asyncio.Task[Any]) -> None:
+    """Forget a finished flush task and log its error, if any."""
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Pushing state changes failed", exc_info=task.exception())
+
+
+class SharedState:
+    """
+    App-scoped reactive key-value store shared by every connection.
+
+    Values live on the :class:`~refast.app.RefastApp` (``ui.shared_state``)
+    rather than on a single :class:`Context`.  Components can bind a prop to a
+    shared key with :meth:`bind`; when the key changes, only the connections
+    that rendered a bound component receive an ``update_props`` message for
+    exactly those components — no page function is re-run.
+
+    Changes made in the same event-loop iteration are coalesced and pushed
+    together.  Call :meth:`flush` to push pending changes immediately.
+
+    Example:
+        ```python
+        ui = RefastApp()
+        ui.shared_state["visitors"] = 0
+
+        @ui.page("/")
+        def home(ctx: Context):
+            return Column([
+                Text(ui.shared_state.bind("visitors", format=lambda v: f"Visitors: {v}")),
+                Button("Join", on_click=ctx.callback(join)),
+            ])
+
+        async def join(ctx: Context):
+            ui.shared_state["visitors"] += 1  # every bound Text updates in place
+        ```
+    """
+
+    def __init__(self, initial: dict[str, Any] | None = None):
+        self._data: dict[str, Any] = dict(initial) if initial else {}
+        self._subscribers: dict[str, list[Callable[[str, Any], Any]]] = {}
+        # key -> context -> targets rendered on that connection
+        self._targets: dict[str, dict[Context, list[BindingTarget]]] = {}
+        self._context_keys: dict[Context, set[str]] = {}
+        self._pending: set[str] = set()
+        self._flush_scheduled = False
+        self._version = 0
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.set(key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._data
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a value with optional default."""
+        return self._data.get(key, default)
+
+    def set(self, key: str, value: Any) -> None:
+        """Set a value and schedule a push to bound components."""
+        self._data[key] = value
+        self._mark_changed(key)
+
+    def update(self, data: dict[str, Any]) -> None:
+        """Update multiple values."""
+        self._data.update(data)
+        for key in data:
+            self._mark_changed(key)
+
+    def pop(self, key: str, *args: Any) -> Any:
+        """Remove specified key and return the corresponding value."""
+        value = self._data.pop(key, *args)
+        self._mark_changed(key)
+        return value
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return self._data.copy()
+
+    def bind(
+        self,
+        key: str,
+        default: Any = None,
+        format: Callable[[Any], Any] | None = None,
+    ) -> Binding:
+        """
+        Create a binding to *key* for use as a prop value or child.
+
+        Args:
+            key: The shared key to display.
+            default: Value used while *key* is not set.
+            format: Optional callable applied to the value before sending.
+
+        Returns:
+            A :class:`~refast.binding.Binding` placeholder.
+        """
+        return Binding(self, key, default=default, format=format)
+
+    def subscribe(self, key: str, callback: Callable[[str, Any], Any]) -> Callable[[], None]:
+        """
+        Register *callback* to run whenever *key* changes.
+
+        The callback receives ``(key, value)`` and may be a coroutine
+        function.  Callbacks run when pending changes are flushed.
+
+        Returns:
+            A function that removes the subscription.
+        """
+        callbacks = self._subscribers.setdefault(key, [])
+        callbacks.append(callback)
+
+        def unsubscribe() -> None:
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+        return unsubscribe
+
+    def subscriber_count(self, key: str) -> int:
+        """Number of connections with components bound to *key*."""
+        return len(self._targets.get(key, {}))
+
+    async def flush(self) -> int:
+        """
+        Push all pending changes now.
+
+        Returns:
+            Number of connections that received updates.
+        """
+        keys = self._pending
+        self._pending = set()
+        if not keys:
+            return 0
+
+        for key in keys:
+            value = self._data.get(key)
+            for callback in list(self._subscribers.get(key, ())):
+                try:
+                    result = callback(key, value)
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception:
+                    logger.exception("Shared state subscriber for %r failed", key)
+
+        per_context: dict[Context, list[BindingTarget]] = {}
+        for key in keys:
+            for ctx, targets in self._targets.get(key, {}).items():
+                per_context.setdefault(ctx, []).extend(targets)
+        if not per_context:
+            return 0
+
+        results = await asyncio.gather(
+            *(push_targets(ctx, targets) for ctx, targets in per_context.items()),
+            return_exceptions=True,
+        )
+        return sum(1 for result in results if not isinstance(result, BaseException))
+
+    def _mark_changed(self, key: str) -> None:
+        """Record *key* as changed and schedule an automatic flush."""
+        self._version += 1
+        self._pending.add(key)
+        if not self._flush_scheduled:
+            self._flush_scheduled = _schedule(self._do_flush)
+
+    def _do_flush(self) -> None:
+        """Run :meth:`flush` in a task (scheduled from :meth:`_mark_changed`)."""
+        self._flush_scheduled = False
+        _create_task(self.flush())
+
+    def _bind(self, ctx: "Context", key: str, target: BindingTarget) -> None:
+        """Register a rendered target for *key* on *ctx*."""
+        self._targets.setdefault(key, {}).setdefault(ctx, []).append(target)
+        self._context_keys.setdefault(ctx, set()).add(key)
+        ctx._binding_sources.add(self)
+
+    def _unbind(self, ctx: "Context") -> None:
+        """Drop every target registered for *ctx*."""
+        for key in self._context_keys.pop(ctx, ()):
+            contexts = self._targets.get(key)
+            if contexts is None:
+                continue
+            contexts.pop(ctx, None)
+            if not contexts:
+                del self._targets[key]
+
+    def _unbind_targets(self, ctx: "Context", match: Callable[[BindingTarget], bool]) -> None:
+        """Drop the targets of *ctx* for which *match* is true."""
+        keys = self._context_keys.get(ctx)
+        if not keys:
+            return
+        for key in list(keys):
+            contexts = self._targets.get(key)
+            if contexts is None or ctx not in contexts:
+                keys.discard(key)
+                continue
+            targets = [target for target in contexts[ctx] if not match(target)]
+            if targets:
+                contexts[ctx] = targets
+                continue
+            del contexts[ctx]
+            keys.discard(key)
+            if not contexts:
+                del self._targets[key]
@@ -82,6 +82,8 @@ class BrowserStore(ABC):
         self._data: dict[str, Any] = {}
         self._pending_updates: list[dict[str, Any]] = []
         self._sync_scheduled = False
+        # Bumped on every change; used to detect stale prefetched pages
+        self._version = 0
 
     @property
     def storage_type(self) -> str:
@@ -197,6 +199,7 @@ class BrowserStore(ABC):
             # This avoids double-encoding strings
             update["value"] = value
         self._pending_updates.append(update)
+        self._version += 1
 
         # Auto-schedule sync if not already scheduled
         self._schedule_sync()
@@ -235,6 +238,7 @@ class BrowserStore(ABC):
             data: Dictionary of key-value pairs from browser
         """
         self._data.clear()
+        self._version += 1
         for key, value in data.items():
             # Try to parse as JSON for complex types
             # If it fails, store the raw string value
@@ -418,6 +422,11 @@ class Store:
         if "session" in data:
             self._session._load_from_browser(data["session"])
 
+    @property
+    def _version(self) -> int:
+        """Change counter covering both storage types."""
+        return self._local._version + self._session._version
+
     def _get_all_pending_updates(self) -> list[dict[str, Any]]:
         """Get pending updates from both stores."""
         return self._local._get_pending_updates() + self._session._get_pending_updates()
@@ -0,0 +1,48 @@
+"""Component and callback ID generation.
+
+IDs are random UUIDs by default.  Inside :func:`deterministic_ids` they are
+numbered in creation order instead, so rendering the same page twice (once
+inline in the HTML shell, once over the WebSocket) yields identical trees.
+"""
+
+import itertools
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_counter: ContextVar["itertools.count[int] | None"] = ContextVar("refast_id_counter", default=None)
+
+
+def new_id(kind: str = "") -> str:
+    """
+    Return a new ID for a component or callback.
+
+    Args:
+        kind: Short tag included in deterministic IDs (e.g. ``"cb"``).
+
+    Returns:
+        A UUID string, or ``"rf-<kind>-<n>"`` inside :func:`deterministic_ids`.
+    """
+    counter = _counter.get()
+    if counter is None:
+        return str(uuid.uuid4())
+    return f"rf-{kind}-{next(counter)}" if kind else f"rf-{next(counter)}"
+
+
+@contextmanager
+def deterministic_ids() -> Iterator[None]:
+    """
+    Number IDs created in this context sequentially, starting from zero.
+
+    Example:
+        ```python
+        with deterministic_ids():
+            tree = ctx._render_page(page(ctx))
+        ```
+    """
+    token = _counter.set(itertools.count())
+    try:
+        yield
+    finally:
+        _counter.reset(token)
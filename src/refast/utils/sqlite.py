@@ -0,0 +1,228 @@
+"""SQLite access off the event loop, with group-committed writes."""
+
+import asyncio
+import contextlib
+import logging
+import os
+import sqlite3
+import threading
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Statements kept compiled per connection by the sqlite3 module
+STATEMENT_CACHE_SIZE = 256
+
+# Write operations: (sql, parameter rows, future resolved with the row count)
+_WriteOp = tuple[str, Sequence[Sequence[Any]], "asyncio.Future[int]"]
+
+
+class SQLiteDatabase:
+    """
+    A SQLite database used from asyncio code.
+
+    Every call runs in a worker thread, each of which owns its connection.
+    Reads run on a small pool of reader threads; in WAL mode they proceed
+    while a write is being committed.  Writes are queued and a background
+    task commits everything queued since the previous commit in one
+    transaction (group commit), so many concurrent writers share one fsync.
+    Each write still resolves only once its transaction has committed.
+
+    The sqlite3 module keeps compiled statements per connection, so callers
+    pass constant SQL with ``?`` parameters to have them prepared once.
+
+    Example:
+        ```python
+        db = SQLiteDatabase("app.db", schema=["CREATE TABLE IF NOT EXISTS kv (k, v)"])
+        await db.execute("INSERT INTO kv VALUES (?, ?)", ("a", 1))
+        rows = await db.read(lambda conn: conn.execute("SELECT * FROM kv").fetchall())
+        await db.close()
+        ```
+
+    Attributes:
+        path: The database file
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        schema: Sequence[str] = (),
+        readers: int = 2,
+        busy_timeout: float = 5.0,
+        synchronous: str = "NORMAL",
+    ):
+        """
+        Initialize the database.  Nothing is opened until first use.
+
+        Args:
+            path: The database file (created if missing)
+            schema: Statements run once when the database is first used,
+                e.g. ``CREATE TABLE IF NOT EXISTS ...``
+            readers: Number of reader threads
+            busy_timeout: Seconds to wait for another process's lock
+            synchronous: SQLite ``synchronous`` setting; ``NORMAL`` is
+                durable across application crashes in WAL mode, ``FULL``
+                also across power loss
+
+        Raises:
+            ValueError: If readers is less than 1
+        """
+        if readers < 1:
+            raise ValueError("readers must be at least 1")
+        self.path = os.fspath(path)
+        self._schema = tuple(schema)
+        self._busy_timeout = busy_timeout
+        self._synchronous = synchronous
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._reader = ThreadPoolExecutor(readers, thread_name_prefix="refast-sqlite-read")
+        self._writer = ThreadPoolExecutor(1, thread_name_prefix="refast-sqlite-write")
+        self._ready: asyncio.Task[None] | None = None
+        self._pending: list[_WriteOp] = []
+        self._flusher: asyncio.Task[None] | None = None
+        self._closed = False
+        self.batches = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        """The calling thread's connection, opened on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path,
+                timeout=self._busy_timeout,
+                isolation_level=None,
+                check_same_thread=False,
+                cached_statements=STATEMENT_CACHE_SIZE,
+            )
+            conn.execute(f"PRAGMA synchronous={self._synchronous}")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _initialize(self) -> None:
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        for statement in self._schema:
+            conn.execute(statement)
+
+    async def _ensure_ready(self) -> None:
+        if self._closed:
+            raise RuntimeError("Database is closed")
+        if self._ready is None:
+            loop = asyncio.get_running_loop()
+            self._ready = asyncio.ensure_future(
+                loop.run_in_executor(self._writer, self._initialize)
+            )
+        await asyncio.shield(self._ready)
+
+    async def read(self, func: Callable[[sqlite3.Connection], T]) -> T:
+        """
+        Run *func* with a reader connection in a reader thread.
+
+        Args:
+            func: Called with the connection; must not write
+
+        Returns:
+            What *func* returns
+        """
+        await self._ensure_ready()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._reader, lambda: func(self._connection()))
+
+    async def execute(self, sql: str, params: Sequence[Any] = ()) -> int:
+        """
+        Run one write statement in the next group commit.
+
+        Args:
+            sql: The statement
+            params: Its parameters
+
+        Returns:
+            The number of rows changed
+        """
+        return await self.executemany(sql, [params])
+
+    async def executemany(self, sql: str, rows: Iterable[Sequence[Any]]) -> int:
+        """
+        Run a write statement for each parameter row, in the next group commit.
+
+        Args:
+            sql: The statement
+            rows: Parameter rows
+
+        Returns:
+            The number of rows changed
+        """
+        await self._ensure_ready()
+        future: asyncio.Future[int] = asyncio.get_running_loop().create_future()
+        self._pending.append((sql, list(rows), future))
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush())
+        return await future
+
+    async def _flush(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            batch, self._pending = self._pending, []
+            try:
+                counts = await loop.run_in_executor(self._writer, self._commit, batch)
+            except Exception:
+                # Retry one by one so a bad statement fails only its caller
+                for op in batch:
+                    try:
+                        count = (await loop.run_in_executor(self._writer, self._commit, [op]))[0]
+                    except Exception as e:
+                        if not op[2].done():
+                            op[2].set_exception(e)
+                    else:
+                        if not op[2].done():
+                            op[2].set_result(count)
+                continue
+            for (_, _, future), count in zip(batch, counts, strict=True):
+                if not future.done():
+                    future.set_result(count)
+
+    def _commit(self, batch: list[_WriteOp]) -> list[int]:
+        """Run *batch* in one transaction (writer thread)."""
+        conn = self._connection()
+        counts = []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for sql, rows, _ in batch:
+                cursor = conn.executemany(sql, rows)
+                counts.append(cursor.rowcount)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self.batches += 1
+        return counts
+
+    async def close(self) -> None:
+        """Commit pending writes, then close every connection."""
+        if self._closed:
+            return
+        if self._flusher is not None:
+            with contextlib.suppress(Exception):
+                await self._flusher
+        self._closed = True
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._shutdown)
+
+    def _shutdown(self) -> None:
+        self._reader.shutdown(wait=True)
+        self._writer.shutdown(wait=True)
+        with self._connections_lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except sqlite3.Error as e:
+                    logger.warning(f"Failed to close SQLite connection: {e}")
+            self._connections.clear()
@@ -9,6 +9,8 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+from refast.utils.sqlite import SQLiteDatabase
+
 # Strict UUID v4 pattern used to validate externally-supplied file IDs before
 # they are composed into filesystem paths (defence-in-depth).
 _UUID_RE = re.compile(
@@ -384,3 +386,175 @@ class DiskFileStore(TempFileStore):
     async def delete_file(self, file_id: str) -> None:
         self._file_path(file_id).unlink(missing_ok=True)
         self._metadata.pop(file_id, None)
+
+
+_FILES_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS files (
+        id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        content_type TEXT NOT NULL,
+        inline INTEGER NOT NULL,
+        user_upload INTEGER NOT NULL,
+        expires_at REAL NOT NULL
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS files_expires_at ON files (expires_at)",
+)
+_FILE_INSERT = "INSERT INTO files VALUES (?, ?, ?, ?, ?, ?, ?)"
+_FILE_SELECT = (
+    "SELECT id, name, size, content_type, inline, user_upload FROM files "
+    "WHERE id = ? AND expires_at > ?"
+)
+_FILE_DELETE = "DELETE FROM files WHERE id = ?"
+_FILE_EXPIRED = "SELECT id FROM files WHERE expires_at <= ?"
+
+
+class SQLiteFileStore(TempFileStore):
+    """
+    Disk-based temporary file store with its metadata in SQLite.
+
+    Like :class:`DiskFileStore`, but file metadata lives in a SQLite
+    database next to the files instead of in process memory, so files
+    survive restarts and can be served by every worker process of the host.
+    All file and database I/O runs in worker threads.
+
+    Args:
+        directory: Directory holding the files and ``files.db``.
+        max_size_bytes: Maximum allowed size per file. Defaults to 100 MiB.
+        ttl_seconds: Time-to-live for stored files. Defaults to 3600 s.
+
+    Example:
+        ```python
+        ui = RefastApp(file_store=SQLiteFileStore("/var/lib/myapp/files"))
+        ```
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_size_bytes: int | None = 100 * 1024 * 1024,
+        ttl_seconds: int = 3600,
+    ) -> None:
+        super().__init__(max_size_bytes=max_size_bytes, ttl_seconds=ttl_seconds)
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._db = SQLiteDatabase(self._directory / "files.db", schema=_FILES_SCHEMA)
+        self._cleanup_task: asyncio.Task[None] | None = None
+
+    def _file_path(self, file_id: str) -> Path:
+        """Return the filesystem path for *file_id*.
+
+        Raises ``ValueError`` if *file_id* is not a valid UUID.
+        """
+        if not _UUID_RE.match(file_id):
+            raise ValueError(f"Invalid file ID: {file_id!r}")
+        return self._directory / file_id
+
+    # ── Cleanup ────────────────────────────────────────────────────────────
+
+    def _start_cleanup(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+            if self._cleanup_task is None or self._cleanup_task.done():
+                self._cleanup_task = loop.create_task(self._cleanup_loop())
+        except RuntimeError:
+            pass
+
+    async def _cleanup_loop(self) -> None:
+        while True:
+            interval = max(min(self.ttl_seconds / 2, 300), 1)
+            await asyncio.sleep(interval)
+            await self.clear_expired()
+
+    async def clear_expired(self) -> int:
+        """Delete expired files and their metadata; return how many."""
+        now = time.time()
+        rows = await self._db.read(lambda conn: conn.execute(_FILE_EXPIRED, (now,)).fetchall())
+        if not rows:
+            return 0
+        ids = [row[0] for row in rows]
+        await self._db.executemany(_FILE_DELETE, [(fid,) for fid in ids])
+
+        def unlink_all() -> None:
+            for fid in ids:
+                self._file_path(fid).unlink(missing_ok=True)
+
+        await asyncio.to_thread(unlink_all)
+        return len(ids)
+
+    async def close(self) -> None:
+        """Stop the cleanup task and close the metadata database."""
+        if self._cleanup_task is not None:
+            self._cleanup_task.cancel()
+            self._cleanup_task = None
+        await self._db.close()
+
+    # ── TempFileStore interface ────────────────────────────────────────────
+
+    async def store_file(
+        self,
+        data: bytes,
+        filename: str,
+        content_type: str = "application/octet-stream",
+        inline: bool = False,
+        user_upload: bool = False,
+    ) -> FileInfo:
+        self._validate_size(data)
+        file_id = str(uuid.uuid4())
+        await asyncio.to_thread(self._file_path(file_id).write_bytes, data)
+        await self._db.execute(
+            _FILE_INSERT,
+            (
+                file_id,
+                filename,
+                len(data),
+                content_type,
+                int(inline),
+                int(user_upload),
+                time.time() + self.ttl_seconds,
+            ),
+        )
+        self._start_cleanup()
+        return FileInfo(
+            id=file_id,
+            name=filename,
+            size=len(data),
+            content_type=content_type,
+            inline=inline,
+            user_upload=user_upload,
+            _store=self,
+        )
+
+    async def get_file(self, file_id: str) -> bytes | None:
+        if await self.get_file_info(file_id) is None:
+            return None
+        try:
+            return await asyncio.to_thread(self._file_path(file_id).read_bytes)
+        except FileNotFoundError:
+            await self._db.execute(_FILE_DELETE, (file_id,))
+            return None
+
+    async def get_file_info(self, file_id: str) -> FileInfo | None:
+        if not _UUID_RE.match(file_id):
+            return None
+        now = time.time()
+        row = await self._db.read(
+            lambda conn: conn.execute(_FILE_SELECT, (file_id, now)).fetchone()
+        )
+        if row is None:
+            return None
+        return FileInfo(
+            id=row[0],
+            name=row[1],
+            size=row[2],
+            content_type=row[3],
+            inline=bool(row[4]),
+            user_upload=bool(row[5]),
+            _store=self,
+        )
+
+    async def delete_file(self, file_id: str) -> None:
+        await asyncio.to_thread(self._file_path(file_id).unlink, missing_ok=True)
+        await self._db.execute(_FILE_DELETE, (file_id,))
@@ -89,12 +89,13 @@ class TestAssetShellRendering:
         """Test HTML shell in full mode loads refast-client.js."""
         app = RefastApp(client_mode="full")
         html = render_html_shell(app)
-        assert 'src="/static/refast-client.js"' in html
-        assert 'src="/static/refast-client-core.js"' not in html
+        # Stable entry names may carry a ?v=<hash> fingerprint
+        assert 'src="/static/refast-client.js' in html
+        assert 'src="/static/refast-client-core.js' not in html
 
     def test_render_shell_core_mode(self):
         """Test HTML shell in core mode loads refast-client-core.js."""
         app = RefastApp(client_mode="core")
         html = render_html_shell(app)
-        assert 'src="/static/refast-client-core.js"' in html
-        assert 'src="/static/refast-client.js"' not in html
+        assert 'src="/static/refast-client-core.js' in html
+        assert 'src="/static/refast-client.js' not in html
@@ -1,14 +1,23 @@
 """Integration tests for runtime theme updates via WebSocket."""
 
-from unittest.mock import AsyncMock, patch
+import json
+from unittest.mock import AsyncMock
 
 import pytest
 
 from refast import RefastApp
 from refast.context import Context
+from refast.events.stream import WebSocketConnection
 from refast.theme import Theme, ThemeColors
 
 
+def connect(app: RefastApp, ws: AsyncMock) -> Context:
+    """Register a context for *ws* with the app's connection registry."""
+    ctx = Context(websocket=ws, app=app)
+    app.stream.add_connection(WebSocketConnection(websocket=ws, connected=True, context=ctx))
+    return ctx
+
+
 class TestCtxSetTheme:
     """Tests for ctx.set_theme() and ctx.broadcast_theme()."""
 
@@ -66,23 +75,22 @@ class TestCtxSetTheme:
 
         ws1 = AsyncMock()
         ws2 = AsyncMock()
-        ctx1 = Context(websocket=ws1, app=app)
-        ctx2 = Context(websocket=ws2, app=app)
+        ctx1 = connect(app, ws1)
+        connect(app, ws2)
 
-        # Simulate active_contexts by patching
-        with patch.object(
-            type(app), "active_contexts", new_callable=lambda: property(lambda self: [ctx1, ctx2])
-        ):
-            theme = Theme(light=ThemeColors(primary="10 20% 30%"))
-            count = await ctx1.broadcast_theme(theme)
+        theme = Theme(light=ThemeColors(primary="10 20% 30%"))
+        count = await ctx1.broadcast_theme(theme)
 
         assert count == 2
         assert app.theme is theme
 
+        # The payload is encoded once and the same frame sent to everyone
+        assert ws1.send_text.call_args[0][0] is ws2.send_text.call_args[0][0]
+
         # Both websockets should have received the message
         for ws in [ws1, ws2]:
-            ws.send_json.assert_called_once()
-            payload = ws.send_json.call_args[0][0]
+            ws.send_text.assert_called_once()
+            payload = json.loads(ws.send_text.call_args[0][0])
             assert payload["type"] == "theme_update"
             assert payload["theme"]["light"] == {"--primary": "10 20% 30%"}
 
@@ -101,19 +109,14 @@ class TestCtxSetTheme:
 
         ws_good = AsyncMock()
         ws_bad = AsyncMock()
-        ws_bad.send_json.side_effect = Exception("Connection closed")
+        ws_bad.send_text.side_effect = Exception("Connection closed")
 
-        ctx_good = Context(websocket=ws_good, app=app)
-        ctx_bad = Context(websocket=ws_bad, app=app)
+        connect(app, ws_bad)
+        ctx_good = connect(app, ws_good)
 
-        with patch.object(
-            type(app),
-            "active_contexts",
-            new_callable=lambda: property(lambda self: [ctx_bad, ctx_good]),
-        ):
-            theme = Theme(light=ThemeColors(primary="5 5% 5%"))
-            count = await ctx_good.broadcast_theme(theme)
+        theme = Theme(light=ThemeColors(primary="5 5% 5%"))
+        count = await ctx_good.broadcast_theme(theme)
 
         # Only the good one should count
         assert count == 1
-        ws_good.send_json.assert_called_once()
+        ws_good.send_text.assert_called_once()
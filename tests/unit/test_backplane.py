@@ -0,0 +1,364 @@
+"""Tests for cross-worker broadcast backplanes."""
+
+import asyncio
+import json
+import tempfile
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+
+from refast import RefastApp
+from refast.context import Context
+from refast.events.backplane import (
+    InProcessBackplane,
+    InProcessHub,
+    RedisBackplane,
+    UnixSocketBackplane,
+)
+from refast.events.broadcast import BroadcastManager
+from refast.events.stream import EventStream, WebSocketConnection
+from refast.theme import Theme, ThemeColors
+
+
+class Recorder:
+    """Collects the payloads a backplane hands to a handler."""
+
+    def __init__(self, backplane, kind="test"):
+        self.payloads = []
+        self.received = asyncio.Event()
+        backplane.on(kind, self)
+
+    async def __call__(self, message):
+        self.payloads.append(message.payload)
+        self.received.set()
+
+    async def wait(self, count=1):
+        async with asyncio.timeout(2):
+            while len(self.payloads) < count:
+                self.received.clear()
+                await self.received.wait()
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for a redis.asyncio client's pub/sub."""
+
+    def __init__(self):
+        self.subscribers: dict[str, list[asyncio.Queue]] = {}
+
+    async def publish(self, channel, data):
+        queues = self.subscribers.get(channel, [])
+        for queue in queues:
+            queue.put_nowait({"type": "message", "channel": channel, "data": data})
+        return len(queues)
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+
+class FakePubSub:
+    def __init__(self, server):
+        self.server = server
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.channels: list[str] = []
+
+    async def subscribe(self, channel):
+        self.channels.append(channel)
+        self.server.subscribers.setdefault(channel, []).append(self.queue)
+
+    async def unsubscribe(self, channel):
+        self.server.subscribers[channel].remove(self.queue)
+
+    async def aclose(self):
+        pass
+
+    async def listen(self):
+        while True:
+            message = await self.queue.get()
+            if isinstance(message, Exception):
+                raise message
+            yield message
+
+
+class TestBackplaneBase:
+    """Tests for the behaviour shared by all backplanes."""
+
+    @pytest.mark.asyncio
+    async def test_publisher_does_not_receive_own_messages(self):
+        """Messages are delivered to other backplanes, not back to the publisher."""
+        hub = InProcessHub()
+        a, b = InProcessBackplane(hub), InProcessBackplane(hub)
+        got_a, got_b = Recorder(a), Recorder(b)
+        await a.start()
+        await b.start()
+
+        await a.publish("test", {"n": 1})
+
+        assert got_b.payloads == [{"n": 1}]
+        assert got_a.payloads == []
+
+    @pytest.mark.asyncio
+    async def test_duplicates_dropped(self):
+        """A frame delivered twice reaches the handlers once."""
+        backplane = InProcessBackplane(InProcessHub())
+        got = Recorder(backplane)
+        frame = json.dumps({"id": "m1", "origin": "other", "kind": "test", "payload": {}})
+
+        await backplane._receive(frame)
+        await backplane._receive(frame.encode())
+
+        assert len(got.payloads) == 1
+
+    @pytest.mark.asyncio
+    async def test_dedup_window_is_bounded(self):
+        """Only the most recent message IDs are remembered."""
+        backplane = InProcessBackplane(InProcessHub(), dedup_size=2)
+        for i in range(5):
+            frame = json.dumps({"id": f"m{i}", "origin": "x", "kind": "test", "payload": {}})
+            await backplane._receive(frame)
+
+        assert list(backplane._seen) == ["m3", "m4"]
+
+    @pytest.mark.asyncio
+    async def test_malformed_and_failing_handlers_are_isolated(self):
+        """Bad frames are dropped and one failing handler does not stop the others."""
+        backplane = InProcessBackplane(InProcessHub())
+        backplane.on("test", AsyncMock(side_effect=RuntimeError("boom")))
+        got = Recorder(backplane)
+
+        await backplane._receive(b"not json")
+        await backplane._receive(json.dumps({"id": "m1"}))
+        await backplane._receive(
+            json.dumps({"id": "m2", "origin": "x", "kind": "test", "payload": {"ok": True}})
+        )
+
+        assert got.payloads == [{"ok": True}]
+
+    @pytest.mark.asyncio
+    async def test_remove_handler(self):
+        """The function returned by on() unregisters the handler."""
+        hub = InProcessHub()
+        a, b = InProcessBackplane(hub), InProcessBackplane(hub)
+        handler = AsyncMock()
+        remove = b.on("test", handler)
+        await b.start()
+
+        remove()
+        await a.publish("test", {})
+
+        handler.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_closed_backplane_stops_receiving(self):
+        """A closed backplane leaves its hub."""
+        hub = InProcessHub()
+        a, b = InProcessBackplane(hub), InProcessBackplane(hub)
+        got = Recorder(b)
+        await b.start()
+        await b.close()
+
+        await a.publish("test", {})
+
+        assert got.payloads == []
+        assert not b.started
+
+
+class TestUnixSocketBackplane:
+    """Tests for UnixSocketBackplane."""
+
+    @pytest.fixture
+    def socket_path(self):
+        # Unix socket paths are limited to ~100 bytes, so avoid pytest's long tmp_path
+        with tempfile.TemporaryDirectory(dir="/tmp") as tmp:
+            yield Path(tmp) / "bp.sock"
+
+    @pytest.mark.asyncio
+    async def test_first_worker_becomes_hub_and_relays(self, socket_path):
+        """One worker hosts the hub and every other worker receives messages."""
+        workers = [UnixSocketBackplane(socket_path) for _ in range(3)]
+        recorders = [Recorder(w) for w in workers]
+        for worker in workers:
+            await worker.start()
+
+        assert [w.is_hub for w in workers] == [True, False, False]
+
+        await workers[1].publish("test", {"from": 1})
+        await recorders[0].wait()
+        await recorders[2].wait()
+        await asyncio.sleep(0.05)
+
+        assert recorders[0].payloads == [{"from": 1}]
+        assert recorders[1].payloads == []
+        assert recorders[2].payloads == [{"from": 1}]
+
+        for worker in workers:
+            await worker.close()
+
+    @pytest.mark.asyncio
+    async def test_hub_failover(self, socket_path):
+        """When the hub exits another worker takes over."""
+        hub, b, c = (UnixSocketBackplane(socket_path, reconnect_delay=0.01) for _ in range(3))
+        got_c = Recorder(c)
+        for worker in (hub, b, c):
+            await worker.start()
+
+        await hub.close()
+
+        async with asyncio.timeout(2):
+            while not (b.is_hub or c.is_hub) or b._writer is None or c._writer is None:
+                await asyncio.sleep(0.01)
+            # Wait for both survivors to be attached to the new hub
+            new_hub = b if b.is_hub else c
+            while len(new_hub._peers) < 2:
+                await asyncio.sleep(0.01)
+
+        await b.publish("test", {"after": "failover"})
+        await got_c.wait()
+        assert got_c.payloads == [{"after": "failover"}]
+
+        await b.close()
+        await c.close()
+
+    @pytest.mark.asyncio
+    async def test_stale_socket_file_is_replaced(self, socket_path):
+        """A socket file left by a crashed hub does not block startup."""
+        socket_path.write_text("")
+        worker = UnixSocketBackplane(socket_path)
+        await worker.start()
+
+        assert worker.is_hub
+
+        await worker.close()
+        assert not socket_path.exists()
+
+
+class TestRedisBackplane:
+    """Tests for RedisBackplane against an in-memory fake client."""
+
+    def test_requires_url_or_client(self):
+        """A URL or a client must be given."""
+        with pytest.raises(ValueError):
+            RedisBackplane()
+
+    @pytest.mark.asyncio
+    async def test_publish_reaches_other_workers(self):
+        """Messages go through the shared channel to the other subscribers."""
+        server = FakeRedis()
+        a = RedisBackplane(client=server, channel="app")
+        b = RedisBackplane(client=server, channel="app")
+        got_a, got_b = Recorder(a), Recorder(b)
+        await a.start()
+        await b.start()
+
+        await a.publish("test", {"n": 1})
+        await got_b.wait()
+        await asyncio.sleep(0.01)
+
+        assert got_b.payloads == [{"n": 1}]
+        assert got_a.payloads == []
+
+        await a.close()
+        await b.close()
+        assert server.subscribers["app"] == []
+
+    @pytest.mark.asyncio
+    async def test_resubscribes_after_error(self):
+        """A failing subscription is re-established."""
+        server = FakeRedis()
+        a = RedisBackplane(client=server, reconnect_delay=0.01)
+        b = RedisBackplane(client=server, reconnect_delay=0.01)
+        got_b = Recorder(b)
+        await a.start()
+        await b.start()
+
+        b._pubsub.queue.put_nowait(ConnectionError("connection reset"))
+        async with asyncio.timeout(2):
+            while len(server.subscribers["refast:backplane"]) < 2 or b._pubsub.queue.qsize():
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.02)
+
+        await a.publish("test", {"n": 2})
+        await got_b.wait()
+        assert got_b.payloads == [{"n": 2}]
+
+        await a.close()
+        await b.close()
+
+
+class TestAppBackplane:
+    """Tests for RefastApp and BroadcastManager over a backplane."""
+
+    @staticmethod
+    def _connect(app, ws):
+        """Register a context for *ws* with *app*'s connection registry."""
+        ctx = Context(websocket=ws, app=app)
+        app.stream.add_connection(WebSocketConnection(websocket=ws, connected=True, context=ctx))
+        return ctx
+
+    @pytest.mark.asyncio
+    async def test_broadcast_reaches_other_worker(self):
+        """ctx.broadcast() is delivered to clients connected to another app."""
+        hub = InProcessHub()
+        app_a = RefastApp(backplane=InProcessBackplane(hub))
+        app_b = RefastApp(backplane=InProcessBackplane(hub))
+        await app_b.backplane.start()
+
+        sender = self._connect(app_a, AsyncMock())
+        remote_ws = AsyncMock()
+        self._connect(app_b, remote_ws)
+
+        count = await sender.broadcast("chat:message", {"text": "hi"})
+
+        assert count == 0  # no other client on this worker
+        payload = json.loads(remote_ws.send_text.call_args[0][0])
+        assert payload == {"type": "event", "eventType": "chat:message", "data": {"text": "hi"}}
+
+    @pytest.mark.asyncio
+    async def test_theme_reaches_other_worker(self):
+        """broadcast_theme() updates the other worker's clients and app theme."""
+        hub = InProcessHub()
+        app_a = RefastApp(backplane=InProcessBackplane(hub))
+        app_b = RefastApp(backplane=InProcessBackplane(hub))
+        await app_b.backplane.start()
+
+        sender = self._connect(app_a, AsyncMock())
+        remote_ws = AsyncMock()
+        self._connect(app_b, remote_ws)
+        theme = Theme(light=ThemeColors(primary="10 20% 30%"), radius="1rem")
+
+        await sender.broadcast_theme(theme)
+
+        assert app_b.theme == theme
+        payload = json.loads(remote_ws.send_text.call_args[0][0])
+        assert payload["type"] == "theme_update"
+        assert payload["theme"]["radius"] == "1rem"
+
+    @pytest.mark.asyncio
+    async def test_channel_broadcast_reaches_other_worker(self):
+        """BroadcastManager channel messages reach subscribers on other workers."""
+        hub = InProcessHub()
+        local, remote = EventStream(), EventStream()
+        manager = BroadcastManager(local, InProcessBackplane(hub))
+        remote_manager = BroadcastManager(remote, InProcessBackplane(hub))
+        await remote_manager.backplane.start()
+
+        subscriber = WebSocketConnection(connected=True, session_id="s2")
+        subscriber.send = AsyncMock(return_value=True)
+        subscriber.subscribe("room:1")
+        remote.add_connection(subscriber)
+        bystander = WebSocketConnection(connected=True)
+        bystander.send = AsyncMock(return_value=True)
+        remote.add_connection(bystander)
+
+        count = await manager.broadcast_to_channel("room:1", "message", {"text": "hi"})
+
+        assert count == 0
+        subscriber.send.assert_called_once()
+        sent = json.loads(subscriber.send.call_args[0][0])
+        assert sent["type"] == "message"
+        assert sent["data"] == {"text": "hi"}
+        bystander.send.assert_not_called()
+
+        # Session exclusion applies on every worker
+        await manager.broadcast_to_channel("room:1", "message", {}, exclude_session="s2")
+        subscriber.send.assert_called_once()
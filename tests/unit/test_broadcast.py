@@ -113,8 +113,8 @@ class TestBroadcastManager:
         conn2 = WebSocketConnection(connected=True)
         conn2.send = AsyncMock(return_value=True)
 
-        stream._connections[conn1.id] = conn1
-        stream._connections[conn2.id] = conn2
+        stream.add_connection(conn1)
+        stream.add_connection(conn2)
 
         count = await broadcaster.broadcast_to_channel(
             "room:1",
@@ -140,8 +140,8 @@ class TestBroadcastManager:
         conn2.subscribe("room:1")
         conn2.send = AsyncMock(return_value=True)
 
-        stream._connections[conn1.id] = conn1
-        stream._connections[conn2.id] = conn2
+        stream.add_connection(conn1)
+        stream.add_connection(conn2)
 
         count = await broadcaster.broadcast_to_channel(
             "room:1",
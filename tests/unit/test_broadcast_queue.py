@@ -0,0 +1,272 @@
+"""Tests for the bounded broadcast queue and batched draining."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+
+from refast.events.broadcast import BroadcastManager
+from refast.events.queue import BroadcastQueue, OverflowPolicy, Priority
+from refast.events.stream import EventStream, WebSocketConnection
+
+
+def add_recorder(stream: EventStream, *, session_id: str | None = None, channels=()):
+    """Register a connection whose sent frames are decoded into a list."""
+    conn = WebSocketConnection(connected=True, session_id=session_id)
+    frames: list[dict] = []
+
+    async def send(data):
+        frames.append(json.loads(data) if isinstance(data, str) else data)
+        return True
+
+    conn.send = AsyncMock(side_effect=send)
+    stream.add_connection(conn)
+    for channel in channels:
+        conn.subscribe(channel)
+    return conn, frames
+
+
+def event_types(frame: dict) -> list[str]:
+    """Event types carried by a single or batch frame."""
+    if frame["type"] == "batch":
+        return [m["type"] for m in frame["messages"]]
+    return [frame["type"]]
+
+
+class TestBroadcastQueue:
+    """Tests for BroadcastQueue."""
+
+    def test_fifo_within_lane(self):
+        """Messages of one priority come out in the order they went in."""
+        queue = BroadcastQueue()
+        for i in range(5):
+            queue.put_nowait(i)
+        assert queue.drain() == [0, 1, 2, 3, 4]
+        assert queue.empty()
+
+    def test_higher_lanes_drain_first(self):
+        """HIGH messages are taken before NORMAL, NORMAL before LOW."""
+        queue = BroadcastQueue()
+        queue.put_nowait("low", Priority.LOW)
+        queue.put_nowait("normal")
+        queue.put_nowait("high", Priority.HIGH)
+        assert queue.get_nowait() == "high"
+        assert queue.drain() == ["normal", "low"]
+
+    def test_drain_limit(self):
+        """drain() takes at most *limit* messages."""
+        queue = BroadcastQueue()
+        for i in range(10):
+            queue.put_nowait(i)
+        assert queue.drain(3) == [0, 1, 2]
+        assert queue.qsize() == 7
+
+    def test_get_nowait_empty_raises(self):
+        """get_nowait() on an empty queue raises QueueEmpty."""
+        with pytest.raises(asyncio.QueueEmpty):
+            BroadcastQueue().get_nowait()
+
+    def test_invalid_maxsize(self):
+        """maxsize must be positive."""
+        with pytest.raises(ValueError):
+            BroadcastQueue(maxsize=0)
+
+    def test_drop_oldest(self):
+        """A full DROP_OLDEST queue evicts the oldest message."""
+        queue = BroadcastQueue(maxsize=3)
+        for i in range(5):
+            assert queue.put_nowait(i) is True
+        assert len(queue) == 3
+        assert queue.drain() == [2, 3, 4]
+        assert queue.stats().dropped == 2
+
+    def test_drop_oldest_spares_higher_lanes(self):
+        """A normal message never evicts a high-priority one."""
+        queue = BroadcastQueue(maxsize=2)
+        queue.put_nowait("alert-1", Priority.HIGH)
+        queue.put_nowait("alert-2", Priority.HIGH)
+        assert queue.put_nowait("tick") is False
+        assert queue.drain() == ["alert-1", "alert-2"]
+
+    def test_high_priority_evicts_lower_lane(self):
+        """A high-priority message evicts the oldest low-priority one."""
+        queue = BroadcastQueue(maxsize=2)
+        queue.put_nowait("tick-1")
+        queue.put_nowait("tick-2", Priority.LOW)
+        assert queue.put_nowait("alert", Priority.HIGH) is True
+        assert queue.drain() == ["alert", "tick-1"]
+
+    def test_drop_newest(self):
+        """A full DROP_NEWEST queue rejects the new message."""
+        queue = BroadcastQueue(maxsize=2, overflow="drop_newest")
+        queue.put_nowait(1)
+        queue.put_nowait(2)
+        assert queue.put_nowait(3) is False
+        assert queue.drain() == [1, 2]
+        assert queue.stats().dropped == 1
+
+    def test_error_policy(self):
+        """A full ERROR queue raises QueueFull."""
+        queue = BroadcastQueue(maxsize=1, overflow=OverflowPolicy.ERROR)
+        queue.put_nowait(1)
+        with pytest.raises(asyncio.QueueFull):
+            queue.put_nowait(2)
+
+    def test_stats(self):
+        """stats() reports depth per lane and the counters."""
+        queue = BroadcastQueue(maxsize=10)
+        queue.put_nowait("a")
+        queue.put_nowait("b", Priority.HIGH)
+        stats = queue.stats()
+        assert stats.depth == 2
+        assert stats.maxsize == 10
+        assert stats.depth_by_priority[Priority.HIGH] == 1
+        assert stats.depth_by_priority[Priority.NORMAL] == 1
+        assert stats.depth_by_priority[Priority.LOW] == 0
+        assert stats.enqueued == 2
+
+        queue.drain()
+        stats = queue.stats()
+        assert stats.dequeued == 2
+        assert stats.batches == 1
+        assert stats.lag == 0.0
+
+    def test_lag_tracks_oldest_message(self, monkeypatch):
+        """lag is the age of the oldest waiting message."""
+        clock = [100.0]
+        monkeypatch.setattr("refast.events.queue.time.monotonic", lambda: clock[0])
+        queue = BroadcastQueue()
+        queue.put_nowait("old", Priority.LOW)
+        clock[0] = 102.0
+        queue.put_nowait("new", Priority.HIGH)
+        clock[0] = 105.0
+        assert queue.lag == 5.0
+
+        queue.drain()
+        assert queue.lag == 0.0
+        assert queue.stats().max_lag == 5.0
+
+    @pytest.mark.asyncio
+    async def test_wait_wakes_on_put(self):
+        """wait() returns as soon as a message is queued, without polling."""
+        queue = BroadcastQueue()
+        waiter = asyncio.create_task(queue.wait())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        queue.put_nowait("x")
+        await asyncio.wait_for(waiter, timeout=1)
+
+
+class TestBatchedProcessing:
+    """Tests for BroadcastManager's queue processing."""
+
+    @pytest.mark.asyncio
+    async def test_queue_broadcast_reports_drop(self):
+        """queue_broadcast() returns False when the message is dropped."""
+        broadcaster = BroadcastManager(EventStream(), max_queue_size=1, overflow="drop_newest")
+        assert broadcaster.queue_broadcast("", "a", {}) is True
+        assert broadcaster.queue_broadcast("", "b", {}) is False
+        assert broadcaster.queue_depth == 1
+        assert broadcaster.stats().dropped == 1
+
+    @pytest.mark.asyncio
+    async def test_burst_merged_into_one_frame(self):
+        """Queued events for the same destination go out as one batch frame."""
+        stream = EventStream()
+        broadcaster = BroadcastManager(stream)
+        _, frames = add_recorder(stream)
+
+        for i in range(50):
+            broadcaster.queue_broadcast("", "tick", {"n": i})
+        await broadcaster.start()
+        await asyncio.sleep(0.01)
+        await broadcaster.stop()
+
+        assert len(frames) == 1
+        assert frames[0]["type"] == "batch"
+        assert [m["data"]["n"] for m in frames[0]["messages"]] == list(range(50))
+
+    @pytest.mark.asyncio
+    async def test_single_event_not_wrapped(self):
+        """A lone queued event is sent as a plain event frame."""
+        stream = EventStream()
+        broadcaster = BroadcastManager(stream)
+        _, frames = add_recorder(stream)
+
+        await broadcaster.start()
+        broadcaster.queue_broadcast("", "notice", {"text": "hi"})
+        await asyncio.sleep(0.01)
+        await broadcaster.stop()
+
+        assert len(frames) == 1
+        assert frames[0]["type"] == "notice"
+        assert frames[0]["data"] == {"text": "hi"}
+
+    @pytest.mark.asyncio
+    async def test_merge_per_destination(self):
+        """Each channel and exclusion gets its own frame with only its events."""
+        stream = EventStream()
+        broadcaster = BroadcastManager(stream)
+        _, room_a = add_recorder(stream, session_id="s1", channels=["room:a"])
+        _, room_b = add_recorder(stream, session_id="s2", channels=["room:b"])
+
+        broadcaster.queue_broadcast("room:a", "a1", {})
+        broadcaster.queue_broadcast("room:b", "b1", {})
+        broadcaster.queue_broadcast("room:a", "a2", {})
+        broadcaster.queue_broadcast("", "all", {}, exclude_session="s2")
+        await broadcaster.start()
+        await asyncio.sleep(0.01)
+        await broadcaster.stop()
+
+        assert [event_types(f) for f in room_a] == [["a1", "a2"], ["all"]]
+        assert [event_types(f) for f in room_b] == [["b1"]]
+
+    @pytest.mark.asyncio
+    async def test_high_priority_sent_first(self):
+        """A high-priority event leads its batch."""
+        stream = EventStream()
+        broadcaster = BroadcastManager(stream)
+        _, frames = add_recorder(stream)
+
+        broadcaster.queue_broadcast("", "tick", {})
+        broadcaster.queue_broadcast("", "alert", {}, priority=Priority.HIGH)
+        await broadcaster.start()
+        await asyncio.sleep(0.01)
+        await broadcaster.stop()
+
+        assert event_types(frames[0]) == ["alert", "tick"]
+
+    @pytest.mark.asyncio
+    async def test_batch_size_limits_frame(self):
+        """No frame carries more than batch_size events."""
+        stream = EventStream()
+        broadcaster = BroadcastManager(stream, batch_size=4)
+        _, frames = add_recorder(stream)
+
+        for i in range(10):
+            broadcaster.queue_broadcast("", "tick", {"n": i})
+        await broadcaster.start()
+        await asyncio.sleep(0.01)
+        await broadcaster.stop()
+
+        assert [len(event_types(f)) for f in frames] == [4, 4, 2]
+        assert broadcaster.queue_depth == 0
+        assert broadcaster.queue_lag == 0.0
+
+    @pytest.mark.asyncio
+    async def test_send_error_does_not_stop_processing(self):
+        """A failing delivery is logged and later batches still go out."""
+        stream = EventStream()
+        broadcaster = BroadcastManager(stream)
+        _, frames = add_recorder(stream)
+        broadcaster._deliver = AsyncMock(side_effect=[RuntimeError("boom"), None])
+
+        await broadcaster.start()
+        broadcaster.queue_broadcast("", "first", {})
+        await asyncio.sleep(0.01)
+        broadcaster.queue_broadcast("", "second", {})
+        await asyncio.sleep(0.01)
+        await broadcaster.stop()
+
+        assert broadcaster._deliver.await_count == 2
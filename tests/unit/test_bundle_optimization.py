@@ -4,11 +4,16 @@ Covers:
 - RefastApp ``preloaded_features`` configuration
 - _load_manifest / _get_chunk_files helpers
 - HTML shell: ESM script tags, modulepreload hints, extension loader
+- HTML shell caching: ETag / 304 and precompressed variants
 - Static handler: pre-compressed file serving (brotli / gzip)
+- Static asset index: immutable caching, ETags and fingerprinted URLs
+- Preload hints: Link header and 103 Early Hints for startup assets
 """
 
+import asyncio
 import gzip
 import json
+import os
 from unittest.mock import patch
 
 import pytest
@@ -16,7 +21,17 @@ from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
 from refast import RefastApp
-from refast.assets import ALL_FEATURE_CHUNKS, _get_chunk_files, _load_manifest
+from refast.assets import (
+    ALL_FEATURE_CHUNKS,
+    IMMUTABLE_CACHE_CONTROL,
+    EncodedBody,
+    StaticAssetIndex,
+    _get_chunk_files,
+    _load_manifest,
+    preload_links,
+    render_html_shell,
+)
+from refast.theme import Theme
 
 # ── Fixtures ─────────────────────────────────────────────────────────────
 
@@ -251,6 +266,92 @@ class TestHtmlShell:
         assert '"icons"' in response.text
 
 
+class TestHtmlShellCache:
+    """Test that the HTML shell is rendered once and served with ETags."""
+
+    def test_shell_is_rendered_once(self, preloaded_features_app):
+        client, ui = preloaded_features_app()
+
+        with patch("refast.assets.render_html_shell", wraps=render_html_shell) as render:
+            client.get("/ui/")
+            client.get("/ui/other")
+            client.get("/ui/")
+
+        assert render.call_count == 1
+
+    def test_etag_and_not_modified(self, preloaded_features_app):
+        client, _ = preloaded_features_app()
+
+        first = client.get("/ui/", headers={"Accept-Encoding": "identity"})
+        etag = first.headers["ETag"]
+        assert first.headers["Cache-Control"] == "no-cache"
+
+        second = client.get("/ui/", headers={"Accept-Encoding": "identity", "If-None-Match": etag})
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["ETag"] == etag
+
+    def test_gzip_variant(self, preloaded_features_app):
+        client, _ = preloaded_features_app()
+
+        identity = client.get("/ui/", headers={"Accept-Encoding": "identity"})
+        gzipped = client.get("/ui/", headers={"Accept-Encoding": "gzip"})
+
+        assert gzipped.headers["Content-Encoding"] == "gzip"
+        assert gzipped.headers["ETag"] != identity.headers["ETag"]
+        # httpx decompresses transparently
+        assert gzipped.text == identity.text
+
+        revalidated = client.get(
+            "/ui/",
+            headers={"Accept-Encoding": "gzip", "If-None-Match": gzipped.headers["ETag"]},
+        )
+        assert revalidated.status_code == 304
+
+    @pytest.mark.parametrize(
+        "change",
+        [
+            lambda ui: ui.add_css("body { color: red; }"),
+            lambda ui: ui.add_js("console.log(1);"),
+            lambda ui: ui.add_head_tag('<meta name="x" content="y">'),
+            lambda ui: setattr(ui, "theme", Theme(radius="1rem")),
+            lambda ui: setattr(ui, "title", "Renamed"),
+        ],
+    )
+    def test_configuration_change_invalidates(self, preloaded_features_app, change):
+        client, ui = preloaded_features_app()
+        etag = client.get("/ui/").headers["ETag"]
+
+        change(ui)
+        response = client.get("/ui/", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_theme_assignment_bumps_shell_version(self, preloaded_features_app):
+        _, ui = preloaded_features_app()
+        version = ui._shell_version
+
+        ui.theme = Theme(radius="1rem")
+
+        assert ui._shell_version == version + 1
+        assert ui.theme == Theme(radius="1rem")
+
+    def test_register_extension_invalidates(self, preloaded_features_app):
+        from refast.extensions import Extension
+
+        class ShellExtension(Extension):
+            name = "shell-ext"
+            scripts = ["shell.js"]
+
+        client, ui = preloaded_features_app()
+        assert "shell-ext" not in client.get("/ui/").text
+
+        ui.register_extension(ShellExtension())
+
+        assert "/static/ext/shell-ext/shell.js" in client.get("/ui/").text
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # Static handler – pre-compressed file serving
 # ═══════════════════════════════════════════════════════════════════════════
@@ -321,6 +422,32 @@ class TestStaticHandlerCompression:
         assert response.headers.get("Content-Encoding") is None
         assert response.content == b"console.log('hello');"
 
+    def test_q_zero_is_not_used(self, preloaded_features_app, tmp_path):
+        """A coding refused with q=0 is never selected."""
+        static = self._setup_static(tmp_path)
+        client, _ = preloaded_features_app()
+
+        with patch("refast.router.STATIC_DIR", static):
+            response = client.get(
+                "/ui/static/test.js",
+                headers={"Accept-Encoding": "br;q=0, gzip;q=0.5"},
+            )
+
+        assert response.headers.get("Content-Encoding") == "gzip"
+        assert response.content == b"console.log('hello');"
+
+    def test_accept_encoding_tokens(self):
+        """Codings are matched as whole tokens with their q values."""
+        body = EncodedBody(b"x", gzip=b"gz", br=b"br")
+
+        assert body.select("gzip, br")[1] == "br"
+        assert body.select("gzip;q=1, br;q=0.5")[1] == "gzip"
+        assert body.select("*")[1] == "br"
+        assert body.select("*, br;q=0")[1] == "gzip"
+        assert body.select("xbr, gzipped")[1] is None
+        assert body.select("gzip;q=0")[1] is None
+        assert body.select("")[1] is None
+
     def test_404_for_missing_file(self, preloaded_features_app, tmp_path):
         client, _ = preloaded_features_app()
 
@@ -330,6 +457,257 @@ class TestStaticHandlerCompression:
         assert response.status_code == 404
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+# Static asset index – cache headers and fingerprinting
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+class TestStaticAssetIndex:
+    """Test the in-memory static index and the headers it is served with."""
+
+    def _setup_build(self, tmp_path, sample_manifest):
+        """Write a small build: stable entry files plus one hashed chunk."""
+        (tmp_path / "manifest.json").write_text(json.dumps(sample_manifest))
+        (tmp_path / "refast-client.js").write_text("import './refast-charts-abc123.js';" * 50)
+        (tmp_path / "refast-client.css").write_text("body { margin: 0; }")
+        (tmp_path / "refast-charts-abc123.js").write_text("export const charts = 1;")
+        (tmp_path / "__init__.py").write_text("")
+        return tmp_path
+
+    def test_index_contents(self, tmp_path, sample_manifest):
+        """Build outputs are indexed; Python files and variants are not."""
+        static = self._setup_build(tmp_path, sample_manifest)
+        (static / "refast-client.js.gz").write_bytes(gzip.compress(b"x"))
+
+        index = StaticAssetIndex(static)
+
+        assert "refast-client.js" in index
+        assert "refast-client.js.gz" not in index
+        assert "__init__.py" not in index
+        assert index.get("refast-charts-abc123.js").immutable is True
+        assert index.get("refast-client.js").immutable is False
+        assert index.get("refast-client.css").content_type == "text/css"
+
+    def test_index_serves_files_that_only_look_like_variants(self, tmp_path):
+        """Only .gz/.br files next to a compressible original are skipped."""
+        (tmp_path / "app.js").write_text("1;")
+        (tmp_path / "app.js.br").write_bytes(b"br")
+        (tmp_path / "archive.tar.gz").write_bytes(b"tar")
+        (tmp_path / "helper.py").write_text("print(1)")
+
+        index = StaticAssetIndex(tmp_path)
+
+        assert "app.js.br" not in index
+        assert "archive.tar.gz" in index
+        assert "helper.py" in index
+
+    def test_static_index_is_precompressed(self, tmp_path):
+        """get_static_index() builds compressed variants up front."""
+        from refast.assets import get_static_index
+
+        (tmp_path / "app.js").write_text("console.log(1);" * 100)
+        assert get_static_index(tmp_path).get("app.js").gzip is not None
+
+    def test_url_fingerprints_stable_names_only(self, tmp_path, sample_manifest):
+        """Stable names get ?v=<hash>; hashed chunks and unknown files do not."""
+        index = StaticAssetIndex(self._setup_build(tmp_path, sample_manifest))
+        version = index.get("refast-client.js").version
+
+        assert index.url("refast-client.js") == f"/static/refast-client.js?v={version}"
+        assert index.url("refast-charts-abc123.js") == "/static/refast-charts-abc123.js"
+        assert index.url("missing.js") == "/static/missing.js"
+
+    def test_hashed_chunk_is_immutable(self, preloaded_features_app, tmp_path, sample_manifest):
+        static = self._setup_build(tmp_path, sample_manifest)
+        client, _ = preloaded_features_app()
+
+        with patch("refast.router.STATIC_DIR", static):
+            response = client.get("/ui/static/refast-charts-abc123.js")
+
+        assert response.status_code == 200
+        assert response.headers["Cache-Control"] == IMMUTABLE_CACHE_CONTROL
+        assert response.headers["Content-Type"].startswith("application/javascript")
+        assert "Last-Modified" in response.headers
+
+    def test_stable_name_revalidates_unless_fingerprinted(
+        self, preloaded_features_app, tmp_path, sample_manifest
+    ):
+        static = self._setup_build(tmp_path, sample_manifest)
+        client, _ = preloaded_features_app()
+        version = StaticAssetIndex(static).get("refast-client.css").version
+
+        with patch("refast.router.STATIC_DIR", static):
+            plain = client.get("/ui/static/refast-client.css")
+            fingerprinted = client.get(f"/ui/static/refast-client.css?v={version}")
+            stale = client.get("/ui/static/refast-client.css?v=0000")
+
+        assert plain.headers["Cache-Control"] == "no-cache"
+        assert fingerprinted.headers["Cache-Control"] == IMMUTABLE_CACHE_CONTROL
+        assert stale.headers["Cache-Control"] == "no-cache"
+
+    def test_if_none_match_returns_304(self, preloaded_features_app, tmp_path, sample_manifest):
+        static = self._setup_build(tmp_path, sample_manifest)
+        client, _ = preloaded_features_app()
+
+        with patch("refast.router.STATIC_DIR", static):
+            first = client.get("/ui/static/refast-client.css")
+            second = client.get(
+                "/ui/static/refast-client.css",
+                headers={"If-None-Match": first.headers["ETag"]},
+            )
+
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["ETag"] == first.headers["ETag"]
+
+    def test_gzip_built_without_prebuilt_variant(
+        self, preloaded_features_app, tmp_path, sample_manifest
+    ):
+        static = self._setup_build(tmp_path, sample_manifest)
+        client, _ = preloaded_features_app()
+
+        with patch("refast.router.STATIC_DIR", static):
+            response = client.get(
+                "/ui/static/refast-client.js", headers={"Accept-Encoding": "gzip"}
+            )
+
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["Vary"] == "Accept-Encoding"
+        assert response.text == (static / "refast-client.js").read_text()
+
+    def test_path_traversal_is_not_found(self, preloaded_features_app, tmp_path):
+        root = tmp_path / "static"
+        root.mkdir()
+        (tmp_path / "secret.txt").write_text("secret")
+        client, _ = preloaded_features_app()
+
+        with patch("refast.router.STATIC_DIR", root):
+            response = client.get("/ui/static/%2e%2e/secret.txt")
+
+        assert response.status_code == 404
+
+    def test_debug_mode_picks_up_rebuilt_files(self, tmp_path, sample_manifest):
+        """With revalidate=True, changed and new files are reloaded."""
+        static = self._setup_build(tmp_path, sample_manifest)
+        index = StaticAssetIndex(static)
+        before = index.get("refast-client.css").etag
+
+        css = static / "refast-client.css"
+        css.write_text("body { margin: 1px; }")
+        os.utime(css, ns=(css.stat().st_mtime_ns + 10**9,) * 2)
+        (static / "late.js").write_text("1;")
+
+        assert index.get("refast-client.css").etag == before
+        assert index.get("refast-client.css", revalidate=True).etag != before
+        assert index.get("late.js") is None
+        assert index.get("late.js", revalidate=True) is not None
+        assert index.get("../manifest.json", revalidate=True) is None
+
+    def test_shell_uses_fingerprinted_urls(self, tmp_path, sample_manifest):
+        static = self._setup_build(tmp_path, sample_manifest)
+        index = StaticAssetIndex(static)
+
+        with patch("refast.assets.STATIC_DIR", static):
+            html = render_html_shell(RefastApp(preloaded_features=["charts"]))
+
+        entry_url = index.url("refast-client.js")
+        assert "?v=" in entry_url
+        assert f'<script type="module" src="{entry_url}">' in html
+        assert f'href="{index.url("refast-client.css")}"' in html
+        assert '<link rel="modulepreload" href="/static/refast-charts-abc123.js">' in html
+        # Chunks importing "./refast-client.js" resolve to the same module
+        import_map = {"imports": {"/static/refast-client.js": entry_url}}
+        assert f'<script type="importmap">{json.dumps(import_map)}</script>' in html
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Preload hints – Link header / 103 Early Hints
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+class TestPreloadHints:
+    """Test that startup assets are announced before the shell is parsed."""
+
+    @pytest.fixture
+    def static(self, tmp_path, sample_manifest):
+        (tmp_path / "manifest.json").write_text(json.dumps(sample_manifest))
+        for name in (
+            "refast-client.js",
+            "refast-client.css",
+            "refast-charts-abc123.js",
+            "refast-shared-zzz000.js",
+            "refast-vendor-vvv111.js",
+        ):
+            (tmp_path / name).write_text(f"/* {name} */")
+        with patch("refast.assets.STATIC_DIR", tmp_path):
+            yield tmp_path
+
+    def test_preload_links_cover_css_entry_and_startup_chunks(self, static):
+        index = StaticAssetIndex(static)
+        links = preload_links(RefastApp(preloaded_features=["charts"]))
+
+        assert links[0] == f"<{index.url('refast-client.css')}>; rel=preload; as=style"
+        assert links[1] == f"<{index.url('refast-client.js')}>; rel=modulepreload"
+        assert "</static/refast-charts-abc123.js>; rel=modulepreload" in links
+        assert "</static/refast-vendor-vvv111.js>; rel=modulepreload" in links
+        assert not any("icons" in link for link in links)
+
+    def test_page_response_has_link_header(self, static, preloaded_features_app):
+        client, ui = preloaded_features_app(preloaded_features=["charts"])
+
+        response = client.get("/ui/")
+
+        assert response.headers["Link"] == ", ".join(preload_links(ui))
+        assert "refast-charts-abc123.js" in response.headers["Link"]
+
+    def test_no_link_header_without_assets(self, tmp_path, preloaded_features_app):
+        client, _ = preloaded_features_app()
+
+        with patch("refast.assets.STATIC_DIR", tmp_path):
+            response = client.get("/ui/")
+
+        assert "Link" not in response.headers
+
+    def test_early_hints_sent_when_server_supports_them(self, static):
+        """With the ASGI early-hint extension a 103 goes out before the shell."""
+        ui = RefastApp(auto_discover_extensions=False)
+        ui.page("/")(lambda ctx: None)
+        fa = FastAPI()
+        fa.include_router(ui.router)
+
+        sent: list[dict] = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/",
+            "raw_path": b"/",
+            "root_path": "",
+            "query_string": b"",
+            "headers": [],
+            "server": ("testserver", 80),
+            "client": ("testclient", 1),
+            "extensions": {"http.response.early_hint": {}},
+        }
+        asyncio.run(fa(scope, receive, send))
+
+        assert [m["type"] for m in sent] == [
+            "http.response.early_hint",
+            "http.response.start",
+            "http.response.body",
+        ]
+        assert sent[0]["links"] == [link.encode() for link in preload_links(ui)]
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # ALL_FEATURE_CHUNKS constant
 # ═══════════════════════════════════════════════════════════════════════════
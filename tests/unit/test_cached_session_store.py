@@ -0,0 +1,220 @@
+"""Tests for CachedSessionStore."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from refast.events.backplane import InProcessBackplane, InProcessHub
+from refast.session.session import SessionData
+from refast.session.stores.cached import CachedSessionStore
+from refast.session.stores.memory import MemorySessionStore
+
+
+def session(session_id: str, **data) -> dict:
+    return SessionData(id=session_id, data=data).to_dict()
+
+
+@pytest.fixture
+def backing():
+    """A shared backing store whose reads are counted."""
+    store = MemorySessionStore()
+    store.get = AsyncMock(wraps=store.get)
+    return store
+
+
+class TestCaching:
+    """Tests for the local cache."""
+
+    @pytest.mark.asyncio
+    async def test_hit_skips_backing_store(self, backing):
+        """A session read twice is fetched from the backing store once."""
+        await backing.set("s1", session("s1", user="ada"))
+        cache = CachedSessionStore(backing)
+
+        assert (await cache.get("s1"))["data"] == {"user": "ada"}
+        assert (await cache.get("s1"))["data"] == {"user": "ada"}
+        assert backing.get.await_count == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_returns_copies(self, backing):
+        """Changing returned data does not change the cached session."""
+        cache = CachedSessionStore(backing)
+        await cache.set("s1", session("s1", n=1))
+
+        data = await cache.get("s1")
+        data["data"]["n"] = 2
+        assert (await cache.get("s1"))["data"] == {"n": 1}
+
+    @pytest.mark.asyncio
+    async def test_lru_bound(self, backing):
+        """The least recently used session is dropped when full."""
+        cache = CachedSessionStore(backing, max_entries=2)
+        for sid in ("a", "b"):
+            await cache.set(sid, session(sid))
+        await cache.get("a")
+        await cache.set("c", session("c"))
+
+        backing.get.reset_mock()
+        await cache.get("a")
+        await cache.get("c")
+        assert backing.get.await_count == 0
+        await cache.get("b")
+        assert backing.get.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_ttl(self, backing):
+        """Entries older than the TTL are re-read."""
+        cache = CachedSessionStore(backing, ttl=0)
+        await cache.set("s1", session("s1"))
+        await cache.get("s1")
+        assert backing.get.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_get_nowait(self, backing):
+        """Cached sessions can be read synchronously; misses cannot."""
+        cache = CachedSessionStore(backing)
+        with pytest.raises(NotImplementedError):
+            cache.get_nowait("s1")
+        await cache.set("s1", session("s1", n=1))
+        assert cache.get_nowait("s1")["data"] == {"n": 1}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_reads_coalesced(self, backing):
+        """Simultaneous misses for one session share one backing read."""
+        await backing.set("s1", session("s1"))
+        cache = CachedSessionStore(backing)
+        results = await asyncio.gather(*(cache.get("s1") for _ in range(5)))
+        assert all(r["id"] == "s1" for r in results)
+        assert backing.get.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_get_many_reads_only_misses(self, backing):
+        """get_many fetches just the sessions not cached."""
+        cache = CachedSessionStore(backing)
+        await cache.set("a", session("a"))
+        await backing.set("b", session("b"))
+        backing.get_many = AsyncMock(wraps=backing.get_many)
+
+        found = await cache.get_many(["a", "b", "missing"])
+        assert sorted(found) == ["a", "b"]
+        backing.get_many.assert_awaited_once_with(["b", "missing"])
+
+    @pytest.mark.asyncio
+    async def test_skipped_write_not_cached(self, backing):
+        """A partial save the backing store skipped does not cache a ghost session."""
+        cache = CachedSessionStore(backing)
+        await cache.set("s1", session("s1", n=1))
+        backing.update = AsyncMock(return_value=False)
+
+        assert await cache.update("s1", session("s1", n=2), changed={"n"}) is False
+
+        assert "s1" not in cache._entries
+        await backing.delete("s1")
+        assert await cache.get("s1") is None
+
+
+class TestInvalidation:
+    """Tests for cross-worker invalidation."""
+
+    @pytest.fixture
+    def workers(self, backing):
+        """Two caches over one backing store, linked by an in-process backplane."""
+        hub = InProcessHub()
+        return (
+            CachedSessionStore(backing, backplane=InProcessBackplane(hub)),
+            CachedSessionStore(backing, backplane=InProcessBackplane(hub)),
+        )
+
+    @pytest.mark.asyncio
+    async def test_write_invalidates_other_workers(self, workers):
+        """A write on one worker is seen by the next read on another."""
+        a, b = workers
+        await a.set("s1", session("s1", n=1))
+        assert (await b.get("s1"))["data"] == {"n": 1}
+
+        await a.update("s1", session("s1", n=2), changed={"n"})
+        assert (await b.get("s1"))["data"] == {"n": 2}
+
+        await b.delete("s1")
+        assert await a.get("s1") is None
+
+    @pytest.mark.asyncio
+    async def test_writes_stamp_versions(self, workers, backing):
+        """Each write stores a new version stamp."""
+        a, _ = workers
+        await a.set("s1", session("s1"))
+        first = (await backing.get("s1"))["version"]
+        await a.set("s1", session("s1"))
+        assert (await backing.get("s1"))["version"] not in (None, first)
+
+    @pytest.mark.asyncio
+    async def test_same_version_kept(self, workers):
+        """A worker already holding the announced version keeps its entry."""
+        a, b = workers
+        await b.set("s1", session("s1"))
+        version = b._entries["s1"].version
+        await a._announce({"s1": version})
+        assert "s1" in b._entries
+        await a._announce({"s1": "other"})
+        assert "s1" not in b._entries
+
+    @pytest.mark.asyncio
+    async def test_read_overtaken_by_invalidation_not_cached(self, workers, backing):
+        """A read that an invalidation overtook is returned but not cached."""
+        a, b = workers
+        await backing.set("s1", session("s1", n=1))
+        release = asyncio.Event()
+        original = backing.get
+
+        async def slow_get(session_id):
+            data = await original(session_id)
+            await release.wait()
+            return data
+
+        backing.get = slow_get
+        read = asyncio.create_task(b.get("s1"))
+        await asyncio.sleep(0)
+        await a.set("s1", session("s1", n=2))
+        release.set()
+        assert (await read)["data"] == {"n": 1}
+
+        assert (await b.get("s1"))["data"] == {"n": 2}
+
+    @pytest.mark.asyncio
+    async def test_get_many_overtaken_by_invalidation_not_cached(self, workers, backing):
+        """A batched read that an invalidation overtook is returned but not cached."""
+        a, b = workers
+        await backing.set("s1", session("s1", n=1))
+        release = asyncio.Event()
+        original = backing.get_many
+
+        async def slow_get_many(session_ids):
+            data = await original(session_ids)
+            await release.wait()
+            return data
+
+        backing.get_many = slow_get_many
+        read = asyncio.create_task(b.get_many(["s1"]))
+        await asyncio.sleep(0)
+        assert "s1" in b._loads
+        await a.set("s1", session("s1", n=2))
+        release.set()
+        assert (await read)["s1"]["data"] == {"n": 1}
+
+        assert "s1" not in b._entries
+        assert (await b.get("s1"))["data"] == {"n": 2}
+
+    @pytest.mark.asyncio
+    async def test_get_many_joins_read_in_flight(self, backing):
+        """get_many shares a concurrent get() of the same session."""
+        await backing.set("s1", session("s1"))
+        cache = CachedSessionStore(backing)
+        backing.get_many = AsyncMock(wraps=backing.get_many)
+
+        single, many = await asyncio.gather(cache.get("s1"), cache.get_many(["s1"]))
+
+        assert single["id"] == many["s1"]["id"] == "s1"
+        assert backing.get.await_count == 1
+        backing.get_many.assert_not_awaited()
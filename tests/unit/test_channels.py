@@ -0,0 +1,175 @@
+"""Tests for the channel subscription index."""
+
+import random
+from unittest.mock import AsyncMock
+
+import pytest
+
+from refast.events.channels import ChannelIndex, channel_matches, is_pattern
+from refast.events.stream import EventStream, WebSocketConnection
+
+
+class TestChannelMatches:
+    """Tests for channel_matches() and is_pattern()."""
+
+    @pytest.mark.parametrize(
+        ("pattern", "channel", "expected"),
+        [
+            ("room:1", "room:1", True),
+            ("room:1", "room:2", False),
+            ("room:*", "room:1", True),
+            ("room:*", "room", False),
+            ("room:*", "room:1:typing", False),
+            ("room:*:typing", "room:1:typing", True),
+            ("room:**", "room:1", True),
+            ("room:**", "room:1:typing", True),
+            ("room:**", "room", False),
+            ("**", "anything:at:all", True),
+        ],
+    )
+    def test_matching(self, pattern, channel, expected):
+        """Wildcards match one segment, a trailing ** one or more."""
+        assert channel_matches(pattern, channel) is expected
+
+    def test_is_pattern(self):
+        """Only whole-segment wildcards make a pattern."""
+        assert is_pattern("room:*")
+        assert is_pattern("room:**")
+        assert not is_pattern("room:1")
+        assert not is_pattern("room*")
+
+    def test_prefix_wildcard_must_be_last(self):
+        """A ** segment in the middle is rejected."""
+        with pytest.raises(ValueError):
+            channel_matches("room:**:typing", "room:1:typing")
+
+
+class TestChannelIndex:
+    """Tests for ChannelIndex."""
+
+    def test_exact_and_wildcard(self):
+        """Exact and wildcard subscribers are both found, each once."""
+        index = ChannelIndex()
+        index.add("room:1", "a")
+        index.add("room:*", "b")
+        index.add("room:**", "c")
+        index.add("room:*", "a")
+
+        assert index.match("room:1") == {"a", "b", "c"}
+        assert index.match("room:2") == {"a", "b", "c"}
+        assert index.match("room:2:typing") == {"c"}
+        assert index.match("lobby") == set()
+
+    def test_discard_prunes(self):
+        """Removing the last subscriber drops the channel or pattern."""
+        index = ChannelIndex()
+        index.add("room:1", "a")
+        index.add("room:*:typing", "b")
+        assert len(index) == 2
+
+        index.discard("room:1", "a")
+        index.discard("room:*:typing", "b")
+        index.discard("room:*:typing", "b")
+        index.discard("never:subscribed", "x")
+
+        assert len(index) == 0
+        assert index._root.is_empty()
+        assert index.match("room:1") == set()
+
+    def test_match_returns_copy(self):
+        """Mutating a match result does not change the index."""
+        index = ChannelIndex()
+        index.add("room:1", "a")
+        index.match("room:1").clear()
+        assert index.match("room:1") == {"a"}
+
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_matches_linear_scan(self, seed):
+        """The index agrees with checking every subscription."""
+        rng = random.Random(seed)
+        pieces = ["a", "b", "c", "*"]
+        subscriptions = []
+        index = ChannelIndex()
+        for key in range(200):
+            segments = rng.choices(pieces, k=rng.randint(1, 3))
+            if rng.random() < 0.2:
+                segments.append("**")
+            pattern = ":".join(segments)
+            subscriptions.append((pattern, key))
+            index.add(pattern, key)
+
+        for pattern, key in rng.sample(subscriptions, 50):
+            index.discard(pattern, key)
+            subscriptions.remove((pattern, key))
+
+        for _ in range(300):
+            channel = ":".join(rng.choices("abcd", k=rng.randint(1, 4)))
+            expected = {key for pattern, key in subscriptions if channel_matches(pattern, channel)}
+            assert index.match(channel) == expected, channel
+
+
+class TestEventStreamChannels:
+    """Tests for EventStream's channel index."""
+
+    def test_subscribe_after_registration(self):
+        """Subscribing a registered connection updates the index."""
+        stream = EventStream()
+        conn = WebSocketConnection()
+        stream.add_connection(conn)
+
+        conn.subscribe("room:*")
+        assert stream.get_subscribers("room:1") == [conn]
+
+        conn.unsubscribe("room:*")
+        assert stream.get_subscribers("room:1") == []
+
+    def test_remove_connection_unindexes(self):
+        """A removed connection is no longer a subscriber or in its session."""
+        stream = EventStream()
+        conn = WebSocketConnection(session_id="s1")
+        conn.subscribe("room:1")
+        stream.add_connection(conn)
+        assert stream.get_session_connections("s1") == [conn]
+
+        stream.remove_connection(conn)
+
+        assert stream.get_subscribers("room:1") == []
+        assert stream.get_session_connections("s1") == []
+        assert len(stream._channels) == 0
+
+        # Subscriptions made after removal do not leak back into the index
+        conn.subscribe("room:2")
+        assert stream.get_subscribers("room:2") == []
+
+    def test_invalid_pattern_rejected(self):
+        """Malformed wildcard patterns raise on subscribe."""
+        conn = WebSocketConnection()
+        with pytest.raises(ValueError):
+            conn.subscribe("room:**:typing")
+
+    def test_is_subscribed_through_pattern(self):
+        """is_subscribed() agrees with the index for wildcard subscriptions."""
+        conn = WebSocketConnection()
+        conn.subscribe("room:**")
+        assert conn.is_subscribed("room:1:typing")
+        assert not conn.is_subscribed("lobby")
+
+    @pytest.mark.asyncio
+    async def test_send_to_subscribers_only_touches_subscribers(self):
+        """Channel sends reach each matching connection once."""
+        stream = EventStream()
+        conns = [WebSocketConnection(connected=True) for _ in range(5)]
+        for conn in conns:
+            conn.send = AsyncMock(return_value=True)
+            stream.add_connection(conn)
+        conns[0].subscribe("room:1")
+        conns[0].subscribe("room:*")
+        conns[1].subscribe("room:**")
+
+        count = await stream.send_to_subscribers("room:1", {"text": "hi"})
+
+        assert count == 2
+        conns[0].send.assert_called_once()
+        conns[1].send.assert_called_once()
+        for conn in conns[2:]:
+            conn.send.assert_not_called()
@@ -0,0 +1,196 @@
+"""Tests for the app-wide connection registry, channels and session sends."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from refast import RefastApp
+from refast.components import Text
+from refast.context import Context
+from refast.events.backplane import InProcessBackplane, InProcessHub
+
+
+def connect(app: RefastApp, session_id: str | None = None) -> Context:
+    """Register a context with a mock WebSocket, as the router does on connect."""
+    ws = AsyncMock()
+    ws.cookies = {app.session_cookie_name: session_id} if session_id else {}
+    ctx = Context(websocket=ws, app=app)
+    _ = app.router
+    app._router._register_context(ws, ctx)
+    return ctx
+
+
+class NoScanDict(dict):
+    """A dict that fails the test if it is iterated."""
+
+    def __iter__(self):
+        raise AssertionError("connections were scanned")
+
+    def values(self):
+        raise AssertionError("connections were scanned")
+
+    def items(self):
+        raise AssertionError("connections were scanned")
+
+
+def sent_events(ctx: Context) -> list[dict]:
+    """Decode the frames sent to a context's WebSocket."""
+    return [json.loads(call.args[0]) for call in ctx._websocket.send_text.call_args_list]
+
+
+class TestRouterRegistry:
+    """Tests for the router feeding the app's EventStream."""
+
+    def test_connection_registered_for_its_lifetime(self):
+        """A WebSocket is registered with its session cookie until it closes."""
+        app = FastAPI()
+        ui = RefastApp()
+
+        @ui.page("/")
+        def home(ctx):
+            return Text("hi")
+
+        app.include_router(ui.router)
+        client = TestClient(app, cookies={"refast_session": "sess-1"})
+
+        with client.websocket_connect("/ws") as websocket:
+            websocket.send_json({"type": "store_init", "path": "/", "data": {}})
+            assert websocket.receive_json()["type"] == "page_render"
+
+            (conn,) = ui.stream.get_session_connections("sess-1")
+            assert ui.active_contexts == [conn.context]
+            assert conn.context.session_id == "sess-1"
+            assert ui.stream.get_websocket_connection(conn.websocket) is conn
+
+        assert ui.stream.connection_count == 0
+        assert ui.active_contexts == []
+        assert ui.stream.get_session_connections("sess-1") == []
+
+
+class TestContextChannels:
+    """Tests for ctx.subscribe() / ctx.send_to_channel()."""
+
+    @pytest.mark.asyncio
+    async def test_send_to_channel_reaches_subscribers_only(self):
+        """Only subscribed clients receive channel events, not the sender."""
+        app = RefastApp()
+        sender, member, outsider = connect(app), connect(app), connect(app)
+        sender.subscribe("room:1")
+        member.subscribe("room:*")
+
+        count = await sender.send_to_channel("room:1", "chat:message", {"text": "hi"})
+
+        assert count == 1
+        assert sent_events(member) == [
+            {"type": "event", "eventType": "chat:message", "data": {"text": "hi"}}
+        ]
+        assert sent_events(sender) == []
+        assert sent_events(outsider) == []
+
+    @pytest.mark.asyncio
+    async def test_include_self(self):
+        """include_self delivers to the sender when it is subscribed."""
+        app = RefastApp()
+        sender = connect(app)
+        sender.subscribe("room:1")
+
+        assert await sender.send_to_channel("room:1", "ping", {}, include_self=True) == 1
+
+    @pytest.mark.asyncio
+    async def test_unsubscribe(self):
+        """Unsubscribed clients stop receiving channel events."""
+        app = RefastApp()
+        sender, member = connect(app), connect(app)
+        member.subscribe("room:1")
+        member.unsubscribe("room:1")
+
+        assert await sender.send_to_channel("room:1", "ping", {}) == 0
+
+    def test_subscribe_without_connection_is_noop(self):
+        """A context that is not connected ignores subscriptions."""
+        ctx = Context(app=RefastApp())
+        ctx.subscribe("room:1")
+        assert ctx.session_id is None
+
+    @pytest.mark.asyncio
+    async def test_channel_send_crosses_workers(self):
+        """With a backplane, subscribers of other apps receive channel events."""
+        hub = InProcessHub()
+        app_a = RefastApp(backplane=InProcessBackplane(hub))
+        app_b = RefastApp(backplane=InProcessBackplane(hub))
+        await app_b.backplane.start()
+        sender = connect(app_a)
+        remote = connect(app_b)
+        remote.subscribe("room:1")
+
+        assert await sender.send_to_channel("room:1", "chat:message", {"text": "hi"}) == 0
+        assert sent_events(remote)[0]["data"] == {"text": "hi"}
+
+
+class TestContextSessions:
+    """Tests for ctx.send_to_session()."""
+
+    @pytest.mark.asyncio
+    async def test_send_to_session_reaches_every_tab(self):
+        """All connections of the session receive the event, others do not."""
+        app = RefastApp()
+        tab1, tab2, other = connect(app, "s1"), connect(app, "s1"), connect(app, "s2")
+
+        count = await tab1.send_to_session("s1", "cart:updated", {"items": 3})
+
+        assert count == 2
+        assert sent_events(tab1)[0]["eventType"] == "cart:updated"
+        assert sent_events(tab2)[0]["data"] == {"items": 3}
+        assert sent_events(other) == []
+
+    @pytest.mark.asyncio
+    async def test_session_lookup_does_not_scan_connections(self):
+        """Session sends never enumerate the other connections."""
+        app = RefastApp()
+        target = connect(app, "s1")
+        for _ in range(50):
+            connect(app, "elsewhere")
+        app.stream._connections = NoScanDict(app.stream._connections)
+
+        assert await target.send_to_session("s1", "ping", {}) == 1
+
+
+class TestContextBroadcast:
+    """Tests for ctx.broadcast() over the connection registry."""
+
+    @pytest.mark.asyncio
+    async def test_broadcast_uses_stream_settings(self):
+        """Broadcasts honour the stream's send_concurrency and skip the sender."""
+        app = RefastApp()
+        app.stream.send_concurrency = 1
+        sender = connect(app)
+        receivers = [connect(app) for _ in range(3)]
+        in_flight = peak = 0
+
+        async def send_text(frame):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+
+        for ctx in receivers:
+            ctx._websocket.send_text.side_effect = send_text
+
+        assert await sender.broadcast("tick", {}) == 3
+        assert peak == 1
+        assert sent_events(sender) == []
+
+    @pytest.mark.asyncio
+    async def test_disconnected_clients_are_skipped(self):
+        """A connection marked disconnected does not receive broadcasts."""
+        app = RefastApp()
+        sender, gone = connect(app), connect(app)
+        gone._connection.connected = False
+
+        assert await sender.broadcast("tick", {}) == 0
+        gone._websocket.send_text.assert_not_called()
@@ -1,5 +1,6 @@
 """Tests for Context class and Callback."""
 
+import asyncio
 from unittest.mock import AsyncMock
 
 import pytest
@@ -1223,3 +1224,530 @@ class TestUrlParams:
         ctx._current_path = "/dashboard"
         ctx._query_string = ""
         assert ctx.url == "/dashboard"
+
+
+class TestContextBatch:
+    """Tests for Context.batch() grouped updates."""
+
+    @pytest.mark.asyncio
+    async def test_batch_sends_single_frame(self):
+        """Updates inside a batch are flushed as one batch message on exit."""
+        ws = AsyncMock()
+        ctx = Context(websocket=ws)
+
+        async with ctx.batch():
+            await ctx.update_props("a", {"x": 1})
+            await ctx.update_text("b", "hello")
+            await ctx.remove("c")
+            ws.send_json.assert_not_called()
+
+        ws.send_json.assert_called_once()
+        message = ws.send_json.call_args[0][0]
+        assert message["type"] == "batch"
+        assert [m["operation"] for m in message["messages"]] == [
+            "update_props",
+            "update_children",
+            "remove",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_batch_single_update_is_sent_unwrapped(self):
+        """A batch containing one update sends that update as-is."""
+        ws = AsyncMock()
+        ctx = Context(websocket=ws)
+
+        async with ctx.batch():
+            await ctx.update_props("a", {"x": 1})
+
+        ws.send_json.assert_called_once_with(
+            {"type": "update", "operation": "update_props", "targetId": "a", "props": {"x": 1}}
+        )
+
+    @pytest.mark.asyncio
+    async def test_batch_merges_update_props_last_wins(self):
+        """Repeated update_props for one target merge with last-wins per key."""
+        ws = AsyncMock()
+        ctx = Context(websocket=ws)
+
+        async with ctx.batch():
+            await ctx.update_props("a", {"x": 1, "y": 1})
+            await ctx.update_props("b", {"z": 1})
+            await ctx.update_props("a", {"x": 2})
+
+        messages = ws.send_json.call_args[0][0]["messages"]
+        assert len(messages) == 2
+        assert messages[0]["props"] == {"x": 2, "y": 1}
+        assert messages[1]["targetId"] == "b"
+
+    @pytest.mark.asyncio
+    async def test_batch_concatenates_append_prop(self):
+        """Consecutive string append_prop calls are concatenated."""
+        ws = AsyncMock()
+        ctx = Context(websocket=ws)
+
+        async with ctx.batch():
+            await ctx.append_prop("out", "content", "Hello")
+            await ctx.append_prop("out", "content", ", ")
+            await ctx.append_prop("out", "content", "world")
+
+        ws.send_json.assert_called_once_with(
+            {
+                "type": "update",
+                "operation": "append_prop",
+                "targetId": "out",
+                "propName": "content",
+                "value": "Hello, world",
+            }
+        )
+
+    @pytest.mark.asyncio
+    async def test_batch_does_not_merge_across_structural_ops(self):
+        """A structural operation prevents folding later updates into earlier ones."""
+        ws = AsyncMock()
+        ctx = Context(websocket=ws)
+
+        async with ctx.batch():
+            await ctx.update_props("a", {"x": 1})
+            await ctx.replace("parent", {"type": "Container", "id": "parent"})
+            await ctx.update_props("a", {"x": 2})
+            await ctx.append_prop("a", "data", {"p": 1})
+            await ctx.append_prop("a", "data", {"p": 2})
+
+        messages = ws.send_json.call_args[0][0]["messages"]
+        assert [m["operation"] for m in messages] == [
+            "update_props",
+            "replace",
+            "update_props",
+            "append_prop",
+            "append_prop",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_batch_discards_updates_on_error(self):
+        """Buffered updates are dropped when the batch block raises."""
+        ws = AsyncMock()
+        ctx = Context(websocket=ws)
+
+        with pytest.raises(RuntimeError):
+            async with ctx.batch():
+                await ctx.update_props("a", {"x": 1})
+                raise RuntimeError("boom")
+
+        ws.send_json.assert_not_called()
+        await ctx.update_props("a", {"x": 2})
+        ws.send_json.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_nested_batch_joins_outer(self):
+        """Nested batches flush only when the outermost block exits."""
+        ws = AsyncMock()
+        ctx = Context(websocket=ws)
+
+        async with ctx.batch():
+            async with ctx.batch():
+                await ctx.update_text("a", "one")
+            ws.send_json.assert_not_called()
+            await ctx.update_text("b", "two")
+
+        ws.send_json.assert_called_once()
+        assert len(ws.send_json.call_args[0][0]["messages"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_batch_does_not_buffer_other_messages(self):
+        """Non-update messages such as toasts are sent immediately."""
+        ws = AsyncMock()
+        ctx = Context(websocket=ws)
+
+        async with ctx.batch():
+            await ctx.update_props("a", {"x": 1})
+            await ctx.show_toast("hi")
+            assert ws.send_json.call_count == 1
+            assert ws.send_json.call_args[0][0]["type"] == "toast"
+
+        assert ws.send_json.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_batch_without_websocket(self):
+        """Batching is a no-op without a WebSocket."""
+        ctx = Context()
+
+        async with ctx.batch():
+            await ctx.update_props("a", {"x": 1})
+
+    @pytest.mark.asyncio
+    async def test_concurrent_handler_is_not_buffered(self):
+        """Updates from another task on the same context bypass the batch."""
+        ws = AsyncMock()
+        ctx = Context(websocket=ws)
+        opened = asyncio.Event()
+        release = asyncio.Event()
+
+        async def batching_handler():
+            async with ctx.batch():
+                await ctx.update_props("a", {"x": 1})
+                opened.set()
+                await release.wait()
+
+        task = asyncio.create_task(batching_handler())
+        await opened.wait()
+        await ctx.update_props("b", {"y": 1})
+
+        ws.send_json.assert_called_once()
+        assert ws.send_json.call_args[0][0]["targetId"] == "b"
+
+        release.set()
+        await task
+        assert ws.send_json.call_args[0][0]["targetId"] == "a"
+
+    @pytest.mark.asyncio
+    async def test_task_outliving_batch_sends_directly(self):
+        """A task started in a batch sends directly once the batch has flushed."""
+        ws = AsyncMock()
+        ctx = Context(websocket=ws)
+        release = asyncio.Event()
+
+        async def later():
+            await release.wait()
+            await ctx.update_text("late", "done")
+
+        async with ctx.batch():
+            task = asyncio.create_task(later())
+            await ctx.update_text("a", "one")
+
+        release.set()
+        await task
+        assert ws.send_json.call_count == 2
+        assert ws.send_json.call_args[0][0]["targetId"] == "late"
+
+    @pytest.mark.asyncio
+    async def test_batches_on_different_contexts_nest(self):
+        """A batch on another context inside a block keeps the outer buffering."""
+        ws_a, ws_b = AsyncMock(), AsyncMock()
+        ctx_a, ctx_b = Context(websocket=ws_a), Context(websocket=ws_b)
+
+        async with ctx_a.batch():
+            async with ctx_b.batch():
+                await ctx_a.update_text("a", "one")
+                await ctx_b.update_text("b", "two")
+            ws_b.send_json.assert_called_once()
+            await ctx_a.update_text("a2", "three")
+            ws_a.send_json.assert_not_called()
+
+        assert len(ws_a.send_json.call_args[0][0]["messages"]) == 2
+
+
+class TestContextPrefetch:
+    """Tests for speculative page rendering with ctx.prefetch()."""
+
+    def _make_app(self, calls: list[str]) -> RefastApp:
+        from refast.components import Button, Text
+
+        ui = RefastApp()
+
+        async def noop(ctx):
+            pass
+
+        @ui.page("/")
+        def home(ctx):
+            calls.append("home")
+            return Text("home", id="home")
+
+        @ui.page("/users/{user_id:int}")
+        async def user(ctx):
+            calls.append(f"user:{ctx.path_params['user_id']}")
+            return Button(
+                f"User {ctx.path_params['user_id']} {ctx.query_params.get('tab', '')}",
+                id="user",
+                on_click=ctx.callback(noop),
+            )
+
+        return ui
+
+    @pytest.mark.asyncio
+    async def test_load_awaits_async_page(self):
+        """load() awaits async page functions instead of sending a coroutine."""
+        calls: list[str] = []
+        ws = AsyncMock()
+        ctx = Context(websocket=ws, app=self._make_app(calls))
+
+        await ctx.load("/users/7")
+
+        rendered = ws.send_json.call_args_list[-1][0][0]
+        assert rendered["type"] == "page_render"
+        assert rendered["component"]["id"] == "user"
+        assert calls == ["user:7"]
+
+    @pytest.mark.asyncio
+    async def test_refresh_awaits_async_page(self):
+        """refresh() awaits async page functions."""
+        calls: list[str] = []
+        ws = AsyncMock()
+        ctx = Context(websocket=ws, app=self._make_app(calls))
+        ctx._path_params = {"user_id": 3}
+
+        await ctx.refresh("/users/3")
+
+        rendered = ws.send_json.call_args_list[-1][0][0]
+        assert rendered["type"] == "refresh"
+        assert rendered["component"]["id"] == "user"
+
+    @pytest.mark.asyncio
+    async def test_prefetch_does_not_touch_current_page(self):
+        """Prefetching leaves path, params and callbacks of the current page alone."""
+        calls: list[str] = []
+        ws = AsyncMock()
+        ctx = Context(websocket=ws, app=self._make_app(calls))
+        ctx._current_path = "/"
+        existing = ctx.callback(lambda c: None)
+
+        assert await ctx.prefetch("/users/5?tab=posts") is True
+
+        assert calls == ["user:5"]
+        assert ctx._current_path == "/"
+        assert ctx.path_params == {}
+        assert ctx.query_params == {}
+        assert list(ctx._callbacks) == [existing.id]
+        ws.send_json.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_load_is_served_from_prefetch(self):
+        """A prefetched page is not rendered again by load()."""
+        calls: list[str] = []
+        ws = AsyncMock()
+        ctx = Context(websocket=ws, app=self._make_app(calls))
+
+        await ctx.prefetch("/users/5?tab=posts")
+        await ctx.load("/users/5?tab=posts")
+
+        assert calls == ["user:5"]
+        rendered = ws.send_json.call_args_list[-1][0][0]
+        assert rendered["component"]["children"] == ["User 5 posts"]
+        assert ctx.path_params == {"user_id": 5}
+        assert ctx.query_params == {"tab": "posts"}
+        callback_id = rendered["component"]["props"]["on_click"]["callbackId"]
+        assert ctx.get_callback(callback_id) is not None
+        assert ctx._prefetched == {}
+
+    @pytest.mark.asyncio
+    async def test_repeated_prefetch_reuses_render(self):
+        """Prefetching an already cached page does not render it again."""
+        calls: list[str] = []
+        ctx = Context(websocket=AsyncMock(), app=self._make_app(calls))
+
+        await ctx.prefetch("/users/1")
+        await ctx.prefetch("/users/1/")
+
+        assert calls == ["user:1"]
+
+    @pytest.mark.asyncio
+    async def test_state_change_invalidates_prefetch(self):
+        """A write to ctx.state after prefetching forces a fresh render."""
+        calls: list[str] = []
+        ctx = Context(websocket=AsyncMock(), app=self._make_app(calls))
+
+        await ctx.prefetch("/users/1")
+        ctx.state["selected"] = 2
+        await ctx.load("/users/1")
+
+        assert calls == ["user:1", "user:1"]
+
+    @pytest.mark.asyncio
+    async def test_shared_state_change_invalidates_prefetch(self):
+        """A write to app.shared_state after prefetching forces a fresh render."""
+        calls: list[str] = []
+        ui = self._make_app(calls)
+        ctx = Context(websocket=AsyncMock(), app=ui)
+
+        await ctx.prefetch("/users/1")
+        ui.shared_state["online"] = 3
+        await ctx.load("/users/1")
+        await asyncio.sleep(0)
+
+        assert calls == ["user:1", "user:1"]
+
+    @pytest.mark.asyncio
+    async def test_expired_prefetch_is_ignored(self):
+        """Renders older than app.prefetch_ttl are not used."""
+        calls: list[str] = []
+        ui = self._make_app(calls)
+        ctx = Context(websocket=AsyncMock(), app=ui)
+
+        await ctx.prefetch("/users/1")
+        for entry in ctx._prefetched.values():
+            entry.expires = 0
+        await ctx.load("/users/1")
+
+        assert calls == ["user:1", "user:1"]
+
+    @pytest.mark.asyncio
+    async def test_prefetch_disabled(self):
+        """prefetch_ttl=0 turns prefetching off."""
+        calls: list[str] = []
+        ui = self._make_app(calls)
+        ui.prefetch_ttl = 0
+        ctx = Context(websocket=AsyncMock(), app=ui)
+
+        assert await ctx.prefetch("/users/1") is False
+        assert calls == []
+
+    @pytest.mark.asyncio
+    async def test_prefetch_unknown_or_failing_page(self):
+        """Unknown paths and page errors are ignored while prefetching."""
+        ui = RefastApp()
+
+        @ui.page("/broken")
+        def broken(ctx):
+            raise RuntimeError("boom")
+
+        ctx = Context(websocket=AsyncMock(), app=ui)
+
+        assert await ctx.prefetch("/missing") is False
+        assert await ctx.prefetch("/broken") is False
+        assert ctx._prefetched == {}
+
+    @pytest.mark.asyncio
+    async def test_prefetch_runs_on_detached_context(self):
+        """Writes made while prefetching reach neither the client nor live data."""
+        from refast.components import Text
+
+        ui = RefastApp()
+
+        @ui.page("/greedy")
+        async def greedy(ctx):
+            ctx.state["seen"] = True
+            ctx.store.local.set("theme", "dark")
+            ctx.session.set("visited", True)
+            await ctx.show_toast("hello")
+            return Text("greedy")
+
+        ws = AsyncMock()
+        ctx = Context(websocket=ws, app=ui)
+        ctx.store.local._data["theme"] = "light"
+
+        assert await ctx.prefetch("/greedy") is False
+
+        ws.send_json.assert_not_called()
+        assert "seen" not in ctx.state
+        assert ctx.store.local.get("theme") == "light"
+        assert ctx.session.get("visited") is None
+
+    @pytest.mark.asyncio
+    async def test_page_initialising_state_is_rendered_live(self):
+        """A page that writes state while prefetching is rendered again on navigation."""
+        from refast.components import Text
+
+        ui = RefastApp()
+        calls: list[str] = []
+
+        @ui.page("/counter")
+        def counter(ctx):
+            calls.append("counter")
+            if "count" not in ctx.state:
+                ctx.state["count"] = 0
+            return Text(str(ctx.state["count"]))
+
+        ctx = Context(websocket=AsyncMock(), app=ui)
+
+        assert await ctx.prefetch("/counter") is False
+        assert ctx._prefetched == {}
+        await ctx.load("/counter")
+
+        assert calls == ["counter", "counter"]
+        assert ctx.state["count"] == 0
+
+    @pytest.mark.asyncio
+    async def test_prefetch_bindings_target_live_state(self):
+        """Bindings created while prefetching bind to this context's state."""
+        from refast.components import Text
+
+        ui = RefastApp()
+
+        @ui.page("/count")
+        def count(ctx):
+            return Text(ctx.bind("count", 0))
+
+        ctx = Context(websocket=AsyncMock(), app=ui)
+        await ctx.prefetch("/count")
+        await ctx.load("/count")
+
+        assert ctx._prefetched == {}
+        assert "count" in ctx.state._targets
+
+    @pytest.mark.asyncio
+    async def test_prefetch_page_returning_none_is_not_cached(self):
+        """A page function returning None is rejected like during navigation."""
+        ui = RefastApp()
+
+        @ui.page("/empty")
+        def empty(ctx):
+            return None
+
+        ctx = Context(websocket=AsyncMock(), app=ui)
+
+        assert await ctx.prefetch("/empty") is False
+        assert ctx._prefetched == {}
+
+    @pytest.mark.asyncio
+    async def test_prefetch_later_runs_in_background(self):
+        """_prefetch_later() returns at once and load() waits for the render."""
+        calls: list[str] = []
+        ui = self._make_app(calls)
+        ctx = Context(websocket=AsyncMock(), app=ui)
+
+        ctx._prefetch_later("/users/2")
+        ctx._prefetch_later("/users/2/")
+        assert calls == []
+        assert len(ctx._prefetch_tasks) == 1
+
+        await ctx.load("/users/2")
+
+        assert calls == ["user:2"]
+        assert ctx._prefetch_tasks == {}
+
+    @pytest.mark.asyncio
+    async def test_prefetch_later_is_bounded(self):
+        """Prefetch requests beyond the in-flight limit are ignored."""
+        from refast.context import _MAX_PREFETCH_TASKS
+
+        calls: list[str] = []
+        ctx = Context(websocket=AsyncMock(), app=self._make_app(calls))
+
+        for user_id in range(_MAX_PREFETCH_TASKS + 3):
+            ctx._prefetch_later(f"/users/{user_id}")
+        assert len(ctx._prefetch_tasks) == _MAX_PREFETCH_TASKS
+
+        await asyncio.gather(*ctx._prefetch_tasks.values())
+        assert len(calls) == _MAX_PREFETCH_TASKS
+
+        ctx._prefetch_later("/users/99")
+        assert len(ctx._prefetch_tasks) == 1
+        ctx._cancel_prefetches()
+
+    @pytest.mark.asyncio
+    async def test_cancel_prefetches(self):
+        """Pending background prefetches are cancelled when the connection closes."""
+        calls: list[str] = []
+        ctx = Context(websocket=AsyncMock(), app=self._make_app(calls))
+
+        ctx._prefetch_later("/users/2")
+        task = next(iter(ctx._prefetch_tasks.values()))
+        ctx._cancel_prefetches()
+        await asyncio.sleep(0)
+
+        assert task.cancelled()
+        assert calls == []
+        assert ctx._prefetch_tasks == {}
+
+    @pytest.mark.asyncio
+    async def test_prefetch_cache_is_bounded(self):
+        """Only the most recent prefetched pages are kept."""
+        from refast.context import _MAX_PREFETCHED_PAGES
+
+        calls: list[str] = []
+        ctx = Context(websocket=AsyncMock(), app=self._make_app(calls))
+
+        for user_id in range(_MAX_PREFETCHED_PAGES + 3):
+            await ctx.prefetch(f"/users/{user_id}")
+
+        assert len(ctx._prefetched) == _MAX_PREFETCHED_PAGES
+        assert "/users/0" not in ctx._prefetched
@@ -1,10 +1,12 @@
 """Tests for the Refast extension system."""
 
+import gzip
 import tempfile
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
+from starlette.requests import Request
 
 from refast import RefastApp
 from refast.components.base import Component
@@ -15,6 +17,18 @@ from refast.extensions import Extension
 # =============================================================================
 
 
+def make_request(headers: dict[str, str] | None = None, query: str = "") -> Request:
+    """Build a bare GET request for calling static handlers directly."""
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+            "query_string": query.encode(),
+        }
+    )
+
+
 class MockComponent(Component):
     """Mock component for testing."""
 
@@ -482,7 +496,9 @@ class TestExtensionStaticRouting:
             router = RefastRouter(app)
 
             # Call the handler
-            response = await router._extension_static_handler("test-extension", "test.js")
+            response = await router._extension_static_handler(
+                make_request(), "test-extension", "test.js"
+            )
 
             assert response.status_code == 200
 
@@ -494,7 +510,9 @@ class TestExtensionStaticRouting:
         app = RefastApp(auto_discover_extensions=False)
         router = RefastRouter(app)
 
-        response = await router._extension_static_handler("unknown-extension", "test.js")
+        response = await router._extension_static_handler(
+            make_request(), "unknown-extension", "test.js"
+        )
 
         assert response.status_code == 404
 
@@ -512,6 +530,134 @@ class TestExtensionStaticRouting:
 
             router = RefastRouter(app)
 
-            response = await router._extension_static_handler("test-extension", "nonexistent.js")
+            response = await router._extension_static_handler(
+                make_request(), "test-extension", "nonexistent.js"
+            )
 
             assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_serve_extension_static_file_compressed(self, tmp_path):
+        """Extension files are compressed at registration and negotiated per request."""
+        from refast.router import RefastRouter
+
+        (tmp_path / "test.js").write_text("console.log('test');" * 20)
+        app = RefastApp(auto_discover_extensions=False)
+        app.register_extension(SampleExtension(static_dir=tmp_path))
+        router = RefastRouter(app)
+
+        response = await router._extension_static_handler(
+            make_request({"Accept-Encoding": "gzip"}), "test-extension", "test.js"
+        )
+
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert gzip.decompress(response.body) == (tmp_path / "test.js").read_bytes()
+        assert app._extension_assets["test-extension"].get("test.js").gzip is not None
+
+    @pytest.mark.asyncio
+    async def test_fingerprinted_extension_file_is_immutable(self, tmp_path):
+        """A ?v=<hash> URL is cached forever; If-None-Match returns 304."""
+        from refast.assets import IMMUTABLE_CACHE_CONTROL
+        from refast.router import RefastRouter
+
+        (tmp_path / "test.js").write_text("console.log('test');")
+        app = RefastApp(auto_discover_extensions=False)
+        app.register_extension(SampleExtension(static_dir=tmp_path))
+        router = RefastRouter(app)
+        asset = app._extension_assets["test-extension"].get("test.js")
+
+        plain = await router._extension_static_handler(make_request(), "test-extension", "test.js")
+        fingerprinted = await router._extension_static_handler(
+            make_request(query=f"v={asset.version}"), "test-extension", "test.js"
+        )
+        revalidated = await router._extension_static_handler(
+            make_request({"If-None-Match": asset.etag}), "test-extension", "test.js"
+        )
+
+        assert plain.headers["Cache-Control"] == "no-cache"
+        assert fingerprinted.headers["Cache-Control"] == IMMUTABLE_CACHE_CONTROL
+        assert revalidated.status_code == 304
+
+
+class MultiScriptExtension(Extension):
+    """Extension with two scripts and a stylesheet."""
+
+    name = "multi-ext"
+    scripts = ["a.js", "b.js"]
+    styles = ["multi.css"]
+
+    def __init__(self, static_dir: Path):
+        super().__init__()
+        self._static_dir = static_dir
+
+    @property
+    def static_path(self) -> Path:
+        return self._static_dir
+
+
+class TestExtensionAssetUrls:
+    """Tests for fingerprinted and bundled extension asset URLs in the shell."""
+
+    @pytest.fixture
+    def static_dir(self, tmp_path):
+        (tmp_path / "a.js").write_text("window.a = 1")
+        (tmp_path / "b.js").write_text("window.b = 2;")
+        (tmp_path / "multi.css").write_text(".multi { color: red; }")
+        return tmp_path
+
+    def test_shell_fingerprints_extension_urls(self, static_dir):
+        """Scripts and styles are referenced with ?v=<hash>."""
+        from refast.assets import render_html_shell
+
+        app = RefastApp(auto_discover_extensions=False)
+        app.register_extension(MultiScriptExtension(static_dir))
+        index = app._extension_assets["multi-ext"]
+        html = render_html_shell(app)
+
+        assert index.url("a.js").startswith("/static/ext/multi-ext/a.js?v=")
+        assert f'"{index.url("a.js")}", "{index.url("b.js")}"' in html
+        assert f'<link rel="stylesheet" href="{index.url("multi.css")}">' in html
+
+    def test_bundle_mode_serves_one_script(self, static_dir):
+        """bundle_extensions concatenates the scripts into one URL."""
+        from refast.assets import render_html_shell
+
+        app = RefastApp(auto_discover_extensions=False, bundle_extensions=True)
+        app.register_extension(MultiScriptExtension(static_dir))
+        index = app._extension_assets["multi-ext"]
+        html = render_html_shell(app)
+
+        bundle_url = index.url("multi-ext.bundle.js")
+        assert f'"multi-ext": ["{bundle_url}"]' in html
+        assert "/static/ext/multi-ext/a.js" not in html
+        assert index.get("multi-ext.bundle.js").identity == b"window.a = 1\n;\nwindow.b = 2;"
+
+    @pytest.mark.asyncio
+    async def test_bundle_is_served(self, static_dir):
+        from refast.router import RefastRouter
+
+        app = RefastApp(auto_discover_extensions=False, bundle_extensions=True)
+        app.register_extension(MultiScriptExtension(static_dir))
+        router = RefastRouter(app)
+
+        response = await router._extension_static_handler(
+            make_request(), "multi-ext", "multi-ext.bundle.js"
+        )
+
+        assert response.status_code == 200
+        assert response.headers["Content-Type"].startswith("application/javascript")
+        assert b"window.a = 1" in response.body and b"window.b = 2" in response.body
+
+    def test_bundle_rebuilt_in_debug_when_part_changes(self, static_dir):
+        """Revalidating a bundle reloads it when one of its scripts changed."""
+        import os
+
+        app = RefastApp(auto_discover_extensions=False, bundle_extensions=True)
+        app.register_extension(MultiScriptExtension(static_dir))
+        index = app._extension_assets["multi-ext"]
+
+        script = static_dir / "b.js"
+        script.write_text("window.b = 3;")
+        os.utime(script, ns=(script.stat().st_mtime_ns + 10**9,) * 2)
+
+        assert index.get("multi-ext.bundle.js", revalidate=True).identity.endswith(b"3;")
@@ -0,0 +1,146 @@
+"""Tests for concurrent broadcast fan-out."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+
+from refast.events.fanout import BroadcastResult, encode_frame, fan_out
+from refast.events.stream import EventStream, WebSocketConnection
+
+
+class TestBroadcastResult:
+    """Tests for BroadcastResult."""
+
+    def test_behaves_as_delivered_count(self):
+        """The result compares and adds like the delivered count."""
+        result = BroadcastResult(delivered=3, failed=1, timed_out=2)
+        assert result == 3
+        assert result + 1 == 4
+        assert result.total == 6
+
+    def test_defaults_to_zero(self):
+        """An empty result delivered nothing."""
+        result = BroadcastResult()
+        assert result == 0
+        assert (result.failed, result.timed_out) == (0, 0)
+
+
+class TestEncodeFrame:
+    """Tests for encode_frame()."""
+
+    def test_matches_send_json_encoding(self):
+        """Frames are compact JSON with non-ASCII text kept as-is."""
+        assert encode_frame({"a": [1, 2], "b": "héllo"}) == '{"a":[1,2],"b":"héllo"}'
+
+    def test_rejects_unserializable_data(self):
+        """Unserializable data fails once, before anything is sent."""
+        with pytest.raises(TypeError):
+            encode_frame({"value": object()})
+
+
+class TestFanOut:
+    """Tests for fan_out()."""
+
+    @pytest.mark.asyncio
+    async def test_counts_outcomes(self):
+        """Delivered, failed and timed-out recipients are counted separately."""
+
+        async def send(recipient):
+            if recipient == "raises":
+                raise ConnectionError("gone")
+            if recipient == "refuses":
+                return False
+            if recipient == "slow":
+                await asyncio.sleep(10)
+            return None
+
+        result = await fan_out(["ok", "ok", "raises", "refuses", "slow"], send, timeout=0.05)
+
+        assert result == 2
+        assert result.failed == 2
+        assert result.timed_out == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        """No more than `concurrency` sends are in flight at once."""
+        in_flight = peak = 0
+
+        async def send(recipient):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+
+        result = await fan_out(range(100), send, concurrency=8)
+
+        assert result == 100
+        assert peak == 8
+
+    @pytest.mark.asyncio
+    async def test_slow_recipient_does_not_delay_others(self):
+        """Other recipients are served while one send is stuck."""
+        served = []
+        release = asyncio.Event()
+
+        async def send(recipient):
+            if recipient == 0:
+                await release.wait()
+            served.append(recipient)
+
+        task = asyncio.create_task(fan_out(range(5), send, concurrency=2))
+        await asyncio.sleep(0.01)
+        assert served == [1, 2, 3, 4]
+
+        release.set()
+        assert await task == 5
+
+    @pytest.mark.asyncio
+    async def test_no_recipients(self):
+        """Fanning out to nobody returns an empty result."""
+        send = AsyncMock()
+        assert await fan_out([], send) == 0
+        send.assert_not_called()
+
+
+class TestEventStreamFanOut:
+    """Tests for EventStream send limits."""
+
+    @pytest.mark.asyncio
+    async def test_broadcast_skips_stalled_connection(self):
+        """A connection that stops reading is timed out, not waited for."""
+        stream = EventStream(send_timeout=0.05)
+
+        async def stall(data):
+            await asyncio.sleep(10)
+
+        for i in range(3):
+            ws = AsyncMock()
+            if i == 0:
+                ws.send_text = stall
+            conn = WebSocketConnection(websocket=ws, connected=True)
+            stream._connections[conn.id] = conn
+
+        result = await asyncio.wait_for(stream.broadcast({"type": "tick"}), timeout=1)
+
+        assert result == 2
+        assert result.timed_out == 1
+
+    @pytest.mark.asyncio
+    async def test_broadcast_sends_one_shared_frame(self):
+        """The payload is encoded once and the same text sent to every socket."""
+        stream = EventStream()
+        sockets = [AsyncMock() for _ in range(3)]
+        for ws in sockets:
+            conn = WebSocketConnection(websocket=ws, connected=True)
+            stream._connections[conn.id] = conn
+
+        assert await stream.broadcast({"type": "tick", "n": 1}) == 3
+
+        frames = [ws.send_text.call_args[0][0] for ws in sockets]
+        assert json.loads(frames[0]) == {"type": "tick", "n": 1}
+        assert all(frame is frames[0] for frame in frames)
+        for ws in sockets:
+            ws.send_json.assert_not_called()
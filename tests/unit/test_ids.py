@@ -0,0 +1,33 @@
+"""Tests for component and callback ID generation."""
+
+import uuid
+
+from refast.utils.ids import deterministic_ids, new_id
+
+
+class TestNewId:
+    """Tests for new_id() / deterministic_ids()."""
+
+    def test_random_by_default(self):
+        """Outside deterministic_ids() IDs are UUIDs."""
+        first, second = new_id(), new_id("cb")
+
+        assert first != second
+        uuid.UUID(first)
+        uuid.UUID(second)
+
+    def test_sequential_inside_context(self):
+        """Inside deterministic_ids() IDs are numbered from zero, per block."""
+        with deterministic_ids():
+            first = [new_id(), new_id("cb"), new_id()]
+        with deterministic_ids():
+            second = [new_id(), new_id("cb"), new_id()]
+
+        assert first == second == ["rf-0", "rf-cb-1", "rf-2"]
+
+    def test_context_is_restored(self):
+        """Leaving the block goes back to random IDs."""
+        with deterministic_ids():
+            new_id()
+
+        uuid.UUID(new_id())
@@ -142,3 +142,143 @@ class TestMemorySessionStore:
 
         await store.stop_cleanup()
         assert store._cleanup_task is None
+
+
+class TestShardedExpiry:
+    """Tests for sharding and heap-based expiry."""
+
+    def test_invalid_shards(self):
+        """At least one shard is required."""
+        with pytest.raises(ValueError):
+            MemorySessionStore(shards=0)
+
+    def test_invalid_resolution(self):
+        """Expiry buckets must have a positive width."""
+        with pytest.raises(ValueError):
+            MemorySessionStore(resolution=0)
+
+    @pytest.mark.asyncio
+    async def test_sessions_spread_over_shards(self):
+        """Sessions are distributed across the shard dicts."""
+        store = MemorySessionStore(shards=4)
+        for i in range(100):
+            await store.set(f"session-{i}", {"i": i})
+
+        assert store.session_count() == 100
+        assert sum(1 for shard in store._shards if shard) > 1
+        for i in range(100):
+            assert (await store.get(f"session-{i}"))["i"] == i
+
+    @pytest.mark.asyncio
+    async def test_clear_expired_visits_only_expired(self):
+        """Cleanup sweeps the due buckets and leaves the rest untouched."""
+        store = MemorySessionStore()
+        for i in range(10):
+            await store.set(f"old-{i}", {}, ttl=0)
+        for i in range(1000):
+            await store.set(f"live-{i}", {}, ttl=3600)
+        await asyncio.sleep(0.01)
+
+        assert await store.clear_expired() == 10
+        assert store._scheduled == 1000
+        assert store.session_count() == 1000
+
+    @pytest.mark.asyncio
+    async def test_rewritten_session_not_expired_early(self):
+        """A session set again with a longer TTL survives its old expiry."""
+        store = MemorySessionStore()
+        await store.set("session-1", {"v": 1}, ttl=0)
+        await store.set("session-1", {"v": 2}, ttl=3600)
+        await asyncio.sleep(0.01)
+
+        assert await store.clear_expired() == 0
+        assert (await store.get("session-1"))["v"] == 2
+
+    @pytest.mark.asyncio
+    async def test_touch_extends_expiry(self, monkeypatch):
+        """A touched session is not removed at its original expiry."""
+        clock = [1000.0]
+        monkeypatch.setattr("refast.session.stores.memory.time.monotonic", lambda: clock[0])
+        store = MemorySessionStore()
+        await store.set("session-1", {"key": "value"}, ttl=10)
+        assert await store.touch("session-1", ttl=3600)
+        clock[0] += 60
+
+        assert await store.clear_expired() == 0
+        assert await store.exists("session-1")
+
+    @pytest.mark.asyncio
+    async def test_due_bucket_keeps_unexpired_sessions(self, monkeypatch):
+        """Sessions in the current bucket that have not expired stay scheduled."""
+        clock = [1000.0]
+        monkeypatch.setattr("refast.session.stores.memory.time.monotonic", lambda: clock[0])
+        store = MemorySessionStore(resolution=10)
+        await store.set("soon", {}, ttl=2)
+        await store.set("later", {}, ttl=8)
+        clock[0] += 5
+
+        assert await store.clear_expired() == 1
+        assert await store.exists("later")
+        clock[0] += 5
+        assert await store.clear_expired() == 1
+        assert store.session_count() == 0
+
+    @pytest.mark.asyncio
+    async def test_delete_during_cleanup_yield(self, monkeypatch):
+        """A pending session deleted while cleanup yields is skipped, not a KeyError."""
+        clock = [1000.0]
+        monkeypatch.setattr("refast.session.stores.memory.time.monotonic", lambda: clock[0])
+        monkeypatch.setattr("refast.session.stores.memory.CLEANUP_BATCH_SIZE", 2)
+        store = MemorySessionStore(resolution=10)
+        await store.set("later", {}, ttl=8)
+        await store.set("soon", {}, ttl=2)
+        clock[0] += 5
+
+        async def delete_later():
+            await store.delete("later")
+
+        task = asyncio.create_task(delete_later())
+        assert await store.clear_expired() == 1
+        await task
+
+        assert store.session_count() == 0
+        assert store._scheduled == 0
+
+    @pytest.mark.asyncio
+    async def test_rebuild_during_cleanup_yield(self, monkeypatch):
+        """A wheel rebuilt while cleanup yields is not filled with duplicates."""
+        clock = [1000.0]
+        monkeypatch.setattr("refast.session.stores.memory.time.monotonic", lambda: clock[0])
+        monkeypatch.setattr("refast.session.stores.memory.CLEANUP_BATCH_SIZE", 1)
+        store = MemorySessionStore(resolution=10)
+        for i in range(4):
+            await store.set(f"later-{i}", {}, ttl=8)
+        clock[0] += 5
+
+        async def rebuild():
+            store._rebuild_wheel()
+
+        task = asyncio.create_task(rebuild())
+        assert await store.clear_expired() == 0
+        await task
+
+        assert store._scheduled == store.session_count() == 4
+        clock[0] += 5
+        assert await store.clear_expired() == 4
+
+    @pytest.mark.asyncio
+    async def test_touch_expired_session(self):
+        """Touching an already expired session fails and removes it."""
+        store = MemorySessionStore()
+        await store.set("session-1", {}, ttl=0)
+        await asyncio.sleep(0.01)
+        assert await store.touch("session-1") is False
+        assert store.session_count() == 0
+
+    @pytest.mark.asyncio
+    async def test_wheel_compacted_after_rewrites(self):
+        """Stale wheel entries from repeated saves do not accumulate."""
+        store = MemorySessionStore()
+        for _ in range(5000):
+            await store.set("session-1", {})
+        assert store._scheduled <= 1024
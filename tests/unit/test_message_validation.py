@@ -11,6 +11,7 @@ from refast.models.messages import (
     CallbackMessage,
     EventMessage,
     NavigateMessage,
+    PrefetchMessage,
     StoreInitMessage,
     StoreSyncMessage,
     client_message_adapter,
@@ -45,6 +46,15 @@ def test_valid_store_init_message():
     assert msg.type == "store_init"
     assert msg.data == {"session_var": "val"}
     assert msg.path == "/dashboard"
+    assert msg.rendered is None
+
+
+def test_store_init_message_with_rendered_fingerprint():
+    """store_init may carry the fingerprint of the inline page tree."""
+    data = {"type": "store_init", "path": "/", "rendered": "abc123"}
+    msg = client_message_adapter.validate_python(data)
+    assert isinstance(msg, StoreInitMessage)
+    assert msg.rendered == "abc123"
 
 
 def test_valid_navigate_message():
@@ -59,6 +69,13 @@ def test_valid_navigate_message():
     assert msg.path == "/profile"
 
 
+def test_valid_prefetch_message():
+    """Test parsing a valid prefetch message."""
+    msg = client_message_adapter.validate_python({"type": "prefetch", "path": "/docs?page=2"})
+    assert isinstance(msg, PrefetchMessage)
+    assert msg.path == "/docs?page=2"
+
+
 def test_valid_event_message():
     """Test parsing a valid event message."""
     data = {
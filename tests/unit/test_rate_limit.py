@@ -2,14 +2,18 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 
 import pytest
 from fastapi import HTTPException
 
+from refast.security.backends import RateLimitResult
 from refast.security.rate_limit import (
     RateLimitConfig,
+    RateLimitCounter,
     RateLimitEntry,
     RateLimiter,
     rate_limit,
@@ -363,3 +367,98 @@ class TestRateLimitFunction:
             await handler(request)
 
         assert exc_info.value.status_code == 429
+
+
+class TestSlidingWindowCounter:
+    """Tests for the sliding window counter behind RateLimiter."""
+
+    @pytest.fixture
+    def clock(self, monkeypatch: pytest.MonkeyPatch) -> list[float]:
+        """A controllable monotonic clock."""
+        clock = [1000.0]
+        monkeypatch.setattr(
+            "refast.security.backends.memory.time", SimpleNamespace(monotonic=lambda: clock[0])
+        )
+        return clock
+
+    @staticmethod
+    def hit(limiter: RateLimiter, key: str) -> RateLimitResult:
+        """Check *key* against the limiter's backend without awaiting."""
+        config = limiter.config
+        return limiter.backend.hit_nowait(key, config.max_requests, config.window_seconds)
+
+    def test_counter_rolls_windows(self) -> None:
+        """Counts move to the previous window and are dropped after two."""
+        counter = RateLimitCounter(start=0.0, current=4)
+
+        assert counter.advance(15.0, 10.0) == pytest.approx(0.5)
+        assert (counter.start, counter.previous, counter.current) == (10.0, 4, 0)
+        assert counter.estimate(15.0, 10.0) == pytest.approx(2.0)
+
+        counter.advance(45.0, 10.0)
+        assert (counter.start, counter.previous, counter.current) == (40.0, 0, 0)
+
+    @pytest.mark.asyncio
+    async def test_previous_window_slides_out(self, clock: list[float]) -> None:
+        """Requests of the previous window count less as it slides out."""
+        limiter = RateLimiter(max_requests=4, window_seconds=10)
+        for _ in range(4):
+            assert self.hit(limiter, "k").allowed
+
+        result = self.hit(limiter, "k")
+        assert not result.allowed
+        assert result.reset == 10
+
+        clock[0] += 12.5  # 75% of the previous window still covered: 3 requests
+        result = self.hit(limiter, "k")
+        assert result.allowed
+        assert result.remaining == 0
+        assert not self.hit(limiter, "k").allowed
+
+        clock[0] += 20
+        result = self.hit(limiter, "k")
+        assert result.allowed
+        assert result.remaining == 3
+
+    @pytest.mark.asyncio
+    async def test_idle_keys_evicted(self, clock: list[float]) -> None:
+        """Keys idle for two windows are dropped when new keys arrive."""
+        limiter = RateLimiter(max_requests=5, window_seconds=10, shards=1)
+        for i in range(100):
+            self.hit(limiter, f"scanner-{i}")
+
+        clock[0] += 20
+        self.hit(limiter, "client")
+
+        stats = await limiter.get_stats()
+        assert stats["entries"] == {"client": 1}
+
+    @pytest.mark.asyncio
+    async def test_max_keys(self) -> None:
+        """At most max_keys keys are tracked, least recently used dropped first."""
+        limiter = RateLimiter(max_requests=5, window_seconds=60, shards=1, max_keys=3)
+        for key in ("a", "b", "c"):
+            self.hit(limiter, key)
+        self.hit(limiter, "a")
+        self.hit(limiter, "d")
+
+        stats = await limiter.get_stats()
+        assert set(stats["entries"]) == {"a", "c", "d"}
+
+    def test_shared_between_threads(self) -> None:
+        """Concurrent threads never admit more than the limit."""
+        limiter = RateLimiter(max_requests=1000, window_seconds=60)
+
+        def hammer() -> int:
+            return sum(self.hit(limiter, "shared").allowed for _ in range(500))
+
+        with ThreadPoolExecutor(4) as pool:
+            admitted = sum(pool.map(lambda _: hammer(), range(4)))
+        assert admitted == 1000
+
+    def test_invalid_arguments(self) -> None:
+        """shards and max_keys must be positive."""
+        with pytest.raises(ValueError):
+            RateLimiter(shards=0)
+        with pytest.raises(ValueError):
+            RateLimiter(max_keys=0)
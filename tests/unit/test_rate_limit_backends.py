@@ -0,0 +1,347 @@
+"""Tests for rate limit backends."""
+
+from __future__ import annotations
+
+import asyncio
+import fnmatch
+from types import SimpleNamespace
+
+import pytest
+
+from refast.security.backends import (
+    MemoryRateLimitBackend,
+    RateLimitBackend,
+    RateLimitCounter,
+    RateLimitResult,
+    RedisRateLimitBackend,
+    SharedMemoryRateLimitBackend,
+)
+from refast.security.backends import local as local_backend
+from refast.security.rate_limit import RateLimiter
+
+
+class FakeRedis:
+    """In-process stand-in for the subset of redis.asyncio the backend uses.
+
+    Scripts run a Python port of the Lua script against a settable server clock.
+    """
+
+    def __init__(self):
+        self.data: dict[str, dict[str, str]] = {}
+        self.ttls: dict[str, int] = {}
+        self.now_ms = 1_000_000
+        self.round_trips = 0
+        self.scripts: list[tuple[list[str], list]] = []
+
+    def register_script(self, script: str) -> FakeScript:
+        return FakeScript(self)
+
+    def pipeline(self, transaction=True) -> FakePipeline:
+        return FakePipeline(self)
+
+    async def scan_iter(self, match=None, count=None):
+        for key in list(self.data):
+            if match is None or fnmatch.fnmatchcase(key, match):
+                yield key.encode()
+
+    async def delete(self, *keys):
+        self.round_trips += 1
+        return sum(self.data.pop(k.decode(), None) is not None for k in keys)
+
+    def _run(self, name, *args):
+        if name == "script":
+            return self._hit(*args)
+        if name == "time":
+            return [str(self.now_ms // 1000).encode(), str(self.now_ms % 1000 * 1000).encode()]
+        if name == "hmget":
+            key = args[0].decode() if isinstance(args[0], bytes) else args[0]
+            fields = self.data.get(key, {})
+            return [fields.get(f, None) and fields[f].encode() for f in args[1:]]
+        raise AssertionError(f"unexpected command {name}")
+
+    def _hit(self, keys, args):
+        self.scripts.append((keys, args))
+        (key,), (limit, window_ms) = keys, args
+        state = self.data.get(key)
+        counter = None
+        if state and int(state["s"]) <= self.now_ms:
+            counter = RateLimitCounter(int(state["s"]) / 1000, int(state["c"]), int(state["p"]))
+        if counter is None:
+            counter = RateLimitCounter(self.now_ms / 1000)
+        result = counter.hit(self.now_ms / 1000, limit, window_ms / 1000)
+        self.data[key] = {
+            "s": str(round(counter.start * 1000)),
+            "c": str(counter.current),
+            "p": str(counter.previous),
+        }
+        self.ttls[key] = 2 * window_ms
+        return [int(result.allowed), result.remaining, result.reset]
+
+
+class FakeScript:
+    def __init__(self, client: FakeRedis):
+        self.client = client
+
+    async def __call__(self, keys=None, args=None, client=None):
+        client.queued.append(("script", (keys, args)))
+        return client
+
+
+class FakePipeline:
+    def __init__(self, client: FakeRedis):
+        self.client = client
+        self.queued = []
+
+    def __getattr__(self, name):
+        def queue(*args):
+            self.queued.append((name, args))
+
+        return queue
+
+    async def execute(self):
+        self.client.round_trips += 1
+        return [self.client._run(name, *args) for name, args in self.queued]
+
+
+class RecordingBackend(MemoryRateLimitBackend):
+    """Memory backend that batches hits and records each batch."""
+
+    batched = True
+
+    def __init__(self, fail: bool = False):
+        super().__init__()
+        self.batches: list[int] = []
+        self.fail = fail
+
+    async def hit(self, key, limit, window):
+        return await RateLimitBackend.hit(self, key, limit, window)
+
+    async def hit_many(self, hits):
+        self.batches.append(len(hits))
+        if self.fail:
+            raise ConnectionError("backend down")
+        return await super().hit_many(hits)
+
+
+class TestBatching:
+    """Tests for batching concurrent checks."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_hits_decided_together(self) -> None:
+        """Hits made in the same tick reach hit_many as one batch."""
+        backend = RecordingBackend()
+        results = await asyncio.gather(*(backend.hit("k", 5, 60) for _ in range(8)))
+
+        assert backend.batches == [8]
+        assert [r.allowed for r in results] == [True] * 5 + [False] * 3
+        assert [r.remaining for r in results[:5]] == [4, 3, 2, 1, 0]
+
+    @pytest.mark.asyncio
+    async def test_failure_reaches_every_caller(self) -> None:
+        """A failed batch fails each check in it."""
+        backend = RecordingBackend(fail=True)
+        results = await asyncio.gather(
+            *(backend.hit("k", 5, 60) for _ in range(3)), return_exceptions=True
+        )
+        assert all(isinstance(r, ConnectionError) for r in results)
+
+
+class TestMemoryRateLimitBackend:
+    """Tests for MemoryRateLimitBackend."""
+
+    @pytest.mark.asyncio
+    async def test_counts_and_clear(self) -> None:
+        """counts() reports each key; clear() forgets them."""
+        backend = MemoryRateLimitBackend()
+        await backend.hit_many([("a", 5, 60), ("a", 5, 60), ("b", 5, 60)])
+
+        assert await backend.counts(60) == {"a": 2, "b": 1}
+        await backend.clear()
+        assert await backend.counts(60) == {}
+
+
+class TestSharedMemoryRateLimitBackend:
+    """Tests for SharedMemoryRateLimitBackend."""
+
+    @pytest.fixture
+    def clock(self, monkeypatch: pytest.MonkeyPatch) -> list[float]:
+        """A controllable monotonic clock."""
+        clock = [1000.0]
+        monkeypatch.setattr(local_backend, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+        return clock
+
+    @pytest.mark.asyncio
+    async def test_shared_between_workers(self, tmp_path) -> None:
+        """Backends on the same file (one per worker) share each key's count."""
+        path = tmp_path / "limits"
+        first = SharedMemoryRateLimitBackend(path)
+        second = SharedMemoryRateLimitBackend(path)
+
+        results = [await backend.hit("ip", 5, 60) for backend in (first, second) * 4]
+        assert [r.allowed for r in results] == [True] * 5 + [False] * 3
+        assert await second.counts(60) == {"ip": 5}
+
+        await first.clear()
+        assert (await second.hit("ip", 5, 60)).remaining == 4
+        await first.close()
+        await second.close()
+
+    @pytest.mark.asyncio
+    async def test_survives_restart(self, tmp_path) -> None:
+        """Counts persist in the file, which keeps the size it was created with."""
+        path = tmp_path / "limits"
+        backend = SharedMemoryRateLimitBackend(path, slots=64)
+        await backend.hit_many([("ip", 5, 60)] * 3)
+        await backend.close()
+
+        reopened = SharedMemoryRateLimitBackend(path, slots=1024)
+        assert (await reopened.hit("ip", 5, 60)).remaining == 1
+        assert reopened.slots == 64
+        await reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_rejects_other_files(self, tmp_path) -> None:
+        """A file that is not a rate limit table is not used."""
+        path = tmp_path / "other"
+        path.write_bytes(b"not a table")
+        with pytest.raises(ValueError):
+            await SharedMemoryRateLimitBackend(path).hit("ip", 5, 60)
+
+    @pytest.mark.asyncio
+    async def test_full_table_reuses_oldest_slot(self, tmp_path, clock: list[float]) -> None:
+        """When a key's slots are taken, the one whose window started first is reused."""
+        backend = SharedMemoryRateLimitBackend(tmp_path / "limits", slots=4, max_probes=4)
+        for key in ("a", "b", "c", "d"):
+            await backend.hit(key, 5, 60)
+            clock[0] += 1
+        await backend.hit("e", 5, 60)
+
+        assert set(await backend.counts(60)) == {"b", "c", "d", "e"}
+        await backend.close()
+
+    @pytest.mark.asyncio
+    async def test_idle_keys_not_counted(self, tmp_path, clock: list[float]) -> None:
+        """Keys with no requests for two windows start over."""
+        backend = SharedMemoryRateLimitBackend(tmp_path / "limits")
+        await backend.hit_many([("ip", 2, 10)] * 2)
+        assert not (await backend.hit("ip", 2, 10)).allowed
+
+        clock[0] += 20
+        assert await backend.counts(10) == {}
+        assert (await backend.hit("ip", 2, 10)).remaining == 1
+        await backend.close()
+
+    @pytest.mark.asyncio
+    async def test_one_lock_per_batch(self, tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Concurrent checks take the file lock once."""
+        locks = []
+        real = local_backend.fcntl
+
+        def flock(fd, op):
+            locks.append(op)
+            real.flock(fd, op)
+
+        monkeypatch.setattr(
+            local_backend,
+            "fcntl",
+            SimpleNamespace(flock=flock, LOCK_EX=real.LOCK_EX, LOCK_UN=real.LOCK_UN),
+        )
+        backend = SharedMemoryRateLimitBackend(tmp_path / "limits")
+        await backend.hit("warm", 5, 60)
+        locks.clear()
+
+        await asyncio.gather(*(backend.hit(f"ip-{i}", 5, 60) for i in range(20)))
+        assert locks.count(real.LOCK_EX) == 1
+        await backend.close()
+
+    @pytest.mark.asyncio
+    async def test_waiting_for_lock_does_not_block_loop(self, tmp_path) -> None:
+        """A check waiting for another worker's file lock leaves the event loop free."""
+        import fcntl
+        import os
+
+        path = tmp_path / "limits"
+        backend = SharedMemoryRateLimitBackend(path)
+        await backend.hit("warm", 5, 60)
+
+        fd = os.open(path, os.O_RDWR)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            pending = asyncio.ensure_future(backend.hit("ip", 5, 60))
+            await asyncio.sleep(0.05)
+            assert not pending.done()
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+        assert (await pending).remaining == 4
+        await backend.close()
+
+
+class TestRedisRateLimitBackend:
+    """Tests for RedisRateLimitBackend."""
+
+    @pytest.fixture
+    def client(self) -> FakeRedis:
+        """A fake Redis server."""
+        return FakeRedis()
+
+    def test_requires_connection(self) -> None:
+        """Either a URL or a client is needed."""
+        with pytest.raises(ValueError):
+            RedisRateLimitBackend()
+
+    @pytest.mark.asyncio
+    async def test_script_arguments(self, client: FakeRedis) -> None:
+        """Each check runs the script on a prefixed key with the window in milliseconds."""
+        backend = RedisRateLimitBackend(client=client, prefix="app:rl:")
+        result = await backend.hit("1.2.3.4", 10, 1.5)
+
+        assert result == RateLimitResult(allowed=True, remaining=9, reset=2)
+        assert client.scripts == [(["app:rl:1.2.3.4"], [10, 1500])]
+        assert client.ttls["app:rl:1.2.3.4"] == 3000
+
+    @pytest.mark.asyncio
+    async def test_one_round_trip_per_batch(self, client: FakeRedis) -> None:
+        """Concurrent checks share one pipeline."""
+        backend = RedisRateLimitBackend(client=client)
+        results = await asyncio.gather(*(backend.hit("ip", 5, 60) for _ in range(10)))
+
+        assert client.round_trips == 1
+        assert sum(r.allowed for r in results) == 5
+
+    @pytest.mark.asyncio
+    async def test_shared_between_workers(self, client: FakeRedis) -> None:
+        """Workers using the same Redis share each key's count."""
+        workers = [
+            RateLimiter(3, 60, backend=RedisRateLimitBackend(client=client)) for _ in range(3)
+        ]
+        request = SimpleNamespace(client=SimpleNamespace(host="9.9.9.9"), headers={})
+
+        allowed = [(await limiter.is_allowed(request))[0] for limiter in workers * 2]
+        assert allowed == [True, True, True, False, False, False]
+
+        _, info = await workers[0].is_allowed(request)
+        assert info == {"limit": 3, "remaining": 0, "reset": 60}
+
+    @pytest.mark.asyncio
+    async def test_server_clock_slides_window(self, client: FakeRedis) -> None:
+        """Windows follow the server's clock."""
+        backend = RedisRateLimitBackend(client=client)
+        await backend.hit_many([("ip", 4, 10)] * 4)
+        assert not (await backend.hit("ip", 4, 10)).allowed
+
+        client.now_ms += 12_500
+        assert (await backend.hit("ip", 4, 10)).allowed
+        assert not (await backend.hit("ip", 4, 10)).allowed
+
+    @pytest.mark.asyncio
+    async def test_counts_and_clear(self, client: FakeRedis) -> None:
+        """counts() reads every counter; clear() deletes them."""
+        backend = RedisRateLimitBackend(client=client)
+        await backend.hit_many([("a", 5, 60), ("a", 5, 60), ("b", 5, 60)])
+
+        assert await backend.counts(60) == {"a": 2, "b": 1}
+        await backend.clear()
+        assert client.data == {}
+        assert await backend.counts(60) == {}
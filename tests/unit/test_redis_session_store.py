@@ -0,0 +1,457 @@
+"""Tests for the hash-based RedisSessionStore."""
+
+import fnmatch
+import json
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from refast.session.session import Session, SessionData
+from refast.session.stores.redis import (
+    META_FIELD,
+    MIGRATE_SCRIPT,
+    UPDATE_SCRIPT,
+    RedisSessionStore,
+)
+
+
+class ResponseError(Exception):
+    """Stand-in for redis.exceptions.ResponseError."""
+
+
+class FakeRedis:
+    """In-process stand-in for the subset of redis.asyncio the store uses."""
+
+    def __init__(self):
+        self.data: dict[str, dict[str, bytes] | bytes] = {}
+        self.ttls: dict[str, int] = {}
+        self.commands: list[str] = []
+        self.round_trips = 0
+
+    def _hash(self, key):
+        value = self.data.get(key)
+        if value is not None and not isinstance(value, dict):
+            raise ResponseError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return value
+
+    @staticmethod
+    def _bytes(value):
+        return value if isinstance(value, bytes) else str(value).encode()
+
+    async def hgetall(self, key):
+        self.round_trips += 1
+        return self._run("hgetall", key)
+
+    async def hget(self, key, field):
+        self.round_trips += 1
+        return self._run("hget", key, field)
+
+    async def delete(self, *keys):
+        self.round_trips += 1
+        return self._run("delete", *keys)
+
+    async def exists(self, key):
+        self.round_trips += 1
+        return self._run("exists", key)
+
+    async def expire(self, key, ttl):
+        self.round_trips += 1
+        return self._run("expire", key, ttl)
+
+    async def scan_iter(self, match=None, count=None, _type=None):
+        for key in list(self.data):
+            if match and not fnmatch.fnmatchcase(key, match):
+                continue
+            if _type == "hash" and not isinstance(self.data[key], dict):
+                continue
+            yield key.encode()
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def register_script(self, script):
+        return FakeScript(self, {UPDATE_SCRIPT: "update", MIGRATE_SCRIPT: "migrate"}[script])
+
+    def _update(self, key, ttl, count, *rest):
+        """Python port of UPDATE_SCRIPT."""
+        if not self._run("exists", key):
+            return 0
+        pairs, removed = rest[: 2 * count], rest[2 * count :]
+        self._run("hset", key, mapping=dict(zip(pairs[::2], pairs[1::2], strict=True)))
+        if removed:
+            self._run("hdel", key, *removed)
+        self._run("expire", key, ttl)
+        return 1
+
+    def _migrate(self, key, ttl, *pairs):
+        """Python port of MIGRATE_SCRIPT."""
+        if not isinstance(self.data.get(key), bytes):
+            return 0
+        self._run("delete", key)
+        self._run("hset", key, mapping=dict(zip(pairs[::2], pairs[1::2], strict=True)))
+        self._run("expire", key, ttl)
+        return 1
+
+    def _run(self, name, *args, **kwargs):
+        self.commands.append(name)
+        args = tuple(a.decode() if isinstance(a, bytes) else a for a in args)
+        if name == "update":
+            return self._update(*args)
+        if name == "migrate":
+            return self._migrate(*args)
+        if name == "hgetall":
+            return dict((self._hash(args[0]) or {}).items())
+        if name == "hget":
+            return (self._hash(args[0]) or {}).get(args[1])
+        if name == "hset":
+            fields = self._hash(args[0])
+            if fields is None:
+                fields = self.data[args[0]] = {}
+            mapping = {k: self._bytes(v) for k, v in kwargs["mapping"].items()}
+            fields.update(mapping)
+            return len(mapping)
+        if name == "hdel":
+            fields = self._hash(args[0]) or {}
+            return sum(fields.pop(f, None) is not None for f in args[1:])
+        if name == "delete":
+            removed = 0
+            for key in args:
+                removed += self.data.pop(key, None) is not None
+                self.ttls.pop(key, None)
+            return removed
+        if name == "get":
+            value = self.data.get(args[0])
+            if isinstance(value, dict):
+                raise ResponseError("WRONGTYPE Operation against a key holding the wrong kind")
+            return value
+        if name == "ttl":
+            if args[0] not in self.data:
+                return -2
+            return self.ttls.get(args[0], -1)
+        if name == "exists":
+            return int(args[0] in self.data)
+        if name == "expire":
+            if args[0] not in self.data:
+                return 0
+            self.ttls[args[0]] = args[1]
+            return 1
+        raise AssertionError(f"unexpected command {name}")
+
+
+class FakeScript:
+    def __init__(self, client: FakeRedis, name: str):
+        self.client = client
+        self.name = name
+
+    async def __call__(self, keys=None, args=None, client=None):
+        if client is None:
+            self.client.round_trips += 1
+            return self.client._run(self.name, *keys, *args)
+        client.queued.append((self.name, (*keys, *args), {}))
+        return client
+
+
+class FakePipeline:
+    def __init__(self, client: FakeRedis):
+        self.client = client
+        self.queued = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.queued.append((name, args, kwargs))
+
+        return queue
+
+    async def execute(self, raise_on_error=True):
+        """Run the queued commands; like redis-py, errors are raised or returned."""
+        self.client.round_trips += 1
+        results = []
+        for name, args, kwargs in self.queued:
+            try:
+                results.append(self.client._run(name, *args, **kwargs))
+            except ResponseError as e:
+                results.append(e)
+        if raise_on_error:
+            for number, result in enumerate(results, 1):
+                if isinstance(result, ResponseError):
+                    raise ResponseError(f"Command # {number} caused error: {result}")
+        return results
+
+
+def session_data(session_id: str, expires_in: int = 3600, **data) -> dict:
+    now = datetime.now(UTC)
+    return {
+        "id": session_id,
+        "data": data,
+        "created_at": now.isoformat(),
+        "updated_at": now.isoformat(),
+        "expires_at": (now + timedelta(seconds=expires_in)).isoformat(),
+    }
+
+
+class TestRedisSessionStore:
+    """Tests for RedisSessionStore against an in-process fake client.
+
+    The fake counts commands and round trips; the Lua scripts themselves run
+    in :class:`TestRedisSessionStoreFakeServer`.
+    """
+
+    def test_requires_url_or_client(self):
+        """A store needs a Redis URL or client."""
+        with pytest.raises(ValueError):
+            RedisSessionStore()
+
+    def test_unknown_serializer(self):
+        """Only json, orjson and msgpack are accepted."""
+        with pytest.raises(ValueError):
+            RedisSessionStore(client=FakeRedis(), serializer="pickle")
+
+    @pytest.mark.asyncio
+    async def test_round_trip(self):
+        """Sessions are stored as hashes and read back intact."""
+        client = FakeRedis()
+        store = RedisSessionStore(client=client, default_ttl=120)
+        data = session_data("s1", user_id=7, cart=[1, 2])
+        await store.set("s1", data)
+
+        stored = client.data["refast:session:s1"]
+        assert set(stored) == {META_FIELD, "d:user_id", "d:cart"}
+        assert client.ttls["refast:session:s1"] == 120
+        assert await store.get("s1") == data
+        assert await store.exists("s1")
+
+    @pytest.mark.asyncio
+    async def test_set_replaces_removed_keys(self):
+        """A full set drops fields no longer in the session."""
+        client = FakeRedis()
+        store = RedisSessionStore(client=client)
+        await store.set("s1", session_data("s1", a=1, b=2))
+        await store.set("s1", session_data("s1", a=1))
+        assert (await store.get("s1"))["data"] == {"a": 1}
+
+    @pytest.mark.asyncio
+    async def test_update_writes_only_changed_fields(self):
+        """update() sends changed and deleted keys plus EXPIRE in one round trip."""
+        client = FakeRedis()
+        store = RedisSessionStore(client=client)
+        await store.set("s1", session_data("s1", keep=1, change=2, drop=3))
+        client.data["refast:session:s1"]["d:keep"] = b'"untouched"'
+
+        client.commands.clear()
+        client.round_trips = 0
+        await store.update("s1", session_data("s1", keep=1, change=5), changed={"change", "drop"})
+
+        assert client.round_trips == 1
+        assert client.commands == ["update", "exists", "hset", "hdel", "expire"]
+        data = (await store.get("s1"))["data"]
+        assert data == {"keep": "untouched", "change": 5}
+
+    @pytest.mark.asyncio
+    async def test_update_skips_deleted_session(self):
+        """A partial save of a session deleted meanwhile does not recreate it."""
+        client = FakeRedis()
+        store = RedisSessionStore(client=client)
+        await store.set("s1", session_data("s1", a=1))
+        await store.delete("s1")
+
+        assert await store.update("s1", session_data("s1", a=2), changed={"a"}) is False
+
+        assert "refast:session:s1" not in client.data
+        assert await store.get("s1") is None
+
+    @pytest.mark.asyncio
+    async def test_get_many_and_set_many(self):
+        """Batched reads and writes each take one round trip."""
+        client = FakeRedis()
+        store = RedisSessionStore(client=client)
+        sessions = {f"s{i}": session_data(f"s{i}", i=i) for i in range(5)}
+
+        client.round_trips = 0
+        await store.set_many(sessions, ttl=60)
+        found = await store.get_many([*sessions, "missing"])
+        assert client.round_trips == 2
+        assert found == sessions
+        assert set(client.ttls.values()) == {60}
+
+    @pytest.mark.asyncio
+    async def test_touch_and_delete(self):
+        """touch() refreshes the TTL; delete() removes the hash."""
+        client = FakeRedis()
+        store = RedisSessionStore(client=client)
+        await store.set("s1", session_data("s1"))
+
+        assert await store.touch("s1", ttl=900)
+        assert client.ttls["refast:session:s1"] == 900
+        await store.delete("s1")
+        assert await store.get("s1") is None
+        assert not await store.touch("s1")
+
+    @pytest.mark.asyncio
+    async def test_legacy_string_value_migrated(self):
+        """A session stored as a JSON string by the old layout becomes a hash."""
+        client = FakeRedis()
+        data = session_data("old", user_id=7)
+        client.data["refast:session:old"] = json.dumps(data).encode()
+        client.ttls["refast:session:old"] = 300
+        store = RedisSessionStore(client=client)
+
+        assert await store.get("old") == data
+        assert set(client.data["refast:session:old"]) == {META_FIELD, "d:user_id"}
+        assert client.ttls["refast:session:old"] == 300
+        assert await store.get("old") == data
+
+    @pytest.mark.asyncio
+    async def test_get_many_migrates_legacy_string_value(self):
+        """A legacy string in a batch is converted instead of failing the batch."""
+        client = FakeRedis()
+        store = RedisSessionStore(client=client)
+        await store.set("a", session_data("a", n=1))
+        legacy = session_data("legacy", n=2)
+        client.data["refast:session:legacy"] = json.dumps(legacy).encode()
+
+        found = await store.get_many(["a", "legacy", "missing"])
+
+        assert found == {"a": await store.get("a"), "legacy": legacy}
+        assert isinstance(client.data["refast:session:legacy"], dict)
+
+    @pytest.mark.asyncio
+    async def test_legacy_string_value_invalid(self):
+        """A legacy string that is not a session reads as missing."""
+        client = FakeRedis()
+        client.data["refast:session:old"] = b'"not a session"'
+        store = RedisSessionStore(client=client)
+
+        assert await store.get("old") is None
+
+    @pytest.mark.asyncio
+    async def test_clear_expired_scans_in_batches(self):
+        """Sessions past their own expires_at are removed via SCAN."""
+        client = FakeRedis()
+        store = RedisSessionStore(client=client, scan_count=2)
+        await store.set_many(
+            {
+                "old1": session_data("old1", expires_in=-10),
+                "old2": session_data("old2", expires_in=-10),
+                "live": session_data("live"),
+            }
+        )
+        client.data["other:key"] = {"x": b"1"}
+
+        assert await store.clear_expired() == 2
+        assert set(client.data) == {"refast:session:live", "other:key"}
+
+
+@pytest.fixture
+def fake_server():
+    """A fakeredis client; it runs the store's Lua scripts through lupa."""
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    return fakeredis.FakeAsyncRedis()
+
+
+class TestRedisSessionStoreFakeServer:
+    """Tests for RedisSessionStore against fakeredis, including the Lua scripts."""
+
+    @pytest.mark.asyncio
+    async def test_round_trip(self, fake_server):
+        """Sessions are stored as hashes with a TTL and read back intact."""
+        store = RedisSessionStore(client=fake_server, default_ttl=120)
+        data = session_data("s1", user_id=7, cart=[1, 2])
+        await store.set("s1", data)
+
+        assert await fake_server.type("refast:session:s1") == b"hash"
+        assert 0 < await fake_server.ttl("refast:session:s1") <= 120
+        assert await store.get("s1") == data
+
+    @pytest.mark.asyncio
+    async def test_update_writes_only_changed_fields(self, fake_server):
+        """The update script sets changed keys, deletes removed ones and keeps the rest."""
+        store = RedisSessionStore(client=fake_server)
+        await store.set("s1", session_data("s1", keep=1, change=2, drop=3))
+        await fake_server.hset("refast:session:s1", "d:keep", '"untouched"')
+
+        written = await store.update(
+            "s1", session_data("s1", keep=1, change=5), changed={"change", "drop"}, ttl=60
+        )
+
+        assert written is True
+
+        assert (await store.get("s1"))["data"] == {"keep": "untouched", "change": 5}
+        assert 0 < await fake_server.ttl("refast:session:s1") <= 60
+
+    @pytest.mark.asyncio
+    async def test_update_skips_deleted_session(self, fake_server):
+        """A partial save of a deleted session does not recreate it."""
+        store = RedisSessionStore(client=fake_server)
+        await store.set("s1", session_data("s1", a=1))
+        await store.delete("s1")
+
+        assert await store.update("s1", session_data("s1", a=2), changed={"a"}) is False
+
+        assert not await fake_server.exists("refast:session:s1")
+
+    @pytest.mark.asyncio
+    async def test_legacy_string_value_migrated(self, fake_server):
+        """The migrate script turns a legacy JSON string into a hash, keeping its TTL."""
+        data = session_data("old", user_id=7)
+        await fake_server.set("refast:session:old", json.dumps(data), ex=300)
+        store = RedisSessionStore(client=fake_server)
+
+        assert await store.get("old") == data
+        assert await fake_server.type("refast:session:old") == b"hash"
+        assert 0 < await fake_server.ttl("refast:session:old") <= 300
+
+    @pytest.mark.asyncio
+    async def test_get_many_migrates_legacy_string_value(self, fake_server):
+        """A legacy string does not make the whole batch fail."""
+        store = RedisSessionStore(client=fake_server)
+        await store.set("a", session_data("a", n=1))
+        legacy = session_data("legacy", n=2)
+        await fake_server.set("refast:session:legacy", json.dumps(legacy))
+
+        found = await store.get_many(["a", "legacy", "missing"])
+
+        assert set(found) == {"a", "legacy"}
+        assert found["legacy"] == legacy
+        assert await fake_server.type("refast:session:legacy") == b"hash"
+
+    @pytest.mark.asyncio
+    async def test_clear_expired(self, fake_server):
+        """Sessions past their own expires_at are removed."""
+        store = RedisSessionStore(client=fake_server, scan_count=2)
+        await store.set_many(
+            {
+                "old1": session_data("old1", expires_in=-10),
+                "old2": session_data("old2", expires_in=-10),
+                "live": session_data("live"),
+            }
+        )
+
+        assert await store.clear_expired() == 2
+        assert await store.get_many(["old1", "old2", "live"]) == {"live": await store.get("live")}
+
+
+class TestSessionPartialSave:
+    """Session.save() passes only the changed keys to the store."""
+
+    @pytest.mark.asyncio
+    async def test_loaded_session_saves_changes_only(self):
+        """A persisted session writes just the keys set or deleted since loading."""
+        client = FakeRedis()
+        store = RedisSessionStore(client=client)
+        await store.set("s1", session_data("s1", a=1, b=2, c=3))
+
+        session = Session(SessionData.from_dict(await store.get("s1")), store, persisted=True)
+        session.set("a", 10)
+        session.delete("b")
+        client.commands.clear()
+        await session.save()
+
+        assert client.commands == ["update", "exists", "hset", "hdel", "expire"]
+        assert (await store.get("s1"))["data"] == {"a": 10, "c": 3}
+
+        client.commands.clear()
+        session.set("c", 4)
+        await session.save()
+        assert client.commands == ["update", "exists", "hset", "expire"]
+        assert set(client.data["refast:session:s1"]) == {META_FIELD, "d:a", "d:c"}
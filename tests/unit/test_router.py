@@ -5,6 +5,7 @@ from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
 from refast import RefastApp
+from refast.events.stream import WebSocketConnection
 
 
 class TestRefastRouter:
@@ -136,7 +137,7 @@ class TestRefastRouter:
             client.get("/api/page", headers={"referer": "http://testserver/"})
 
     def test_active_contexts_property(self):
-        """Test active_contexts property returns values from _websocket_contexts."""
+        """Test active_contexts property returns the contexts of registered connections."""
         app = RefastApp()
         # Initialize router
         _ = app.router
@@ -147,7 +148,7 @@ class TestRefastRouter:
         # Mock a context
         mock_ws = object()
         mock_ctx = object()
-        refast_router._websocket_contexts[mock_ws] = mock_ctx
+        app.stream.add_connection(WebSocketConnection(websocket=mock_ws, context=mock_ctx))
 
         assert refast_router.active_contexts == [mock_ctx]
 
@@ -241,3 +242,155 @@ class TestWebSocketEndpoint:
             assert response["message"] == "Error 400"
             assert response["description"] == "Invalid action"
             assert response["variant"] == "destructive"
+
+    def test_websocket_navigate_uses_prefetched_page(self):
+        """A prefetch message renders the page ahead of the navigate message."""
+        from refast.components import Text
+
+        app = FastAPI()
+        ui = RefastApp()
+        renders: list[str] = []
+
+        @ui.page("/")
+        def home(ctx):
+            return Text("home")
+
+        @ui.page("/about")
+        async def about(ctx):
+            renders.append(ctx.url)
+            return Text("about", id="about")
+
+        app.include_router(ui.router, prefix="/ui")
+        client = TestClient(app)
+
+        with client.websocket_connect("/ui/ws") as websocket:
+            websocket.send_json({"type": "store_init", "path": "/", "data": {}})
+            assert websocket.receive_json()["type"] == "page_render"
+            assert websocket.receive_json()["type"] == "store_ready"
+
+            websocket.send_json({"type": "prefetch", "path": "/about?ref=nav"})
+            websocket.send_json({"type": "navigate", "path": "/about?ref=nav"})
+            response = websocket.receive_json()
+
+        assert response["type"] == "page_render"
+        assert response["component"]["id"] == "about"
+        assert renders == ["/about?ref=nav"]
+
+
+class TestInlineInitialTree:
+    """Tests for RefastApp(inline_initial_tree=True)."""
+
+    def _client(self, page=None, **kwargs):
+        from refast.components import Button, Container, Text
+
+        ui = RefastApp(inline_initial_tree=True, **kwargs)
+
+        async def clicked(ctx):
+            pass
+
+        @ui.page("/items/{item_id:int}")
+        def item(ctx):
+            if page is not None:
+                return page(ctx)
+            label = ctx.store.local.get("label", f"Item {ctx.path_params['item_id']}")
+            return Container(
+                children=[
+                    Text(label),
+                    Text(ctx.query_params.get("tab", "none")),
+                    Button("Go", on_click=ctx.callback(clicked)),
+                ]
+            )
+
+        app = FastAPI()
+        app.include_router(ui.router)
+        return TestClient(app), ui
+
+    def _initial_data(self, html):
+        import json
+        import re
+
+        match = re.search(r"window.__REFAST_INITIAL_DATA__ = (.*?);window", html)
+        fingerprint = re.search(r'__REFAST_INITIAL_HASH__ = "(\w+)"', html).group(1)
+        return json.loads(match.group(1)), fingerprint
+
+    def test_shell_embeds_rendered_tree(self):
+        """The page is rendered in the HTTP request with deterministic IDs."""
+        client, _ = self._client()
+
+        response = client.get("/items/7?tab=info")
+        tree, _ = self._initial_data(response.text)
+
+        assert response.headers["Cache-Control"] == "private, no-cache"
+        # IDs are numbered in creation order: children before their parent
+        assert tree["id"] == "rf-4"
+        assert tree["children"][0]["children"] == ["Item 7"]
+        assert tree["children"][1]["children"] == ["info"]
+        assert tree["children"][2]["id"] == "rf-3"
+
+    def test_same_page_same_etag(self):
+        """Deterministic IDs make the document cacheable by ETag."""
+        client, _ = self._client()
+
+        first = client.get("/items/7")
+        second = client.get("/items/7", headers={"If-None-Match": first.headers["ETag"]})
+
+        assert second.status_code == 304
+
+    def test_script_cannot_be_closed_by_content(self):
+        """'<' in the tree is escaped inside the inline script."""
+        from refast.components import Text
+
+        client, _ = self._client(page=lambda ctx: Text("</script><b>x</b>"))
+
+        html = client.get("/items/1").text
+
+        assert "</script><b>" not in html
+        assert "\\u003c/script>" in html
+
+    def test_failed_render_falls_back_to_plain_shell(self):
+        """A page that raises still gets the shell; the WebSocket renders it later."""
+
+        def broken(ctx):
+            raise RuntimeError("boom")
+
+        client, _ = self._client(page=broken)
+
+        response = client.get("/items/1")
+
+        assert response.status_code == 200
+        assert "__REFAST_INITIAL_DATA__" not in response.text
+
+    def test_store_init_skips_identical_page_render(self):
+        """store_init with the inline fingerprint only reconciles storage."""
+        client, ui = self._client()
+        _, fingerprint = self._initial_data(client.get("/items/7").text)
+
+        with client.websocket_connect("/ws") as websocket:
+            websocket.send_json(
+                {"type": "store_init", "path": "/items/7", "data": {}, "rendered": fingerprint}
+            )
+            response = websocket.receive_json()
+            ctx = ui.active_contexts[0]
+
+        assert response["type"] == "store_ready"
+        # Callbacks of the inline tree are registered under the same IDs
+        assert ctx.get_callback("rf-cb-2") is not None
+
+    def test_store_init_sends_page_when_storage_changes_output(self):
+        client, _ = self._client()
+        _, fingerprint = self._initial_data(client.get("/items/7").text)
+
+        with client.websocket_connect("/ws") as websocket:
+            websocket.send_json(
+                {
+                    "type": "store_init",
+                    "path": "/items/7",
+                    "data": {"local": {"label": "Saved"}},
+                    "rendered": fingerprint,
+                }
+            )
+            response = websocket.receive_json()
+
+        assert response["type"] == "page_render"
+        assert response["component"]["children"][0]["children"] == ["Saved"]
+        assert response["component"]["id"] == "rf-4"
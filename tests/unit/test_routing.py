@@ -0,0 +1,129 @@
+"""Tests for the segment-trie page route matcher."""
+
+import random
+
+import pytest
+
+from refast.routing import RouteTrie, compile_pattern
+
+
+def _linear_match(patterns, path):
+    """Reference matcher: try each compiled pattern in registration order."""
+    for compiled, param_types, handler in patterns:
+        m = compiled.fullmatch(path)
+        if m:
+            params = {}
+            for k, v in m.groupdict().items():
+                try:
+                    params[k] = param_types.get(k, str)(v)
+                except (ValueError, TypeError):
+                    params[k] = v
+            return handler, params
+    return None, {}
+
+
+class TestRouteTrie:
+    """Tests for RouteTrie.add() / RouteTrie.match()."""
+
+    def test_static_and_param_segments(self):
+        """Static and typed parameter segments are matched and coerced."""
+        trie = RouteTrie()
+        trie.add("/users/{id:int}/posts/{slug}", "post")
+
+        assert trie.match("/users/3/posts/hello") == ("post", {"id": 3, "slug": "hello"})
+        assert trie.match("/users/x/posts/hello") == (None, {})
+        assert trie.match("/users/3/posts") == (None, {})
+
+    def test_first_registered_wins_across_branches(self):
+        """Precedence is registration order, not static-before-param."""
+        trie = RouteTrie()
+        trie.add("/a/{x}/c", "param-first")
+        trie.add("/a/b/c", "static-second")
+
+        assert trie.match("/a/b/c") == ("param-first", {"x": "b"})
+
+    def test_later_branch_used_when_earlier_fails_deeper(self):
+        """A branch that fails further down falls back to the next candidate."""
+        trie = RouteTrie()
+        trie.add("/a/b/{n:int}", "static-int")
+        trie.add("/a/{x}/{y}", "params")
+
+        assert trie.match("/a/b/7") == ("static-int", {"n": 7})
+        assert trie.match("/a/b/seven") == ("params", {"x": "b", "y": "seven"})
+
+    def test_same_shape_keeps_first_names(self):
+        """Patterns of the same shape use the first registration's names."""
+        trie = RouteTrie()
+        trie.add("/a/{x}", "first")
+        trie.add("/a/{y}", "second")
+
+        assert trie.match("/a/hello") == ("first", {"x": "hello"})
+
+    def test_mixed_segment(self):
+        """Segments mixing text and parameters are matched as a whole."""
+        trie = RouteTrie()
+        trie.add("/api/v{major:int}.{minor:int}/status", "status")
+
+        assert trie.match("/api/v2.10/status") == ("status", {"major": 2, "minor": 10})
+        assert trie.match("/api/version/status") == (None, {})
+
+    def test_catch_all(self):
+        """{name:path} captures the rest of the URL, slashes included."""
+        trie = RouteTrie()
+        trie.add("/files/{rest:path}", "files")
+        trie.add("/repo/{name}/blob/{file:path}/raw", "raw")
+
+        assert trie.match("/files/a/b/c.txt") == ("files", {"rest": "a/b/c.txt"})
+        assert trie.match("/files/") == (None, {})
+        assert trie.match("/repo/refast/blob/src/app.py/raw") == (
+            "raw",
+            {"name": "refast", "file": "src/app.py"},
+        )
+
+    def test_catch_all_respects_registration_order(self):
+        """A catch-all registered first beats later, more specific patterns."""
+        trie = RouteTrie()
+        trie.add("/docs/{page:path}", "catch-all")
+        trie.add("/docs/{section}/{page}", "two-segments")
+
+        assert trie.match("/docs/guide/intro")[0] == "catch-all"
+
+    def test_uncoercible_value_is_kept(self):
+        """Values that fail type coercion are returned as strings."""
+        trie = RouteTrie()
+        trie.add("/v/{value:float}", "value")
+
+        assert trie.match("/v/1.2.3") == ("value", {"value": "1.2.3"})
+
+    def test_len(self):
+        """len() reports the number of registered patterns."""
+        trie = RouteTrie()
+        trie.add("/a/{x}", "a")
+        trie.add("/b/{x}", "b")
+
+        assert len(trie) == 2
+
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_matches_linear_scan(self, seed):
+        """The trie returns exactly what trying patterns in order would."""
+        rng = random.Random(seed)
+        pieces = ["a", "b", "c", "{p0}", "{p0:int}", "{p0:float}", "v{p0:int}"]
+        values = ["a", "b", "c", "12", "1.5", "v3", "zz", "a/b", ""]
+
+        trie = RouteTrie()
+        patterns = []
+        for index in range(200):
+            segments = [
+                piece.replace("p0", f"p{i}")
+                for i, piece in enumerate(rng.choices(pieces, k=rng.randint(1, 3)))
+            ]
+            if rng.random() < 0.2:
+                segments.append("{rest:path}")
+            path = "/" + "/".join(segments)
+            compiled, param_types = compile_pattern(path)
+            patterns.append((compiled, param_types, index))
+            trie.add(path, index)
+
+        for _ in range(500):
+            path = "/" + "/".join(rng.choice(values) for _ in range(rng.randint(1, 4)))
+            assert trie.match(path) == _linear_match(patterns, path), path
@@ -6,6 +6,7 @@ import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
+from refast.security.backends import SharedMemoryRateLimitBackend
 from refast.security.csp import ContentSecurityPolicy
 from refast.security.csrf import CSRFConfig
 from refast.security.middleware import SecurityMiddleware
@@ -230,6 +231,30 @@ class TestSecurityMiddlewareRateLimiting:
         assert "X-RateLimit-Limit" in response.headers
         assert "X-RateLimit-Remaining" in response.headers
 
+    def test_limit_shared_between_workers(self, tmp_path) -> None:
+        """Workers sharing a backend file enforce one limit between them."""
+
+        def worker() -> TestClient:
+            app = FastAPI()
+            app.add_middleware(
+                SecurityMiddleware,
+                secret_key="test-secret",
+                rate_limit=3,
+                rate_limit_window=60,
+                rate_limit_backend=SharedMemoryRateLimitBackend(tmp_path / "limits"),
+                csrf_enabled=False,
+            )
+
+            @app.get("/")
+            async def home() -> dict[str, str]:
+                return {"status": "ok"}
+
+            return TestClient(app)
+
+        first, second = worker(), worker()
+        statuses = [client.get("/").status_code for client in (first, second, first, second)]
+        assert statuses == [200, 200, 200, 429]
+
 
 class TestSecurityMiddlewareConfiguration:
     """Tests for SecurityMiddleware configuration options."""
@@ -1,13 +1,45 @@
 """Tests for SessionMiddleware."""
 
+import asyncio
+
 import pytest
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, Request
+from fastapi.responses import StreamingResponse
 from fastapi.testclient import TestClient
 
-from refast.session.middleware import SessionMiddleware, get_session
+from refast.session.middleware import SessionMiddleware, get_session, load_session
+from refast.session.session import Session
+from refast.session.stores.base import SessionStore
 from refast.session.stores.memory import MemorySessionStore
 
 
+class CountingStore(MemorySessionStore):
+    """Memory store counting reads and writes."""
+
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+        self.writes = 0
+
+    def get_nowait(self, session_id):
+        self.reads += 1
+        return super().get_nowait(session_id)
+
+    async def set(self, session_id, data, ttl=None):
+        self.writes += 1
+        await super().set(session_id, data, ttl)
+
+
+class AsyncOnlyStore(MemorySessionStore):
+    """A store whose reads must be awaited, like a networked one."""
+
+    async def get(self, session_id):
+        await asyncio.sleep(0)
+        return super().get_nowait(session_id)
+
+    get_nowait = SessionStore.get_nowait
+
+
 class TestSessionMiddleware:
     """Tests for SessionMiddleware class."""
 
@@ -124,6 +156,14 @@ class TestGetSessionDependency:
         assert response.status_code == 200
         assert "id" in response.json()
 
+    def test_direct_call(self):
+        """get_session can be called synchronously with a request."""
+        from types import SimpleNamespace
+
+        session = Session()
+        request = SimpleNamespace(state=SimpleNamespace(session=session))
+        assert get_session(request) is session
+
     def test_dependency_set_get(self, app_with_dependency):
         """Test set and get via dependency."""
         client = TestClient(app_with_dependency)
@@ -166,3 +206,187 @@ class TestSessionMiddlewareOptions:
         client = TestClient(app)
         response = client.get("/")
         assert response.status_code == 200
+
+
+class TestLazySessions:
+    """Sessions are read from the store only when a request uses them."""
+
+    @pytest.fixture
+    def store(self):
+        """Create a counting store fixture."""
+        return CountingStore()
+
+    @pytest.fixture
+    def client(self, store):
+        """A client with an established session."""
+        app = FastAPI()
+        app.add_middleware(SessionMiddleware, store=store)
+
+        @app.get("/set/{value}")
+        async def set_value(request: Request, value: str):
+            request.state.session.set("value", value)
+            return {}
+
+        @app.get("/get")
+        async def get_value(request: Request):
+            return {"value": request.state.session.get("value")}
+
+        @app.get("/unused")
+        async def unused():
+            return {}
+
+        @app.get("/static/app.js")
+        async def static():
+            return {}
+
+        @app.get("/stream")
+        async def stream(request: Request):
+            async def body():
+                yield b"a"
+                request.state.session.set("value", "streamed")
+                yield b"b"
+
+            return StreamingResponse(body())
+
+        client = TestClient(app)
+        client.get("/set/x")
+        store.reads = store.writes = 0
+        return client
+
+    def test_unused_session_not_loaded(self, client, store):
+        """A request that ignores the session costs no read and sends no cookie."""
+        response = client.get("/unused")
+        assert store.reads == 0
+        assert "set-cookie" not in response.headers
+
+    def test_excluded_paths_skipped(self, store):
+        """Excluded prefixes get no session and no cookie, even without one."""
+        app = FastAPI()
+        app.add_middleware(SessionMiddleware, store=store)
+
+        @app.get("/static/app.js")
+        async def static(request: Request):
+            return {"has_session": hasattr(request.state, "session")}
+
+        @app.get("/statistics")
+        async def statistics(request: Request):
+            return {"has_session": hasattr(request.state, "session")}
+
+        client = TestClient(app)
+        response = client.get("/static/app.js")
+        assert response.json() == {"has_session": False}
+        assert "set-cookie" not in response.headers
+        assert client.get("/statistics").json() == {"has_session": True}
+
+    def test_unmodified_session_sends_no_cookie(self, client, store):
+        """Reading a session neither rewrites it nor re-sends the cookie."""
+        response = client.get("/get")
+        assert response.json() == {"value": "x"}
+        assert store.reads == 1
+        assert store.writes == 0
+        assert "set-cookie" not in response.headers
+
+    def test_modified_session_sends_cookie(self, client, store):
+        """Changing the session saves it and re-sends the cookie."""
+        response = client.get("/set/y")
+        assert store.writes == 1
+        assert "refast_session" in response.headers["set-cookie"]
+
+    def test_refresh_when_due(self, store):
+        """A session older than refresh_after is re-saved and its cookie re-sent."""
+        app = FastAPI()
+        app.add_middleware(SessionMiddleware, store=store, refresh_after=0)
+
+        @app.get("/set")
+        async def set_value(request: Request):
+            request.state.session.set("n", 1)
+            return {}
+
+        @app.get("/get")
+        async def get_value(request: Request):
+            return {"n": request.state.session.get("n")}
+
+        client = TestClient(app)
+        client.get("/set")
+        store.writes = 0
+        response = client.get("/get")
+        assert response.json() == {"n": 1}
+        assert store.writes == 1
+        assert "set-cookie" in response.headers
+
+    def test_changes_during_streaming_saved(self, client):
+        """Session changes made while the body streams are saved afterwards."""
+        response = client.get("/stream")
+        assert response.content == b"ab"
+        assert client.get("/get").json() == {"value": "streamed"}
+
+
+class TestAsyncOnlyStore:
+    """Lazy loading with a store that cannot read synchronously."""
+
+    @pytest.fixture
+    def store(self):
+        """Create an async-only store fixture."""
+        return AsyncOnlyStore()
+
+    def build(self, store, **options) -> TestClient:
+        app = FastAPI()
+        app.add_middleware(SessionMiddleware, store=store, **options)
+
+        @app.get("/set")
+        async def set_value(session: Session = Depends(get_session)):
+            session.set("n", 1)
+            return {}
+
+        @app.get("/loaded")
+        async def loaded(request: Request):
+            session = await load_session(request)
+            return {"n": session.get("n")}
+
+        @app.get("/dependency")
+        async def dependency(session: Session = Depends(get_session)):
+            return {"n": session.get("n")}
+
+        @app.get("/async-dependency")
+        async def async_dependency(session: Session = Depends(load_session)):
+            return {"n": session.get("n")}
+
+        @app.get("/direct")
+        async def direct(request: Request):
+            return {"n": request.state.session.get("n")}
+
+        @app.get("/sync")
+        def sync(request: Request):
+            return {"n": request.state.session.get("n")}
+
+        client = TestClient(app, raise_server_exceptions=False)
+        client.get("/set")
+        return client
+
+    def test_awaited_loading(self, store):
+        """get_session and load_session load the session."""
+        assert self.build(store).get("/loaded").json() == {"n": 1}
+
+    def test_sync_endpoint_loads_from_thread(self, store):
+        """Sync endpoints can read request.state.session directly."""
+        assert self.build(store).get("/sync").json() == {"n": 1}
+
+    def test_dependency_loading(self, store):
+        """get_session (in a worker thread) and Depends(load_session) load it."""
+        client = self.build(store, lazy=True)
+        assert client.get("/dependency").json() == {"n": 1}
+        assert client.get("/async-dependency").json() == {"n": 1}
+
+    def test_direct_access_in_async_endpoint_fails(self, store):
+        """Unloaded sessions cannot be read synchronously on the event loop."""
+        assert self.build(store, lazy=True).get("/direct").status_code == 500
+
+    def test_eager_loading(self, store):
+        """With lazy=False the session is loaded before the endpoint runs."""
+        assert self.build(store, lazy=False).get("/direct").json() == {"n": 1}
+
+    def test_eager_by_default(self, store):
+        """Stores without get_nowait load sessions up front by default."""
+        assert SessionMiddleware(FastAPI(), store=store).lazy is False
+        assert SessionMiddleware(FastAPI(), store=MemorySessionStore()).lazy is True
+        assert self.build(store).get("/direct").json() == {"n": 1}
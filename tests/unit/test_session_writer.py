@@ -0,0 +1,173 @@
+"""Tests for SessionWriter and WebSocket sessions."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from refast import RefastApp
+from refast.components import Text
+from refast.session import MemorySessionStore, SessionMiddleware, SessionWriter
+from refast.session.session import SessionData
+
+
+async def stored(store: MemorySessionStore, session_id: str) -> dict:
+    return (await store.get(session_id))["data"]
+
+
+class TestSessionWriter:
+    """Tests for SessionWriter."""
+
+    @pytest.mark.asyncio
+    async def test_acquire_loads_once_and_shares(self):
+        """Connections with the same session ID share one loaded session."""
+        store = MemorySessionStore()
+        await store.set("s1", SessionData(id="s1", data={"user": "ada"}).to_dict())
+        store.get = AsyncMock(wraps=store.get)
+        writer = SessionWriter(store)
+
+        first = await writer.acquire("s1")
+        second = await writer.acquire("s1")
+        assert first is second
+        assert first.get("user") == "ada"
+        store.get.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_unknown_id_not_adopted(self):
+        """An ID missing from the store gets a fresh, unsaved session instead."""
+        store = MemorySessionStore()
+        writer = SessionWriter(store, interval=0.01)
+        session = await writer.acquire("planted")
+        assert session.id != "planted"
+        assert session.keys() == []
+
+        session.set("user", "victim")
+        await asyncio.sleep(0.05)
+        await writer.release(session)
+        assert await store.get("planted") is None
+        assert await store.get(session.id) is None
+
+        other = await writer.acquire("planted")
+        assert other is not session
+
+    @pytest.mark.asyncio
+    async def test_mutations_debounced_into_one_write(self):
+        """A burst of changes is saved once, after the interval."""
+        store = MemorySessionStore()
+        await store.set("s1", SessionData(id="s1").to_dict())
+        store.update = AsyncMock(wraps=store.update)
+        writer = SessionWriter(store, interval=0.02)
+        session = await writer.acquire("s1")
+
+        for i in range(20):
+            session.set("count", i)
+        session.set("name", "x")
+        store.update.assert_not_awaited()
+
+        await asyncio.sleep(0.1)
+        store.update.assert_awaited_once()
+        assert store.update.await_args.args[2] == {"count", "name"}
+        assert await stored(store, "s1") == {"count": 19, "name": "x"}
+
+    @pytest.mark.asyncio
+    async def test_sessions_batched(self):
+        """Sessions changed within an interval are written in one flush."""
+        store = MemorySessionStore()
+        await store.set_many({f"s{i}": SessionData(id=f"s{i}").to_dict() for i in range(3)})
+        store.update = AsyncMock(wraps=store.update)
+        writer = SessionWriter(store, interval=0.02)
+        writer.flush = AsyncMock(wraps=writer.flush)
+        sessions = [await writer.acquire(f"s{i}") for i in range(3)]
+        for session in sessions:
+            session.set("seen", True)
+
+        await asyncio.sleep(0.1)
+        writer.flush.assert_awaited_once()
+        assert sorted(call.args[0] for call in store.update.await_args_list) == ["s0", "s1", "s2"]
+
+    @pytest.mark.asyncio
+    async def test_release_saves_when_last_user_leaves(self):
+        """Pending changes are saved when the last connection closes."""
+        store = MemorySessionStore()
+        await store.set("s1", SessionData(id="s1").to_dict())
+        store.update = AsyncMock(wraps=store.update)
+        writer = SessionWriter(store, interval=60)
+        session = await writer.acquire("s1")
+        await writer.acquire("s1")
+        session.set("n", 1)
+
+        await writer.release(session)
+        store.update.assert_not_awaited()
+        await writer.release(session)
+        store.update.assert_awaited_once()
+        assert await stored(store, "s1") == {"n": 1}
+        await writer.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_write_retried_in_full(self):
+        """A session whose write failed is rewritten whole on the next save."""
+        store = MemorySessionStore()
+        await store.set("s1", SessionData(id="s1", data={"a": 1}).to_dict())
+        writer = SessionWriter(store, interval=60)
+        session = await writer.acquire("s1")
+        session.set("b", 2)
+
+        original = store.update
+        store.update = AsyncMock(side_effect=ConnectionError("down"))
+        await writer.flush()
+        assert session.is_modified
+
+        store.update = original
+        await writer.release(session)
+        assert await stored(store, "s1") == {"a": 1, "b": 2}
+
+
+class TestWebSocketSession:
+    """ctx.session is the cookie's session, shared with HTTP requests."""
+
+    def test_session_shared_with_http(self):
+        """Values set over HTTP are read by the page, and its changes saved."""
+        store = MemorySessionStore()
+        ui = RefastApp(session_store=store, session_write_interval=0.01)
+
+        @ui.page("/")
+        def home(ctx):
+            visits = ctx.session.get("visits", 0) + 1
+            ctx.session.set("visits", visits)
+            return Text(f"{ctx.session.get('user')} visit {visits}")
+
+        app = FastAPI()
+        app.add_middleware(SessionMiddleware, store=store)
+
+        @app.get("/login")
+        async def login(request: Request):
+            request.state.session.set("user", "ada")
+            return {}
+
+        @app.get("/visits")
+        async def visits(request: Request):
+            return {"visits": request.state.session.get("visits")}
+
+        app.include_router(ui.router)
+        client = TestClient(app)
+        client.get("/login")
+
+        def render() -> str:
+            with client.websocket_connect("/ws") as websocket:
+                websocket.send_json({"type": "store_init", "path": "/", "data": {}})
+                while True:
+                    message = websocket.receive_json()
+                    if message["type"] == "page_render":
+                        return json.dumps(message["component"])
+
+        assert "ada visit 1" in render()
+        assert "ada visit 2" in render()
+        assert client.get("/visits").json() == {"visits": 2}
+
+    def test_without_store(self):
+        """Without a session store ctx.session is a blank, unsaved session."""
+        ui = RefastApp()
+        assert ui.sessions is None
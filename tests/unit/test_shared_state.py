@@ -0,0 +1,192 @@
+"""Tests for SharedState and reactive bindings."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from refast import RefastApp
+from refast.binding import Binding
+from refast.components.base import Container, Text
+from refast.context import Context
+from refast.state import SharedState
+
+
+def _render(ctx: Context, component) -> dict:
+    return ctx._render_page(component)
+
+
+class TestSharedStateBasic:
+    """Tests for dict-like SharedState operations."""
+
+    def test_app_has_shared_state(self):
+        """RefastApp exposes an app-scoped SharedState."""
+        ui = RefastApp(auto_discover_extensions=False)
+        assert isinstance(ui.shared_state, SharedState)
+
+    def test_get_set(self):
+        """Values can be set and read back."""
+        shared = SharedState({"a": 1})
+        shared["b"] = 2
+        shared.update({"c": 3})
+        assert shared["a"] == 1
+        assert shared.get("b") == 2
+        assert "c" in shared
+        assert shared.pop("c") == 3
+        assert shared.to_dict() == {"a": 1, "b": 2}
+
+    def test_bind_returns_binding(self):
+        """bind() creates a Binding placeholder."""
+        shared = SharedState()
+        binding = shared.bind("count", default=0)
+        assert isinstance(binding, Binding)
+        assert binding.resolve() == 0
+
+
+class TestSharedStateRendering:
+    """Tests for resolving shared bindings during render."""
+
+    def test_bound_prop_is_resolved(self):
+        """A bound prop renders with the current shared value."""
+        shared = SharedState({"title": "Hello"})
+        ctx = Context(websocket=AsyncMock())
+        tree = _render(ctx, Container(id="box", extra_props={"title": shared.bind("title")}))
+        assert tree["props"]["title"] == "Hello"
+        assert shared.subscriber_count("title") == 1
+
+    def test_bound_child_is_resolved_with_format(self):
+        """A bound child renders through its format function."""
+        shared = SharedState({"count": 3})
+        ctx = Context(websocket=AsyncMock())
+        tree = _render(ctx, Text(shared.bind("count", format=lambda v: f"Count: {v}"), id="label"))
+        assert tree["children"] == ["Count: 3"]
+
+    def test_http_render_does_not_register(self):
+        """Renders without a WebSocket resolve values but register nothing."""
+        shared = SharedState({"count": 1})
+        ctx = Context()
+        tree = _render(ctx, Text(shared.bind("count"), id="label"))
+        assert tree["children"] == ["1"]
+        assert shared.subscriber_count("count") == 0
+
+    def test_rerender_replaces_targets(self):
+        """A full page render drops targets from the previous render."""
+        shared = SharedState({"count": 1})
+        ctx = Context(websocket=AsyncMock())
+        _render(ctx, Text(shared.bind("count"), id="one"))
+        _render(ctx, Container(id="page"))
+        assert shared.subscriber_count("count") == 0
+
+
+@pytest.mark.asyncio
+class TestSharedStatePush:
+    """Tests for pushing shared changes to bound connections."""
+
+    async def test_set_pushes_to_bound_connections_only(self):
+        """Only connections that rendered a bound component are updated."""
+        shared = SharedState({"count": 0})
+        bound_ws, other_ws = AsyncMock(), AsyncMock()
+        bound_ctx = Context(websocket=bound_ws)
+        other_ctx = Context(websocket=other_ws)
+        _render(bound_ctx, Text(shared.bind("count"), id="label"))
+        _render(other_ctx, Text("static", id="label"))
+
+        shared.set("count", 5)
+        delivered = await shared.flush()
+
+        assert delivered == 1
+        bound_ws.send_json.assert_called_once_with(
+            {
+                "type": "update",
+                "operation": "update_props",
+                "targetId": "label",
+                "children": ["5"],
+            }
+        )
+        other_ws.send_json.assert_not_called()
+
+    async def test_changes_are_coalesced_per_connection(self):
+        """Several changed keys for one connection are sent in one frame."""
+        shared = SharedState({"a": 1, "b": 2})
+        ws = AsyncMock()
+        ctx = Context(websocket=ws)
+        _render(
+            ctx,
+            Container(
+                id="page",
+                children=[
+                    Text(shared.bind("a"), id="a"),
+                    Container(id="b", extra_props={"title": shared.bind("b")}),
+                ],
+            ),
+        )
+
+        shared.update({"a": 10, "b": 20})
+        await shared.flush()
+
+        ws.send_json.assert_called_once()
+        message = ws.send_json.call_args[0][0]
+        assert message["type"] == "batch"
+        by_target = {m["targetId"]: m for m in message["messages"]}
+        assert by_target["a"]["children"] == ["10"]
+        assert by_target["b"]["props"] == {"title": 20}
+
+    async def test_automatic_flush_on_running_loop(self):
+        """Changes are pushed automatically on the running event loop."""
+        shared = SharedState({"count": 0})
+        ws = AsyncMock()
+        ctx = Context(websocket=ws)
+        _render(ctx, Text(shared.bind("count"), id="label"))
+
+        shared["count"] = 1
+        shared["count"] = 2
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+        ws.send_json.assert_called_once()
+        assert ws.send_json.call_args[0][0]["children"] == ["2"]
+
+    async def test_failed_connection_is_not_counted(self):
+        """A connection that fails to send does not stop the others."""
+        shared = SharedState({"count": 0})
+        bad_ws, good_ws = AsyncMock(), AsyncMock()
+        bad_ws.send_json.side_effect = RuntimeError("closed")
+        for ws in (bad_ws, good_ws):
+            _render(Context(websocket=ws), Text(shared.bind("count"), id="label"))
+
+        shared.set("count", 1)
+        assert await shared.flush() == 1
+        good_ws.send_json.assert_called_once()
+
+    async def test_clear_bindings_on_disconnect(self):
+        """Clearing a context's bindings stops further pushes to it."""
+        shared = SharedState({"count": 0})
+        ws = AsyncMock()
+        ctx = Context(websocket=ws)
+        _render(ctx, Text(shared.bind("count"), id="label"))
+
+        ctx._clear_bindings()
+        shared.set("count", 1)
+        assert await shared.flush() == 0
+        ws.send_json.assert_not_called()
+
+    async def test_subscribe_and_unsubscribe(self):
+        """Subscribers (sync or async) are called with the changed key and value."""
+        shared = SharedState()
+        seen: list[tuple[str, object]] = []
+
+        async def on_change_async(key, value):
+            seen.append(("async", value))
+
+        unsubscribe = shared.subscribe("k", lambda key, value: seen.append((key, value)))
+        shared.subscribe("k", on_change_async)
+
+        shared.set("k", 1)
+        await shared.flush()
+        assert seen == [("k", 1), ("async", 1)]
+
+        unsubscribe()
+        shared.set("k", 2)
+        await shared.flush()
+        assert seen[-1] == ("async", 2)
+        assert len(seen) == 3
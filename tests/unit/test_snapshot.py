@@ -0,0 +1,384 @@
+"""Tests for context snapshots and their stores."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from refast import RefastApp
+from refast.components import Text
+from refast.context import Context
+from refast.snapshot import (
+    SNAPSHOT_STORAGE_KEY,
+    ContextSnapshot,
+    DiskSnapshotStore,
+    MemorySnapshotStore,
+    RedisSnapshotStore,
+    SnapshotWriter,
+)
+
+
+def make_context() -> Context:
+    """A context with a mock WebSocket and empty browser storage."""
+    ctx = Context(websocket=AsyncMock(), app=RefastApp())
+    ctx._load_store_from_browser({"local": {}, "session": {}})
+    return ctx
+
+
+class FakeRedis:
+    """The subset of redis.asyncio used by RedisSnapshotStore."""
+
+    def __init__(self):
+        self.data: dict[str, bytes] = {}
+        self.ttls: dict[str, int] = {}
+        self.pipelines = 0
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+        self.ttls[key] = ttl
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, client: FakeRedis):
+        self.client = client
+        self.commands = []
+
+    def setex(self, key, ttl, value):
+        self.commands.append((key, ttl, value))
+
+    async def execute(self):
+        self.client.pipelines += 1
+        for command in self.commands:
+            await self.client.setex(*command)
+
+
+class TestContextSnapshot:
+    """Tests for ContextSnapshot."""
+
+    def test_capture_and_restore(self):
+        """A snapshot carries state, location and storage to a new context."""
+        ctx = make_context()
+        ctx.state["count"] = 3
+        ctx._current_path = "/items/7"
+        ctx._query_string = "tab=2"
+        ctx._query_params = {"tab": "2"}
+        ctx._path_params = {"id": 7}
+        ctx.store.local.set("theme", "dark")
+
+        snapshot = ContextSnapshot.decode(ContextSnapshot.capture(ctx).encode())
+
+        fresh = make_context()
+        snapshot.restore(fresh)
+        assert fresh.state.to_dict() == {"count": 3}
+        assert fresh.url == "/items/7?tab=2"
+        assert fresh.query_params == {"tab": "2"}
+        assert fresh.path_params == {"id": 7}
+        assert fresh.store.local.get("theme") == "dark"
+
+    def test_snapshot_id_not_captured(self):
+        """The snapshot ID in sessionStorage is not part of the snapshot."""
+        ctx = make_context()
+        ctx.store.session.set(SNAPSHOT_STORAGE_KEY, "abc")
+        assert ContextSnapshot.capture(ctx).store["session"] == {}
+
+    def test_browser_storage_wins(self):
+        """Keys the browser reported are not overwritten by the snapshot."""
+        snapshot = ContextSnapshot(store={"local": {"theme": "dark", "lang": "fr"}})
+        ctx = Context(websocket=AsyncMock(), app=RefastApp())
+        ctx._load_store_from_browser({"local": {"theme": '"light"'}, "session": {}})
+
+        snapshot.restore(ctx)
+        assert ctx.store.local.get("theme") == "light"
+        assert ctx.store.local.get("lang") == "fr"
+
+    def test_unserializable_state(self):
+        """encode() raises TypeError for state JSON cannot hold."""
+        with pytest.raises(TypeError):
+            ContextSnapshot(state={"value": object()}).encode()
+
+
+class TestMemorySnapshotStore:
+    """Tests for MemorySnapshotStore."""
+
+    @pytest.mark.asyncio
+    async def test_round_trip_is_a_copy(self):
+        """Stored snapshots do not change with the object they came from."""
+        store = MemorySnapshotStore()
+        snapshot = ContextSnapshot(state={"items": [1]})
+        await store.set("a", snapshot)
+        snapshot.state["items"].append(2)
+
+        assert (await store.get("a")).state == {"items": [1]}
+        await store.delete("a")
+        assert await store.get("a") is None
+
+    @pytest.mark.asyncio
+    async def test_expiry(self):
+        """Expired snapshots are not returned and can be swept."""
+        store = MemorySnapshotStore()
+        await store.set("old", ContextSnapshot(), ttl=0)
+        await store.set("new", ContextSnapshot(), ttl=60)
+
+        assert await store.clear_expired() == 1
+        assert await store.get("old") is None
+        assert await store.get("new") is not None
+
+
+class TestDiskSnapshotStore:
+    """Tests for DiskSnapshotStore."""
+
+    @pytest.mark.asyncio
+    async def test_shared_between_instances(self, tmp_path):
+        """A snapshot written by one worker's store is read by another's."""
+        await DiskSnapshotStore(tmp_path).set("tab1", ContextSnapshot(state={"n": 1}))
+        snapshot = await DiskSnapshotStore(tmp_path).get("tab1")
+        assert snapshot.state == {"n": 1}
+
+    @pytest.mark.asyncio
+    async def test_set_many_leaves_no_temp_files(self, tmp_path):
+        """Batched writes produce exactly one file per snapshot."""
+        store = DiskSnapshotStore(tmp_path)
+        await store.set_many({f"t{i}": ContextSnapshot(state={"i": i}) for i in range(5)})
+        assert sorted(p.name for p in tmp_path.iterdir()) == [f"t{i}.json" for i in range(5)]
+        assert (await store.get("t3")).state == {"i": 3}
+
+    @pytest.mark.asyncio
+    async def test_rejects_path_traversal(self, tmp_path):
+        """IDs that could leave the directory are refused."""
+        store = DiskSnapshotStore(tmp_path / "snaps")
+        with pytest.raises(ValueError):
+            await store.set("../evil", ContextSnapshot())
+        assert await store.get("../evil") is None
+
+    @pytest.mark.asyncio
+    async def test_expiry_and_corrupt_files(self, tmp_path):
+        """Expired and unreadable files read as missing."""
+        store = DiskSnapshotStore(tmp_path)
+        await store.set("old", ContextSnapshot(), ttl=0)
+        await store.set("live", ContextSnapshot())
+        (tmp_path / "bad.json").write_text("{not json")
+
+        assert await store.get("bad") is None
+        assert await store.clear_expired() == 1
+        assert await store.get("old") is None
+        assert await store.get("live") is not None
+        await store.delete("live")
+        assert await store.get("live") is None
+
+
+class TestRedisSnapshotStore:
+    """Tests for RedisSnapshotStore with an in-memory client."""
+
+    def test_requires_url_or_client(self):
+        """A store needs a Redis URL or client."""
+        with pytest.raises(ValueError):
+            RedisSnapshotStore()
+
+    @pytest.mark.asyncio
+    async def test_round_trip(self):
+        """Snapshots are stored under the prefix with a TTL."""
+        client = FakeRedis()
+        store = RedisSnapshotStore(client=client, default_ttl=120)
+        await store.set("tab", ContextSnapshot(state={"n": 1}))
+
+        assert client.ttls == {"refast:snapshot:tab": 120}
+        assert (await store.get("tab")).state == {"n": 1}
+        await store.delete("tab")
+        assert await store.get("tab") is None
+
+    @pytest.mark.asyncio
+    async def test_set_many_uses_one_pipeline(self):
+        """A batch of snapshots is written in one round trip."""
+        client = FakeRedis()
+        store = RedisSnapshotStore(client=client)
+        await store.set_many({"a": ContextSnapshot(), "b": ContextSnapshot()}, ttl=30)
+        assert client.pipelines == 1
+        assert set(client.data) == {"refast:snapshot:a", "refast:snapshot:b"}
+
+
+class TestSnapshotWriter:
+    """Tests for SnapshotWriter."""
+
+    @pytest.mark.asyncio
+    async def test_restore_assigns_fresh_id(self):
+        """Each connection gets a new snapshot ID, synced to sessionStorage."""
+        store = MemorySnapshotStore()
+        await store.set("old-id", ContextSnapshot(state={"n": 5}))
+        writer = SnapshotWriter(store, interval=0.01)
+
+        ctx = Context(websocket=AsyncMock(), app=RefastApp())
+        ctx._load_store_from_browser({"session": {SNAPSHOT_STORAGE_KEY: json.dumps("old-id")}})
+
+        assert await writer.restore(ctx) is True
+        assert ctx.state["n"] == 5
+        assert ctx._snapshot_id not in (None, "old-id")
+        assert ctx.store.session.get(SNAPSHOT_STORAGE_KEY) == ctx._snapshot_id
+
+        # The restored state is saved under the new ID
+        await asyncio.sleep(0.05)
+        assert (await store.get(ctx._snapshot_id)).state == {"n": 5}
+
+    @pytest.mark.asyncio
+    async def test_restore_deletes_old_snapshot(self):
+        """After moving to a new ID the old snapshot is deleted."""
+        store = MemorySnapshotStore()
+        await store.set("old-id", ContextSnapshot(state={"n": 5}))
+        writer = SnapshotWriter(store, interval=60)
+
+        ctx = make_context()
+        ctx._load_store_from_browser({"session": {SNAPSHOT_STORAGE_KEY: json.dumps("old-id")}})
+
+        assert await writer.restore(ctx) is True
+        assert await store.get("old-id") is None
+        assert (await store.get(ctx._snapshot_id)).state == {"n": 5}
+
+    @pytest.mark.asyncio
+    async def test_restore_refuses_other_session(self):
+        """A snapshot taken in another session is neither applied nor deleted."""
+        from types import SimpleNamespace
+
+        store = MemorySnapshotStore()
+        owner = make_context()
+        owner._connection = SimpleNamespace(session_id="alice")
+        owner.state["secret"] = 1
+        await store.set("alice-tab", ContextSnapshot.capture(owner))
+        writer = SnapshotWriter(store)
+
+        ctx = make_context()
+        ctx._connection = SimpleNamespace(session_id="mallory")
+        ctx._load_store_from_browser({"session": {SNAPSHOT_STORAGE_KEY: json.dumps("alice-tab")}})
+
+        assert await writer.restore(ctx) is False
+        assert "secret" not in ctx.state
+        assert await store.get("alice-tab") is not None
+        assert (await store.get("alice-tab")).session_hash != "alice"
+
+    @pytest.mark.asyncio
+    async def test_restore_without_snapshot(self):
+        """A tab without a snapshot starts fresh."""
+        writer = SnapshotWriter(MemorySnapshotStore())
+        ctx = make_context()
+        assert await writer.restore(ctx) is False
+        assert ctx._snapshot_id is not None
+
+    @pytest.mark.asyncio
+    async def test_marks_coalesce_into_one_write(self):
+        """Many changes within an interval cost one batched write."""
+        store = MemorySnapshotStore()
+        store.set_many = AsyncMock(wraps=store.set_many)
+        writer = SnapshotWriter(store, interval=0.02)
+        contexts = [make_context() for _ in range(3)]
+        for ctx in contexts:
+            await writer.restore(ctx)
+
+        for i in range(10):
+            for ctx in contexts:
+                ctx.state["i"] = i
+                writer.mark(ctx)
+        await asyncio.sleep(0.1)
+
+        store.set_many.assert_awaited_once()
+        for ctx in contexts:
+            assert (await store.get(ctx._snapshot_id)).state == {"i": 9}
+
+    @pytest.mark.asyncio
+    async def test_unchanged_context_not_rewritten(self):
+        """Marking a context whose data did not change writes nothing."""
+        store = MemorySnapshotStore()
+        writer = SnapshotWriter(store)
+        ctx = make_context()
+        await writer.restore(ctx)
+        ctx.state["n"] = 1
+        writer.mark(ctx)
+        await writer.flush()
+
+        store.set_many = AsyncMock()
+        writer.mark(ctx)
+        await writer.flush()
+        store.set_many.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_release_writes_immediately(self):
+        """Disconnecting writes the final state without waiting."""
+        store = MemorySnapshotStore()
+        writer = SnapshotWriter(store, interval=60)
+        ctx = make_context()
+        await writer.restore(ctx)
+        ctx.state["n"] = 2
+        writer.mark(ctx)
+
+        await writer.release(ctx)
+        assert (await store.get(ctx._snapshot_id)).state == {"n": 2}
+        await writer.close()
+
+    @pytest.mark.asyncio
+    async def test_unserializable_state_is_skipped(self):
+        """A context whose state cannot be encoded does not block the others."""
+        store = MemorySnapshotStore()
+        writer = SnapshotWriter(store)
+        good, bad = make_context(), make_context()
+        for ctx in (good, bad):
+            await writer.restore(ctx)
+            writer.mark(ctx)
+        good.state["n"] = 1
+        bad.state["n"] = object()
+
+        await writer.flush()
+        assert (await store.get(good._snapshot_id)).state == {"n": 1}
+        assert await store.get(bad._snapshot_id) is None
+        await writer.close()
+
+
+class TestWorkerFailover:
+    """A client reconnecting to another worker keeps its state."""
+
+    def test_state_survives_switching_workers(self, tmp_path):
+        """State built on one app instance is restored by another."""
+
+        def build_worker() -> TestClient:
+            ui = RefastApp(snapshot_store=DiskSnapshotStore(tmp_path))
+
+            @ui.page("/")
+            def home(ctx):
+                ctx.state["visits"] = ctx.state.get("visits", 0) + 1
+                return Text(f"Visits: {ctx.state['visits']}")
+
+            app = FastAPI()
+            app.include_router(ui.router)
+            return TestClient(app)
+
+        def load(client: TestClient, session: dict) -> tuple[str, str | None]:
+            """Connect, return the rendered text and the new snapshot ID."""
+            with client.websocket_connect("/ws") as websocket:
+                websocket.send_json(
+                    {"type": "store_init", "path": "/", "data": {"local": {}, "session": session}}
+                )
+                text, snapshot_id = None, None
+                while text is None or snapshot_id is None:
+                    message = websocket.receive_json()
+                    if message["type"] == "page_render":
+                        text = json.dumps(message["component"])
+                    elif message["type"] == "store_update":
+                        for update in message["updates"]:
+                            if update["key"] == SNAPSHOT_STORAGE_KEY:
+                                snapshot_id = update["value"]
+            return text, snapshot_id
+
+        text, snapshot_id = load(build_worker(), {})
+        assert "Visits: 1" in text
+
+        session = {SNAPSHOT_STORAGE_KEY: json.dumps(snapshot_id)}
+        text, _ = load(build_worker(), session)
+        assert "Visits: 2" in text
@@ -0,0 +1,118 @@
+"""Tests for SQLiteSessionStore and the SQLite helper."""
+
+import asyncio
+import sqlite3
+
+import pytest
+
+from refast.session.session import SessionData
+from refast.session.stores.sqlite import SQLiteSessionStore
+from refast.utils.sqlite import SQLiteDatabase
+
+
+def session(session_id: str, **data) -> dict:
+    return SessionData(id=session_id, data=data).to_dict()
+
+
+@pytest.fixture
+async def store(tmp_path):
+    """A store in a temporary database, closed after the test."""
+    store = SQLiteSessionStore(tmp_path / "sessions.db")
+    yield store
+    await store.close()
+
+
+class TestSQLiteSessionStore:
+    """Tests for SQLiteSessionStore."""
+
+    @pytest.mark.asyncio
+    async def test_round_trip(self, store):
+        """Sessions are stored and read back intact."""
+        await store.set("s1", session("s1", user="ada", cart=[1, 2]))
+        assert (await store.get("s1"))["data"] == {"user": "ada", "cart": [1, 2]}
+        assert await store.exists("s1")
+        assert await store.get("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_overwrite_and_delete(self, store):
+        """set() replaces a session; delete() removes it."""
+        await store.set("s1", session("s1", n=1))
+        await store.set("s1", session("s1", n=2))
+        assert (await store.get("s1"))["data"] == {"n": 2}
+        await store.delete("s1")
+        assert not await store.exists("s1")
+
+    @pytest.mark.asyncio
+    async def test_expiry_and_touch(self, store):
+        """Expired sessions are invisible, cannot be touched and are cleared."""
+        await store.set("old", session("old"), ttl=0)
+        await store.set("live", session("live"), ttl=60)
+
+        assert await store.get("old") is None
+        assert not await store.touch("old")
+        assert await store.touch("live", ttl=120)
+        assert await store.clear_expired() == 1
+        assert await store.clear_expired() == 0
+
+    @pytest.mark.asyncio
+    async def test_many(self, store):
+        """set_many and get_many handle batches of sessions."""
+        sessions = {f"s{i}": session(f"s{i}", i=i) for i in range(1200)}
+        await store.set_many(sessions)
+        found = await store.get_many([*sessions, "missing"])
+        assert found == sessions
+
+    @pytest.mark.asyncio
+    async def test_concurrent_writes_group_committed(self, store):
+        """Writes issued together share transactions."""
+        await store.set("warm", session("warm"))
+        before = store._db.batches
+        await asyncio.gather(*(store.set(f"s{i}", session(f"s{i}")) for i in range(50)))
+        assert store._db.batches - before < 50
+        assert len(await store.get_many(f"s{i}" for i in range(50))) == 50
+
+    @pytest.mark.asyncio
+    async def test_durable_and_shared(self, tmp_path):
+        """A second store on the same file (another worker, or after a restart) sees the data."""
+        path = tmp_path / "shared.db"
+        first, second = SQLiteSessionStore(path), SQLiteSessionStore(path)
+        await first.set("s1", session("s1", n=1))
+        assert (await second.get("s1"))["data"] == {"n": 1}
+        await first.close()
+        await second.close()
+
+        with sqlite3.connect(path) as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN DELETE FROM sessions WHERE expires_at <= 0"
+            ).fetchall()
+        assert "sessions_expires_at" in str(plan)
+
+
+class TestSQLiteDatabase:
+    """Tests for the SQLite helper."""
+
+    @pytest.mark.asyncio
+    async def test_failed_statement_only_fails_its_caller(self, tmp_path):
+        """A bad write in a batch does not fail the others."""
+        db = SQLiteDatabase(tmp_path / "t.db", schema=["CREATE TABLE t (k TEXT PRIMARY KEY)"])
+        await db.execute("INSERT INTO t VALUES (?)", ("a",))
+        results = await asyncio.gather(
+            db.execute("INSERT INTO t VALUES (?)", ("b",)),
+            db.execute("INSERT INTO t VALUES (?)", ("a",)),
+            db.execute("INSERT INTO t VALUES (?)", ("c",)),
+            return_exceptions=True,
+        )
+        assert results[0] == 1 and results[2] == 1
+        assert isinstance(results[1], sqlite3.IntegrityError)
+        rows = await db.read(lambda conn: conn.execute("SELECT k FROM t ORDER BY k").fetchall())
+        assert rows == [("a",), ("b",), ("c",)]
+        await db.close()
+
+    @pytest.mark.asyncio
+    async def test_closed(self, tmp_path):
+        """A closed database refuses further use."""
+        db = SQLiteDatabase(tmp_path / "t.db")
+        await db.close()
+        with pytest.raises(RuntimeError):
+            await db.read(lambda conn: None)
@@ -1,8 +1,13 @@
 """Tests for State class."""
 
+import asyncio
+from unittest.mock import AsyncMock
+
 import pytest
 from pydantic import BaseModel
 
+from refast.components.base import Container, Text
+from refast.context import Context
 from refast.state import State
 
 
@@ -191,3 +196,204 @@ class TestStateInitialCopy:
         """Test State with None initial."""
         state = State(None)
         assert state.to_dict() == {}
+
+
+@pytest.mark.asyncio
+class TestStateBindings:
+    """Tests for ctx.bind() state-bound props."""
+
+    async def test_bind_renders_current_value(self):
+        """A bound child renders the current state value."""
+        ctx = Context(websocket=AsyncMock())
+        ctx.state["count"] = 2
+        tree = ctx._render_page(Text(ctx.bind("count"), id="label"))
+        assert tree["children"] == ["2"]
+
+    async def test_bind_default_and_format(self):
+        """Default and format apply when rendering a bound prop."""
+        ctx = Context(websocket=AsyncMock())
+        tree = ctx._render_page(
+            Container(id="box", extra_props={"title": ctx.bind("n", 0, format=lambda v: v + 1)})
+        )
+        assert tree["props"]["title"] == 1
+
+    async def test_set_queues_update_props(self):
+        """Setting a bound key sends update_props for exactly the bound target."""
+        ws = AsyncMock()
+        ctx = Context(websocket=ws)
+        ctx._render_page(
+            Container(id="page", children=[Text(ctx.bind("count", 0), id="label"), Text("x")])
+        )
+
+        ctx.state["count"] = 1
+        ctx.state.set("count", 2)
+        await ctx.state.flush()
+
+        ws.send_json.assert_called_once_with(
+            {
+                "type": "update",
+                "operation": "update_props",
+                "targetId": "label",
+                "children": ["2"],
+            }
+        )
+
+    async def test_update_and_pop_queue_updates(self):
+        """update() and pop() on bound keys queue updates too."""
+        ws = AsyncMock()
+        ctx = Context(websocket=ws)
+        ctx._render_page(
+            Container(
+                id="box",
+                extra_props={"title": ctx.bind("title", "none")},
+                children=[Text(ctx.bind("body"), id="body")],
+            )
+        )
+
+        ctx.state.update({"title": "Hi", "body": "There", "other": 1})
+        await ctx.state.flush()
+        messages = ws.send_json.call_args[0][0]["messages"]
+        assert {m["targetId"]: m.get("props", m.get("children")) for m in messages} == {
+            "box": {"title": "Hi"},
+            "body": ["There"],
+        }
+
+        ws.send_json.reset_mock()
+        ctx.state.pop("title")
+        await ctx.state.flush()
+        assert ws.send_json.call_args[0][0]["props"] == {"title": "none"}
+
+    async def test_unbound_keys_do_not_send(self):
+        """Changing keys that are not bound sends nothing."""
+        ws = AsyncMock()
+        ctx = Context(websocket=ws)
+        ctx._render_page(Text(ctx.bind("count"), id="label"))
+
+        ctx.state["other"] = 1
+        await ctx.state.flush()
+        ws.send_json.assert_not_called()
+
+    async def test_automatic_flush(self):
+        """Bound changes are pushed automatically on the running loop."""
+        ws = AsyncMock()
+        ctx = Context(websocket=ws)
+        ctx._render_page(Text(ctx.bind("count"), id="label"))
+
+        ctx.state["count"] = 5
+        for _ in range(3):
+            await asyncio.sleep(0)
+        ws.send_json.assert_called_once()
+
+    async def test_automatic_flush_task_is_tracked(self, caplog):
+        """Flush tasks are referenced until done and their errors are logged."""
+        from refast import state as state_module
+
+        ws = AsyncMock()
+        ws.send_json.side_effect = RuntimeError("closed")
+        ctx = Context(websocket=ws)
+        ctx._render_page(Text(ctx.bind("count"), id="label"))
+
+        ctx.state["count"] = 5
+        await asyncio.sleep(0)
+        assert len(state_module._background_tasks) == 1
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+        assert state_module._background_tasks == set()
+        assert "Pushing state changes failed" in caplog.text
+
+    async def test_page_render_replaces_bindings(self):
+        """A new page render drops stale targets and pending pushes."""
+        ws = AsyncMock()
+        ctx = Context(websocket=ws)
+        ctx._render_page(Text(ctx.bind("count"), id="old"))
+        ctx.state["count"] = 1
+        ctx._render_page(Text(ctx.bind("count"), id="new"))
+
+        await ctx.state.flush()
+        ws.send_json.assert_not_called()
+
+        ctx.state["count"] = 2
+        await ctx.state.flush()
+        assert ws.send_json.call_args[0][0]["targetId"] == "new"
+
+    async def test_replace_drops_targets_of_old_subtree(self):
+        """Replacing a component unbinds everything rendered inside it."""
+        ws = AsyncMock()
+        ctx = Context(websocket=ws)
+        ctx._render_page(
+            Container(
+                id="page",
+                children=[
+                    Container(id="panel", children=[Text(ctx.bind("count"), id="old")]),
+                    Text(ctx.bind("count"), id="keep"),
+                ],
+            )
+        )
+
+        for _ in range(3):
+            await ctx.replace(
+                "panel", Container(id="panel", children=[Text(ctx.bind("count"), id="new")])
+            )
+        ws.send_json.reset_mock()
+
+        ctx.state["count"] = 1
+        await ctx.state.flush()
+        messages = ws.send_json.call_args[0][0]["messages"]
+        assert [m["targetId"] for m in messages] == ["keep", "new"]
+
+    async def test_refresh_target_does_not_pile_up(self):
+        """Repeated partial refreshes keep a single target per bound component."""
+        from refast.app import RefastApp
+
+        ui = RefastApp()
+
+        @ui.page("/")
+        def home(ctx):
+            return Container(id="page", children=[Text(ctx.bind("count"), id="label")])
+
+        ws = AsyncMock()
+        ctx = Context(websocket=ws, app=ui)
+        for _ in range(3):
+            await ctx.refresh(target_id="label")
+
+        assert [t.component_id for t in ctx.state._targets["count"]] == ["label"]
+
+    async def test_children_update_keeps_prop_bindings(self):
+        """Replacing children unbinds the old children but not the parent's props."""
+        ws = AsyncMock()
+        ctx = Context(websocket=ws)
+        ctx._render_page(
+            Container(
+                id="box",
+                extra_props={"title": ctx.bind("title")},
+                children=[Text(ctx.bind("body"), id="body")],
+            )
+        )
+
+        await ctx.update_props("box", {"children": [Text("static")]})
+        await ctx.remove("missing")
+
+        assert "body" not in ctx.state._targets
+        assert [t.prop for t in ctx.state._targets["title"]] == ["title"]
+
+    async def test_remove_drops_shared_state_targets(self):
+        """Removing a component unbinds its shared state targets too."""
+        from refast.state import SharedState
+
+        shared = SharedState()
+        ctx = Context(websocket=AsyncMock())
+        ctx._render_page(
+            Container(
+                id="page",
+                children=[
+                    Container(id="panel", children=[Text(shared.bind("online"), id="a")]),
+                    Text(shared.bind("online"), id="b"),
+                ],
+            )
+        )
+
+        await ctx.remove("panel")
+
+        assert [t.component_id for t in shared._targets["online"][ctx]] == ["b"]
+        assert "panel" not in ctx._binding_parents
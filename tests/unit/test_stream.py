@@ -86,6 +86,18 @@ class TestWebSocketConnection:
         assert result is True
         ws.send_json.assert_called_once_with({"test": "data"})
 
+    @pytest.mark.asyncio
+    async def test_send_encoded_frame(self):
+        """Test a pre-encoded frame is sent as text."""
+        ws = AsyncMock()
+        conn = WebSocketConnection(websocket=ws, connected=True)
+
+        result = await conn.send('{"test":"data"}')
+
+        assert result is True
+        ws.send_text.assert_called_once_with('{"test":"data"}')
+        ws.send_json.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_send_error_marks_disconnected(self):
         """Test send error marks connection as disconnected."""
@@ -205,8 +217,8 @@ class TestEventStream:
         conn2 = WebSocketConnection(connected=True)
         conn2.send = AsyncMock(return_value=True)
 
-        stream._connections[conn1.id] = conn1
-        stream._connections[conn2.id] = conn2
+        stream.add_connection(conn1)
+        stream.add_connection(conn2)
 
         count = await stream.send_to_subscribers("channel1", {"test": "data"})
 
@@ -4,7 +4,7 @@ import time
 
 import pytest
 
-from refast.utils.temp_file_store import DiskFileStore, FileInfo, MemoryFileStore
+from refast.utils.temp_file_store import DiskFileStore, FileInfo, MemoryFileStore, SQLiteFileStore
 
 # ─── FileInfo ─────────────────────────────────────────────────────────────────
 
@@ -241,3 +241,48 @@ class TestDiskFileStore:
         assert new_dir.exists()
         info = await store.store_file(b"x", "x.bin", "application/octet-stream")
         assert info.id in store._metadata
+
+
+# ─── SQLiteFileStore ──────────────────────────────────────────────────────────
+
+
+class TestSQLiteFileStore:
+    @pytest.mark.asyncio
+    async def test_store_and_retrieve(self, tmp_path):
+        store = SQLiteFileStore(str(tmp_path))
+        info = await store.store_file(b"sqlite content", "s.txt", "text/plain", inline=True)
+        assert await store.get_file(info.id) == b"sqlite content"
+        retrieved = await store.get_file_info(info.id)
+        assert (retrieved.name, retrieved.size, retrieved.inline) == ("s.txt", 14, True)
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_metadata_survives_restart(self, tmp_path):
+        first = SQLiteFileStore(str(tmp_path))
+        info = await first.store_file(b"kept", "kept.bin", user_upload=True)
+        await first.close()
+
+        second = SQLiteFileStore(str(tmp_path))
+        retrieved = await second.get_file_info(info.id)
+        assert retrieved.user_upload is True
+        assert await retrieved.read() == b"kept"
+        await second.close()
+
+    @pytest.mark.asyncio
+    async def test_delete_and_unknown(self, tmp_path):
+        store = SQLiteFileStore(str(tmp_path))
+        info = await store.store_file(b"del", "del.bin")
+        await store.delete_file(info.id)
+        assert not (tmp_path / info.id).exists()
+        assert await store.get_file(info.id) is None
+        assert await store.get_file_info("../files.db") is None
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_clear_expired(self, tmp_path):
+        store = SQLiteFileStore(str(tmp_path), ttl_seconds=0)
+        info = await store.store_file(b"old", "old.bin")
+        assert await store.get_file(info.id) is None
+        assert await store.clear_expired() == 1
+        assert not (tmp_path / info.id).exists()
+        await store.close()